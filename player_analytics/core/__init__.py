@@ -14,10 +14,12 @@ from .session_tracker import SessionTracker
 from .player_database import PlayerDatabase
 from .analytics_engine import AnalyticsEngine
 from .report_generator import ReportGenerator
+from .event_buffer import EventBuffer
 
 __all__ = [
     "SessionTracker",
     "PlayerDatabase",
     "AnalyticsEngine",
     "ReportGenerator",
+    "EventBuffer",
 ]
@@ -7,12 +7,13 @@ Processes player data to generate insights and metrics.
 Provides engagement analysis, retention metrics, and trends.
 """
 
+import copy
 import logging
-import sqlite3
+from bisect import bisect_left
 from collections import defaultdict
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from .player_database import PlayerDatabase
 
@@ -33,6 +34,7 @@ class AnalyticsEngine:
     
     def __init__(self, database: Optional[PlayerDatabase] = None):
         self.db = database or PlayerDatabase()
+        self._segments_cache: Optional[Tuple[Tuple[int, datetime], Dict[str, Any]]] = None
     
     def get_engagement_metrics(
         self,
@@ -41,54 +43,50 @@ class AnalyticsEngine:
         """
         Calculate engagement metrics for the specified period.
         
+        Read from the rollup tables: session counts and playtime cover
+        whole hours from the cutoff, unique players whole days.
+        
         Args:
             days: Number of days to analyze
             
         Returns:
             Engagement metrics
         """
-        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
-        
-        with sqlite3.connect(self.db.db_path) as conn:
-            # Daily Active Users (DAU)
-            dau_query = """
-                SELECT DATE(start_time) as day, COUNT(DISTINCT player_id) as count
-                FROM sessions
-                WHERE start_time >= ?
-                GROUP BY DATE(start_time)
-                ORDER BY day
-            """
-            dau_data = conn.execute(dau_query, (cutoff,)).fetchall()
-            
-            # Total unique players in period
-            unique_players = conn.execute(
-                """SELECT COUNT(DISTINCT player_id) FROM sessions 
-                   WHERE start_time >= ?""",
-                (cutoff,)
-            ).fetchone()[0]
-            
-            # Total sessions
-            total_sessions = conn.execute(
-                """SELECT COUNT(*) FROM sessions WHERE start_time >= ?""",
-                (cutoff,)
-            ).fetchone()[0]
-            
-            # Total playtime
-            total_playtime = conn.execute(
-                """SELECT SUM(duration_minutes) FROM sessions 
-                   WHERE start_time >= ? AND end_time IS NOT NULL""",
-                (cutoff,)
-            ).fetchone()[0] or 0
-            
-            # Average session duration
-            avg_session = conn.execute(
-                """SELECT AVG(duration_minutes) FROM sessions 
-                   WHERE start_time >= ? AND end_time IS NOT NULL""",
-                (cutoff,)
-            ).fetchone()[0] or 0
-            
-            # Sessions per player
-            sessions_per_player = total_sessions / unique_players if unique_players > 0 else 0
+        cutoff = datetime.now() - timedelta(days=days)
+        cutoff_hour = cutoff.isoformat()[:13]
+        cutoff_day = cutoff.isoformat()[:10]
+        
+        conn = self.db.connection()
+        # Daily Active Users (DAU)
+        dau_query = """
+            SELECT day, COUNT(DISTINCT player_id) as count
+            FROM daily_player_rollups
+            WHERE day >= ?
+            GROUP BY day
+            ORDER BY day
+        """
+        dau_data = conn.execute(dau_query, (cutoff_day,)).fetchall()
+        
+        # Total unique players in period
+        unique_players = conn.execute(
+            """SELECT COUNT(DISTINCT player_id) FROM daily_player_rollups 
+               WHERE day >= ?""",
+            (cutoff_day,)
+        ).fetchone()[0]
+        
+        # Sessions, ended sessions and playtime
+        total_sessions, ended_sessions, total_playtime = conn.execute(
+            """SELECT COALESCE(SUM(sessions), 0), COALESCE(SUM(ended_sessions), 0),
+                      COALESCE(SUM(playtime_minutes), 0)
+               FROM hourly_rollups WHERE hour >= ?""",
+            (cutoff_hour,)
+        ).fetchone()
+        
+        # Average session duration
+        avg_session = total_playtime / ended_sessions if ended_sessions > 0 else 0
+        
+        # Sessions per player
+        sessions_per_player = total_sessions / unique_players if unique_players > 0 else 0
         
         # Calculate DAU average
         dau_values = [row[1] for row in dau_data]
@@ -112,64 +110,86 @@ class AnalyticsEngine:
     def get_retention_metrics(
         self,
         cohort_date: Optional[str] = None,
+        offsets: Sequence[int] = (1, 7, 14, 30),
     ) -> Dict[str, Any]:
         """
         Calculate player retention metrics.
         
+        Players are grouped into daily cohorts by their first session.
+        A player is retained at day N if they played again on or after
+        N days after their first day. Cells that cannot be observed yet
+        (cohort day + N in the future) are left out, so the cohorts form
+        a retention triangle; the overall rates only count cohorts that
+        are old enough.
+        
         Args:
             cohort_date: Start date for cohort (default: 30 days ago)
+            offsets: Day offsets to report
             
         Returns:
             Retention metrics
         """
         if cohort_date is None:
             cohort_date = (datetime.now() - timedelta(days=30)).strftime("%Y-%m-%d")
+        today = datetime.now().date()
         
-        with sqlite3.connect(self.db.db_path) as conn:
-            # Get players who started in the cohort period (first session)
-            cohort_query = """
-                SELECT player_id, MIN(DATE(start_time)) as first_day
-                FROM sessions
-                GROUP BY player_id
-                HAVING first_day >= ?
-            """
-            
-            cohort_players = conn.execute(
-                cohort_query, (cohort_date,)
-            ).fetchall()
-            
-            if not cohort_players:
-                return {"error": "No players in cohort period"}
-            
-            cohort_size = len(cohort_players)
-            player_ids = [p[0] for p in cohort_players]
-            
-            # Calculate retention for each day
+        conn = self.db.connection()
+        # One pass over first-seen: players per (cohort, days active since
+        # first day), with the number of players active at least that long
+        triangle_query = """
+            SELECT first_day, span,
+                   SUM(COUNT(*)) OVER (PARTITION BY first_day ORDER BY span DESC) as retained,
+                   SUM(COUNT(*)) OVER (PARTITION BY first_day) as size
+            FROM (
+                SELECT first_day,
+                       CAST(julianday(last_day) - julianday(first_day) AS INTEGER) as span
+                FROM player_first_seen
+                WHERE first_day >= ?
+            )
+            GROUP BY first_day, span
+            ORDER BY first_day, span
+        """
+        spans: Dict[str, List[Tuple[int, int]]] = defaultdict(list)
+        sizes: Dict[str, int] = {}
+        for first_day, span, retained, size in conn.execute(triangle_query, (cohort_date,)):
+            spans[first_day].append((span, retained))
+            sizes[first_day] = size
+        
+        if not sizes:
+            return {"error": "No players in cohort period"}
+        
+        cohorts = []
+        totals = {offset: [0, 0] for offset in offsets}
+        for first_day, size in sizes.items():
+            age = (today - datetime.strptime(first_day, "%Y-%m-%d").date()).days
+            cohort_spans = spans[first_day]
             retention = {}
-            for day_offset in [1, 7, 14, 30]:
-                target_date = (
-                    datetime.strptime(cohort_date, "%Y-%m-%d") + 
-                    timedelta(days=day_offset)
-                ).strftime("%Y-%m-%d")
-                
-                # Count players who returned on or after target day
-                placeholders = ",".join("?" * len(player_ids))
-                returned = conn.execute(
-                    f"""SELECT COUNT(DISTINCT player_id) FROM sessions
-                       WHERE player_id IN ({placeholders})
-                       AND DATE(start_time) >= ?""",
-                    (*player_ids, target_date)
-                ).fetchone()[0]
-                
-                retention[f"day_{day_offset}"] = {
+            for offset in offsets:
+                if offset > age:
+                    continue
+                # Players whose span reaches the offset (spans are ascending)
+                index = bisect_left(cohort_spans, (offset,))
+                returned = cohort_spans[index][1] if index < len(cohort_spans) else 0
+                retention[f"day_{offset}"] = {
                     "returned": returned,
-                    "rate": round((returned / cohort_size) * 100, 1),
+                    "rate": round((returned / size) * 100, 1),
                 }
+                totals[offset][0] += returned
+                totals[offset][1] += size
+            cohorts.append({"date": first_day, "size": size, "retention": retention})
         
         return {
             "cohort_date": cohort_date,
-            "cohort_size": cohort_size,
-            "retention": retention,
+            "cohort_size": sum(sizes.values()),
+            "retention": {
+                f"day_{offset}": {
+                    "returned": returned,
+                    "players": players,
+                    "rate": round((returned / players) * 100, 1) if players else 0,
+                }
+                for offset, (returned, players) in totals.items()
+            },
+            "cohorts": cohorts,
         }
     
     def get_peak_hours(
@@ -185,28 +205,28 @@ class AnalyticsEngine:
         Returns:
             Peak hour analysis
         """
-        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
-        
-        with sqlite3.connect(self.db.db_path) as conn:
-            # Sessions by hour
-            hourly_query = """
-                SELECT strftime('%H', start_time) as hour, COUNT(*) as count
-                FROM sessions
-                WHERE start_time >= ?
-                GROUP BY hour
-                ORDER BY hour
-            """
-            hourly_data = conn.execute(hourly_query, (cutoff,)).fetchall()
-            
-            # Sessions by day of week
-            daily_query = """
-                SELECT strftime('%w', start_time) as dow, COUNT(*) as count
-                FROM sessions
-                WHERE start_time >= ?
-                GROUP BY dow
-                ORDER BY dow
-            """
-            daily_data = conn.execute(daily_query, (cutoff,)).fetchall()
+        cutoff_hour = (datetime.now() - timedelta(days=days)).isoformat()[:13]
+        
+        conn = self.db.connection()
+        # Sessions by hour
+        hourly_query = """
+            SELECT substr(hour, 12, 2) as hour_of_day, SUM(sessions) as count
+            FROM hourly_rollups
+            WHERE hour >= ?
+            GROUP BY hour_of_day
+            ORDER BY hour_of_day
+        """
+        hourly_data = conn.execute(hourly_query, (cutoff_hour,)).fetchall()
+        
+        # Sessions by day of week
+        daily_query = """
+            SELECT strftime('%w', substr(hour, 1, 10)) as dow, SUM(sessions) as count
+            FROM hourly_rollups
+            WHERE hour >= ?
+            GROUP BY dow
+            ORDER BY dow
+        """
+        daily_data = conn.execute(daily_query, (cutoff_hour,)).fetchall()
         
         # Find peaks
         hour_counts = {int(row[0]): row[1] for row in hourly_data}
@@ -242,69 +262,89 @@ class AnalyticsEngine:
         """
         Segment players by engagement level.
         
+        One streaming pass over the playtime index: only segment counts
+        and the top 5 rowids per segment are kept, then those players are
+        looked up. Results are cached until the players table changes or
+        the churn cutoff moves to the next minute.
+        
         Returns:
             Player segmentation
         """
-        with sqlite3.connect(self.db.db_path) as conn:
-            # Get all players with playtime
-            players = conn.execute(
-                """SELECT player_id, username, total_playtime_minutes, 
-                          session_count, last_seen
-                   FROM players
-                   ORDER BY total_playtime_minutes DESC"""
-            ).fetchall()
-        
-        if not players:
-            return {"segments": {}, "total_players": 0}
-        
-        segments = {
-            "whales": [],      # Top 10% by playtime
-            "regulars": [],    # Next 30%
-            "casuals": [],     # Next 40%
-            "churned": [],     # Haven't played in 14+ days
-            "new": [],         # Played less than 3 sessions
-        }
+        churn_threshold = (datetime.now() - timedelta(days=14)).replace(second=0, microsecond=0)
+        key = (self.db.table_version("players"), churn_threshold)
+        if self._segments_cache is not None and self._segments_cache[0] == key:
+            return copy.deepcopy(self._segments_cache[1])
         
-        now = datetime.now()
-        churn_threshold = now - timedelta(days=14)
+        conn = self.db.connection()
+        total_players = conn.execute("SELECT COUNT(*) FROM players").fetchone()[0]
+        if not total_players:
+            result = {"segments": {}, "total_players": 0}
+            self._segments_cache = (key, result)
+            return copy.deepcopy(result)
         
-        for i, player in enumerate(players):
-            player_id, username, playtime, sessions, last_seen = player
-            
-            last_seen_dt = datetime.fromisoformat(last_seen) if last_seen else now
-            
-            player_data = {
-                "player_id": player_id,
-                "username": username,
-                "playtime_hours": round(playtime / 60, 1),
-                "sessions": sessions,
-            }
-            
+        counts = {
+            "whales": 0,      # Top 10% by playtime
+            "regulars": 0,    # Next 30%
+            "casuals": 0,     # Next 40%
+            "churned": 0,     # Haven't played in 14+ days
+            "new": 0,         # Played less than 3 sessions
+        }
+        top_rowids: Dict[str, List[int]] = {name: [] for name in counts}
+        cutoff = churn_threshold.isoformat()
+        
+        # Plain tuples: this loop sees every player
+        cursor = conn.cursor()
+        cursor.row_factory = None
+        cursor.execute(
+            """SELECT rowid, last_seen, session_count
+               FROM players
+               ORDER BY total_playtime_minutes DESC"""
+        )
+        for position, (rowid, last_seen, sessions) in enumerate(cursor):
             # Segment classification
-            if last_seen_dt < churn_threshold:
-                segments["churned"].append(player_data)
+            if last_seen and last_seen < cutoff:
+                segment = "churned"
             elif sessions < 3:
-                segments["new"].append(player_data)
+                segment = "new"
+            elif position * 10 < total_players:
+                segment = "whales"
+            elif position * 10 < total_players * 4:
+                segment = "regulars"
             else:
-                percentile = i / len(players)
-                if percentile < 0.1:
-                    segments["whales"].append(player_data)
-                elif percentile < 0.4:
-                    segments["regulars"].append(player_data)
-                else:
-                    segments["casuals"].append(player_data)
+                segment = "casuals"
+            counts[segment] += 1
+            # Rows arrive by playtime, so the first 5 seen are the top 5
+            if len(top_rowids[segment]) < 5:
+                top_rowids[segment].append(rowid)
         
-        return {
-            "total_players": len(players),
+        rowids = [rowid for ids in top_rowids.values() for rowid in ids]
+        players = {
+            row["rowid"]: {
+                "player_id": row["player_id"],
+                "username": row["username"],
+                "playtime_hours": round(row["total_playtime_minutes"] / 60, 1),
+                "sessions": row["session_count"],
+            }
+            for row in conn.execute(
+                f"""SELECT rowid, player_id, username, total_playtime_minutes, session_count
+                    FROM players WHERE rowid IN ({",".join("?" * len(rowids))})""",
+                rowids
+            )
+        }
+        
+        result = {
+            "total_players": total_players,
             "segments": {
                 name: {
-                    "count": len(players_list),
-                    "percentage": round((len(players_list) / len(players)) * 100, 1),
-                    "top_players": players_list[:5],
+                    "count": count,
+                    "percentage": round((count / total_players) * 100, 1),
+                    "top_players": [players[rowid] for rowid in top_rowids[name]],
                 }
-                for name, players_list in segments.items()
+                for name, count in counts.items()
             },
         }
+        self._segments_cache = (key, result)
+        return copy.deepcopy(result)
     
     def get_leaderboard(
         self,
@@ -321,29 +361,29 @@ class AnalyticsEngine:
         Returns:
             Leaderboard entries
         """
-        with sqlite3.connect(self.db.db_path) as conn:
-            if metric == "playtime":
-                query = """
-                    SELECT player_id, username, total_playtime_minutes as value
-                    FROM players
-                    ORDER BY total_playtime_minutes DESC
-                    LIMIT ?
-                """
-                label = "hours"
-                divisor = 60
-            elif metric == "sessions":
-                query = """
-                    SELECT player_id, username, session_count as value
-                    FROM players
-                    ORDER BY session_count DESC
-                    LIMIT ?
-                """
-                label = "sessions"
-                divisor = 1
-            else:
-                return []
-            
-            rows = conn.execute(query, (limit,)).fetchall()
+        conn = self.db.connection()
+        if metric == "playtime":
+            query = """
+                SELECT player_id, username, total_playtime_minutes as value
+                FROM players
+                ORDER BY total_playtime_minutes DESC
+                LIMIT ?
+            """
+            label = "hours"
+            divisor = 60
+        elif metric == "sessions":
+            query = """
+                SELECT player_id, username, session_count as value
+                FROM players
+                ORDER BY session_count DESC
+                LIMIT ?
+            """
+            label = "sessions"
+            divisor = 1
+        else:
+            return []
+        
+        rows = conn.execute(query, (limit,)).fetchall()
         
         return [
             {
@@ -396,16 +436,16 @@ class AnalyticsEngine:
             favorite_hour = 0
         
         # Rank
-        with sqlite3.connect(self.db.db_path) as conn:
-            rank = conn.execute(
-                """SELECT COUNT(*) + 1 FROM players 
-                   WHERE total_playtime_minutes > ?""",
-                (player.total_playtime_minutes,)
-            ).fetchone()[0]
-            
-            total_players = conn.execute(
-                "SELECT COUNT(*) FROM players"
-            ).fetchone()[0]
+        conn = self.db.connection()
+        rank = conn.execute(
+            """SELECT COUNT(*) + 1 FROM players 
+               WHERE total_playtime_minutes > ?""",
+            (player.total_playtime_minutes,)
+        ).fetchone()[0]
+        
+        total_players = conn.execute(
+            "SELECT COUNT(*) FROM players"
+        ).fetchone()[0]
         
         return {
             "player": player.to_dict(),
@@ -433,23 +473,30 @@ class AnalyticsEngine:
         Returns:
             Server comparison
         """
-        cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+        cutoff = datetime.now() - timedelta(days=days)
         
-        with sqlite3.connect(self.db.db_path) as conn:
-            query = """
-                SELECT 
-                    server_name,
-                    COUNT(*) as sessions,
-                    COUNT(DISTINCT player_id) as unique_players,
-                    SUM(duration_minutes) as total_playtime,
-                    AVG(duration_minutes) as avg_session
-                FROM sessions
-                WHERE start_time >= ? AND end_time IS NOT NULL
-                GROUP BY server_name
-                ORDER BY sessions DESC
-            """
-            
-            rows = conn.execute(query, (cutoff,)).fetchall()
+        conn = self.db.connection()
+        # Ended sessions only, as playtime is known once a session ends
+        query = """
+            SELECT 
+                server_name,
+                SUM(ended_sessions) as sessions,
+                SUM(playtime_minutes) as total_playtime
+            FROM hourly_rollups
+            WHERE hour >= ?
+            GROUP BY server_name
+            HAVING sessions > 0
+            ORDER BY sessions DESC
+        """
+        rows = conn.execute(query, (cutoff.isoformat()[:13],)).fetchall()
+        
+        unique_players = dict(conn.execute(
+            """SELECT server_name, COUNT(DISTINCT player_id)
+               FROM daily_player_rollups
+               WHERE day >= ?
+               GROUP BY server_name""",
+            (cutoff.isoformat()[:10],)
+        ).fetchall())
         
         return {
             "period_days": days,
@@ -457,9 +504,9 @@ class AnalyticsEngine:
                 {
                     "server_name": row[0],
                     "sessions": row[1],
-                    "unique_players": row[2],
-                    "total_playtime_hours": round((row[3] or 0) / 60, 1),
-                    "avg_session_minutes": round(row[4] or 0, 1),
+                    "unique_players": unique_players.get(row[0], 0),
+                    "total_playtime_hours": round((row[2] or 0) / 60, 1),
+                    "avg_session_minutes": round((row[2] or 0) / row[1], 1),
                 }
                 for row in rows
             ],
@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Event Buffer
+============
+
+Buffered, batched ingestion of gameplay events.
+
+Chatty events (kills, deaths, item pickups) are appended to an in-memory
+buffer and written by a background flusher in one ``executemany``
+transaction per batch, instead of one INSERT and commit each. A batch is
+written when ``batch_size`` events are waiting or ``flush_interval``
+seconds have passed. When the buffer reaches ``capacity`` the producer
+writes the backlog itself (backpressure) instead of growing without
+bound. ``close()`` - also run at interpreter exit - writes what is left
+and checkpoints the WAL so the events are on disk.
+"""
+
+import atexit
+import json
+import logging
+import threading
+import time
+import weakref
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from .player_database import PlayerDatabase
+
+logger = logging.getLogger(__name__)
+
+EventRow = Tuple[str, Optional[str], str, str, str]
+
+_open_buffers: "weakref.WeakSet[EventBuffer]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_buffers() -> None:
+    for buffer in list(_open_buffers):
+        buffer.close()
+
+
+class EventBuffer:
+    """
+    Background-flushed event buffer for a PlayerDatabase.
+
+    Example:
+        buffer = EventBuffer(db, batch_size=1000, flush_interval=0.5)
+        buffer.append("p1", "kill", {"mob": "zombie"}, session_id="p1_2025")
+        buffer.close()
+    """
+
+    def __init__(
+        self,
+        database: PlayerDatabase,
+        batch_size: int = 1000,
+        flush_interval: float = 0.5,
+        capacity: int = 100_000,
+    ):
+        self.db = database
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.capacity = capacity
+        self.flushed = 0
+
+        self._events: List[EventRow] = []
+        self._cond = threading.Condition()
+        self._flush_lock = threading.Lock()
+        self._closed = False
+        self._thread = threading.Thread(target=self._run, name="event-buffer", daemon=True)
+        self._thread.start()
+        _open_buffers.add(self)
+
+    def append(
+        self,
+        player_id: str,
+        event_type: str,
+        event_data: Optional[Dict] = None,
+        session_id: Optional[str] = None,
+    ) -> None:
+        """Queue an event (blocks only while writing a full buffer)."""
+        row = (
+            player_id,
+            session_id,
+            event_type,
+            json.dumps(event_data or {}),
+            datetime.now().isoformat(),
+        )
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("Event buffer is closed")
+            self._events.append(row)
+            pending = len(self._events)
+            if pending == self.batch_size:
+                self._cond.notify()
+
+        if pending >= self.capacity:
+            self.flush()
+
+    def flush(self) -> int:
+        """Write all queued events now; returns how many were written."""
+        with self._flush_lock:
+            with self._cond:
+                rows, self._events = self._events, []
+            if not rows:
+                return 0
+            try:
+                self.db.log_events(rows)
+            except BaseException:
+                # Keep the events (ahead of newer ones) for the next attempt
+                with self._cond:
+                    self._events[:0] = rows
+                raise
+            self.flushed += len(rows)
+            return len(rows)
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                if not self._closed and len(self._events) < self.batch_size:
+                    self._cond.wait(self.flush_interval)
+                if self._closed:
+                    return
+            try:
+                self.flush()
+            except Exception as e:
+                logger.error(f"Event flush failed, retrying: {e}")
+                time.sleep(self.flush_interval)
+
+    def __len__(self) -> int:
+        return len(self._events)
+
+    def close(self) -> None:
+        """Stop the flusher, write remaining events and checkpoint the WAL."""
+        with self._cond:
+            if self._closed:
+                return
+            self._closed = True
+            self._cond.notify()
+        self._thread.join()
+        self.flush()
+        self.db.connection().execute("PRAGMA wal_checkpoint(FULL)")
+        _open_buffers.discard(self)
@@ -5,15 +5,32 @@ Player Database
 
 Stores and manages player data for analytics.
 Uses SQLite for local storage with optional external DB support.
+
+Each thread keeps one persistent connection (WAL journal, tuned pragmas,
+prepared statement cache). Writes run in ``BEGIN IMMEDIATE`` transactions;
+``unit_of_work()`` groups several calls into one transaction.
+
+Session aggregates are kept in two rollup tables, updated in the same
+transaction as the session itself, keyed by the session's start time:
+    hourly_rollups        - (hour, server) -> sessions started, sessions
+                            ended, playtime minutes
+    daily_player_rollups  - (day, server, player) -> sessions, playtime;
+                            the exact set of players active per day
+    player_first_seen     - player -> first and last day with a session
+
+``table_versions`` holds a counter per table that triggers bump on every
+change, so derived results can be cached until their table changes.
 """
 
 import json
 import logging
 import sqlite3
+import threading
+from contextlib import contextmanager
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -98,18 +115,88 @@ class PlayerDatabase:
     - Session history
     - Event logging
     - Efficient querying
+    
+    Example:
+        db = PlayerDatabase(Path("players.db"))
+        with db.unit_of_work():
+            player = db.get_or_create_player("p1", "Steve")
+            session = db.create_session("p1", "survival")
     """
     
-    def __init__(self, db_path: Optional[Path] = None):
+    def __init__(self, db_path: Optional[Path] = None, busy_timeout_ms: int = 5000):
         self.db_path = db_path or Path.home() / ".player_analytics" / "players.db"
         self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
         
         self._init_db()
     
+    def connection(self) -> sqlite3.Connection:
+        """This thread's persistent connection (autocommit, WAL)."""
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(
+                str(self.db_path),
+                isolation_level=None,
+                check_same_thread=False,
+                cached_statements=256,
+            )
+            conn.row_factory = sqlite3.Row
+            conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            conn.execute("PRAGMA temp_store = MEMORY")
+            conn.execute("PRAGMA cache_size = -16000")
+            self._local.conn = conn
+        return conn
+    
+    @contextmanager
+    def unit_of_work(self) -> Iterator[sqlite3.Connection]:
+        """
+        Run a block in one write transaction.
+        
+        Database calls made inside the block (on this thread) join the
+        transaction, so a multi-step operation commits once or not at all.
+        """
+        conn = self.connection()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+    
+    def close(self) -> None:
+        """Close this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+    
+    @staticmethod
+    def _player_from_row(row: sqlite3.Row) -> Player:
+        return Player(
+            player_id=row["player_id"],
+            username=row["username"],
+            first_seen=row["first_seen"],
+            last_seen=row["last_seen"],
+            total_playtime_minutes=row["total_playtime_minutes"],
+            session_count=row["session_count"],
+            discord_id=row["discord_id"],
+            tags=json.loads(row["tags"]),
+            custom_data=json.loads(row["custom_data"]),
+        )
+    
     def _init_db(self) -> None:
         """Initialize database schema."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.executescript("""
+        # executescript() commits first, so the transaction is in the script
+        self.connection().executescript("""
+                BEGIN IMMEDIATE;
+                
                 CREATE TABLE IF NOT EXISTS players (
                     player_id TEXT PRIMARY KEY,
                     username TEXT NOT NULL,
@@ -149,7 +236,108 @@ class PlayerDatabase:
                 CREATE INDEX IF NOT EXISTS idx_events_player ON events(player_id);
                 CREATE INDEX IF NOT EXISTS idx_events_type ON events(event_type);
                 CREATE INDEX IF NOT EXISTS idx_events_time ON events(timestamp);
+                
+                CREATE TABLE IF NOT EXISTS hourly_rollups (
+                    hour TEXT NOT NULL,
+                    server_name TEXT NOT NULL,
+                    sessions INTEGER DEFAULT 0,
+                    ended_sessions INTEGER DEFAULT 0,
+                    playtime_minutes INTEGER DEFAULT 0,
+                    PRIMARY KEY (hour, server_name)
+                ) WITHOUT ROWID;
+                
+                CREATE TABLE IF NOT EXISTS daily_player_rollups (
+                    day TEXT NOT NULL,
+                    server_name TEXT NOT NULL,
+                    player_id TEXT NOT NULL,
+                    sessions INTEGER DEFAULT 0,
+                    playtime_minutes INTEGER DEFAULT 0,
+                    PRIMARY KEY (day, server_name, player_id)
+                ) WITHOUT ROWID;
+                
+                CREATE TABLE IF NOT EXISTS player_first_seen (
+                    player_id TEXT PRIMARY KEY,
+                    first_day TEXT NOT NULL,
+                    last_day TEXT NOT NULL
+                ) WITHOUT ROWID;
+                
+                CREATE INDEX IF NOT EXISTS idx_first_seen_day ON player_first_seen(first_day);
+                CREATE INDEX IF NOT EXISTS idx_players_playtime
+                    ON players(total_playtime_minutes, last_seen, session_count);
+                
+                CREATE TABLE IF NOT EXISTS table_versions (
+                    name TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL DEFAULT 0
+                ) WITHOUT ROWID;
+                
+                INSERT OR IGNORE INTO table_versions (name) VALUES ('players');
+                
+                CREATE TRIGGER IF NOT EXISTS players_version_insert AFTER INSERT ON players
+                BEGIN
+                    UPDATE table_versions SET version = version + 1 WHERE name = 'players';
+                END;
+                
+                CREATE TRIGGER IF NOT EXISTS players_version_update AFTER UPDATE ON players
+                BEGIN
+                    UPDATE table_versions SET version = version + 1 WHERE name = 'players';
+                END;
+                
+                CREATE TRIGGER IF NOT EXISTS players_version_delete AFTER DELETE ON players
+                BEGIN
+                    UPDATE table_versions SET version = version + 1 WHERE name = 'players';
+                END;
+                
+                COMMIT;
             """)
+        
+        # Databases created before the rollup tables existed
+        conn = self.connection()
+        if (
+            conn.execute("SELECT 1 FROM sessions LIMIT 1").fetchone()
+            and not (
+                conn.execute("SELECT 1 FROM hourly_rollups LIMIT 1").fetchone()
+                and conn.execute("SELECT 1 FROM player_first_seen LIMIT 1").fetchone()
+            )
+        ):
+            self.rebuild_rollups()
+    
+    def rebuild_rollups(self) -> None:
+        """Recompute the rollup tables from the sessions table."""
+        with self.unit_of_work() as conn:
+            conn.execute("DELETE FROM hourly_rollups")
+            conn.execute("DELETE FROM daily_player_rollups")
+            conn.execute("DELETE FROM player_first_seen")
+            conn.execute(
+                """INSERT INTO hourly_rollups
+                   (hour, server_name, sessions, ended_sessions, playtime_minutes)
+                   SELECT substr(start_time, 1, 13), server_name, COUNT(*),
+                          COUNT(end_time), SUM(duration_minutes)
+                   FROM sessions
+                   GROUP BY 1, 2"""
+            )
+            conn.execute(
+                """INSERT INTO daily_player_rollups
+                   (day, server_name, player_id, sessions, playtime_minutes)
+                   SELECT substr(start_time, 1, 10), server_name, player_id,
+                          COUNT(*), SUM(duration_minutes)
+                   FROM sessions
+                   GROUP BY 1, 2, 3"""
+            )
+            conn.execute(
+                """INSERT INTO player_first_seen (player_id, first_day, last_day)
+                   SELECT player_id, MIN(substr(start_time, 1, 10)),
+                          MAX(substr(start_time, 1, 10))
+                   FROM sessions
+                   GROUP BY player_id"""
+            )
+    
+    def table_version(self, table: str = "players") -> int:
+        """Change counter of a table (bumped on every insert/update/delete)."""
+        row = self.connection().execute(
+            "SELECT version FROM table_versions WHERE name = ?",
+            (table,)
+        ).fetchone()
+        return row[0] if row else 0
     
     def get_or_create_player(
         self,
@@ -157,8 +345,7 @@ class PlayerDatabase:
         username: str,
     ) -> Player:
         """Get existing player or create new one."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
+        with self.unit_of_work() as conn:
             cursor = conn.execute(
                 "SELECT * FROM players WHERE player_id = ?",
                 (player_id,)
@@ -166,17 +353,7 @@ class PlayerDatabase:
             row = cursor.fetchone()
             
             if row:
-                return Player(
-                    player_id=row["player_id"],
-                    username=row["username"],
-                    first_seen=row["first_seen"],
-                    last_seen=row["last_seen"],
-                    total_playtime_minutes=row["total_playtime_minutes"],
-                    session_count=row["session_count"],
-                    discord_id=row["discord_id"],
-                    tags=json.loads(row["tags"]),
-                    custom_data=json.loads(row["custom_data"]),
-                )
+                return self._player_from_row(row)
             else:
                 # Create new player
                 now = datetime.now().isoformat()
@@ -195,7 +372,7 @@ class PlayerDatabase:
     
     def update_player(self, player: Player) -> None:
         """Update player record."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.unit_of_work() as conn:
             conn.execute(
                 """UPDATE players SET
                    username = ?,
@@ -220,27 +397,16 @@ class PlayerDatabase:
     
     def get_player(self, player_id: str) -> Optional[Player]:
         """Get player by ID."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
-                "SELECT * FROM players WHERE player_id = ?",
-                (player_id,)
-            )
-            row = cursor.fetchone()
-            
-            if row:
-                return Player(
-                    player_id=row["player_id"],
-                    username=row["username"],
-                    first_seen=row["first_seen"],
-                    last_seen=row["last_seen"],
-                    total_playtime_minutes=row["total_playtime_minutes"],
-                    session_count=row["session_count"],
-                    discord_id=row["discord_id"],
-                    tags=json.loads(row["tags"]),
-                    custom_data=json.loads(row["custom_data"]),
-                )
-            return None
+        conn = self.connection()
+        cursor = conn.execute(
+            "SELECT * FROM players WHERE player_id = ?",
+            (player_id,)
+        )
+        row = cursor.fetchone()
+        
+        if row:
+            return self._player_from_row(row)
+        return None
     
     def search_players(
         self,
@@ -248,30 +414,16 @@ class PlayerDatabase:
         limit: int = 50,
     ) -> List[Player]:
         """Search players by username."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
-                """SELECT * FROM players 
-                   WHERE username LIKE ? 
-                   ORDER BY total_playtime_minutes DESC
-                   LIMIT ?""",
-                (f"%{query}%", limit)
-            )
-            
-            return [
-                Player(
-                    player_id=row["player_id"],
-                    username=row["username"],
-                    first_seen=row["first_seen"],
-                    last_seen=row["last_seen"],
-                    total_playtime_minutes=row["total_playtime_minutes"],
-                    session_count=row["session_count"],
-                    discord_id=row["discord_id"],
-                    tags=json.loads(row["tags"]),
-                    custom_data=json.loads(row["custom_data"]),
-                )
-                for row in cursor.fetchall()
-            ]
+        conn = self.connection()
+        cursor = conn.execute(
+            """SELECT * FROM players 
+               WHERE username LIKE ? 
+               ORDER BY total_playtime_minutes DESC
+               LIMIT ?""",
+            (f"%{query}%", limit)
+        )
+        
+        return [self._player_from_row(row) for row in cursor.fetchall()]
     
     def create_session(
         self,
@@ -282,13 +434,35 @@ class PlayerDatabase:
         session_id = f"{player_id}_{datetime.now().strftime('%Y%m%d%H%M%S')}"
         start_time = datetime.now().isoformat()
         
-        with sqlite3.connect(self.db_path) as conn:
+        with self.unit_of_work() as conn:
             conn.execute(
                 """INSERT INTO sessions 
                    (session_id, player_id, server_name, start_time)
                    VALUES (?, ?, ?, ?)""",
                 (session_id, player_id, server_name, start_time)
             )
+            conn.execute(
+                """INSERT INTO hourly_rollups (hour, server_name, sessions)
+                   VALUES (?, ?, 1)
+                   ON CONFLICT (hour, server_name)
+                   DO UPDATE SET sessions = sessions + 1""",
+                (start_time[:13], server_name)
+            )
+            conn.execute(
+                """INSERT INTO daily_player_rollups
+                   (day, server_name, player_id, sessions)
+                   VALUES (?, ?, ?, 1)
+                   ON CONFLICT (day, server_name, player_id)
+                   DO UPDATE SET sessions = sessions + 1""",
+                (start_time[:10], server_name, player_id)
+            )
+            conn.execute(
+                """INSERT INTO player_first_seen (player_id, first_day, last_day)
+                   VALUES (?, ?, ?)
+                   ON CONFLICT (player_id)
+                   DO UPDATE SET last_day = MAX(last_day, excluded.last_day)""",
+                (player_id, start_time[:10], start_time[:10])
+            )
         
         return Session(
             session_id=session_id,
@@ -302,9 +476,7 @@ class PlayerDatabase:
         session_id: str,
     ) -> Optional[Session]:
         """End a session and calculate duration."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            
+        with self.unit_of_work() as conn:
             # Get session
             cursor = conn.execute(
                 "SELECT * FROM sessions WHERE session_id = ?",
@@ -328,6 +500,32 @@ class PlayerDatabase:
                 (end_time.isoformat(), duration, session_id)
             )
             
+            # Update rollups (ending a session twice only corrects playtime)
+            playtime_delta = duration - row["duration_minutes"]
+            conn.execute(
+                """UPDATE hourly_rollups SET
+                   ended_sessions = ended_sessions + ?,
+                   playtime_minutes = playtime_minutes + ?
+                   WHERE hour = ? AND server_name = ?""",
+                (
+                    int(row["end_time"] is None),
+                    playtime_delta,
+                    row["start_time"][:13],
+                    row["server_name"],
+                )
+            )
+            conn.execute(
+                """UPDATE daily_player_rollups SET
+                   playtime_minutes = playtime_minutes + ?
+                   WHERE day = ? AND server_name = ? AND player_id = ?""",
+                (
+                    playtime_delta,
+                    row["start_time"][:10],
+                    row["server_name"],
+                    row["player_id"],
+                )
+            )
+            
             # Update player stats
             conn.execute(
                 """UPDATE players SET
@@ -349,29 +547,27 @@ class PlayerDatabase:
     
     def get_active_sessions(self, server_name: Optional[str] = None) -> List[Session]:
         """Get all active (ongoing) sessions."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            
-            if server_name:
-                cursor = conn.execute(
-                    """SELECT * FROM sessions 
-                       WHERE end_time IS NULL AND server_name = ?""",
-                    (server_name,)
-                )
-            else:
-                cursor = conn.execute(
-                    "SELECT * FROM sessions WHERE end_time IS NULL"
-                )
-            
-            return [
-                Session(
-                    session_id=row["session_id"],
-                    player_id=row["player_id"],
-                    server_name=row["server_name"],
-                    start_time=row["start_time"],
-                )
-                for row in cursor.fetchall()
-            ]
+        conn = self.connection()
+        if server_name:
+            cursor = conn.execute(
+                """SELECT * FROM sessions 
+                   WHERE end_time IS NULL AND server_name = ?""",
+                (server_name,)
+            )
+        else:
+            cursor = conn.execute(
+                "SELECT * FROM sessions WHERE end_time IS NULL"
+            )
+        
+        return [
+            Session(
+                session_id=row["session_id"],
+                player_id=row["player_id"],
+                server_name=row["server_name"],
+                start_time=row["start_time"],
+            )
+            for row in cursor.fetchall()
+        ]
     
     def get_player_sessions(
         self,
@@ -379,27 +575,26 @@ class PlayerDatabase:
         limit: int = 50,
     ) -> List[Session]:
         """Get session history for a player."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            cursor = conn.execute(
-                """SELECT * FROM sessions 
-                   WHERE player_id = ?
-                   ORDER BY start_time DESC
-                   LIMIT ?""",
-                (player_id, limit)
+        conn = self.connection()
+        cursor = conn.execute(
+            """SELECT * FROM sessions 
+               WHERE player_id = ?
+               ORDER BY start_time DESC
+               LIMIT ?""",
+            (player_id, limit)
+        )
+        
+        return [
+            Session(
+                session_id=row["session_id"],
+                player_id=row["player_id"],
+                server_name=row["server_name"],
+                start_time=row["start_time"],
+                end_time=row["end_time"],
+                duration_minutes=row["duration_minutes"],
             )
-            
-            return [
-                Session(
-                    session_id=row["session_id"],
-                    player_id=row["player_id"],
-                    server_name=row["server_name"],
-                    start_time=row["start_time"],
-                    end_time=row["end_time"],
-                    duration_minutes=row["duration_minutes"],
-                )
-                for row in cursor.fetchall()
-            ]
+            for row in cursor.fetchall()
+        ]
     
     def log_event(
         self,
@@ -409,7 +604,7 @@ class PlayerDatabase:
         session_id: Optional[str] = None,
     ) -> None:
         """Log a player event."""
-        with sqlite3.connect(self.db_path) as conn:
+        with self.unit_of_work() as conn:
             conn.execute(
                 """INSERT INTO events 
                    (player_id, session_id, event_type, event_data, timestamp)
@@ -423,6 +618,22 @@ class PlayerDatabase:
                 )
             )
     
+    def log_events(self, events: List[Tuple[str, Optional[str], str, str, str]]) -> None:
+        """
+        Log many events in one transaction.
+        
+        Args:
+            events: (player_id, session_id, event_type, event_data JSON,
+                timestamp) rows
+        """
+        with self.unit_of_work() as conn:
+            conn.executemany(
+                """INSERT INTO events 
+                   (player_id, session_id, event_type, event_data, timestamp)
+                   VALUES (?, ?, ?, ?, ?)""",
+                events
+            )
+    
     def get_player_events(
         self,
         player_id: str,
@@ -430,60 +641,58 @@ class PlayerDatabase:
         limit: int = 100,
     ) -> List[Dict[str, Any]]:
         """Get events for a player."""
-        with sqlite3.connect(self.db_path) as conn:
-            conn.row_factory = sqlite3.Row
-            
-            if event_type:
-                cursor = conn.execute(
-                    """SELECT * FROM events 
-                       WHERE player_id = ? AND event_type = ?
-                       ORDER BY timestamp DESC
-                       LIMIT ?""",
-                    (player_id, event_type, limit)
-                )
-            else:
-                cursor = conn.execute(
-                    """SELECT * FROM events 
-                       WHERE player_id = ?
-                       ORDER BY timestamp DESC
-                       LIMIT ?""",
-                    (player_id, limit)
-                )
-            
-            return [
-                {
-                    "event_id": row["event_id"],
-                    "player_id": row["player_id"],
-                    "session_id": row["session_id"],
-                    "event_type": row["event_type"],
-                    "event_data": json.loads(row["event_data"]),
-                    "timestamp": row["timestamp"],
-                }
-                for row in cursor.fetchall()
-            ]
+        conn = self.connection()
+        if event_type:
+            cursor = conn.execute(
+                """SELECT * FROM events 
+                   WHERE player_id = ? AND event_type = ?
+                   ORDER BY timestamp DESC
+                   LIMIT ?""",
+                (player_id, event_type, limit)
+            )
+        else:
+            cursor = conn.execute(
+                """SELECT * FROM events 
+                   WHERE player_id = ?
+                   ORDER BY timestamp DESC
+                   LIMIT ?""",
+                (player_id, limit)
+            )
+        
+        return [
+            {
+                "event_id": row["event_id"],
+                "player_id": row["player_id"],
+                "session_id": row["session_id"],
+                "event_type": row["event_type"],
+                "event_data": json.loads(row["event_data"]),
+                "timestamp": row["timestamp"],
+            }
+            for row in cursor.fetchall()
+        ]
     
     def get_stats(self) -> Dict[str, Any]:
         """Get database statistics."""
-        with sqlite3.connect(self.db_path) as conn:
-            player_count = conn.execute(
-                "SELECT COUNT(*) FROM players"
-            ).fetchone()[0]
-            
-            session_count = conn.execute(
-                "SELECT COUNT(*) FROM sessions"
-            ).fetchone()[0]
-            
-            event_count = conn.execute(
-                "SELECT COUNT(*) FROM events"
-            ).fetchone()[0]
-            
-            total_playtime = conn.execute(
-                "SELECT SUM(total_playtime_minutes) FROM players"
-            ).fetchone()[0] or 0
-            
-            return {
-                "total_players": player_count,
-                "total_sessions": session_count,
-                "total_events": event_count,
-                "total_playtime_hours": total_playtime / 60,
-            }
+        conn = self.connection()
+        player_count = conn.execute(
+            "SELECT COUNT(*) FROM players"
+        ).fetchone()[0]
+        
+        session_count = conn.execute(
+            "SELECT COUNT(*) FROM sessions"
+        ).fetchone()[0]
+        
+        event_count = conn.execute(
+            "SELECT COUNT(*) FROM events"
+        ).fetchone()[0]
+        
+        total_playtime = conn.execute(
+            "SELECT SUM(total_playtime_minutes) FROM players"
+        ).fetchone()[0] or 0
+        
+        return {
+            "total_players": player_count,
+            "total_sessions": session_count,
+            "total_events": event_count,
+            "total_playtime_hours": total_playtime / 60,
+        }
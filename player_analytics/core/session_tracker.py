@@ -11,6 +11,7 @@ import logging
 from datetime import datetime
 from typing import Any, Dict, List, Optional, Callable
 
+from .event_buffer import EventBuffer
 from .player_database import PlayerDatabase, Player, Session
 
 logger = logging.getLogger(__name__)
@@ -25,15 +26,34 @@ class SessionTracker:
     - Active session management
     - Event hooks for notifications
     - Session duration tracking
+    - Optional buffered event ingestion for chatty gameplay events
     """
     
     def __init__(
         self,
         database: Optional[PlayerDatabase] = None,
         server_name: str = "default",
+        buffer_events: bool = False,
+        event_batch_size: int = 1000,
+        event_flush_interval: float = 0.5,
     ):
+        """
+        Initialize session tracker.
+        
+        Args:
+            database: Player database (default: ~/.player_analytics/players.db)
+            server_name: Server this tracker records sessions for
+            buffer_events: Write log_player_event() events in background
+                batches instead of one transaction each
+            event_batch_size: Events per batch when buffering
+            event_flush_interval: Max seconds an event waits when buffering
+        """
         self.db = database or PlayerDatabase()
         self.server_name = server_name
+        self.event_buffer = (
+            EventBuffer(self.db, batch_size=event_batch_size, flush_interval=event_flush_interval)
+            if buffer_events else None
+        )
         
         # Active sessions indexed by player_id
         self._active_sessions: Dict[str, Session] = {}
@@ -93,26 +113,28 @@ class SessionTracker:
                 "session_id": existing.session_id,
             }
         
-        # Get or create player record
-        player = self.db.get_or_create_player(player_id, username)
-        
-        # Update username if changed
-        if player.username != username:
-            player.username = username
-            self.db.update_player(player)
-        
-        # Create session
-        session = self.db.create_session(player_id, self.server_name)
+        # All join writes commit as one transaction
+        with self.db.unit_of_work():
+            # Get or create player record
+            player = self.db.get_or_create_player(player_id, username)
+            
+            # Update username if changed
+            if player.username != username:
+                player.username = username
+                self.db.update_player(player)
+            
+            # Create session
+            session = self.db.create_session(player_id, self.server_name)
+            
+            # Log event
+            self.db.log_event(
+                player_id=player_id,
+                event_type="join",
+                event_data=metadata or {},
+                session_id=session.session_id,
+            )
         self._active_sessions[player_id] = session
         
-        # Log event
-        self.db.log_event(
-            player_id=player_id,
-            event_type="join",
-            event_data=metadata or {},
-            session_id=session.session_id,
-        )
-        
         # Trigger callbacks
         for callback in self._on_join_callbacks:
             try:
@@ -163,25 +185,27 @@ class SessionTracker:
         
         session = self._active_sessions[player_id]
         
-        # End session
-        ended_session = self.db.end_session(session.session_id)
+        # All leave writes commit as one transaction
+        with self.db.unit_of_work():
+            # End session
+            ended_session = self.db.end_session(session.session_id)
+            
+            # Get updated player
+            player = self.db.get_player(player_id)
+            
+            # Log event
+            self.db.log_event(
+                player_id=player_id,
+                event_type="leave",
+                event_data={
+                    "reason": reason,
+                    "duration_minutes": ended_session.duration_minutes if ended_session else 0,
+                    **(metadata or {}),
+                },
+                session_id=session.session_id,
+            )
         del self._active_sessions[player_id]
         
-        # Get updated player
-        player = self.db.get_player(player_id)
-        
-        # Log event
-        self.db.log_event(
-            player_id=player_id,
-            event_type="leave",
-            event_data={
-                "reason": reason,
-                "duration_minutes": ended_session.duration_minutes if ended_session else 0,
-                **(metadata or {}),
-            },
-            session_id=session.session_id,
-        )
-        
         # Trigger callbacks
         for callback in self._on_leave_callbacks:
             try:
@@ -232,12 +256,15 @@ class SessionTracker:
         if player_id in self._active_sessions:
             session_id = self._active_sessions[player_id].session_id
         
-        self.db.log_event(
-            player_id=player_id,
-            event_type=event_type,
-            event_data=event_data or {},
-            session_id=session_id,
-        )
+        if self.event_buffer is not None:
+            self.event_buffer.append(player_id, event_type, event_data, session_id)
+        else:
+            self.db.log_event(
+                player_id=player_id,
+                event_type=event_type,
+                event_data=event_data or {},
+                session_id=session_id,
+            )
         
         # Trigger event callbacks
         for callback in self._on_event_callbacks:
@@ -310,8 +337,18 @@ class SessionTracker:
         logger.info(f"Ended {count} sessions due to: {reason}")
         return count
     
+    def flush_events(self) -> int:
+        """Write buffered events now; returns how many were written."""
+        return self.event_buffer.flush() if self.event_buffer is not None else 0
+    
+    def close(self) -> None:
+        """Write buffered events durably and stop the flusher."""
+        if self.event_buffer is not None:
+            self.event_buffer.close()
+    
     def get_stats(self) -> Dict[str, Any]:
         """Get current tracking statistics."""
+        self.flush_events()
         db_stats = self.db.get_stats()
         
         return {
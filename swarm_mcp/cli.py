@@ -7,6 +7,7 @@ WE ARE SWARM - A pack of wolves, not bees.
 """
 
 import argparse
+import os
 import sys
 from pathlib import Path
 
@@ -75,11 +76,42 @@ def cmd_inbox(args):
         print()
 
 
+def cmd_migrate_messages(args):
+    """Import legacy per-file inboxes into the segment log."""
+    from .core.howl_store import migrate_file_inboxes
+    
+    migrated = migrate_file_inboxes(args.messages, remove_source=args.remove)
+    
+    print(f"📦 Migrated inboxes in {args.messages}")
+    print("=" * 40)
+    
+    if not migrated:
+        print("(no legacy inboxes found)")
+        return
+    
+    for wolf_id, count in migrated.items():
+        print(f"🐺 {wolf_id}: {count} howls imported")
+
+
+def cmd_import_memory(args):
+    """Load a file-based memory den into the SQLite backend."""
+    from .core.memory import PackMemory
+    
+    memory = PackMemory(args.memory, backend="sqlite")
+    imported = memory.import_from_files()
+    
+    print(f"📦 Imported {args.memory} into {memory.db.path}")
+    print("=" * 40)
+    print(f"📚 Lore: {imported['entries']}")
+    print(f"🏹 Hunts: {imported['records']}")
+    print(f"📝 Notes: {imported['notes']}")
+
+
 def cmd_search(args):
     """Search shared knowledge."""
     from .core.memory import PackMemory
     
-    memory = PackMemory(args.memory)
+    memory = PackMemory(args.memory, backend=args.memory_backend)
     results = memory.recall(args.query, limit=args.limit)
     
     print(f"🔍 Search results for '{args.query}'")
@@ -100,7 +132,7 @@ def cmd_learn(args):
     """Save something you learned."""
     from .core.memory import PackMemory
     
-    memory = PackMemory(args.memory)
+    memory = PackMemory(args.memory, backend=args.memory_backend)
     item = memory.share_lore(
         wolf_id=args.agent,
         category=args.category,
@@ -337,6 +369,12 @@ def main():
     parser.add_argument("--workspace", default="./swarm_workspace", help="Workspace directory")
     parser.add_argument("--messages", default="./swarm_messages", help="Messages directory")
     parser.add_argument("--memory", default="./swarm_memory", help="Shared memory directory")
+    parser.add_argument(
+        "--memory-backend",
+        default=os.environ.get("SWARM_MEMORY_BACKEND", "files"),
+        choices=["files", "sqlite"],
+        help="Shared memory storage (default: $SWARM_MEMORY_BACKEND or files)"
+    )
     
     subparsers = parser.add_subparsers(dest="command", help="Commands")
     
@@ -358,6 +396,15 @@ def main():
     inbox_parser.add_argument("--unread", action="store_true", help="Only show unread")
     inbox_parser.set_defaults(func=cmd_inbox)
     
+    # migrate-messages
+    migrate_parser = subparsers.add_parser("migrate-messages", help="Import legacy per-file inboxes")
+    migrate_parser.add_argument("--remove", action="store_true", help="Delete JSON files after import")
+    migrate_parser.set_defaults(func=cmd_migrate_messages)
+    
+    # import-memory
+    import_parser = subparsers.add_parser("import-memory", help="Load file-based memory into SQLite")
+    import_parser.set_defaults(func=cmd_import_memory)
+    
     # search
     search_parser = subparsers.add_parser("search", help="Search shared knowledge")
     search_parser.add_argument("query", help="What to search for")
@@ -443,6 +490,8 @@ def main():
         print("  status   - Check which agents are available")
         print("  send     - Send a message to an agent")
         print("  inbox    - Check your messages")
+        print("  migrate-messages - Import legacy per-file inboxes")
+        print("  import-memory - Load file-based memory into SQLite")
         print("  search   - Search shared knowledge")
         print("  learn    - Save something you learned")
         print("  tasks    - Find tasks in the codebase")
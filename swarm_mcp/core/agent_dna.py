@@ -25,15 +25,22 @@ Author: The Swarm
 License: MIT
 """
 
+import bisect
+import heapq
 import json
+import os
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 from collections import defaultdict
 import statistics
 
 
+# Profile deltas appended to <agent>.log before it is folded into <agent>.json
+SNAPSHOT_EVERY = 100
+
+
 @dataclass
 class TaskRecord:
     """Record of a completed task."""
@@ -99,6 +106,12 @@ class AgentDNA:
             files=["src/auth.py"]
         )
         print(best)  # "agent-1" (because they've done auth work before)
+    
+    Matching is served from inverted indexes (category, file and module ->
+    agents) plus a success-rate ordering, all kept current by record_task,
+    so lookups cost time proportional to the matched postings. Each task
+    appends a small delta to ``profiles/<agent>.log``; the full profile
+    JSON is rewritten only every SNAPSHOT_EVERY tasks.
     """
     
     def __init__(self, storage_dir: str = "./swarm_dna"):
@@ -112,33 +125,105 @@ class AgentDNA:
         
         self.profiles: Dict[str, AgentProfile] = {}
         self.task_history: List[TaskRecord] = []
+        
+        # Inverted indexes: key -> agents with a score for it
+        self._category_index: Dict[str, Set[str]] = defaultdict(set)
+        self._file_index: Dict[str, Set[str]] = defaultdict(set)
+        self._module_index: Dict[str, Set[str]] = defaultdict(set)
+        # (-success_rate, -total_tasks, agent_id), ascending = best first
+        self._by_success: List[Tuple[float, int, str]] = []
+        # Deltas in each agent's log since its last snapshot
+        self._pending_deltas: Dict[str, int] = defaultdict(int)
+        
         self._load_data()
     
     def _load_data(self):
-        """Load profiles and task history."""
-        # Load profiles
-        for profile_file in self.profiles_dir.glob("*.json"):
-            try:
-                data = json.loads(profile_file.read_text())
-                self.profiles[data["agent_id"]] = AgentProfile(
-                    agent_id=data["agent_id"],
-                    total_tasks=data.get("total_tasks", 0),
-                    success_rate=data.get("success_rate", 0.0),
-                    category_scores=data.get("category_scores", {}),
-                    category_counts=data.get("category_counts", {}),
-                    avg_completion_times=data.get("avg_completion_times", {}),
-                    file_expertise=data.get("file_expertise", {}),
-                    module_expertise=data.get("module_expertise", {}),
-                    collaboration_affinity=data.get("collaboration_affinity", {}),
-                    peak_hours=data.get("peak_hours", []),
-                    strengths=data.get("strengths", []),
-                    weaknesses=data.get("weaknesses", [])
-                )
-            except Exception:
-                pass
+        """Load profiles (snapshot + delta log) and build the indexes."""
+        agent_ids = {path.stem for path in self.profiles_dir.glob("*.json")}
+        agent_ids |= {path.stem for path in self.profiles_dir.glob("*.log")}
+        
+        for agent_id in agent_ids:
+            profile_file = self.profiles_dir / f"{agent_id}.json"
+            profile = AgentProfile(agent_id=agent_id)
+            if profile_file.exists():
+                try:
+                    data = json.loads(profile_file.read_text())
+                    profile = AgentProfile(
+                        agent_id=data["agent_id"],
+                        total_tasks=data.get("total_tasks", 0),
+                        success_rate=data.get("success_rate", 0.0),
+                        category_scores=data.get("category_scores", {}),
+                        category_counts=data.get("category_counts", {}),
+                        avg_completion_times=data.get("avg_completion_times", {}),
+                        file_expertise=data.get("file_expertise", {}),
+                        module_expertise=data.get("module_expertise", {}),
+                        collaboration_affinity=data.get("collaboration_affinity", {}),
+                        peak_hours=data.get("peak_hours", []),
+                        strengths=data.get("strengths", []),
+                        weaknesses=data.get("weaknesses", [])
+                    )
+                except Exception:
+                    pass
+            
+            # Replay deltas the snapshot doesn't include yet
+            log_file = self.profiles_dir / f"{agent_id}.log"
+            if log_file.exists():
+                for line in log_file.read_text().splitlines():
+                    try:
+                        delta = json.loads(line)
+                    except ValueError:
+                        continue
+                    if delta["n"] > profile.total_tasks:
+                        self._apply_delta(profile, delta)
+                    self._pending_deltas[agent_id] += 1
+                self._calculate_strengths(profile)
+            
+            if profile.total_tasks:
+                self.profiles[agent_id] = profile
+                self._index_profile(profile)
+    
+    def _index_profile(self, profile: AgentProfile, delta: Optional[Dict[str, Any]] = None):
+        """Add a profile's keys (or just those in a delta) to the indexes."""
+        agent_id = profile.agent_id
+        categories = [delta["category"]] if delta else profile.category_scores
+        files = delta["files"] if delta else profile.file_expertise
+        modules = delta["modules"] if delta else profile.module_expertise
+        
+        for category in categories:
+            self._category_index[category].add(agent_id)
+        for file in files:
+            self._file_index[file].add(agent_id)
+        for module in modules:
+            self._module_index[module].add(agent_id)
+        
+        bisect.insort(self._by_success, self._rank_key(profile))
+    
+    @staticmethod
+    def _rank_key(profile: AgentProfile) -> Tuple[float, int, str]:
+        return (-profile.success_rate, -profile.total_tasks, profile.agent_id)
+    
+    def _unrank(self, profile: AgentProfile):
+        """Drop a profile from the success-rate ordering (before it changes)."""
+        entry = self._rank_key(profile)
+        i = bisect.bisect_left(self._by_success, entry)
+        if i < len(self._by_success) and self._by_success[i] == entry:
+            del self._by_success[i]
+    
+    def _append_delta(self, profile: AgentProfile, delta: Dict[str, Any]):
+        """Persist one task's contribution; fold the log into a snapshot now and then."""
+        log_file = self.profiles_dir / f"{profile.agent_id}.log"
+        with open(log_file, "a") as log:
+            log.write(json.dumps(delta) + "\n")
+        
+        self._pending_deltas[profile.agent_id] += 1
+        if self._pending_deltas[profile.agent_id] >= SNAPSHOT_EVERY:
+            self._save_profile(profile)
+            # The snapshot covers every delta (by "n"), so truncating is safe even if interrupted
+            log_file.write_text("")
+            self._pending_deltas[profile.agent_id] = 0
     
     def _save_profile(self, profile: AgentProfile):
-        """Save a profile to disk."""
+        """Save a full profile snapshot to disk."""
         data = {
             "agent_id": profile.agent_id,
             "total_tasks": profile.total_tasks,
@@ -156,7 +241,9 @@ class AgentDNA:
         }
         
         profile_file = self.profiles_dir / f"{profile.agent_id}.json"
-        profile_file.write_text(json.dumps(data, indent=2))
+        tmp_file = profile_file.with_suffix(".tmp")
+        tmp_file.write_text(json.dumps(data, indent=2))
+        os.replace(tmp_file, profile_file)
     
     def _extract_module(self, file_path: str) -> str:
         """Extract module from file path."""
@@ -253,27 +340,52 @@ class AgentDNA:
         
         profile = self.profiles[agent_id]
         
+        # Category score is weighted by success and quality
+        task_score = record.quality_score if record.success else 0.3
+        if record.reverted:
+            task_score *= 0.5
+        
+        delta = {
+            "n": profile.total_tasks + 1,
+            "category": record.category,
+            "success": record.success,
+            "task_score": task_score,
+            "duration": (record.completed_at - record.started_at).total_seconds() / 60,
+            "files": [file.replace("\\", "/").lower() for file in record.files_touched],
+            "modules": [self._extract_module(file) for file in record.files_touched],
+            "collaborators": record.collaborators,
+            "hour": record.completed_at.hour
+        }
+        
+        self._unrank(profile)
+        self._apply_delta(profile, delta)
+        
+        # Recalculate strengths and weaknesses
+        self._calculate_strengths(profile)
+        
+        profile.last_updated = datetime.now()
+        self._index_profile(profile, delta)
+        self._append_delta(profile, delta)
+    
+    def _apply_delta(self, profile: AgentProfile, delta: Dict[str, Any]):
+        """Fold one task's contribution into a profile."""
         # Update basic stats
         profile.total_tasks += 1
         
         # Update success rate (rolling average)
         old_successes = profile.success_rate * (profile.total_tasks - 1)
-        new_successes = old_successes + (1 if record.success else 0)
+        new_successes = old_successes + (1 if delta["success"] else 0)
         profile.success_rate = new_successes / profile.total_tasks
         
         # Update category scores
-        category = record.category
+        category = delta["category"]
         if category not in profile.category_counts:
             profile.category_counts[category] = 0
             profile.category_scores[category] = 0.0
         
         profile.category_counts[category] += 1
         
-        # Category score is weighted by success and quality
-        task_score = record.quality_score if record.success else 0.3
-        if record.reverted:
-            task_score *= 0.5
-        
+        task_score = delta["task_score"]
         old_score = profile.category_scores[category]
         count = profile.category_counts[category]
         profile.category_scores[category] = (
@@ -281,7 +393,7 @@ class AgentDNA:
         )
         
         # Update completion times
-        duration = (record.completed_at - record.started_at).total_seconds() / 60
+        duration = delta["duration"]
         if category not in profile.avg_completion_times:
             profile.avg_completion_times[category] = duration
         else:
@@ -289,36 +401,27 @@ class AgentDNA:
             profile.avg_completion_times[category] = (old_time + duration) / 2
         
         # Update file expertise
-        for file in record.files_touched:
-            normalized = file.replace("\\", "/").lower()
+        for normalized in delta["files"]:
             if normalized not in profile.file_expertise:
                 profile.file_expertise[normalized] = 0.0
             profile.file_expertise[normalized] += task_score
         
         # Update module expertise
-        for file in record.files_touched:
-            module = self._extract_module(file)
+        for module in delta["modules"]:
             if module not in profile.module_expertise:
                 profile.module_expertise[module] = 0.0
             profile.module_expertise[module] += task_score
         
         # Update collaboration affinity
-        for collaborator in record.collaborators:
+        for collaborator in delta["collaborators"]:
             if collaborator not in profile.collaboration_affinity:
                 profile.collaboration_affinity[collaborator] = 0.0
             profile.collaboration_affinity[collaborator] += 1
         
         # Update peak hours
-        hour = record.completed_at.hour
-        profile.peak_hours.append(hour)
+        profile.peak_hours.append(delta["hour"])
         # Keep last 50 hours
         profile.peak_hours = profile.peak_hours[-50:]
-        
-        # Recalculate strengths and weaknesses
-        self._calculate_strengths(profile)
-        
-        profile.last_updated = datetime.now()
-        self._save_profile(profile)
     
     def _calculate_strengths(self, profile: AgentProfile):
         """Calculate agent's strengths and weaknesses."""
@@ -378,61 +481,94 @@ class AgentDNA:
         Returns:
             Tuple of (agent_id, confidence_score) or None
         """
-        exclude = set(exclude or [])
-        candidates = []
+        best = self.find_best_agents(category, files, modules, exclude, k=1)
+        return best[0] if best else None
+    
+    def find_best_agents(
+        self,
+        category: Optional[str] = None,
+        files: Optional[List[str]] = None,
+        modules: Optional[List[str]] = None,
+        exclude: Optional[List[str]] = None,
+        k: int = 5
+    ) -> List[Tuple[str, float]]:
+        """
+        Find the top-k agents for a task, best first.
+        
+        Only agents in the index postings for the category, files and
+        modules are scored; every other agent scores its success rate, so
+        the best of those come straight from the success-rate ordering.
         
-        for agent_id, profile in self.profiles.items():
-            if agent_id in exclude:
-                continue
+        Args:
+            category: Task category
+            files: Files that will be touched
+            modules: Modules involved
+            exclude: Agents to exclude
+            k: How many agents to return
             
+        Returns:
+            List of (agent_id, confidence_score)
+        """
+        exclude = set(exclude or [])
+        category = category.lower() if category else None
+        file_keys = [file.replace("\\", "/").lower() for file in files or []]
+        if modules:
+            module_keys = [module.lower() for module in modules]
+        else:
+            # Extract modules from files
+            module_keys = [self._extract_module(file) for file in files or []]
+        
+        matched: Set[str] = set()
+        if category:
+            matched |= self._category_index.get(category, set())
+        for file in file_keys:
+            matched |= self._file_index.get(file, set())
+        for module in module_keys:
+            matched |= self._module_index.get(module, set())
+        
+        matched -= exclude
+        candidates = []
+        for agent_id in matched:
+            profile = self.profiles[agent_id]
             score = 0.0
-            factors = 0
+            factors = 0.0
             
             # Category match
-            if category and category.lower() in profile.category_scores:
-                cat_score = profile.category_scores[category.lower()]
-                cat_count = profile.category_counts.get(category.lower(), 0)
+            if category in profile.category_scores:
+                cat_score = profile.category_scores[category]
+                cat_count = profile.category_counts.get(category, 0)
                 # Weight by experience
                 experience_factor = min(cat_count / 10, 1.0)
                 score += cat_score * experience_factor * 2
                 factors += 2
             
             # File expertise match
-            if files:
-                for file in files:
-                    normalized = file.replace("\\", "/").lower()
-                    if normalized in profile.file_expertise:
-                        score += min(profile.file_expertise[normalized] / 5, 1.0)
-                        factors += 1
+            for file in file_keys:
+                if file in profile.file_expertise:
+                    score += min(profile.file_expertise[file] / 5, 1.0)
+                    factors += 1
             
             # Module expertise match
-            if modules:
-                for module in modules:
-                    if module.lower() in profile.module_expertise:
-                        score += min(profile.module_expertise[module.lower()] / 5, 1.0)
-                        factors += 1
-            elif files:
-                # Extract modules from files
-                for file in files:
-                    module = self._extract_module(file)
-                    if module in profile.module_expertise:
-                        score += min(profile.module_expertise[module] / 5, 1.0)
-                        factors += 1
+            for module in module_keys:
+                if module in profile.module_expertise:
+                    score += min(profile.module_expertise[module] / 5, 1.0)
+                    factors += 1
             
             # Base score from success rate
             score += profile.success_rate * 0.5
             factors += 0.5
             
-            if factors > 0:
-                normalized_score = score / factors
-                candidates.append((agent_id, normalized_score))
+            candidates.append((agent_id, score / factors))
         
-        if not candidates:
-            return None
+        # Unmatched agents score only their success rate: take the best k
+        wanted = len(candidates) + k
+        for negative_rate, _, agent_id in self._by_success:
+            if len(candidates) >= wanted:
+                break
+            if agent_id not in matched and agent_id not in exclude:
+                candidates.append((agent_id, -negative_rate))
         
-        # Sort by score
-        candidates.sort(key=lambda x: x[1], reverse=True)
-        return candidates[0]
+        return heapq.nlargest(k, candidates, key=lambda x: x[1])
     
     def get_task_estimate(
         self,
@@ -448,27 +584,34 @@ class AgentDNA:
     
     def get_leaderboard(
         self,
-        category: Optional[str] = None
+        category: Optional[str] = None,
+        limit: Optional[int] = None
     ) -> List[Tuple[str, float, int]]:
         """
         Get leaderboard of agents.
         
+        Args:
+            category: Rank by this category's score instead of success rate
+            limit: Return only the top entries
+        
         Returns:
             List of (agent_id, score, task_count)
         """
-        leaderboard = []
-        
-        for agent_id, profile in self.profiles.items():
-            if category:
-                score = profile.category_scores.get(category.lower(), 0)
-                count = profile.category_counts.get(category.lower(), 0)
-            else:
-                score = profile.success_rate
-                count = profile.total_tasks
-            
-            if count > 0:
-                leaderboard.append((agent_id, score, count))
+        if not category:
+            ranked = self._by_success if limit is None else self._by_success[:limit]
+            return [
+                (agent_id, -negative_rate, -negative_count)
+                for negative_rate, negative_count, agent_id in ranked
+            ]
+        
+        category = category.lower()
+        leaderboard = [
+            (agent_id, self.profiles[agent_id].category_scores[category], self.profiles[agent_id].category_counts[category])
+            for agent_id in self._category_index.get(category, ())
+        ]
         
+        if limit is not None:
+            return heapq.nlargest(limit, leaderboard, key=lambda x: (x[1], x[2]))
         leaderboard.sort(key=lambda x: (x[1], x[2]), reverse=True)
         return leaderboard
     
@@ -490,7 +633,7 @@ class AgentDNA:
             )
             return best_collab[0]
         
-        # Otherwise find someone strong in this category
+        # Otherwise find someone strong in this category (index lookup)
         result = self.find_best_agent(
             category=category,
             exclude=[agent_id]
@@ -3,11 +3,15 @@ Swarm Brain - Collective memory and knowledge sharing.
 """
 
 import json
+import os
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from .knowledge_db import KnowledgeDB, read_note_files
+from .knowledge_index import KnowledgeIndex
+
 
 @dataclass
 class Learning:
@@ -62,25 +66,40 @@ class SwarmBrain:
             outcome="50% latency reduction",
             success=True
         )
+    
+    Data is stored as JSON files by default; ``backend="sqlite"`` keeps it
+    in ``<brain_dir>/swarm_brain.db`` instead (see KnowledgeDB).
     """
     
-    def __init__(self, brain_dir: str = "./swarm_brain"):
+    def __init__(self, brain_dir: str = "./swarm_brain", backend: str = "files"):
         """
         Initialize swarm brain.
         
         Args:
             brain_dir: Directory to store brain data
+            backend: Storage backend ("files" or "sqlite")
         """
+        if backend not in ("files", "sqlite"):
+            raise ValueError(f"Unknown brain backend: {backend}")
+        
         self.brain_dir = Path(brain_dir)
         self.brain_dir.mkdir(parents=True, exist_ok=True)
+        self.backend = backend
         
         self.learnings_dir = self.brain_dir / "learnings"
         self.decisions_dir = self.brain_dir / "decisions"
         self.notes_dir = self.brain_dir / "notes"
         
-        self.learnings_dir.mkdir(exist_ok=True)
-        self.decisions_dir.mkdir(exist_ok=True)
-        self.notes_dir.mkdir(exist_ok=True)
+        self.db: Optional[KnowledgeDB] = None
+        if backend == "sqlite":
+            self.db = KnowledgeDB(self.brain_dir / "swarm_brain.db")
+        else:
+            self.learnings_dir.mkdir(exist_ok=True)
+            self.decisions_dir.mkdir(exist_ok=True)
+            self.notes_dir.mkdir(exist_ok=True)
+        
+        self.index = KnowledgeIndex(self.brain_dir / "index")
+        self._index_checked = False
         
         self._learning_counter = 0
         self._decision_counter = 0
@@ -95,7 +114,7 @@ class SwarmBrain:
             counter = self._decision_counter
         
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        return f"{prefix}_{timestamp}_{counter}"
+        return f"{prefix}_{timestamp}_{os.getpid()}_{counter}"
     
     def share_learning(
         self,
@@ -130,6 +149,20 @@ class SwarmBrain:
             metadata=metadata or {}
         )
         
+        if self.db is not None:
+            self.db.add_entry({
+                "id": learning.id,
+                "author": learning.agent_id,
+                "category": learning.category,
+                "title": learning.title,
+                "body": learning.content,
+                "tags": learning.tags,
+                "timestamp": learning.timestamp.isoformat(),
+                "votes": learning.upvotes,
+                "metadata": learning.metadata
+            })
+            return learning
+        
         # Save by category
         category_dir = self.learnings_dir / category
         category_dir.mkdir(exist_ok=True)
@@ -148,6 +181,15 @@ class SwarmBrain:
         }
         learning_file.write_text(json.dumps(learning_data, indent=2))
         
+        self.index.add(
+            doc_id=learning.id,
+            category=learning.category,
+            path=str(learning_file.relative_to(self.brain_dir)),
+            title=learning.title,
+            body=learning.content,
+            tags=learning.tags
+        )
+        
         return learning
     
     def record_decision(
@@ -183,6 +225,19 @@ class SwarmBrain:
             learnings=learnings or []
         )
         
+        if self.db is not None:
+            self.db.add_record({
+                "id": dec.id,
+                "author": dec.agent_id,
+                "decision": dec.decision,
+                "context": dec.context,
+                "outcome": dec.outcome,
+                "success": dec.success,
+                "timestamp": dec.timestamp.isoformat(),
+                "lessons": dec.learnings
+            })
+            return dec
+        
         # Save by agent
         agent_dir = self.decisions_dir / agent_id
         agent_dir.mkdir(exist_ok=True)
@@ -209,7 +264,11 @@ class SwarmBrain:
         limit: int = 10
     ) -> List[Learning]:
         """
-        Search learnings in the swarm brain.
+        Search learnings in the swarm brain, most relevant first.
+        
+        Learnings are ranked with BM25 over title, content and tags via
+        the knowledge index (FTS5 with the sqlite backend); only the
+        returned learnings are loaded.
         
         Args:
             query: Search query
@@ -219,52 +278,130 @@ class SwarmBrain:
         Returns:
             Matching learnings
         """
+        if self.db is not None:
+            return [
+                Learning(
+                    id=row["id"],
+                    agent_id=row["author"],
+                    category=row["category"],
+                    title=row["title"],
+                    content=row["body"],
+                    tags=row["tags"],
+                    timestamp=datetime.fromisoformat(row["timestamp"]),
+                    upvotes=row["votes"],
+                    metadata=row["metadata"]
+                )
+                for row in self.db.search(query, category=category, limit=limit)
+            ]
+        
+        self._ensure_index()
+        
         results = []
-        query_lower = query.lower()
+        for _, _, path in self.index.search(query, category=category, limit=limit):
+            try:
+                data = json.loads((self.brain_dir / path).read_text())
+                learning = Learning(
+                    id=data["id"],
+                    agent_id=data["agent_id"],
+                    category=data["category"],
+                    title=data["title"],
+                    content=data["content"],
+                    tags=data.get("tags", []),
+                    timestamp=datetime.fromisoformat(data["timestamp"]),
+                    upvotes=data.get("upvotes", 0),
+                    metadata=data.get("metadata", {})
+                )
+                results.append(learning)
+            except Exception:
+                pass
         
-        # Search through learnings
-        search_dirs = [self.learnings_dir / category] if category else [
-            d for d in self.learnings_dir.iterdir() if d.is_dir()
-        ]
+        return results
+    
+    def _ensure_index(self) -> None:
+        """Build the search index once if learnings predate it."""
+        if self._index_checked:
+            return
+        self._index_checked = True
+        if not self.index.exists() and next(self.learnings_dir.glob("*/*.json"), None):
+            self.rebuild_index()
+    
+    def rebuild_index(self) -> int:
+        """
+        Rebuild the search index from the learning files on disk.
         
-        for search_dir in search_dirs:
-            if not search_dir.exists():
-                continue
-            
-            for learning_file in search_dir.glob("*.json"):
-                if len(results) >= limit:
-                    break
-                
+        Returns:
+            Number of learnings indexed
+        """
+        documents = []
+        for learning_file in self.learnings_dir.glob("*/*.json"):
+            try:
+                data = json.loads(learning_file.read_text())
+                documents.append({
+                    "doc_id": data["id"],
+                    "category": data["category"],
+                    "path": str(learning_file.relative_to(self.brain_dir)),
+                    "title": data.get("title", ""),
+                    "body": data.get("content", ""),
+                    "tags": data.get("tags", [])
+                })
+            except Exception:
+                pass
+        
+        return self.index.rebuild(documents)
+    
+    def import_from_files(self) -> Dict[str, int]:
+        """
+        Bulk-load an existing file brain (learnings, decisions, notes) into
+        the sqlite backend. Already imported entries are skipped.
+        
+        Returns:
+            Rows imported per kind ("entries", "records", "notes")
+        """
+        if self.db is None:
+            raise ValueError("import_from_files requires backend='sqlite'")
+        
+        def learnings():
+            for learning_file in self.learnings_dir.glob("*/*.json"):
                 try:
                     data = json.loads(learning_file.read_text())
-                    
-                    # Simple text matching
-                    searchable = (
-                        data.get("title", "").lower() +
-                        data.get("content", "").lower() +
-                        " ".join(data.get("tags", []))
-                    )
-                    
-                    if query_lower in searchable:
-                        learning = Learning(
-                            id=data["id"],
-                            agent_id=data["agent_id"],
-                            category=data["category"],
-                            title=data["title"],
-                            content=data["content"],
-                            tags=data.get("tags", []),
-                            timestamp=datetime.fromisoformat(data["timestamp"]),
-                            upvotes=data.get("upvotes", 0),
-                            metadata=data.get("metadata", {})
-                        )
-                        results.append(learning)
+                    yield {
+                        "id": data["id"],
+                        "author": data["agent_id"],
+                        "category": data["category"],
+                        "title": data.get("title", ""),
+                        "body": data.get("content", ""),
+                        "tags": data.get("tags", []),
+                        "timestamp": data["timestamp"],
+                        "votes": data.get("upvotes", 0),
+                        "metadata": data.get("metadata", {})
+                    }
                 except Exception:
                     pass
         
-        return results
+        def decisions():
+            for dec_file in self.decisions_dir.glob("*/*.json"):
+                try:
+                    data = json.loads(dec_file.read_text())
+                    yield {
+                        "id": data["id"],
+                        "author": data["agent_id"],
+                        "decision": data["decision"],
+                        "context": data["context"],
+                        "outcome": data.get("outcome"),
+                        "success": data.get("success"),
+                        "timestamp": data["timestamp"],
+                        "lessons": data.get("learnings", [])
+                    }
+                except Exception:
+                    pass
+        
+        return self.db.bulk_import(learnings(), decisions(), read_note_files(self.notes_dir))
     
     def get_agent_notes(self, agent_id: str) -> List[Dict[str, Any]]:
         """Get all notes for an agent."""
+        if self.db is not None:
+            return self.db.get_notes(agent_id)
+        
         notes_file = self.notes_dir / f"{agent_id}.json"
         if not notes_file.exists():
             return []
@@ -276,6 +413,9 @@ class SwarmBrain:
     
     def add_note(self, agent_id: str, content: str, note_type: str = "general") -> Dict[str, Any]:
         """Add a note for an agent."""
+        if self.db is not None:
+            return self.db.add_note(agent_id, content, note_type, datetime.now().isoformat())
+        
         notes = self.get_agent_notes(agent_id)
         
         note = {
@@ -293,6 +433,15 @@ class SwarmBrain:
     
     def get_stats(self) -> Dict[str, Any]:
         """Get brain statistics."""
+        if self.db is not None:
+            stats = self.db.stats()
+            return {
+                "total_learnings": stats["entries"],
+                "total_decisions": stats["records"],
+                "categories": stats["categories"],
+                "agents_with_decisions": stats["record_authors"]
+            }
+        
         learning_count = sum(
             len(list(d.glob("*.json")))
             for d in self.learnings_dir.iterdir()
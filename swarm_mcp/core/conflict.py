@@ -22,16 +22,20 @@ Author: The Swarm
 License: MIT
 """
 
+import heapq
 import json
 import hashlib
+import os
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set, Tuple
-from collections import defaultdict
+from typing import Any, Dict, Iterator, List, Optional, Set, Tuple
+from collections import Counter, defaultdict
 import re
 
+from .locking import file_lock
+
 
 class ConflictSeverity(Enum):
     """How serious is the conflict."""
@@ -71,6 +75,81 @@ class Conflict:
     resolution: Optional[str] = None
 
 
+class _TrieNode:
+    """One path component in the claim trie."""
+    __slots__ = ("children", "owners", "below")
+    
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.owners: Set[str] = set()           # agents claiming exactly this path
+        self.below: Counter = Counter()         # claims per agent in this subtree
+
+
+class PathTrie:
+    """
+    Claimed paths, one node per component.
+    
+    A claim on a directory covers every file beneath it, so a lookup
+    reports claims on the path itself, on its ancestors, and on its
+    descendants - walking only the nodes that lead to a claim.
+    """
+    
+    def __init__(self):
+        self.root = _TrieNode()
+    
+    def add(self, path: str, agent_id: str) -> None:
+        node = self.root
+        node.below[agent_id] += 1
+        for part in path.split("/"):
+            node = node.children.setdefault(part, _TrieNode())
+            node.below[agent_id] += 1
+        node.owners.add(agent_id)
+    
+    def remove(self, path: str, agent_id: str) -> None:
+        nodes = [self.root]
+        for part in path.split("/"):
+            child = nodes[-1].children.get(part)
+            if child is None:
+                return
+            nodes.append(child)
+        if agent_id not in nodes[-1].owners:
+            return
+        nodes[-1].owners.discard(agent_id)
+        
+        parts = path.split("/")
+        for depth in range(len(nodes) - 1, -1, -1):
+            node = nodes[depth]
+            node.below[agent_id] -= 1
+            if node.below[agent_id] <= 0:
+                del node.below[agent_id]
+            if depth and not node.below:
+                del nodes[depth - 1].children[parts[depth - 1]]
+    
+    def overlaps(self, path: str) -> Iterator[Tuple[str, str]]:
+        """
+        Yield (agent_id, overlapping path) for every claim that overlaps
+        ``path``: the overlapping path is the more specific of the two.
+        """
+        node = self.root
+        for part in path.split("/"):
+            node = node.children.get(part)
+            if node is None:
+                return
+            for agent_id in node.owners:
+                yield agent_id, path
+        
+        # Claims beneath this path
+        stack = [(node, path)]
+        while stack:
+            current, current_path = stack.pop()
+            for part, child in current.children.items():
+                child_path = f"{current_path}/{part}"
+                for agent_id in child.owners:
+                    yield agent_id, child_path
+                if child.below:
+                    stack.append((child, child_path))
+
+
 class ConflictDetector:
     """
     Detects and prevents duplicate work across agents.
@@ -98,8 +177,18 @@ class ConflictDetector:
         if conflicts:
             print(f"⚠️ Conflict with {conflicts[0].agents}")
             # Agent-2 should pick different work
+    
+    Active intents are indexed (a PathTrie for files, inverted indexes for
+    modules, functions and keywords), so a check only looks at intents
+    that share something with the proposed work. Declarations go through
+    ``intents.journal``, an append-only log written under a file lock, so
+    detectors in several processes see each other's intents. Expired
+    intents are dropped from an expiry heap as time passes.
     """
     
+    # Rewrite the journal once it holds this many more lines than live intents
+    JOURNAL_SLACK = 256
+    
     def __init__(
         self,
         storage_dir: str = "./swarm_conflicts",
@@ -117,58 +206,180 @@ class ConflictDetector:
         self.intent_ttl = timedelta(hours=intent_ttl_hours)
         self.intents: Dict[str, WorkIntent] = {}
         self.conflicts: Dict[str, Conflict] = {}
+        
+        self.journal_path = self.storage_dir / "intents.journal"
+        self._lock_path = self.storage_dir / ".lock"
+        self._reset_indexes()
         self._load_intents()
     
+    def _reset_indexes(self):
+        self._file_trie = PathTrie()
+        self._module_index: Dict[str, Set[str]] = defaultdict(set)
+        self._function_index: Dict[str, Set[str]] = defaultdict(set)
+        self._keyword_index: Dict[str, Set[str]] = defaultdict(set)
+        # (expires_at, agent_id, started_at) - stale entries are skipped when popped
+        self._expiry_heap: List[Tuple[datetime, str, datetime]] = []
+        self._journal_pos = 0
+        self._journal_inode: Optional[int] = None
+        self._journal_lines = 0
+    
     def _generate_id(self) -> str:
         """Generate unique ID."""
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S%f")
         return f"conflict_{hashlib.sha256(timestamp.encode()).hexdigest()[:8]}"
     
     def _load_intents(self):
-        """Load active intents from storage."""
+        """Load active intents from the journal (importing the legacy snapshot once)."""
         intents_file = self.storage_dir / "active_intents.json"
-        if intents_file.exists():
+        if intents_file.exists() and not self.journal_path.exists():
             try:
                 data = json.loads(intents_file.read_text())
-                for agent_id, intent_data in data.items():
-                    started_at = datetime.fromisoformat(intent_data["started_at"])
-                    expires_at = started_at + self.intent_ttl
-                    
-                    # Skip expired intents
-                    if datetime.now() > expires_at:
-                        continue
-                    
-                    self.intents[agent_id] = WorkIntent(
-                        agent_id=agent_id,
-                        description=intent_data["description"],
-                        files=intent_data.get("files", []),
-                        modules=intent_data.get("modules", []),
-                        functions=intent_data.get("functions", []),
-                        keywords=intent_data.get("keywords", []),
-                        started_at=started_at,
-                        expires_at=expires_at,
-                        status=intent_data.get("status", "active")
-                    )
+                with file_lock(self._lock_path):
+                    with open(self.journal_path, "a") as journal:
+                        for agent_id, intent_data in data.items():
+                            started_at = datetime.fromisoformat(intent_data["started_at"])
+                            entry = dict(intent_data, op="declare", agent_id=agent_id)
+                            entry["expires_at"] = (started_at + self.intent_ttl).isoformat()
+                            journal.write(json.dumps(entry) + "\n")
+                intents_file.unlink()
             except Exception:
                 pass
+        
+        self._refresh()
+    
+    def _refresh(self):
+        """Apply journal entries written since the last look (by any process)."""
+        try:
+            stat = self.journal_path.stat()
+        except FileNotFoundError:
+            stat = None
+        
+        # Journal rewritten by a compaction: rebuild from scratch
+        if stat is None or stat.st_ino != self._journal_inode or stat.st_size < self._journal_pos:
+            if self._journal_inode is not None:
+                self.intents.clear()
+                self._reset_indexes()
+            if stat is None:
+                return
+            self._journal_inode = stat.st_ino
+        
+        if stat.st_size > self._journal_pos:
+            with open(self.journal_path, "rb") as journal:
+                journal.seek(self._journal_pos)
+                data = journal.read()
+            complete = data[:data.rfind(b"\n") + 1]
+            self._journal_pos += len(complete)
+            for line in complete.decode("utf-8").splitlines():
+                self._journal_lines += 1
+                try:
+                    self._apply(json.loads(line))
+                except (ValueError, KeyError):
+                    pass
+        
+        self._expire()
     
-    def _save_intents(self):
-        """Save intents to storage."""
-        data = {}
-        for agent_id, intent in self.intents.items():
+    def _apply(self, entry: Dict[str, Any]):
+        """Apply one journal entry to the in-memory intents and indexes."""
+        agent_id = entry["agent_id"]
+        
+        if entry["op"] == "declare":
+            if agent_id in self.intents:
+                self._unindex(self.intents[agent_id])
+            started_at = datetime.fromisoformat(entry["started_at"])
+            expires_at = datetime.fromisoformat(entry["expires_at"]) if entry.get("expires_at") else None
+            intent = WorkIntent(
+                agent_id=agent_id,
+                description=entry["description"],
+                files=entry.get("files", []),
+                modules=entry.get("modules", []),
+                functions=entry.get("functions", []),
+                keywords=entry.get("keywords", []),
+                started_at=started_at,
+                expires_at=expires_at,
+                status=entry.get("status", "active")
+            )
+            self.intents[agent_id] = intent
             if intent.status == "active":
-                data[agent_id] = {
-                    "description": intent.description,
-                    "files": intent.files,
-                    "modules": intent.modules,
-                    "functions": intent.functions,
-                    "keywords": intent.keywords,
-                    "started_at": intent.started_at.isoformat(),
-                    "status": intent.status
-                }
+                self._index(intent)
         
-        intents_file = self.storage_dir / "active_intents.json"
-        intents_file.write_text(json.dumps(data, indent=2))
+        elif agent_id in self.intents:
+            intent = self.intents[agent_id]
+            if intent.status == "active":
+                self._unindex(intent)
+            intent.status = entry["op"]
+    
+    def _index(self, intent: WorkIntent):
+        agent_id = intent.agent_id
+        for path in set(intent.files):
+            self._file_trie.add(path, agent_id)
+        for module in set(m.lower() for m in intent.modules):
+            self._module_index[module].add(agent_id)
+        for function in set(f.lower() for f in intent.functions):
+            self._function_index[function].add(agent_id)
+        for keyword in set(k.lower() for k in intent.keywords):
+            self._keyword_index[keyword].add(agent_id)
+        if intent.expires_at:
+            heapq.heappush(self._expiry_heap, (intent.expires_at, agent_id, intent.started_at))
+    
+    def _unindex(self, intent: WorkIntent):
+        agent_id = intent.agent_id
+        for path in set(intent.files):
+            self._file_trie.remove(path, agent_id)
+        for index, values in (
+            (self._module_index, intent.modules),
+            (self._function_index, intent.functions),
+            (self._keyword_index, intent.keywords)
+        ):
+            for value in set(v.lower() for v in values):
+                index[value].discard(agent_id)
+                if not index[value]:
+                    del index[value]
+    
+    def _expire(self):
+        """Drop intents whose TTL has passed (cheap when nothing expired)."""
+        now = datetime.now()
+        while self._expiry_heap and self._expiry_heap[0][0] < now:
+            _, agent_id, started_at = heapq.heappop(self._expiry_heap)
+            intent = self.intents.get(agent_id)
+            # Skip entries for intents that were since replaced
+            if intent is None or intent.started_at != started_at:
+                continue
+            if intent.status == "active":
+                self._unindex(intent)
+            del self.intents[agent_id]
+    
+    def _append(self, entry: Dict[str, Any]):
+        """Append a journal entry (caller holds the lock and has refreshed)."""
+        with open(self.journal_path, "ab") as journal:
+            journal.write(json.dumps(entry).encode("utf-8") + b"\n")
+        self._refresh()
+        
+        if self._journal_lines > len(self.intents) + self.JOURNAL_SLACK:
+            self._compact()
+    
+    def _compact(self):
+        """Rewrite the journal with only the live intents (caller holds the lock)."""
+        tmp_path = self.journal_path.with_suffix(".tmp")
+        with open(tmp_path, "w") as journal:
+            for intent in self.get_active_intents():
+                journal.write(json.dumps(self._intent_entry(intent)) + "\n")
+        os.replace(tmp_path, self.journal_path)
+        self._refresh()
+    
+    @staticmethod
+    def _intent_entry(intent: WorkIntent) -> Dict[str, Any]:
+        return {
+            "op": "declare",
+            "agent_id": intent.agent_id,
+            "description": intent.description,
+            "files": intent.files,
+            "modules": intent.modules,
+            "functions": intent.functions,
+            "keywords": intent.keywords,
+            "started_at": intent.started_at.isoformat(),
+            "expires_at": intent.expires_at.isoformat() if intent.expires_at else None,
+            "status": intent.status
+        }
     
     def _normalize_path(self, path: str) -> str:
         """Normalize file path for comparison."""
@@ -186,21 +397,6 @@ class ConflictDetector:
             return parts[-2]  # Parent directory
         return parts[0]
     
-    def _calculate_similarity(
-        self,
-        set1: Set[str],
-        set2: Set[str]
-    ) -> Tuple[float, Set[str]]:
-        """Calculate Jaccard similarity and overlap."""
-        if not set1 or not set2:
-            return 0.0, set()
-        
-        intersection = set1 & set2
-        union = set1 | set2
-        
-        similarity = len(intersection) / len(union) if union else 0.0
-        return similarity, intersection
-    
     def declare_intent(
         self,
         agent_id: str,
@@ -228,37 +424,39 @@ class ConflictDetector:
         Returns:
             Tuple of (intent, list of conflicts)
         """
-        # First check for conflicts
-        conflicts = self.check_conflicts(
-            agent_id=agent_id,
-            files=files,
-            modules=modules,
-            functions=functions,
-            keywords=keywords
-        )
-        
-        # Create intent
-        ttl = timedelta(hours=ttl_hours) if ttl_hours else self.intent_ttl
-        intent = WorkIntent(
-            agent_id=agent_id,
-            description=description,
-            files=[self._normalize_path(f) for f in (files or [])],
-            modules=modules or [],
-            functions=functions or [],
-            keywords=[k.lower() for k in (keywords or [])],
-            expires_at=datetime.now() + ttl
-        )
-        
-        # Extract modules from files if not provided
-        if files and not modules:
-            intent.modules = list(set(
-                self._extract_module(f) for f in files
-            ))
-        
-        self.intents[agent_id] = intent
-        self._save_intents()
+        # Check and record under one lock, so two processes can't both
+        # declare the same work without one seeing the other
+        with file_lock(self._lock_path):
+            self._refresh()
+            conflicts = self._find_conflicts(
+                agent_id=agent_id,
+                files=files,
+                modules=modules,
+                functions=functions,
+                keywords=keywords
+            )
+            
+            # Create intent
+            ttl = timedelta(hours=ttl_hours) if ttl_hours else self.intent_ttl
+            intent = WorkIntent(
+                agent_id=agent_id,
+                description=description,
+                files=[self._normalize_path(f) for f in (files or [])],
+                modules=modules or [],
+                functions=functions or [],
+                keywords=[k.lower() for k in (keywords or [])],
+                expires_at=datetime.now() + ttl
+            )
+            
+            # Extract modules from files if not provided
+            if files and not modules:
+                intent.modules = list(set(
+                    self._extract_module(f) for f in files
+                ))
+            
+            self._append(self._intent_entry(intent))
         
-        return intent, conflicts
+        return self.intents.get(agent_id, intent), conflicts
     
     def check_conflicts(
         self,
@@ -271,6 +469,9 @@ class ConflictDetector:
         """
         Check if proposed work conflicts with active intents.
         
+        A claim on a directory conflicts with files beneath it (and the
+        other way round).
+        
         Args:
             agent_id: Agent checking for conflicts
             files: Files they want to touch
@@ -281,6 +482,18 @@ class ConflictDetector:
         Returns:
             List of conflicts (empty if none)
         """
+        self._refresh()
+        return self._find_conflicts(agent_id, files, modules, functions, keywords)
+    
+    def _find_conflicts(
+        self,
+        agent_id: str,
+        files: Optional[List[str]] = None,
+        modules: Optional[List[str]] = None,
+        functions: Optional[List[str]] = None,
+        keywords: Optional[List[str]] = None
+    ) -> List[Conflict]:
+        """Look up conflicts in the indexes (intents must be refreshed)."""
         conflicts = []
         
         # Normalize inputs
@@ -293,31 +506,27 @@ class ConflictDetector:
         if my_files and not my_modules:
             my_modules = set(self._extract_module(f) for f in my_files)
         
-        # Check against all active intents
-        now = datetime.now()
-        for other_agent, intent in self.intents.items():
-            # Skip self
-            if other_agent == agent_id:
-                continue
-            
-            # Skip expired/inactive
-            if intent.status != "active":
-                continue
-            if intent.expires_at and now > intent.expires_at:
-                continue
-            
-            other_files = set(intent.files)
-            other_modules = set(m.lower() for m in intent.modules)
-            other_functions = set(f.lower() for f in intent.functions)
-            other_keywords = set(k.lower() for k in intent.keywords)
+        # Only intents sharing something with this work are candidates
+        file_overlaps: Dict[str, Set[str]] = defaultdict(set)
+        for path in my_files:
+            for other_agent, overlap in self._file_trie.overlaps(path):
+                file_overlaps[other_agent].add(overlap)
+        
+        function_overlaps = self._index_overlaps(self._function_index, my_functions)
+        module_overlaps = self._index_overlaps(self._module_index, my_modules)
+        keyword_overlaps = self._index_overlaps(self._keyword_index, my_keywords)
+        
+        candidates = set(file_overlaps) | set(module_overlaps) | set(keyword_overlaps)
+        candidates.discard(agent_id)
+        
+        for other_agent in sorted(candidates, key=lambda a: self.intents[a].started_at):
+            intent = self.intents[other_agent]
             
             # Check file overlap (BLOCKING)
-            file_sim, file_overlap = self._calculate_similarity(my_files, other_files)
+            file_overlap = file_overlaps.get(other_agent)
             if file_overlap:
                 # Check function overlap (even more specific)
-                func_sim, func_overlap = self._calculate_similarity(
-                    my_functions, other_functions
-                )
+                func_overlap = function_overlaps.get(other_agent)
                 
                 if func_overlap:
                     severity = ConflictSeverity.BLOCKING
@@ -337,27 +546,33 @@ class ConflictDetector:
                 continue
             
             # Check module overlap (MEDIUM)
-            mod_sim, mod_overlap = self._calculate_similarity(my_modules, other_modules)
-            if mod_overlap and mod_sim > 0.3:
-                conflicts.append(Conflict(
-                    id=self._generate_id(),
-                    agents=[agent_id, other_agent],
-                    severity=ConflictSeverity.MEDIUM,
-                    reason=f"Same module(s): {mod_overlap}",
-                    overlapping_files=[]
-                ))
-                continue
+            mod_overlap = module_overlaps.get(other_agent)
+            if mod_overlap:
+                other_modules = set(m.lower() for m in intent.modules)
+                mod_sim = len(mod_overlap) / len(my_modules | other_modules)
+                if mod_sim > 0.3:
+                    conflicts.append(Conflict(
+                        id=self._generate_id(),
+                        agents=[agent_id, other_agent],
+                        severity=ConflictSeverity.MEDIUM,
+                        reason=f"Same module(s): {mod_overlap}",
+                        overlapping_files=[]
+                    ))
+                    continue
             
             # Check keyword overlap (LOW/INFO)
-            kw_sim, kw_overlap = self._calculate_similarity(my_keywords, other_keywords)
-            if kw_overlap and kw_sim > 0.5:
-                conflicts.append(Conflict(
-                    id=self._generate_id(),
-                    agents=[agent_id, other_agent],
-                    severity=ConflictSeverity.LOW if kw_sim > 0.7 else ConflictSeverity.INFO,
-                    reason=f"Similar keywords: {kw_overlap}",
-                    overlapping_keywords=list(kw_overlap)
-                ))
+            kw_overlap = keyword_overlaps.get(other_agent)
+            if kw_overlap:
+                other_keywords = set(k.lower() for k in intent.keywords)
+                kw_sim = len(kw_overlap) / len(my_keywords | other_keywords)
+                if kw_sim > 0.5:
+                    conflicts.append(Conflict(
+                        id=self._generate_id(),
+                        agents=[agent_id, other_agent],
+                        severity=ConflictSeverity.LOW if kw_sim > 0.7 else ConflictSeverity.INFO,
+                        reason=f"Similar keywords: {kw_overlap}",
+                        overlapping_keywords=list(kw_overlap)
+                    ))
         
         # Save conflicts
         for conflict in conflicts:
@@ -365,33 +580,43 @@ class ConflictDetector:
         
         return conflicts
     
+    @staticmethod
+    def _index_overlaps(index: Dict[str, Set[str]], values: Set[str]) -> Dict[str, Set[str]]:
+        """Agent -> the given values it shares, from an inverted index."""
+        overlaps: Dict[str, Set[str]] = defaultdict(set)
+        for value in values:
+            for other_agent in index.get(value, ()):
+                overlaps[other_agent].add(value)
+        return overlaps
+    
+    def _finish(self, agent_id: str, status: str) -> bool:
+        with file_lock(self._lock_path):
+            self._refresh()
+            intent = self.intents.get(agent_id)
+            if intent is None:
+                return False
+            self._append({"op": status, "agent_id": agent_id})
+        return True
+    
     def complete_work(self, agent_id: str) -> bool:
         """Mark an agent's work as complete, freeing up the area."""
-        if agent_id in self.intents:
-            self.intents[agent_id].status = "completed"
-            self._save_intents()
-            return True
-        return False
+        return self._finish(agent_id, "completed")
     
     def abandon_work(self, agent_id: str) -> bool:
         """Mark work as abandoned (agent got stuck, reassigned, etc.)."""
-        if agent_id in self.intents:
-            self.intents[agent_id].status = "abandoned"
-            self._save_intents()
-            return True
-        return False
+        return self._finish(agent_id, "abandoned")
     
     def get_active_intents(self) -> List[WorkIntent]:
         """Get all currently active work intents."""
-        now = datetime.now()
+        self._refresh()
         return [
             intent for intent in self.intents.values()
-            if intent.status == "active" and
-            (not intent.expires_at or now < intent.expires_at)
+            if intent.status == "active"
         ]
     
     def get_agent_intent(self, agent_id: str) -> Optional[WorkIntent]:
         """Get a specific agent's current intent."""
+        self._refresh()
         intent = self.intents.get(agent_id)
         if intent and intent.status == "active":
             return intent
@@ -0,0 +1,408 @@
+"""
+Event Store - Columnar, day-partitioned coordination history.
+
+🐺 The pack's memory of every hunt, one day per page.
+
+PatternMiner keeps its event history here instead of one JSON file per
+event. Each day is an append-only partition directory of packed columns:
+
+    <root>/strings.txt              - Interned strings, one JSON string per
+                                      line (id = line number, from 1)
+    <root>/<YYYY-MM-DD>/ts.col      - float64 epoch seconds
+    <root>/<YYYY-MM-DD>/duration.col- float64 minutes
+    <root>/<YYYY-MM-DD>/quality.col - float64 quality score
+    <root>/<YYYY-MM-DD>/type.col    - uint32 event type id
+    <root>/<YYYY-MM-DD>/outcome.col - uint32 outcome id
+    <root>/<YYYY-MM-DD>/category.col- uint32 category id (0 = none)
+    <root>/<YYYY-MM-DD>/nagents.col - uint16 agents per event
+    <root>/<YYYY-MM-DD>/agents.col  - uint32 agent ids, all events flattened
+    <root>/<YYYY-MM-DD>/extra.jsonl - id, context and tags, one line per event
+    <root>/<YYYY-MM-DD>/extra_end.col  - uint64 end of each row's extra line
+    <root>/<YYYY-MM-DD>/agents_end.col - uint64 end of each row's agent ids
+
+Readers pick partitions by name, so a time-bounded scan never opens older
+days, and hold one partition in memory at a time. ts.col is written last,
+so a row exists once its timestamp does. A torn append (crash mid-write)
+leaves bytes past the last row in some files; the next append cuts every
+file back to the committed rows (using the end offsets) before writing.
+"""
+
+import itertools
+import json
+import os
+from array import array
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+
+from .locking import file_lock
+
+
+# Fixed-width columns: file name -> array typecode (written in this order,
+# so ts.col, written last, never holds a row the others lack)
+COLUMNS = {
+    "duration": "d",
+    "quality": "d",
+    "type": "I",
+    "outcome": "I",
+    "category": "I",
+    "nagents": "H",
+    "extra_end": "Q",
+    "agents_end": "Q",
+    "ts": "d",
+}
+
+# Bookkeeping columns, not part of EventChunk
+OFFSET_COLUMNS = ("extra_end", "agents_end")
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _last_value(path: Path, typecode: str) -> int:
+    """Last entry of a column file (0 if empty)."""
+    column = array(typecode)
+    with open(path, "rb") as handle:
+        handle.seek(-column.itemsize, os.SEEK_END)
+        column.frombytes(handle.read(column.itemsize))
+    return column[0]
+
+
+@dataclass
+class EventChunk:
+    """The columns of one partition (or the rows of it that were asked for)."""
+    day: str
+    ts: array
+    duration: array
+    quality: array
+    type: array
+    outcome: array
+    category: array
+    nagents: array
+    agents: array
+    # Row numbers within the partition, when only some rows were selected
+    rows: Optional[List[int]] = field(default=None)
+
+    def __len__(self) -> int:
+        return len(self.ts)
+
+
+class EventStore:
+    """
+    🐺 Append-only columnar event log, one partition per day.
+
+    Example:
+        store = EventStore("./swarm_patterns/events")
+        store.append({"id": "event_1", "event_type": "task_complete", ...})
+
+        for record in store.iter_events(start=datetime(2025, 1, 1)):
+            ...
+    """
+
+    def __init__(self, root: Union[str, Path]):
+        """
+        Initialize event store.
+
+        Args:
+            root: Directory holding the partitions
+        """
+        self.root = Path(root)
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.strings_path = self.root / "strings.txt"
+        self._lock_path = self.root / ".lock"
+
+        self._strings: List[str] = []
+        self._ids: Dict[str, int] = {}
+        self._strings_pos = 0
+        self._load_strings()
+
+    def _load_strings(self) -> None:
+        """Pick up strings interned since the last look (by any process)."""
+        try:
+            with open(self.strings_path, "rb") as strings:
+                strings.seek(self._strings_pos)
+                data = strings.read()
+        except FileNotFoundError:
+            return
+
+        complete = data[:data.rfind(b"\n") + 1]
+        self._strings_pos += len(complete)
+        for line in complete.decode("utf-8").splitlines():
+            self._strings.append(json.loads(line))
+            self._ids[self._strings[-1]] = len(self._strings)
+
+    def _intern(self, value: str) -> int:
+        """String id, adding it to the table if new (caller holds the lock)."""
+        if value not in self._ids:
+            self._load_strings()
+        if value not in self._ids:
+            # Everything past the last whole line is a torn append
+            if _file_size(self.strings_path) > self._strings_pos:
+                os.truncate(self.strings_path, self._strings_pos)
+            with open(self.strings_path, "ab") as strings:
+                line = json.dumps(value).encode("utf-8") + b"\n"
+                strings.write(line)
+            self._strings_pos += len(line)
+            self._strings.append(value)
+            self._ids[value] = len(self._strings)
+        return self._ids[value]
+
+    def _string(self, string_id: int) -> Optional[str]:
+        if string_id == 0:
+            return None
+        if string_id > len(self._strings):
+            self._load_strings()
+        return self._strings[string_id - 1]
+
+    def partitions(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> List[str]:
+        """Partition names (days) overlapping [start, end], oldest first."""
+        first = start.strftime("%Y-%m-%d") if start else ""
+        last = end.strftime("%Y-%m-%d") if end else "9999"
+        return sorted(
+            path.name for path in self.root.iterdir()
+            if path.is_dir() and first <= path.name <= last
+        )
+
+    def rows(self, day: str) -> int:
+        """Rows stored in one partition (the ts column is written last)."""
+        return _file_size(self.root / day / "ts.col") // array("d").itemsize
+
+    def _repair_locked(self, partition: Path) -> Tuple[int, int]:
+        """
+        Cut a torn append off every file of a partition (caller holds the lock).
+
+        Returns:
+            Committed length of extra.jsonl (bytes) and agents.col (ids)
+        """
+        rows = _file_size(partition / "ts.col") // array("d").itemsize
+        if rows and _file_size(partition / "agents_end.col") < rows * 8:
+            self._rebuild_offsets(partition, rows)
+
+        for name, typecode in COLUMNS.items():
+            path = partition / f"{name}.col"
+            if _file_size(path) > rows * array(typecode).itemsize:
+                os.truncate(path, rows * array(typecode).itemsize)
+
+        if rows:
+            extra_end = _last_value(partition / "extra_end.col", "Q")
+            agents_end = _last_value(partition / "agents_end.col", "Q")
+        else:
+            extra_end = agents_end = 0
+        if _file_size(partition / "extra.jsonl") > extra_end:
+            os.truncate(partition / "extra.jsonl", extra_end)
+        if _file_size(partition / "agents.col") > agents_end * array("I").itemsize:
+            os.truncate(partition / "agents.col", agents_end * array("I").itemsize)
+        return extra_end, agents_end
+
+    def _rebuild_offsets(self, partition: Path, rows: int) -> None:
+        """Write the end offset columns of a partition that predates them."""
+        extra_end, agents_end = array("Q"), array("Q")
+        position = 0
+        with open(partition / "extra.jsonl", "rb") as handle:
+            for line in itertools.islice(handle, rows):
+                position += len(line)
+                extra_end.append(position)
+        total = 0
+        for count in self.read_chunk(partition.name).nagents[:rows]:
+            total += count
+            agents_end.append(total)
+        (partition / "extra_end.col").write_bytes(extra_end.tobytes())
+        (partition / "agents_end.col").write_bytes(agents_end.tobytes())
+
+    def append(self, record: Dict[str, Any]) -> int:
+        """
+        Append one event record.
+
+        Args:
+            record: Dict with id, event_type, agents, context, outcome,
+                timestamp (datetime), duration_minutes, quality_score, tags
+
+        Returns:
+            Row number of the record in its day partition
+        """
+        timestamp: datetime = record["timestamp"]
+        partition = self.root / timestamp.strftime("%Y-%m-%d")
+        partition.mkdir(exist_ok=True)
+
+        with file_lock(self._lock_path):
+            extra_end, agents_end = self._repair_locked(partition)
+            row = self.rows(partition.name)
+            category = record["context"].get("category")
+            agents = array("I", [self._intern(agent) for agent in record["agents"]])
+            values = {
+                "ts": timestamp.timestamp(),
+                "duration": float(record.get("duration_minutes", 0)),
+                "quality": float(record.get("quality_score", 1.0)),
+                "type": self._intern(record["event_type"]),
+                "outcome": self._intern(record["outcome"]),
+                "category": self._intern(category) if isinstance(category, str) else 0,
+                "nagents": len(agents),
+            }
+            extra = {"id": record["id"], "context": record["context"], "tags": record.get("tags", [])}
+            line = json.dumps(extra).encode("utf-8") + b"\n"
+            values["extra_end"] = extra_end + len(line)
+            values["agents_end"] = agents_end + len(agents)
+
+            # Variable-width data first, then the fixed columns that define the row count
+            with open(partition / "extra.jsonl", "ab") as handle:
+                handle.write(line)
+            with open(partition / "agents.col", "ab") as handle:
+                handle.write(agents.tobytes())
+            for name, typecode in COLUMNS.items():
+                with open(partition / f"{name}.col", "ab") as handle:
+                    handle.write(array(typecode, [values[name]]).tobytes())
+        return row
+
+    def read_chunk(self, day: str) -> EventChunk:
+        """Load the columns of one partition."""
+        partition = self.root / day
+        columns: Dict[str, array] = {}
+        for name, typecode in COLUMNS.items():
+            if name in OFFSET_COLUMNS:
+                continue
+            column = array(typecode)
+            try:
+                data = (partition / f"{name}.col").read_bytes()
+                column.frombytes(data[:len(data) - len(data) % column.itemsize])
+            except FileNotFoundError:
+                pass
+            columns[name] = column
+
+        rows = min(len(column) for column in columns.values())
+        for name in columns:
+            del columns[name][rows:]
+
+        agents = array("I")
+        try:
+            data = (partition / "agents.col").read_bytes()
+            agents.frombytes(data[:len(data) - len(data) % agents.itemsize])
+        except FileNotFoundError:
+            pass
+
+        return EventChunk(day=day, agents=agents, **columns)
+
+    def scan(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> Iterator[EventChunk]:
+        """
+        🐺 Stream columns partition by partition, trimmed to [start, end].
+
+        Only the partitions overlapping the range are read.
+        """
+        low = start.timestamp() if start else float("-inf")
+        high = end.timestamp() if end else float("inf")
+        for day in self.partitions(start, end):
+            chunk = self.read_chunk(day)
+            if len(chunk) and (chunk.ts[0] < low or chunk.ts[-1] > high):
+                keep = [i for i, ts in enumerate(chunk.ts) if low <= ts <= high]
+                chunk = self._select(chunk, keep)
+            yield chunk
+
+    @staticmethod
+    def _select(chunk: EventChunk, rows: List[int]) -> EventChunk:
+        offsets = [0]
+        for count in chunk.nagents:
+            offsets.append(offsets[-1] + count)
+        agents = array("I")
+        for row in rows:
+            agents.extend(chunk.agents[offsets[row]:offsets[row + 1]])
+        columns = {
+            name: array(typecode, (getattr(chunk, name)[row] for row in rows))
+            for name, typecode in COLUMNS.items()
+            if name not in OFFSET_COLUMNS
+        }
+        return EventChunk(day=chunk.day, agents=agents, rows=rows, **columns)
+
+    def iter_events(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Full event records in time order, one partition in memory at a time.
+
+        Args:
+            start: Earliest timestamp (inclusive)
+            end: Latest timestamp (inclusive)
+
+        Returns:
+            Iterator of event record dicts (as passed to append)
+        """
+        for chunk in self.scan(start, end):
+            records = self._records(chunk)
+            # Appends from several processes can interleave slightly out of order
+            records.sort(key=lambda record: record["timestamp"])
+            yield from records
+
+    def read_since(self, cursors: Dict[str, int]) -> Tuple[List[Dict[str, Any]], Dict[str, int]]:
+        """
+        Event records appended after per-partition row cursors, in time order.
+
+        Partitions are append-only, so a row count per day is a stable
+        cursor even when processes append to an older day after a newer one.
+
+        Args:
+            cursors: Day -> rows already read (missing days count as 0)
+
+        Returns:
+            (new records, cursors advanced past them)
+        """
+        records: List[Dict[str, Any]] = []
+        advanced = dict(cursors)
+        for day in self.partitions():
+            seen = cursors.get(day, 0)
+            if self.rows(day) <= seen:
+                continue
+            chunk = self.read_chunk(day)
+            if len(chunk) <= seen:
+                continue
+            records.extend(self._records(self._select(chunk, list(range(seen, len(chunk))))))
+            advanced[day] = len(chunk)
+        records.sort(key=lambda record: record["timestamp"])
+        return records, advanced
+
+    def _records(self, chunk: EventChunk) -> List[Dict[str, Any]]:
+        """Decode a chunk's rows into full event records (partition order)."""
+        rows = chunk.rows if chunk.rows is not None else range(len(chunk))
+        with open(self.root / chunk.day / "extra.jsonl", "rb") as handle:
+            extras = handle.read().splitlines()
+
+        offset = 0
+        records = []
+        for i, row in enumerate(rows):
+            count = chunk.nagents[i]
+            agents = [self._string(agent_id) for agent_id in chunk.agents[offset:offset + count]]
+            offset += count
+            extra = json.loads(extras[row])
+            records.append({
+                "id": extra["id"],
+                "event_type": self._string(chunk.type[i]),
+                "agents": agents,
+                "context": extra["context"],
+                "outcome": self._string(chunk.outcome[i]),
+                "timestamp": datetime.fromtimestamp(chunk.ts[i]),
+                "duration_minutes": chunk.duration[i],
+                "quality_score": chunk.quality[i],
+                "tags": extra["tags"],
+            })
+        return records
+
+    def count(self, start: Optional[datetime] = None, end: Optional[datetime] = None) -> int:
+        """Number of events in [start, end]; days fully inside are sized by stat() alone."""
+        first = start.strftime("%Y-%m-%d") if start else ""
+        last = end.strftime("%Y-%m-%d") if end else "9999"
+        total = 0
+        for day in self.partitions(start, end):
+            if first < day < last:
+                try:
+                    total += (self.root / day / "ts.col").stat().st_size // 8
+                except FileNotFoundError:
+                    pass
+            else:
+                low = start.timestamp() if start else float("-inf")
+                high = end.timestamp() if end else float("inf")
+                total += sum(1 for ts in self.read_chunk(day).ts if low <= ts <= high)
+        return total
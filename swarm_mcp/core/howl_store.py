@@ -0,0 +1,1420 @@
+"""
+Howl Store - Where the pack's howls are kept.
+
+🐺 Every howl leaves a track. The store decides how the tracks are laid down.
+
+Backends:
+- SegmentLogStore: Append-only segment log per wolf with a fixed-width
+  offset index. A send is one append; a read touches only the howls it
+  returns. Pack howls are stored once in a shared topic and merged into
+  each wolf's reads.
+- FileHowlStore: The original layout, one JSON file per howl in
+  ``<territory>/<wolf>/incoming/``.
+
+Stores deal in plain howl records (the JSON dicts MessageQueue has always
+written), so they know nothing about Howl objects.
+
+InboxWatcher lets a receiver sleep until a howl lands: inotify on Linux,
+an in-process condition variable elsewhere.
+"""
+
+import atexit
+import ctypes
+import ctypes.util
+import bisect
+import heapq
+import json
+import os
+import select
+import struct
+import sys
+import threading
+import time
+import warnings
+import weakref
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, FrozenSet, Iterator, List, Optional, Set, Tuple, Union
+
+from .locking import file_lock
+
+
+# Index entry: segment, byte offset, length, urgency, flags, timestamp
+INDEX_ENTRY = struct.Struct("<IQIBBd")
+FLAG_DROPPED = 0x01
+# Pack topic howl meant for only some wolves (listed in the record's "audience")
+FLAG_SUBSET = 0x02
+
+# Pseudo-wolf holding the shared pack broadcast topic
+PACK_TOPIC = "_pack"
+
+# Written to a territory once migrate_file_inboxes has imported it
+MIGRATED_MARKER = ".migrated"
+
+_open_stores: "weakref.WeakSet[HowlStore]" = weakref.WeakSet()
+
+# inotify events that mean "something was written into the inbox directory"
+_IN_MODIFY = 0x002
+_IN_CLOSE_WRITE = 0x008
+_IN_MOVED_TO = 0x080
+_IN_CREATE = 0x100
+
+try:
+    _libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+    HAS_INOTIFY = sys.platform.startswith("linux") and hasattr(_libc, "inotify_init1")
+except (OSError, TypeError):
+    HAS_INOTIFY = False
+
+# Bumped and broadcast on every in-process append
+_appended = threading.Condition()
+_append_generation = 0
+
+
+@atexit.register
+def _flush_open_stores() -> None:
+    """Make batched writes durable when the process exits."""
+    for store in list(_open_stores):
+        try:
+            store.flush()
+        except Exception:
+            pass
+
+
+def _segment_name(segment: int) -> str:
+    return f"{segment:08d}.seg"
+
+
+def _file_size(path: Path) -> int:
+    try:
+        return path.stat().st_size
+    except FileNotFoundError:
+        return 0
+
+
+def _epoch(timestamp: Any) -> float:
+    try:
+        return datetime.fromisoformat(timestamp).timestamp()
+    except (TypeError, ValueError):
+        return time.time()
+
+
+def _notify_appended() -> None:
+    global _append_generation
+    with _appended:
+        _append_generation += 1
+        _appended.notify_all()
+
+
+class InboxWatcher:
+    """
+    🐺 Sleep until something is written into an inbox directory.
+
+    On Linux an inotify watch wakes the waiter within milliseconds of a
+    send from any process. Elsewhere it waits on an in-process condition
+    variable that every store append notifies, re-checking every
+    ``poll_interval`` seconds to pick up sends from other processes.
+
+    Create the watcher *before* checking the inbox so no send is missed.
+
+    Example:
+        with store.watch("alpha") as watcher:
+            while not store.next_unheard("alpha"):
+                watcher.wait(5.0)
+    """
+
+    def __init__(self, paths: List[Path], poll_interval: float = 0.25):
+        self.paths = [Path(path) for path in paths]
+        for path in self.paths:
+            path.mkdir(parents=True, exist_ok=True)
+        self.poll_interval = poll_interval
+        self._fd: Optional[int] = None
+        with _appended:
+            self._seen = _append_generation
+
+        if HAS_INOTIFY:
+            fd = _libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+            if fd >= 0:
+                events = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+                if all(_libc.inotify_add_watch(fd, os.fsencode(path), events) >= 0 for path in self.paths):
+                    self._fd = fd
+                else:
+                    os.close(fd)
+
+    def wait(self, timeout: float) -> None:
+        """Block until the inbox may have changed or ``timeout`` seconds pass."""
+        if timeout <= 0:
+            return
+
+        if self._fd is not None:
+            ready, _, _ = select.select([self._fd], [], [], timeout)
+            if ready:
+                self._drain()
+            return
+
+        with _appended:
+            if _append_generation == self._seen:
+                _appended.wait(min(timeout, self.poll_interval))
+            self._seen = _append_generation
+
+    def _drain(self) -> None:
+        try:
+            while os.read(self._fd, 4096):
+                pass
+        except BlockingIOError:
+            pass
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    def __enter__(self) -> "InboxWatcher":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+@dataclass
+class HeardState:
+    """
+    Which howls a wolf has heard, by sequence number.
+
+    Every howl below ``watermark`` is heard, as is every howl in ``heard``.
+    The watermark advances past contiguous heard howls, so ``heard`` only
+    holds the exceptions: howls heard out of order. Howls below ``start``
+    are not in the wolf's view at all (pack howls from before it joined).
+    """
+    watermark: int = 0
+    heard: Set[int] = field(default_factory=set)
+    start: int = 0
+
+    def is_heard(self, seq: int) -> bool:
+        return seq < self.watermark or seq in self.heard
+
+    def mark(self, seq: int) -> bool:
+        """Mark one howl heard. Returns False if it already was."""
+        if self.is_heard(seq):
+            return False
+        self.heard.add(seq)
+        self._advance()
+        return True
+
+    def mark_through(self, seq: int) -> None:
+        """Mark every howl up to and including ``seq`` heard."""
+        if seq < self.watermark:
+            return
+        self.watermark = seq + 1
+        self.heard = {s for s in self.heard if s >= self.watermark}
+        self._advance()
+
+    def unheard(self, total: int) -> int:
+        """Unheard howls out of ``total`` sent."""
+        return max(0, total - self.watermark - len(self.heard))
+
+    def _advance(self) -> None:
+        while self.watermark in self.heard:
+            self.heard.discard(self.watermark)
+            self.watermark += 1
+
+
+class HowlStore(ABC):
+    """Storage backend interface for MessageQueue."""
+
+    @abstractmethod
+    def append(self, wolf_id: str, record: Dict[str, Any]) -> None:
+        """Store a howl record in a wolf's inbox."""
+
+    @abstractmethod
+    def read(
+        self,
+        wolf_id: str,
+        unheard_only: bool = False,
+        limit: Optional[int] = 50
+    ) -> List[Dict[str, Any]]:
+        """Read howl records, newest first."""
+
+    @abstractmethod
+    def mark_heard(self, wolf_id: str, howl_id: str) -> bool:
+        """Mark a howl as heard."""
+
+    @abstractmethod
+    def count_unheard(self, wolf_id: str) -> int:
+        """Count unheard howls for a wolf."""
+
+    @abstractmethod
+    def wolves(self) -> List[str]:
+        """Wolves that have an inbox in this store."""
+
+    @abstractmethod
+    def inbox_paths(self, wolf_id: str) -> List[Path]:
+        """Directories that change whenever a howl is stored for a wolf."""
+
+    def watch(self, wolf_id: str) -> InboxWatcher:
+        """Watch a wolf's inbox for new howls."""
+        return InboxWatcher(self.inbox_paths(wolf_id))
+
+    def broadcast(self, record: Dict[str, Any], pack: Optional[List[str]] = None) -> None:
+        """Deliver a pack howl to ``pack`` (default: every wolf), one copy each."""
+        for wolf_id in pack or self.wolves():
+            self.append(wolf_id, {**record, "recipient": wolf_id})
+
+    def next_by_urgency(
+        self,
+        wolf_id: str,
+        max_urgency: int = 4,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Read unheard howls at least as urgent as ``max_urgency``, most urgent (then oldest) first."""
+        records = [
+            record for record in self.next_unheard(wolf_id, limit=sys.maxsize)
+            if int(record.get("urgency", 3)) <= max_urgency
+        ]
+        records.sort(key=lambda record: int(record.get("urgency", 3)))
+        return records[:limit]
+
+    def take_by_urgency(
+        self,
+        wolf_id: str,
+        max_urgency: int = 4,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Like ``next_by_urgency``, and mark the howls returned as heard."""
+        records = self.next_by_urgency(wolf_id, max_urgency, limit)
+        return [record for record in records if self.mark_heard(wolf_id, record["id"])]
+
+    def next_unheard(self, wolf_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Read the oldest unheard howl records, oldest first."""
+        return list(reversed(self.read(wolf_id, unheard_only=True, limit=None)))[:limit]
+
+    def mark_heard_up_to(self, wolf_id: str, howl_id: str) -> bool:
+        """Mark a howl and every older howl as heard."""
+        records = self.read(wolf_id, limit=None)
+        ids = [record["id"] for record in records]
+        if howl_id not in ids:
+            return False
+
+        for record in records[ids.index(howl_id):]:
+            if not record.get("heard"):
+                self.mark_heard(wolf_id, record["id"])
+        return True
+
+    def compact(self, wolf_id: str) -> Dict[str, int]:
+        """Reclaim space used by heard howls. No-op unless the backend supports it."""
+        return {"segments_removed": 0, "howls_dropped": 0, "bytes_reclaimed": 0}
+
+    def flush(self) -> None:
+        """Make buffered writes durable."""
+
+    def close(self) -> None:
+        """Flush and release open handles."""
+        self.flush()
+
+
+class FileHowlStore(HowlStore):
+    """
+    🐺 Legacy layout: one pretty-printed JSON file per howl.
+
+    Kept for existing territories and as the source for
+    ``migrate_file_inboxes``.
+    """
+
+    def __init__(self, territory: Union[str, Path]):
+        self.territory = Path(territory)
+        self.territory.mkdir(parents=True, exist_ok=True)
+
+    def _inbox(self, wolf_id: str) -> Path:
+        return self.territory / wolf_id / "incoming"
+
+    def inbox_paths(self, wolf_id: str) -> List[Path]:
+        return [self._inbox(wolf_id)]
+
+    def append(self, wolf_id: str, record: Dict[str, Any]) -> None:
+        inbox = self._inbox(wolf_id)
+        inbox.mkdir(parents=True, exist_ok=True)
+
+        howl_file = inbox / f"{record['id']}.json"
+        howl_file.write_text(json.dumps({**record, "heard": record.get("heard", False)}, indent=2))
+        _notify_appended()
+
+    def iter_files(self, wolf_id: str, newest_first: bool = False) -> Iterator[Tuple[Path, Dict[str, Any]]]:
+        """Yield (file, record) pairs for every readable howl in an inbox."""
+        inbox = self._inbox(wolf_id)
+        if not inbox.exists():
+            return
+
+        for howl_file in sorted(inbox.glob("*.json"), reverse=newest_first):
+            try:
+                yield howl_file, json.loads(howl_file.read_text())
+            except Exception:
+                pass
+
+    def read(
+        self,
+        wolf_id: str,
+        unheard_only: bool = False,
+        limit: Optional[int] = 50
+    ) -> List[Dict[str, Any]]:
+        records = []
+        for _, data in self.iter_files(wolf_id, newest_first=True):
+            if limit is not None and len(records) >= limit:
+                break
+            if unheard_only and data.get("heard"):
+                continue
+            records.append(data)
+        return records
+
+    def mark_heard(self, wolf_id: str, howl_id: str) -> bool:
+        howl_file = self._inbox(wolf_id) / f"{howl_id}.json"
+        if not howl_file.exists():
+            return False
+
+        try:
+            data = json.loads(howl_file.read_text())
+            data["heard"] = True
+            howl_file.write_text(json.dumps(data, indent=2))
+            return True
+        except Exception:
+            return False
+
+    def count_unheard(self, wolf_id: str) -> int:
+        return len(self.read(wolf_id, unheard_only=True, limit=None))
+
+    def wolves(self) -> List[str]:
+        return sorted(d.name for d in self.territory.iterdir() if (d / "incoming").is_dir())
+
+
+class _LogWriter:
+    """Append handles for one wolf's active segment."""
+
+    def __init__(self, log_dir: Path, segment: int):
+        self.segment = segment
+        self.segment_file = open(log_dir / _segment_name(segment), "ab")
+        self.index_file = open(log_dir / "index.bin", "ab")
+        self.ids_file = open(log_dir / "ids.txt", "ab")
+        self.pending = 0
+
+    def flush(self, sync: bool = False) -> None:
+        for handle in (self.segment_file, self.index_file, self.ids_file):
+            handle.flush()
+            if sync:
+                os.fsync(handle.fileno())
+        if sync:
+            self.pending = 0
+
+    def close(self) -> None:
+        self.flush(sync=self.pending > 0)
+        for handle in (self.segment_file, self.index_file, self.ids_file):
+            handle.close()
+
+
+@dataclass
+class _Stream:
+    """One log as one wolf sees it: the wolf's own inbox, or the pack topic."""
+    name: str
+    log_dir: Path
+    heard_path: Path
+    state: HeardState
+    shared: bool = False
+
+
+class SegmentLogStore(HowlStore):
+    """
+    🐺 Append-only segment log per wolf, plus one shared pack topic.
+
+    Layout of ``<territory>/<wolf>/log/``:
+        00000000.seg     - Howl records, one compact JSON line each
+        index.bin        - Fixed-width entry per howl (see INDEX_ENTRY); the
+                           entry number is the howl's sequence number
+        ids.txt          - "<seq>\\t<howl id>" lines for id lookups
+        heard.json       - Heard watermark plus exceptions (see HeardState)
+        pack_heard.json  - The wolf's position in the pack topic
+        .lock            - Cross-process writer/reader lock
+
+    Pack howls are appended once to the ``_pack`` topic log (same layout,
+    no heard state of its own) and merged into every member's reads by
+    timestamp. A howl to a subset of the pack is stored there once too,
+    flagged FLAG_SUBSET with its ``audience`` in the record; other wolves
+    skip it. A wolf joins the pack the first time it gets a howl (or on
+    ``join``) and sees pack howls from that point on; reading the inbox of
+    a wolf that never joined finds nothing and leaves no trace.
+
+    Heard state lives in small sidecars, so counting unheard howls and
+    marking howls heard never touch the logs themselves.
+
+    Writes are flushed to the OS on every send and fsynced in batches
+    (every ``fsync_batch`` howls or ``fsync_interval`` seconds, and on
+    ``flush``/``close``/exit). Heard howls in sealed segments are dropped
+    by ``compact``.
+
+    Example:
+        store = SegmentLogStore("./pack_messages")
+        queue = MessageQueue("./pack_messages", backend=store)
+    """
+
+    def __init__(
+        self,
+        territory: Union[str, Path],
+        segment_max_bytes: int = 4 * 1024 * 1024,
+        fsync_batch: int = 64,
+        fsync_interval: float = 1.0
+    ):
+        """
+        Initialize segment log store.
+
+        Args:
+            territory: Directory for pack communications
+            segment_max_bytes: Roll to a new segment past this size
+            fsync_batch: Fsync after this many unsynced howls
+            fsync_interval: Fsync when the last sync is older than this (seconds)
+        """
+        self.territory = Path(territory)
+        self.territory.mkdir(parents=True, exist_ok=True)
+        self.segment_max_bytes = segment_max_bytes
+        self.fsync_batch = fsync_batch
+        self.fsync_interval = fsync_interval
+
+        self._writers: Dict[str, _LogWriter] = {}
+        self._ids: Dict[str, Dict[str, int]] = {}
+        self._ids_pos: Dict[str, int] = {}
+        self._ids_inode: Dict[str, int] = {}
+        # Subset howls in the pack topic (seqs in order) and their audiences
+        self._subsets: List[int] = []
+        self._subsets_scanned = 0
+        self._audiences: Dict[int, FrozenSet[str]] = {}
+        self._subsets_guard = threading.Lock()
+        self._last_sync = time.monotonic()
+        _open_stores.add(self)
+
+    def _log_dir(self, wolf_id: str) -> Path:
+        return self.territory / wolf_id / "log"
+
+    def inbox_paths(self, wolf_id: str) -> List[Path]:
+        return [self._log_dir(wolf_id), self._log_dir(PACK_TOPIC)]
+
+    def _lock_path(self, wolf_id: str) -> Path:
+        return self._log_dir(wolf_id) / ".lock"
+
+    @contextmanager
+    def _locked(self, wolf_id: str, shared: bool = True) -> Iterator[None]:
+        """Lock a wolf's log, then (always shared) the pack topic. Always in that order."""
+        with file_lock(self._lock_path(wolf_id), shared=shared):
+            with file_lock(self._lock_path(PACK_TOPIC), shared=True):
+                yield
+
+    @staticmethod
+    def _entry_count(index_path: Path) -> int:
+        try:
+            return index_path.stat().st_size // INDEX_ENTRY.size
+        except FileNotFoundError:
+            return 0
+
+    def _repair_locked(self, wolf_id: str, log_dir: Path) -> int:
+        """
+        Cut a torn append off a wolf's log (caller holds the wolf's exclusive lock).
+
+        The index entry commits a howl: the index is cut to whole entries,
+        the active segment to the end of the last entry, and ids.txt to the
+        lines of committed entries (missing ones are re-added).
+
+        Returns:
+            Number of committed howls
+        """
+        self._finish_rewrite(log_dir)
+        index_path = log_dir / "index.bin"
+        size = _file_size(index_path)
+        rows = size // INDEX_ENTRY.size
+        if size > rows * INDEX_ENTRY.size:
+            os.truncate(index_path, rows * INDEX_ENTRY.size)
+
+        if rows:
+            segment, offset, length = self._read_entry(index_path, rows - 1)[:3]
+            end = offset + length
+        else:
+            segment, end = max(self._max_segment(log_dir), 0), 0
+        segment_path = log_dir / _segment_name(segment)
+        if _file_size(segment_path) > end:
+            os.truncate(segment_path, end)
+
+        ids_path = log_dir / "ids.txt"
+        if self._ids_committed(ids_path, rows):
+            return rows
+
+        # Slow path after a crash: keep the committed lines, re-add the rest
+        data = ids_path.read_bytes() if ids_path.exists() else b""
+        keep, ids_end = set(), 0
+        for line in data[:data.rfind(b"\n") + 1].splitlines(keepends=True):
+            seq = int(line.partition(b"\t")[0])
+            if seq >= rows:
+                break
+            keep.add(seq)
+            ids_end += len(line)
+        if data:
+            os.truncate(ids_path, ids_end)
+        readers: Dict[Any, Any] = {}
+        try:
+            with open(ids_path, "ab") as ids_file:
+                for seq, (segment, offset, length, *_) in self._iter_entries(index_path):
+                    if seq in keep:
+                        continue
+                    record = json.loads(self._read_payload(log_dir, readers, segment, offset, length))
+                    ids_file.write(f"{seq}\t{record['id']}\n".encode("utf-8"))
+        finally:
+            for handle in readers.values():
+                handle.close()
+        self._ids.pop(wolf_id, None)
+        self._ids_pos.pop(wolf_id, None)
+        return rows
+
+    @staticmethod
+    def _ids_committed(ids_path: Path, rows: int) -> bool:
+        """Whether ids.txt ends with a whole line for exactly the last committed entry."""
+        size = _file_size(ids_path)
+        if not rows or not size:
+            return rows == 0 and size == 0
+        with open(ids_path, "rb") as ids_file:
+            ids_file.seek(max(0, size - 512))
+            tail = ids_file.read()
+        if not tail.endswith(b"\n"):
+            return False
+        last = tail[:-1].rsplit(b"\n", 1)[-1]
+        return last.partition(b"\t")[0] == str(rows - 1).encode("ascii")
+
+    @staticmethod
+    def _max_segment(log_dir: Path) -> int:
+        segments = [int(p.stem) for p in log_dir.glob("*.seg") if p.stem.isdigit()]
+        return max(segments, default=-1)
+
+    def _active_segment(self, log_dir: Path) -> int:
+        """The segment of the newest index entry is the one being appended to."""
+        index_path = log_dir / "index.bin"
+        if self._entry_count(index_path) == 0:
+            return max(self._max_segment(log_dir), 0)
+        return self._read_entry(index_path, self._entry_count(index_path) - 1)[0]
+
+    def _writer(self, wolf_id: str, log_dir: Path, segment: int) -> _LogWriter:
+        writer = self._writers.get(wolf_id)
+        if writer is not None and writer.segment == segment:
+            return writer
+        if writer is not None:
+            writer.close()
+        writer = _LogWriter(log_dir, segment)
+        self._writers[wolf_id] = writer
+        return writer
+
+    def _close_writer(self, wolf_id: str) -> None:
+        writer = self._writers.pop(wolf_id, None)
+        if writer is not None:
+            writer.close()
+
+    def _sync(self, writer: _LogWriter) -> None:
+        now = time.monotonic()
+        sync = writer.pending >= self.fsync_batch or now - self._last_sync >= self.fsync_interval
+        writer.flush(sync=sync)
+        if sync:
+            self._last_sync = now
+
+    @staticmethod
+    def _read_entry(index_path: Path, seq: int) -> Tuple[int, int, int, int, int, float]:
+        with open(index_path, "rb") as index:
+            index.seek(seq * INDEX_ENTRY.size)
+            return INDEX_ENTRY.unpack(index.read(INDEX_ENTRY.size))
+
+    @staticmethod
+    def _iter_entries_reversed(
+        index_path: Path,
+        chunk: int = 256
+    ) -> Iterator[Tuple[int, Tuple[int, int, int, int, int, float]]]:
+        """Yield (seq, entry) from newest to oldest, reading the index in chunks."""
+        end = SegmentLogStore._entry_count(index_path)
+        if end == 0:
+            return
+
+        with open(index_path, "rb") as index:
+            while end > 0:
+                start = max(0, end - chunk)
+                index.seek(start * INDEX_ENTRY.size)
+                entries = list(INDEX_ENTRY.iter_unpack(index.read((end - start) * INDEX_ENTRY.size)))
+                for offset in range(len(entries) - 1, -1, -1):
+                    yield start + offset, entries[offset]
+                end = start
+
+    @staticmethod
+    def _iter_entries(
+        index_path: Path,
+        start: int = 0,
+        chunk: int = 256
+    ) -> Iterator[Tuple[int, Tuple[int, int, int, int, int, float]]]:
+        """Yield (seq, entry) from ``start`` to the newest, reading the index in chunks."""
+        if not index_path.exists():
+            return
+
+        with open(index_path, "rb") as index:
+            index.seek(start * INDEX_ENTRY.size)
+            seq = start
+            while True:
+                data = index.read(chunk * INDEX_ENTRY.size)
+                data = data[:len(data) - len(data) % INDEX_ENTRY.size]
+                if not data:
+                    return
+                for entry in INDEX_ENTRY.iter_unpack(data):
+                    yield seq, entry
+                    seq += 1
+
+    def _last_seq_at(self, index_path: Path, timestamp: float, low: int = 0) -> int:
+        """Binary-search the newest entry sent at or before ``timestamp`` (-1 if none)."""
+        high = self._entry_count(index_path)
+        while low < high:
+            middle = (low + high) // 2
+            if self._read_entry(index_path, middle)[5] <= timestamp:
+                low = middle + 1
+            else:
+                high = middle
+        return low - 1
+
+    @staticmethod
+    def _read_payload(
+        log_dir: Path,
+        readers: Dict[Any, Any],
+        segment: int,
+        offset: int,
+        length: int
+    ) -> bytes:
+        key = (log_dir, segment)
+        if key not in readers:
+            readers[key] = open(log_dir / _segment_name(segment), "rb")
+        handle = readers[key]
+        handle.seek(offset)
+        return handle.read(length)
+
+    @staticmethod
+    def _load_heard(heard_path: Path) -> HeardState:
+        """Read a heard state sidecar. Callers hold the owning wolf's lock."""
+        try:
+            data = json.loads(heard_path.read_text())
+            return HeardState(
+                watermark=data["watermark"],
+                heard=set(data["heard"]),
+                start=data.get("start", 0)
+            )
+        except (FileNotFoundError, ValueError, KeyError):
+            return HeardState()
+
+    @staticmethod
+    def _save_heard(heard_path: Path, state: HeardState) -> None:
+        """Atomically replace a heard state sidecar. Callers hold the owning wolf's exclusive lock."""
+        tmp_path = heard_path.with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({
+            "start": state.start,
+            "watermark": state.watermark,
+            "heard": sorted(state.heard)
+        }))
+        os.replace(tmp_path, heard_path)
+
+    def _join_locked(self, wolf_id: str) -> None:
+        """Start a wolf's pack position at the current end of the topic. Caller holds the wolf's lock."""
+        pack_path = self._log_dir(wolf_id) / "pack_heard.json"
+        if pack_path.exists() or wolf_id == PACK_TOPIC:
+            return
+
+        # Logs that predate the pack topic have seen every pack howl
+        if (self._log_dir(wolf_id) / "index.bin").exists():
+            start = 0
+        else:
+            start = self._entry_count(self._log_dir(PACK_TOPIC) / "index.bin")
+        self._save_heard(pack_path, HeardState(watermark=start, start=start))
+
+    def _is_member(self, wolf_id: str) -> bool:
+        log_dir = self._log_dir(wolf_id)
+        return (log_dir / "pack_heard.json").exists() or (log_dir / "index.bin").exists()
+
+    def join(self, wolf_id: str) -> None:
+        """🐺 Add a wolf to the pack: it will hear every pack howl from now on."""
+        if (self._log_dir(wolf_id) / "pack_heard.json").exists():
+            return
+        self._log_dir(wolf_id).mkdir(parents=True, exist_ok=True)
+        with self._locked(wolf_id, shared=False):
+            self._join_locked(wolf_id)
+
+    def _streams(self, wolf_id: str) -> List[_Stream]:
+        """The logs a wolf reads, with its heard state in each. Caller holds ``_locked``."""
+        log_dir = self._log_dir(wolf_id)
+        topic_dir = self._log_dir(PACK_TOPIC)
+        pack_path = log_dir / "pack_heard.json"
+
+        streams = [_Stream(wolf_id, log_dir, log_dir / "heard.json", self._load_heard(log_dir / "heard.json"))]
+        # Logs that predate the pack topic have no pack position yet and
+        # start at its beginning (see _join_locked)
+        if self._is_member(wolf_id) and (topic_dir / "index.bin").exists():
+            streams.append(_Stream(PACK_TOPIC, topic_dir, pack_path, self._load_heard(pack_path), shared=True))
+        return streams
+
+    def _read_record(
+        self,
+        wolf_id: str,
+        stream: _Stream,
+        readers: Dict[Any, Any],
+        entry: Tuple[int, int, int, int, int, float],
+        heard: bool
+    ) -> Optional[Dict[str, Any]]:
+        segment, offset, length = entry[:3]
+        try:
+            data = json.loads(self._read_payload(stream.log_dir, readers, segment, offset, length))
+        except Exception:
+            return None
+        data["heard"] = heard
+        if stream.shared:
+            data.pop("audience", None)
+            data["recipient"] = wolf_id
+        return data
+
+    def _subset_seqs(self) -> List[int]:
+        """Sequence numbers of subset howls in the pack topic, scanning only new index entries."""
+        index_path = self._log_dir(PACK_TOPIC) / "index.bin"
+        with self._subsets_guard:
+            for seq, entry in self._iter_entries(index_path, self._subsets_scanned):
+                if entry[4] & FLAG_SUBSET:
+                    self._subsets.append(seq)
+                self._subsets_scanned = seq + 1
+            return list(self._subsets)
+
+    def _hears(
+        self,
+        wolf_id: str,
+        stream: _Stream,
+        seq: int,
+        entry: Optional[Tuple[int, int, int, int, int, float]] = None
+    ) -> bool:
+        """Whether a howl in one of a wolf's streams is meant for it (reads the entry if not given)."""
+        if not stream.shared:
+            return True
+        audience = self._audiences.get(seq)
+        if audience is None:
+            entry = entry or self._read_entry(stream.log_dir / "index.bin", seq)
+            if not entry[4] & FLAG_SUBSET:
+                return True
+            readers: Dict[Any, Any] = {}
+            try:
+                record = json.loads(self._read_payload(stream.log_dir, readers, *entry[:3]))
+            finally:
+                for handle in readers.values():
+                    handle.close()
+            # Payloads never change, so the audience can be kept
+            audience = self._audiences[seq] = frozenset(record.get("audience", ()))
+        return wolf_id in audience
+
+    def _hidden(self, wolf_id: str, stream: _Stream, total: int) -> List[int]:
+        """Subset howls in the topic from the wolf's watermark on that are not meant for it."""
+        subsets = self._subset_seqs()
+        return [
+            seq for seq in subsets[bisect.bisect_left(subsets, stream.state.watermark):]
+            if seq < total and not self._hears(wolf_id, stream, seq)
+        ]
+
+    def _skip_hidden(self, wolf_id: str, stream: _Stream) -> None:
+        """Move the wolf's pack watermark past subset howls it was never meant to hear."""
+        if not stream.shared:
+            return
+        hidden = set(self._hidden(wolf_id, stream, self._entry_count(stream.log_dir / "index.bin")))
+        while stream.state.watermark in hidden:
+            stream.state.mark(stream.state.watermark)
+
+    def _lookup(self, wolf_id: str, howl_id: str) -> Optional[int]:
+        """Find a howl's sequence number, reading only ids added since the last lookup."""
+        ids_path = self._log_dir(wolf_id) / "ids.txt"
+        try:
+            inode = ids_path.stat().st_ino
+        except FileNotFoundError:
+            return None
+        # A rewritten log (see import_records) renumbers its howls
+        if self._ids_inode.get(wolf_id) != inode:
+            self._ids_inode[wolf_id] = inode
+            self._ids.pop(wolf_id, None)
+            self._ids_pos.pop(wolf_id, None)
+        known = self._ids.setdefault(wolf_id, {})
+        if howl_id in known:
+            return known[howl_id]
+
+        with open(ids_path, "rb") as ids_file:
+            ids_file.seek(self._ids_pos.get(wolf_id, 0))
+            data = ids_file.read()
+
+        complete = data[:data.rfind(b"\n") + 1]
+        self._ids_pos[wolf_id] = self._ids_pos.get(wolf_id, 0) + len(complete)
+        for line in complete.decode("utf-8").splitlines():
+            seq, _, known_id = line.partition("\t")
+            known[known_id] = int(seq)
+
+        return known.get(howl_id)
+
+    def _find(self, streams: List[_Stream], howl_id: str) -> Optional[Tuple[_Stream, int]]:
+        for stream in streams:
+            seq = self._lookup(stream.name, howl_id)
+            if seq is not None and seq >= stream.state.start:
+                return stream, seq
+        return None
+
+    def contains(self, wolf_id: str, howl_id: str) -> bool:
+        """Check whether a howl id is already in a wolf's own log."""
+        return self._lookup(wolf_id, howl_id) is not None
+
+    def append(self, wolf_id: str, record: Dict[str, Any]) -> None:
+        self._append(wolf_id, record)
+
+    def _append(self, wolf_id: str, record: Dict[str, Any], flags: int = 0) -> None:
+        payload = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+        log_dir = self._log_dir(wolf_id)
+        log_dir.mkdir(parents=True, exist_ok=True)
+
+        with file_lock(self._lock_path(wolf_id)):
+            self._append_locked(wolf_id, log_dir, record, payload, flags)
+
+        _notify_appended()
+
+    def _append_locked(
+        self,
+        wolf_id: str,
+        log_dir: Path,
+        record: Dict[str, Any],
+        payload: bytes,
+        flags: int = 0
+    ) -> None:
+        """Append one encoded howl (caller holds the wolf's exclusive lock)."""
+        self._join_locked(wolf_id)
+        seq = self._repair_locked(wolf_id, log_dir)
+
+        segment = self._active_segment(log_dir)
+        writer = self._writer(wolf_id, log_dir, segment)
+        offset = writer.segment_file.seek(0, os.SEEK_END)
+        if offset and offset + len(payload) > self.segment_max_bytes:
+            segment = self._max_segment(log_dir) + 1
+            writer = self._writer(wolf_id, log_dir, segment)
+            offset = 0
+
+        writer.segment_file.write(payload)
+        writer.index_file.write(INDEX_ENTRY.pack(
+            segment,
+            offset,
+            len(payload),
+            int(record.get("urgency", 3)),
+            flags,
+            _epoch(record.get("timestamp"))
+        ))
+        writer.ids_file.write(f"{seq}\t{record['id']}\n".encode("utf-8"))
+        writer.pending += 1
+        self._sync(writer)
+
+        if record.get("heard") and wolf_id != PACK_TOPIC:
+            state = self._load_heard(log_dir / "heard.json")
+            state.mark(seq)
+            self._save_heard(log_dir / "heard.json", state)
+
+    def import_records(self, wolf_id: str, records: List[Dict[str, Any]]) -> int:
+        """
+        🐺 Add howls from elsewhere (e.g. legacy inboxes) in timestamp order.
+
+        Howls whose id is already in the log are skipped. Howls newer than
+        the log's last entry are appended; older ones make the log be
+        rewritten with every entry in timestamp order (heard state kept),
+        since reads and ``mark_heard_up_to`` rely on that order.
+
+        Returns:
+            Number of howls imported
+        """
+        log_dir = self._log_dir(wolf_id)
+        log_dir.mkdir(parents=True, exist_ok=True)
+
+        with file_lock(self._lock_path(wolf_id)):
+            fresh: Dict[str, Dict[str, Any]] = {}
+            for record in records:
+                if "id" in record and record["id"] not in fresh and not self.contains(wolf_id, record["id"]):
+                    fresh[record["id"]] = record
+            # Stable sort: same-instant howls keep the order they were given in
+            ordered = sorted(fresh.values(), key=lambda record: _epoch(record.get("timestamp")))
+            if not ordered:
+                return 0
+
+            self._join_locked(wolf_id)
+            rows = self._repair_locked(wolf_id, log_dir)
+            last = self._read_entry(log_dir / "index.bin", rows - 1)[5] if rows else float("-inf")
+            if _epoch(ordered[0].get("timestamp")) >= last:
+                for record in ordered:
+                    payload = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+                    self._append_locked(wolf_id, log_dir, record, payload)
+            else:
+                self._rewrite_locked(wolf_id, log_dir, ordered)
+            self.flush()
+
+        _notify_appended()
+        return len(ordered)
+
+    def _rewrite_locked(self, wolf_id: str, log_dir: Path, records: List[Dict[str, Any]]) -> None:
+        """
+        Rewrite a wolf's log with ``records`` merged in by timestamp (caller
+        holds the wolf's exclusive lock).
+
+        Howls go to fresh segments; index.bin, ids.txt and heard.json are
+        written as ``*.new`` files and swapped in, index first (the commit
+        point, see ``_finish_rewrite``). Dropped entries are left out.
+        """
+        self._close_writer(wolf_id)
+        index_path = log_dir / "index.bin"
+        state = self._load_heard(log_dir / "heard.json")
+        old_segments = list(log_dir.glob("*.seg"))
+
+        # (timestamp, order, payload, urgency, heard, id); existing howls first on ties
+        merged: List[Tuple[float, int, bytes, int, bool, str]] = []
+        readers: Dict[Any, Any] = {}
+        try:
+            for seq, (segment, offset, length, urgency, flags, ts) in self._iter_entries(index_path):
+                if flags & FLAG_DROPPED:
+                    continue
+                payload = self._read_payload(log_dir, readers, segment, offset, length)
+                merged.append((ts, len(merged), payload, urgency, state.is_heard(seq), json.loads(payload)["id"]))
+        finally:
+            for handle in readers.values():
+                handle.close()
+        for record in records:
+            payload = (json.dumps(record, separators=(",", ":")) + "\n").encode("utf-8")
+            merged.append((
+                _epoch(record.get("timestamp")), len(merged), payload,
+                int(record.get("urgency", 3)), bool(record.get("heard")), record["id"]
+            ))
+        merged.sort(key=lambda howl: howl[:2])
+
+        segment = self._max_segment(log_dir) + 1
+        out = open(log_dir / _segment_name(segment), "wb")
+        new_state = HeardState()
+        try:
+            with open(log_dir / "index.bin.new", "wb") as index, open(log_dir / "ids.txt.new", "wb") as ids:
+                for seq, (ts, _, payload, urgency, heard, howl_id) in enumerate(merged):
+                    if out.tell() and out.tell() + len(payload) > self.segment_max_bytes:
+                        out.flush()
+                        os.fsync(out.fileno())
+                        out.close()
+                        segment += 1
+                        out = open(log_dir / _segment_name(segment), "wb")
+                    index.write(INDEX_ENTRY.pack(segment, out.tell(), len(payload), urgency, 0, ts))
+                    ids.write(f"{seq}\t{howl_id}\n".encode("utf-8"))
+                    out.write(payload)
+                    if heard:
+                        new_state.mark(seq)
+                for handle in (index, ids, out):
+                    handle.flush()
+                    os.fsync(handle.fileno())
+        finally:
+            out.close()
+        self._save_heard(log_dir / "heard.json.new", new_state)
+
+        os.replace(log_dir / "index.bin.new", index_path)
+        self._finish_rewrite(log_dir)
+        for old_path in old_segments:
+            old_path.unlink()
+
+    @staticmethod
+    def _finish_rewrite(log_dir: Path) -> None:
+        """
+        Settle an interrupted rewrite: before the new index was swapped in
+        it is rolled back, after that rolled forward.
+        """
+        pending = [log_dir / name for name in ("index.bin.new", "ids.txt.new", "heard.json.new")]
+        if pending[0].exists():
+            for path in pending:
+                path.unlink(missing_ok=True)
+            return
+        for path in pending[1:]:
+            if path.exists():
+                os.replace(path, path.with_suffix(""))
+
+    def broadcast(self, record: Dict[str, Any], pack: Optional[List[str]] = None) -> None:
+        """
+        🐺 Store a pack howl once in the pack topic.
+
+        Wolves listed in ``pack`` are joined first so they hear it. If they
+        are not the whole pack the howl carries them as its audience and
+        every other wolf skips it.
+        """
+        if pack is None:
+            self.append(PACK_TOPIC, record)
+            return
+        for wolf_id in pack:
+            self.join(wolf_id)
+        if set(pack) >= set(self.wolves()):
+            self.append(PACK_TOPIC, record)
+        else:
+            self._append(PACK_TOPIC, {**record, "audience": sorted(set(pack))}, FLAG_SUBSET)
+
+    def read(
+        self,
+        wolf_id: str,
+        unheard_only: bool = False,
+        limit: Optional[int] = 50
+    ) -> List[Dict[str, Any]]:
+        if not self._is_member(wolf_id):
+            return []
+
+        def walk(position: int, stream: _Stream) -> Iterator[Tuple[float, int, int, Any, bool]]:
+            state = stream.state
+            for seq, entry in self._iter_entries_reversed(stream.log_dir / "index.bin"):
+                if seq < state.start or (unheard_only and seq < state.watermark):
+                    return
+                if entry[4] & FLAG_DROPPED or not self._hears(wolf_id, stream, seq, entry):
+                    continue
+                heard = state.is_heard(seq)
+                if unheard_only and heard:
+                    continue
+                yield -entry[5], position, seq, entry, heard
+
+        records: List[Dict[str, Any]] = []
+        readers: Dict[Any, Any] = {}
+        with self._locked(wolf_id):
+            streams = self._streams(wolf_id)
+            try:
+                for _, position, _, entry, heard in heapq.merge(*(walk(i, s) for i, s in enumerate(streams))):
+                    if limit is not None and len(records) >= limit:
+                        break
+                    data = self._read_record(wolf_id, streams[position], readers, entry, heard)
+                    if data is not None:
+                        records.append(data)
+            finally:
+                for handle in readers.values():
+                    handle.close()
+
+        return records
+
+    def next_unheard(self, wolf_id: str, limit: int = 10) -> List[Dict[str, Any]]:
+        """Read the oldest unheard howls, starting at each log's heard watermark."""
+        if not self._is_member(wolf_id):
+            return []
+
+        def walk(position: int, stream: _Stream) -> Iterator[Tuple[float, int, int, Any]]:
+            for seq, entry in self._iter_entries(stream.log_dir / "index.bin", stream.state.watermark):
+                if (
+                    not entry[4] & FLAG_DROPPED
+                    and seq not in stream.state.heard
+                    and self._hears(wolf_id, stream, seq, entry)
+                ):
+                    yield entry[5], position, seq, entry
+
+        records: List[Dict[str, Any]] = []
+        readers: Dict[Any, Any] = {}
+        with self._locked(wolf_id):
+            streams = self._streams(wolf_id)
+            try:
+                for _, position, _, entry in heapq.merge(*(walk(i, s) for i, s in enumerate(streams))):
+                    if len(records) >= limit:
+                        break
+                    data = self._read_record(wolf_id, streams[position], readers, entry, False)
+                    if data is not None:
+                        records.append(data)
+            finally:
+                for handle in readers.values():
+                    handle.close()
+
+        return records
+
+    def next_by_urgency(
+        self,
+        wolf_id: str,
+        max_urgency: int = 4,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """Pick the most urgent unheard howls from the indexes, reading only their payloads."""
+        if not self._is_member(wolf_id):
+            return []
+        with self._locked(wolf_id):
+            return [data for _, _, data in self._pick_locked(wolf_id, self._streams(wolf_id), max_urgency, limit)]
+
+    def take_by_urgency(
+        self,
+        wolf_id: str,
+        max_urgency: int = 4,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        🐺 Pick the most urgent unheard howls and mark them heard, under one lock.
+
+        Concurrent receivers of the same wolf never get the same howl, and
+        each heard file is written once per call.
+        """
+        if not self._is_member(wolf_id):
+            return []
+        with self._locked(wolf_id, shared=False):
+            picked = self._pick_locked(wolf_id, self._streams(wolf_id), max_urgency, limit)
+            changed: List[_Stream] = []
+            for stream, seq, _ in picked:
+                if stream.state.mark(seq) and not any(stream is other for other in changed):
+                    changed.append(stream)
+            for stream in changed:
+                self._skip_hidden(wolf_id, stream)
+                self._save_heard(stream.heard_path, stream.state)
+        return [data for _, _, data in picked]
+
+    def _pick_locked(
+        self,
+        wolf_id: str,
+        streams: List[_Stream],
+        max_urgency: int,
+        limit: int
+    ) -> List[Tuple[_Stream, int, Dict[str, Any]]]:
+        """The most urgent (then oldest) unheard howls as (stream, seq, record). Caller holds ``_locked``."""
+        picked: List[Tuple[_Stream, int, Dict[str, Any]]] = []
+        readers: Dict[Any, Any] = {}
+        candidates = (
+            (entry[3], entry[5], position, seq, entry)
+            for position, stream in enumerate(streams)
+            for seq, entry in self._iter_entries(stream.log_dir / "index.bin", stream.state.watermark)
+            if entry[3] <= max_urgency and not entry[4] & FLAG_DROPPED and seq not in stream.state.heard
+            and self._hears(wolf_id, stream, seq, entry)
+        )
+        try:
+            for _, _, position, seq, entry in heapq.nsmallest(limit, candidates):
+                data = self._read_record(wolf_id, streams[position], readers, entry, False)
+                if data is not None:
+                    picked.append((streams[position], seq, data))
+        finally:
+            for handle in readers.values():
+                handle.close()
+        return picked
+
+    def mark_heard(self, wolf_id: str, howl_id: str) -> bool:
+        if not self._is_member(wolf_id):
+            return False
+        with self._locked(wolf_id, shared=False):
+            found = self._find(self._streams(wolf_id), howl_id)
+            if found is None:
+                return False
+            stream, seq = found
+            if not self._hears(wolf_id, stream, seq):
+                return False
+            if stream.state.mark(seq):
+                self._skip_hidden(wolf_id, stream)
+                self._save_heard(stream.heard_path, stream.state)
+        return True
+
+    def mark_heard_up_to(self, wolf_id: str, howl_id: str) -> bool:
+        if not self._is_member(wolf_id):
+            return False
+        with self._locked(wolf_id, shared=False):
+            streams = self._streams(wolf_id)
+            found = self._find(streams, howl_id)
+            if found is None:
+                return False
+
+            owner, seq = found
+            entry = self._read_entry(owner.log_dir / "index.bin", seq)
+            if not self._hears(wolf_id, owner, seq, entry):
+                return False
+            timestamp = entry[5]
+            for stream in streams:
+                if stream is owner:
+                    through = seq
+                else:
+                    through = self._last_seq_at(stream.log_dir / "index.bin", timestamp, stream.state.start)
+                if through >= stream.state.watermark:
+                    stream.state.mark_through(through)
+                    self._skip_hidden(wolf_id, stream)
+                    self._save_heard(stream.heard_path, stream.state)
+        return True
+
+    def count_unheard(self, wolf_id: str) -> int:
+        if not self._is_member(wolf_id):
+            return 0
+        with self._locked(wolf_id):
+            count = 0
+            for stream in self._streams(wolf_id):
+                total = self._entry_count(stream.log_dir / "index.bin")
+                count += stream.state.unheard(total)
+                if stream.shared:
+                    count -= len(self._hidden(wolf_id, stream, total))
+            return count
+
+    def wolves(self) -> List[str]:
+        return sorted(
+            d.name for d in self.territory.iterdir()
+            if d.name != PACK_TOPIC and (
+                (d / "log" / "index.bin").exists() or (d / "log" / "pack_heard.json").exists()
+            )
+        )
+
+    def compact(self, wolf_id: str) -> Dict[str, int]:
+        """
+        🐺 Drop heard howls from sealed segments.
+
+        Live howls of every sealed segment that holds at least one heard howl
+        are copied into a fresh segment and their index entries repointed;
+        heard entries are marked dropped. Sequence numbers never change.
+        The active segment is left alone.
+
+        Pass ``PACK_TOPIC`` to compact the pack topic; there a howl counts
+        as heard once every member's watermark has passed it.
+
+        Args:
+            wolf_id: Wolf whose log to compact
+
+        Returns:
+            Counts of segments removed, howls dropped and bytes reclaimed
+        """
+        if wolf_id == PACK_TOPIC:
+            with file_lock(self._lock_path(PACK_TOPIC)):
+                watermarks = [
+                    self._load_heard(self._log_dir(member) / "pack_heard.json").watermark
+                    for member in self.wolves()
+                ]
+                floor = min(watermarks, default=0)
+                return self._compact_locked(PACK_TOPIC, lambda seq: seq < floor)
+
+        with file_lock(self._lock_path(wolf_id)):
+            state = self._load_heard(self._log_dir(wolf_id) / "heard.json")
+            return self._compact_locked(wolf_id, state.is_heard)
+
+    def _compact_locked(self, wolf_id: str, is_heard: Callable[[int], bool]) -> Dict[str, int]:
+        stats = super().compact(wolf_id)
+        log_dir = self._log_dir(wolf_id)
+        index_path = log_dir / "index.bin"
+        if self._entry_count(index_path) == 0:
+            return stats
+
+        self._close_writer(wolf_id)
+        with open(index_path, "r+b") as index:
+            entries = list(INDEX_ENTRY.iter_unpack(index.read()))
+            active = entries[-1][0]
+            stale = {
+                segment for seq, (segment, _, _, _, flags, _) in enumerate(entries)
+                if segment != active and is_heard(seq) and not flags & FLAG_DROPPED
+            }
+            if not stale:
+                return stats
+
+            new_segment = self._max_segment(log_dir) + 1
+            new_path = log_dir / _segment_name(new_segment)
+            updates = []
+            readers: Dict[Any, Any] = {}
+            try:
+                with open(new_path, "wb") as out:
+                    for seq, (segment, offset, length, urgency, flags, ts) in enumerate(entries):
+                        if segment not in stale or flags & FLAG_DROPPED:
+                            continue
+                        if is_heard(seq):
+                            updates.append((seq, (segment, offset, length, urgency, flags | FLAG_DROPPED, ts)))
+                            stats["howls_dropped"] += 1
+                            continue
+                        data = self._read_payload(log_dir, readers, segment, offset, length)
+                        updates.append((seq, (new_segment, out.tell(), length, urgency, flags, ts)))
+                        out.write(data)
+                    out.flush()
+                    os.fsync(out.fileno())
+            finally:
+                for handle in readers.values():
+                    handle.close()
+
+            for seq, entry in updates:
+                index.seek(seq * INDEX_ENTRY.size)
+                index.write(INDEX_ENTRY.pack(*entry))
+            index.flush()
+            os.fsync(index.fileno())
+
+        reclaimed = -new_path.stat().st_size
+        for segment in stale:
+            old_path = log_dir / _segment_name(segment)
+            reclaimed += old_path.stat().st_size
+            old_path.unlink()
+            stats["segments_removed"] += 1
+        stats["bytes_reclaimed"] = reclaimed
+
+        return stats
+
+    def flush(self) -> None:
+        for writer in list(self._writers.values()):
+            writer.flush(sync=True)
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        for wolf_id in list(self._writers):
+            self._close_writer(wolf_id)
+
+
+BACKENDS = {
+    "segments": SegmentLogStore,
+    "files": FileHowlStore,
+}
+
+
+def make_store(territory: Union[str, Path], backend: Union[str, HowlStore] = "segments") -> HowlStore:
+    """
+    Resolve a backend name (or pass through a ready store).
+
+    Opening a segment store on a territory whose legacy per-file inboxes
+    hold howls it does not have warns: those howls stay hidden from it
+    until ``swarm migrate-messages`` imports them. Territories the
+    migrator has run on (MIGRATED_MARKER) are not scanned again.
+    """
+    if isinstance(backend, HowlStore):
+        return backend
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown howl store backend: {backend} (expected one of {sorted(BACKENDS)})")
+    store = BACKENDS[backend](territory)
+    if isinstance(store, SegmentLogStore) and _has_unmigrated_howls(territory, store):
+        warnings.warn(
+            f"{territory} has legacy per-file howls not yet migrated; run 'swarm migrate-messages' to import them",
+            stacklevel=2
+        )
+    return store
+
+
+def _has_unmigrated_howls(territory: Union[str, Path], store: SegmentLogStore) -> bool:
+    """Whether any legacy per-file howl is missing from a segment store."""
+    territory = Path(territory)
+    if (territory / MIGRATED_MARKER).exists() or not any(territory.glob("*/incoming")):
+        return False
+    return any(
+        not store.contains(howl_file.parent.parent.name, howl_file.stem)
+        for howl_file in territory.glob("*/incoming/*.json")
+    )
+
+
+def migrate_file_inboxes(
+    territory: Union[str, Path],
+    target: Optional[SegmentLogStore] = None,
+    remove_source: bool = False
+) -> Dict[str, int]:
+    """
+    🐺 One-shot import of legacy per-file inboxes into a segment log.
+
+    Howls are imported in timestamp order, merged with any howls the
+    target already holds (see ``SegmentLogStore.import_records``). Howls
+    already present in the target (by id) are skipped, so an interrupted
+    migration can simply be run again.
+
+    Args:
+        territory: Territory holding ``<wolf>/incoming/*.json`` inboxes
+        target: Store to import into (defaults to a SegmentLogStore on the
+            same territory)
+        remove_source: Delete each JSON file once its howl is durable
+
+    Afterwards the territory is marked as migrated, so ``make_store``
+    stops scanning its legacy inboxes.
+
+    Returns:
+        Number of howls imported per wolf
+    """
+    source = FileHowlStore(territory)
+    target = target or SegmentLogStore(territory)
+    migrated: Dict[str, int] = {}
+
+    for wolf_id in source.wolves():
+        howl_files, records = [], []
+        for howl_file, record in source.iter_files(wolf_id):
+            howl_files.append(howl_file)
+            records.append(record)
+
+        migrated[wolf_id] = target.import_records(wolf_id, records)
+        if remove_source:
+            for howl_file in howl_files:
+                howl_file.unlink()
+
+    (Path(territory) / MIGRATED_MARKER).write_text(datetime.now().isoformat())
+    return migrated
@@ -0,0 +1,334 @@
+"""
+Knowledge DB - Single-file SQLite storage for pack knowledge.
+
+🐺 One den, one scent trail - shared safely by the whole pack.
+
+Optional storage engine for PackMemory and SwarmBrain
+(``backend="sqlite"``). Everything lives in one SQLite database in WAL
+mode, so several MCP server processes can read while one writes:
+
+    entries      - Lore / learnings (id, author, category, title, body,
+                   tags, timestamp, votes, metadata)
+    entries_fts  - FTS5 index over title, body and tags, ranked with BM25
+    records      - Hunt records / decisions
+    notes        - Per-agent notes, appended one row at a time
+    tallies      - Trigger-maintained counts, so stats never scan tables
+
+Text goes into FTS5 already split by ``knowledge_index.tokenize`` so both
+backends agree on what matches.
+"""
+
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Union
+
+from .knowledge_index import tokenize
+
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    id TEXT PRIMARY KEY,
+    author TEXT NOT NULL,
+    category TEXT NOT NULL,
+    title TEXT NOT NULL,
+    body TEXT NOT NULL,
+    tags TEXT NOT NULL DEFAULT '[]',
+    timestamp TEXT NOT NULL,
+    votes INTEGER NOT NULL DEFAULT 0,
+    metadata TEXT NOT NULL DEFAULT '{}'
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS entries_fts USING fts5(title, body, tags);
+
+CREATE TABLE IF NOT EXISTS records (
+    id TEXT PRIMARY KEY,
+    author TEXT NOT NULL,
+    decision TEXT NOT NULL,
+    context TEXT NOT NULL,
+    outcome TEXT,
+    success INTEGER,
+    timestamp TEXT NOT NULL,
+    lessons TEXT NOT NULL DEFAULT '[]'
+);
+
+CREATE TABLE IF NOT EXISTS notes (
+    author TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    content TEXT NOT NULL,
+    type TEXT NOT NULL,
+    timestamp TEXT NOT NULL,
+    PRIMARY KEY (author, seq)
+);
+
+CREATE TABLE IF NOT EXISTS tallies (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (kind, key)
+);
+
+CREATE TRIGGER IF NOT EXISTS entries_tally AFTER INSERT ON entries BEGIN
+    INSERT INTO tallies (kind, key, count) VALUES ('category', NEW.category, 1)
+    ON CONFLICT (kind, key) DO UPDATE SET count = count + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS records_tally AFTER INSERT ON records BEGIN
+    INSERT INTO tallies (kind, key, count) VALUES ('author', NEW.author, 1)
+    ON CONFLICT (kind, key) DO UPDATE SET count = count + 1;
+END;
+"""
+
+# bm25() column weights for title, body, tags
+FTS_WEIGHTS = (2.0, 1.0, 2.0)
+
+
+class KnowledgeDB:
+    """
+    🐺 SQLite (WAL) knowledge store with FTS5 search.
+
+    Each thread gets its own connection; writes run in ``BEGIN IMMEDIATE``
+    transactions and wait on ``busy_timeout`` instead of failing when
+    another process holds the write lock.
+
+    Example:
+        db = KnowledgeDB("./pack_memory/pack_memory.db")
+        db.add_entry({"id": "lore_1", "author": "scout-1", ...})
+        rows = db.search("circular import", limit=5)
+    """
+
+    def __init__(self, path: Union[str, Path], busy_timeout_ms: int = 5000):
+        """
+        Initialize knowledge database.
+
+        Args:
+            path: Database file (created if missing)
+            busy_timeout_ms: How long writers wait for the lock
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.busy_timeout_ms = busy_timeout_ms
+        self._local = threading.local()
+
+        # executescript() commits first, so the transaction is in the script
+        self._conn().executescript(f"BEGIN IMMEDIATE;\n{SCHEMA}\nCOMMIT;")
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Run a block in one write transaction."""
+        conn = self._conn()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    @staticmethod
+    def _insert_entry(conn: sqlite3.Connection, entry: Dict[str, Any]) -> bool:
+        tags = entry.get("tags", [])
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO entries (id, author, category, title, body, tags, timestamp, votes, metadata) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                entry["id"],
+                entry["author"],
+                entry["category"],
+                entry["title"],
+                entry["body"],
+                json.dumps(tags),
+                entry["timestamp"],
+                entry.get("votes", 0),
+                json.dumps(entry.get("metadata", {}))
+            )
+        )
+        if not cursor.rowcount:
+            return False
+        conn.execute(
+            "INSERT INTO entries_fts (rowid, title, body, tags) VALUES (?, ?, ?, ?)",
+            (
+                cursor.lastrowid,
+                " ".join(tokenize(entry["title"])),
+                " ".join(tokenize(entry["body"])),
+                " ".join(tokenize(" ".join(tags)))
+            )
+        )
+        return True
+
+    @staticmethod
+    def _insert_record(conn: sqlite3.Connection, record: Dict[str, Any]) -> bool:
+        success = record.get("success")
+        cursor = conn.execute(
+            "INSERT OR IGNORE INTO records (id, author, decision, context, outcome, success, timestamp, lessons) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                record["id"],
+                record["author"],
+                record["decision"],
+                record["context"],
+                record.get("outcome"),
+                None if success is None else int(success),
+                record["timestamp"],
+                json.dumps(record.get("lessons", []))
+            )
+        )
+        return bool(cursor.rowcount)
+
+    def add_entry(self, entry: Dict[str, Any]) -> None:
+        """Store a lore entry / learning (ignored if the id exists)."""
+        with self._write() as conn:
+            self._insert_entry(conn, entry)
+
+    def add_record(self, record: Dict[str, Any]) -> None:
+        """Store a hunt record / decision (ignored if the id exists)."""
+        with self._write() as conn:
+            self._insert_record(conn, record)
+
+    def search(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        limit: int = 10
+    ) -> List[Dict[str, Any]]:
+        """
+        🐺 Full-text search, best BM25 match first.
+
+        Args:
+            query: Search query (any term may match)
+            category: Optional category filter
+            limit: Max results
+
+        Returns:
+            Entry dicts
+        """
+        terms = sorted(set(tokenize(query)))
+        if not terms:
+            return []
+
+        sql = (
+            "SELECT e.* FROM entries_fts JOIN entries e ON e.rowid = entries_fts.rowid "
+            "WHERE entries_fts MATCH ?"
+        )
+        params: List[Any] = [" OR ".join(f'"{term}"' for term in terms)]
+        if category:
+            sql += " AND e.category = ?"
+            params.append(category)
+        sql += " ORDER BY bm25(entries_fts, ?, ?, ?) LIMIT ?"
+        params.extend(FTS_WEIGHTS)
+        params.append(limit)
+
+        return [self._entry_dict(row) for row in self._conn().execute(sql, params)]
+
+    @staticmethod
+    def _entry_dict(row: sqlite3.Row) -> Dict[str, Any]:
+        entry = dict(row)
+        entry["tags"] = json.loads(entry["tags"])
+        entry["metadata"] = json.loads(entry["metadata"])
+        return entry
+
+    def add_note(self, author: str, content: str, note_type: str, timestamp: str) -> Dict[str, Any]:
+        """Append a note; its id is ``note_<n>`` for the author's n-th note."""
+        with self._write() as conn:
+            seq = conn.execute(
+                "SELECT COALESCE(MAX(seq), 0) + 1 FROM notes WHERE author = ?", (author,)
+            ).fetchone()[0]
+            conn.execute(
+                "INSERT INTO notes (author, seq, content, type, timestamp) VALUES (?, ?, ?, ?, ?)",
+                (author, seq, content, note_type, timestamp)
+            )
+        return {"id": f"note_{seq}", "content": content, "type": note_type, "timestamp": timestamp}
+
+    def get_notes(self, author: str) -> List[Dict[str, Any]]:
+        """All notes for an author, oldest first."""
+        rows = self._conn().execute(
+            "SELECT seq, content, type, timestamp FROM notes WHERE author = ? ORDER BY seq", (author,)
+        )
+        return [
+            {"id": f"note_{row['seq']}", "content": row["content"], "type": row["type"], "timestamp": row["timestamp"]}
+            for row in rows
+        ]
+
+    def stats(self) -> Dict[str, Any]:
+        """Counts from the tallies table (no table scans)."""
+        categories: Dict[str, int] = {}
+        authors: Dict[str, int] = {}
+        for row in self._conn().execute("SELECT kind, key, count FROM tallies"):
+            (categories if row["kind"] == "category" else authors)[row["key"]] = row["count"]
+        return {
+            "entries": sum(categories.values()),
+            "records": sum(authors.values()),
+            "categories": sorted(categories),
+            "record_authors": sorted(authors)
+        }
+
+    def bulk_import(
+        self,
+        entries: Iterable[Dict[str, Any]] = (),
+        records: Iterable[Dict[str, Any]] = (),
+        notes: Iterable[Dict[str, Any]] = ()
+    ) -> Dict[str, int]:
+        """
+        Import many rows in one transaction. Entries and records whose id
+        already exists are skipped, so an import can be re-run.
+
+        Args:
+            entries: Entry dicts (as for add_entry)
+            records: Record dicts (as for add_record)
+            notes: Dicts with author, seq, content, type, timestamp
+
+        Returns:
+            Rows imported per table
+        """
+        counts = {"entries": 0, "records": 0, "notes": 0}
+        with self._write() as conn:
+            for entry in entries:
+                counts["entries"] += self._insert_entry(conn, entry)
+            for record in records:
+                counts["records"] += self._insert_record(conn, record)
+            for note in notes:
+                cursor = conn.execute(
+                    "INSERT OR IGNORE INTO notes (author, seq, content, type, timestamp) VALUES (?, ?, ?, ?, ?)",
+                    (note["author"], note["seq"], note["content"], note["type"], note["timestamp"])
+                )
+                counts["notes"] += cursor.rowcount
+        return counts
+
+
+def read_note_files(notes_dir: Path) -> Iterator[Dict[str, Any]]:
+    """Yield notes from a ``notes/<author>.json`` directory as import rows."""
+    for notes_file in Path(notes_dir).glob("*.json"):
+        try:
+            notes = json.loads(notes_file.read_text())
+        except Exception:
+            continue
+        for seq, note in enumerate(notes, 1):
+            yield {
+                "author": notes_file.stem,
+                "seq": seq,
+                "content": note.get("content", ""),
+                "type": note.get("type", "general"),
+                "timestamp": note.get("timestamp", "")
+            }
@@ -0,0 +1,251 @@
+"""
+Knowledge Index - Ranked search over the pack's shared knowledge.
+
+🐺 A good nose finds the freshest trail first.
+
+An inverted index (term -> documents) with BM25 scoring, shared by
+PackMemory.recall and SwarmBrain.search. The index is an append-only
+postings log next to the JSON files it covers:
+
+    <den>/index/postings.log - One JSON line per document: id, category,
+                               path, token count and term frequencies
+    <den>/index/.lock        - Serializes appends and rebuilds
+
+Every process keeps the postings in memory and reads only the lines
+appended since its last look, so a search never walks the JSON files.
+The log can always be rebuilt from those files.
+"""
+
+import heapq
+import json
+import math
+import os
+import re
+from collections import Counter, defaultdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
+
+from .locking import file_lock
+
+
+_WORD = re.compile(r"[^\W_]+")
+_CAMEL_PART = re.compile(r"[A-Z]?[a-z]+|[A-Z]+(?![a-z])|\d+")
+
+# Title and tag tokens count this many times toward term frequency
+FIELD_BOOST = 2
+
+
+def tokenize(text: str) -> List[str]:
+    """
+    Split text into lowercase search terms.
+
+    camelCase / PascalCase words are split ("ImportError" -> "import",
+    "error") and simple plurals are folded ("imports" -> "import").
+    """
+    tokens = []
+    for word in _WORD.findall(text):
+        for part in _CAMEL_PART.findall(word) or [word]:
+            token = part.lower()
+            if len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+                token = token[:-1]
+            tokens.append(token)
+    return tokens
+
+
+def term_frequencies(title: str, body: str, tags: List[str]) -> Counter:
+    """Term frequencies for a document, with title and tags boosted."""
+    counts = Counter(tokenize(body))
+    for token in tokenize(title) + tokenize(" ".join(tags)):
+        counts[token] += FIELD_BOOST
+    return counts
+
+
+class KnowledgeIndex:
+    """
+    🐺 BM25 inverted index over knowledge documents.
+
+    Example:
+        index = KnowledgeIndex("./pack_memory/index")
+        index.add("lore_1", "debugging", "lore/debugging/lore_1.json",
+                  title="Circular imports", body="Check the import graph...")
+
+        for doc_id, score, path in index.search("circular import", limit=5):
+            ...
+    """
+
+    def __init__(self, index_dir: Union[str, Path], k1: float = 1.5, b: float = 0.75):
+        """
+        Initialize knowledge index.
+
+        Args:
+            index_dir: Directory holding the postings log
+            k1: BM25 term-frequency saturation
+            b: BM25 document-length normalization
+        """
+        self.index_dir = Path(index_dir)
+        self.index_dir.mkdir(parents=True, exist_ok=True)
+        self.postings_path = self.index_dir / "postings.log"
+        self.k1 = k1
+        self.b = b
+
+        self._reset()
+
+    def _reset(self) -> None:
+        self._postings: Dict[str, Dict[str, int]] = defaultdict(dict)
+        self._docs: Dict[str, Tuple[str, str, int]] = {}
+        self._total_length = 0
+        self._pos = 0
+        self._inode: Optional[int] = None
+
+    def exists(self) -> bool:
+        """Whether a postings log has been written."""
+        return self.postings_path.exists()
+
+    def __len__(self) -> int:
+        self.refresh()
+        return len(self._docs)
+
+    def _apply(self, entry: Dict[str, Any]) -> None:
+        doc_id = entry["id"]
+        if doc_id in self._docs:
+            return
+        self._docs[doc_id] = (entry["category"], entry["path"], entry["len"])
+        self._total_length += entry["len"]
+        for term, tf in entry["tf"].items():
+            self._postings[term][doc_id] = tf
+
+    def refresh(self) -> None:
+        """Pick up documents indexed since the last look (by any process)."""
+        try:
+            stat = self.postings_path.stat()
+        except FileNotFoundError:
+            if self._docs:
+                self._reset()
+            return
+
+        # Rebuilt (replaced) or truncated: start over
+        if stat.st_ino != self._inode or stat.st_size < self._pos:
+            self._reset()
+            self._inode = stat.st_ino
+        if stat.st_size == self._pos:
+            return
+
+        with open(self.postings_path, "rb") as postings:
+            postings.seek(self._pos)
+            data = postings.read()
+
+        complete = data[:data.rfind(b"\n") + 1]
+        self._pos += len(complete)
+        for line in complete.decode("utf-8").splitlines():
+            try:
+                self._apply(json.loads(line))
+            except (ValueError, KeyError):
+                pass
+
+    @staticmethod
+    def _entry(
+        doc_id: str,
+        category: str,
+        path: str,
+        title: str,
+        body: str,
+        tags: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        tf = term_frequencies(title, body, tags or [])
+        return {
+            "id": doc_id,
+            "category": category,
+            "path": path,
+            "len": sum(tf.values()),
+            "tf": dict(tf)
+        }
+
+    def add(
+        self,
+        doc_id: str,
+        category: str,
+        path: str,
+        title: str,
+        body: str,
+        tags: Optional[List[str]] = None
+    ) -> None:
+        """
+        Index one document.
+
+        Args:
+            doc_id: Document ID
+            category: Category (for filtered searches)
+            path: Where the document lives, relative to the den
+            title: Title text (boosted)
+            body: Body text
+            tags: Tags (boosted)
+        """
+        line = json.dumps(self._entry(doc_id, category, path, title, body, tags), separators=(",", ":"))
+        with file_lock(self.index_dir / ".lock"):
+            with open(self.postings_path, "ab") as postings:
+                postings.write(line.encode("utf-8") + b"\n")
+        self.refresh()
+
+    def rebuild(self, documents: Iterable[Dict[str, Any]]) -> int:
+        """
+        Replace the index with the given documents.
+
+        Args:
+            documents: Dicts with doc_id, category, path, title, body, tags
+
+        Returns:
+            Number of documents indexed
+        """
+        tmp_path = self.index_dir / "postings.log.tmp"
+        count = 0
+        with file_lock(self.index_dir / ".lock"):
+            with open(tmp_path, "wb") as postings:
+                for doc in documents:
+                    entry = self._entry(**doc)
+                    postings.write(json.dumps(entry, separators=(",", ":")).encode("utf-8") + b"\n")
+                    count += 1
+            os.replace(tmp_path, self.postings_path)
+
+        self._reset()
+        self.refresh()
+        return count
+
+    def search(
+        self,
+        query: str,
+        category: Optional[str] = None,
+        limit: int = 10
+    ) -> List[Tuple[str, float, str]]:
+        """
+        🐺 Rank documents against a query with BM25.
+
+        Args:
+            query: Search query
+            category: Optional category filter
+            limit: Max results
+
+        Returns:
+            (doc_id, score, path) tuples, best first
+        """
+        self.refresh()
+        if not self._docs:
+            return []
+
+        total = len(self._docs)
+        average_length = self._total_length / total or 1
+        scores: Dict[str, float] = defaultdict(float)
+
+        for term in set(tokenize(query)):
+            postings = self._postings.get(term)
+            if not postings:
+                continue
+            idf = math.log(1 + (total - len(postings) + 0.5) / (len(postings) + 0.5))
+            for doc_id, tf in postings.items():
+                doc_category, _, length = self._docs[doc_id]
+                if category and doc_category != category:
+                    continue
+                norm = self.k1 * (1 - self.b + self.b * length / average_length)
+                scores[doc_id] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [(doc_id, score, self._docs[doc_id][1]) for doc_id, score in best]
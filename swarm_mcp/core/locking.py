@@ -0,0 +1,61 @@
+"""
+Den Locks - Cross-process file locking.
+
+🐺 One wolf at the carcass at a time.
+
+Several MCP server processes can share the same territory on disk. Writers
+that append to shared logs or rewrite shared state take an exclusive lock;
+readers that must not observe a half-finished rewrite take a shared lock.
+"""
+
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Union
+
+try:
+    import fcntl
+    HAS_FCNTL = True
+except ImportError:  # Windows
+    HAS_FCNTL = False
+
+
+_process_locks: Dict[str, threading.RLock] = {}
+_process_locks_guard = threading.Lock()
+
+
+def _process_lock(path: Path) -> threading.RLock:
+    """Fallback lock used where fcntl is unavailable (single process only)."""
+    key = str(path.resolve())
+    with _process_locks_guard:
+        if key not in _process_locks:
+            _process_locks[key] = threading.RLock()
+        return _process_locks[key]
+
+
+@contextmanager
+def file_lock(path: Union[str, Path], shared: bool = False) -> Iterator[None]:
+    """
+    🐺 Hold an advisory lock on ``path`` for the duration of the block.
+
+    Each acquisition opens its own descriptor, so the lock also serializes
+    threads of the same process.
+
+    Args:
+        path: Lock file (created if missing)
+        shared: Take a shared (reader) lock instead of an exclusive one
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+
+    if not HAS_FCNTL:
+        with _process_lock(path):
+            yield
+        return
+
+    with open(path, "a+b") as handle:
+        fcntl.flock(handle.fileno(), fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle.fileno(), fcntl.LOCK_UN)
@@ -5,11 +5,15 @@ Pack Memory - Collective hunting knowledge.
 """
 
 import json
+import os
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
+from .knowledge_db import KnowledgeDB, read_note_files
+from .knowledge_index import KnowledgeIndex
+
 
 @dataclass
 class HuntingLore:
@@ -64,25 +68,42 @@ class PackMemory:
             outcome="50% faster",
             success=True
         )
+    
+    Lore, hunts and notes are JSON files under the den by default. Pass
+    ``backend="sqlite"`` to keep everything in one SQLite database
+    (``<den>/pack_memory.db``) instead; ``import_from_files`` loads an
+    existing den into it.
     """
     
-    def __init__(self, den: str = "./pack_memory"):
+    def __init__(self, den: str = "./pack_memory", backend: str = "files"):
         """
         Initialize pack memory.
         
         Args:
             den: Directory for pack memory
+            backend: Storage backend ("files" or "sqlite")
         """
+        if backend not in ("files", "sqlite"):
+            raise ValueError(f"Unknown pack memory backend: {backend}")
+        
         self.den = Path(den)
         self.den.mkdir(parents=True, exist_ok=True)
+        self.backend = backend
         
         self.lore_den = self.den / "lore"
         self.hunt_records = self.den / "hunts"
         self.wolf_notes = self.den / "notes"
         
-        self.lore_den.mkdir(exist_ok=True)
-        self.hunt_records.mkdir(exist_ok=True)
-        self.wolf_notes.mkdir(exist_ok=True)
+        self.db: Optional[KnowledgeDB] = None
+        if backend == "sqlite":
+            self.db = KnowledgeDB(self.den / "pack_memory.db")
+        else:
+            self.lore_den.mkdir(exist_ok=True)
+            self.hunt_records.mkdir(exist_ok=True)
+            self.wolf_notes.mkdir(exist_ok=True)
+        
+        self.index = KnowledgeIndex(self.den / "index")
+        self._index_checked = False
         
         self._lore_counter = 0
         self._hunt_counter = 0
@@ -97,7 +118,7 @@ class PackMemory:
             counter = self._hunt_counter
         
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        return f"{prefix}_{timestamp}_{counter}"
+        return f"{prefix}_{timestamp}_{os.getpid()}_{counter}"
     
     def share_lore(
         self,
@@ -132,6 +153,20 @@ class PackMemory:
             metadata=metadata or {}
         )
         
+        if self.db is not None:
+            self.db.add_entry({
+                "id": lore.id,
+                "author": lore.wolf_id,
+                "category": lore.category,
+                "title": lore.title,
+                "body": lore.wisdom,
+                "tags": lore.tags,
+                "timestamp": lore.timestamp.isoformat(),
+                "votes": lore.respect,
+                "metadata": lore.metadata
+            })
+            return lore
+        
         # Save by category
         category_den = self.lore_den / category
         category_den.mkdir(exist_ok=True)
@@ -150,6 +185,15 @@ class PackMemory:
         }
         lore_file.write_text(json.dumps(lore_data, indent=2))
         
+        self.index.add(
+            doc_id=lore.id,
+            category=lore.category,
+            path=str(lore_file.relative_to(self.den)),
+            title=lore.title,
+            body=lore.wisdom,
+            tags=lore.tags
+        )
+        
         return lore
     
     def record_hunt(
@@ -185,6 +229,19 @@ class PackMemory:
             lessons=lessons or []
         )
         
+        if self.db is not None:
+            self.db.add_record({
+                "id": record.id,
+                "author": record.wolf_id,
+                "decision": record.decision,
+                "context": record.context,
+                "outcome": record.outcome,
+                "success": record.success,
+                "timestamp": record.timestamp.isoformat(),
+                "lessons": record.lessons
+            })
+            return record
+        
         # Save by wolf
         wolf_records = self.hunt_records / wolf_id
         wolf_records.mkdir(exist_ok=True)
@@ -211,7 +268,11 @@ class PackMemory:
         limit: int = 10
     ) -> List[HuntingLore]:
         """
-        🐺 Recall wisdom from pack memory.
+        🐺 Recall wisdom from pack memory, most relevant first.
+        
+        Lore is ranked with BM25 over title, wisdom and tags via the
+        knowledge index (FTS5 with the sqlite backend); only the returned
+        lore is loaded.
         
         Args:
             query: What to search for
@@ -221,50 +282,130 @@ class PackMemory:
         Returns:
             Matching lore
         """
+        if self.db is not None:
+            return [
+                HuntingLore(
+                    id=row["id"],
+                    wolf_id=row["author"],
+                    category=row["category"],
+                    title=row["title"],
+                    wisdom=row["body"],
+                    tags=row["tags"],
+                    timestamp=datetime.fromisoformat(row["timestamp"]),
+                    respect=row["votes"],
+                    metadata=row["metadata"]
+                )
+                for row in self.db.search(query, category=category, limit=limit)
+            ]
+        
+        self._ensure_index()
+        
         results = []
-        query_lower = query.lower()
+        for _, _, path in self.index.search(query, category=category, limit=limit):
+            try:
+                data = json.loads((self.den / path).read_text())
+                lore = HuntingLore(
+                    id=data["id"],
+                    wolf_id=data["wolf_id"],
+                    category=data["category"],
+                    title=data["title"],
+                    wisdom=data["wisdom"],
+                    tags=data.get("tags", []),
+                    timestamp=datetime.fromisoformat(data["timestamp"]),
+                    respect=data.get("respect", 0),
+                    metadata=data.get("metadata", {})
+                )
+                results.append(lore)
+            except Exception:
+                pass
         
-        search_dens = [self.lore_den / category] if category else [
-            d for d in self.lore_den.iterdir() if d.is_dir()
-        ]
+        return results
+    
+    def _ensure_index(self) -> None:
+        """Build the search index once if lore predates it."""
+        if self._index_checked:
+            return
+        self._index_checked = True
+        if not self.index.exists() and next(self.lore_den.glob("*/*.json"), None):
+            self.rebuild_index()
+    
+    def rebuild_index(self) -> int:
+        """
+        🐺 Rebuild the search index from the lore files on disk.
         
-        for search_den in search_dens:
-            if not search_den.exists():
-                continue
-            
-            for lore_file in search_den.glob("*.json"):
-                if len(results) >= limit:
-                    break
-                
+        Returns:
+            Number of lore entries indexed
+        """
+        documents = []
+        for lore_file in self.lore_den.glob("*/*.json"):
+            try:
+                data = json.loads(lore_file.read_text())
+                documents.append({
+                    "doc_id": data["id"],
+                    "category": data["category"],
+                    "path": str(lore_file.relative_to(self.den)),
+                    "title": data.get("title", ""),
+                    "body": data.get("wisdom", ""),
+                    "tags": data.get("tags", [])
+                })
+            except Exception:
+                pass
+        
+        return self.index.rebuild(documents)
+    
+    def import_from_files(self) -> Dict[str, int]:
+        """
+        🐺 Bulk-load an existing file den (lore, hunts, notes) into the
+        sqlite backend. Already imported entries are skipped.
+        
+        Returns:
+            Rows imported per kind ("entries", "records", "notes")
+        """
+        if self.db is None:
+            raise ValueError("import_from_files requires backend='sqlite'")
+        
+        def lore():
+            for lore_file in self.lore_den.glob("*/*.json"):
                 try:
                     data = json.loads(lore_file.read_text())
-                    
-                    searchable = (
-                        data.get("title", "").lower() +
-                        data.get("wisdom", "").lower() +
-                        " ".join(data.get("tags", []))
-                    )
-                    
-                    if query_lower in searchable:
-                        lore = HuntingLore(
-                            id=data["id"],
-                            wolf_id=data["wolf_id"],
-                            category=data["category"],
-                            title=data["title"],
-                            wisdom=data["wisdom"],
-                            tags=data.get("tags", []),
-                            timestamp=datetime.fromisoformat(data["timestamp"]),
-                            respect=data.get("respect", 0),
-                            metadata=data.get("metadata", {})
-                        )
-                        results.append(lore)
+                    yield {
+                        "id": data["id"],
+                        "author": data["wolf_id"],
+                        "category": data["category"],
+                        "title": data.get("title", ""),
+                        "body": data.get("wisdom", ""),
+                        "tags": data.get("tags", []),
+                        "timestamp": data["timestamp"],
+                        "votes": data.get("respect", 0),
+                        "metadata": data.get("metadata", {})
+                    }
                 except Exception:
                     pass
         
-        return results
+        def hunts():
+            for record_file in self.hunt_records.glob("*/*.json"):
+                try:
+                    data = json.loads(record_file.read_text())
+                    yield {
+                        "id": data["id"],
+                        "author": data["wolf_id"],
+                        "decision": data["decision"],
+                        "context": data["context"],
+                        "outcome": data.get("outcome"),
+                        "success": data.get("success"),
+                        "timestamp": data["timestamp"],
+                        "lessons": data.get("lessons", [])
+                    }
+                except Exception:
+                    pass
+        
+        return self.db.bulk_import(lore(), hunts(), read_note_files(self.wolf_notes))
     
     def get_wolf_notes(self, wolf_id: str) -> List[Dict[str, Any]]:
         """Get personal notes for a wolf."""
+        if self.db is not None:
+            return self.db.get_notes(wolf_id)
+        
         notes_file = self.wolf_notes / f"{wolf_id}.json"
         if not notes_file.exists():
             return []
@@ -276,6 +417,9 @@ class PackMemory:
     
     def add_note(self, wolf_id: str, content: str, note_type: str = "general") -> Dict[str, Any]:
         """Add a personal note for a wolf."""
+        if self.db is not None:
+            return self.db.add_note(wolf_id, content, note_type, datetime.now().isoformat())
+        
         notes = self.get_wolf_notes(wolf_id)
         
         note = {
@@ -293,6 +437,15 @@ class PackMemory:
     
     def pack_stats(self) -> Dict[str, Any]:
         """Get pack memory statistics."""
+        if self.db is not None:
+            stats = self.db.stats()
+            return {
+                "total_lore": stats["entries"],
+                "total_hunts": stats["records"],
+                "categories": stats["categories"],
+                "active_wolves": stats["record_authors"]
+            }
+        
         lore_count = sum(
             len(list(d.glob("*.json")))
             for d in self.lore_den.iterdir()
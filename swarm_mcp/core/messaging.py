@@ -4,12 +4,20 @@ Pack Messaging - Wolf-to-wolf communication system.
 🐺 Wolves communicate through howls - the pack always knows.
 """
 
-import json
+import itertools
+import os
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
+
+from .howl_store import HowlStore, make_store
+
+
+# Shared by every queue in the process, so two queues never mint the same id
+_howl_counter = itertools.count(1)
 
 
 class HowlUrgency(Enum):
@@ -43,6 +51,36 @@ class Howl:
     heard: bool = False
 
 
+def _howl_to_record(msg: Howl) -> Dict[str, Any]:
+    """Serialize a howl into the on-disk record format."""
+    return {
+        "id": msg.id,
+        "sender": msg.sender,
+        "recipient": msg.recipient,
+        "content": msg.content,
+        "howl_type": msg.howl_type.value,
+        "urgency": msg.urgency.value,
+        "timestamp": msg.timestamp.isoformat(),
+        "metadata": msg.metadata,
+        "heard": msg.heard
+    }
+
+
+def _record_to_howl(data: Dict[str, Any]) -> Howl:
+    """Rebuild a howl from its on-disk record."""
+    return Howl(
+        id=data["id"],
+        sender=data["sender"],
+        recipient=data["recipient"],
+        content=data["content"],
+        howl_type=HowlType(data.get("howl_type", "w2w")),
+        urgency=HowlUrgency(data.get("urgency", 3)),
+        timestamp=datetime.fromisoformat(data["timestamp"]),
+        metadata=data.get("metadata", {}),
+        heard=data.get("heard", False)
+    )
+
+
 class MessageQueue:
     """
     🐺 Pack message queue - howls echo through the territory.
@@ -58,24 +96,33 @@ class MessageQueue:
         
         # Mark as heard
         queue.mark_heard(howls[0].id, "alpha")
+    
+    Howls are kept in an append-only segment log per wolf by default.
+    Legacy one-JSON-file-per-howl inboxes are imported once with
+    ``swarm migrate-messages``; pass ``backend="files"`` to keep using
+    that layout.
     """
     
-    def __init__(self, territory: str = "./pack_messages"):
+    def __init__(
+        self,
+        territory: str = "./pack_messages",
+        backend: Union[str, HowlStore] = "segments"
+    ):
         """
         Initialize message queue.
         
         Args:
             territory: Directory for pack communications
+            backend: Storage backend name ("segments", "files") or a HowlStore
         """
         self.territory = Path(territory)
         self.territory.mkdir(parents=True, exist_ok=True)
-        self._howl_counter = 0
+        self.store = make_store(self.territory, backend)
     
     def _generate_id(self) -> str:
-        """Generate unique howl ID."""
-        self._howl_counter += 1
+        """Generate unique howl ID (unique across queues and server processes)."""
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
-        return f"howl_{timestamp}_{self._howl_counter}"
+        return f"howl_{timestamp}_{os.getpid()}_{next(_howl_counter)}"
     
     def send(
         self,
@@ -111,22 +158,47 @@ class MessageQueue:
         )
         
         # Save to recipient's territory
-        inbox = self.territory / recipient / "incoming"
-        inbox.mkdir(parents=True, exist_ok=True)
-        
-        howl_file = inbox / f"{msg.id}.json"
-        howl_data = {
-            "id": msg.id,
-            "sender": msg.sender,
-            "recipient": msg.recipient,
-            "content": msg.content,
-            "howl_type": msg.howl_type.value,
-            "urgency": msg.urgency.value,
-            "timestamp": msg.timestamp.isoformat(),
-            "metadata": msg.metadata,
-            "heard": False
-        }
-        howl_file.write_text(json.dumps(howl_data, indent=2))
+        self.store.append(recipient, _howl_to_record(msg))
+        
+        return msg
+    
+    def broadcast(
+        self,
+        sender: str,
+        content: str,
+        pack: Optional[List[str]] = None,
+        urgency: HowlUrgency = HowlUrgency.NORMAL,
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> Howl:
+        """
+        🐺 Howl to the whole pack.
+        
+        The segment backend stores the howl once in the shared pack topic
+        and every wolf hears it from its own read position; a howl to a
+        ``pack`` subset is stored there once too, and only those wolves
+        hear it. The files backend writes one copy per wolf.
+        
+        Args:
+            sender: Sending wolf
+            content: Howl content
+            pack: Only these wolves hear it (default: the whole pack)
+            urgency: How urgent
+            metadata: Extra data
+            
+        Returns:
+            The pack howl (recipient "pack")
+        """
+        msg = Howl(
+            id=self._generate_id(),
+            sender=sender,
+            recipient="pack",
+            content=content,
+            howl_type=HowlType.PACK_HOWL,
+            urgency=urgency,
+            metadata=metadata or {}
+        )
+        
+        self.store.broadcast(_howl_to_record(msg), pack)
         
         return msg
     
@@ -147,32 +219,10 @@ class MessageQueue:
         Returns:
             List of howls
         """
-        inbox = self.territory / wolf_id / "incoming"
-        if not inbox.exists():
-            return []
-        
         howls = []
-        for howl_file in sorted(inbox.glob("*.json"), reverse=True):
-            if len(howls) >= limit:
-                break
-            
+        for data in self.store.read(wolf_id, unheard_only=unheard_only, limit=limit):
             try:
-                data = json.loads(howl_file.read_text())
-                if unheard_only and data.get("heard"):
-                    continue
-                
-                msg = Howl(
-                    id=data["id"],
-                    sender=data["sender"],
-                    recipient=data["recipient"],
-                    content=data["content"],
-                    howl_type=HowlType(data.get("howl_type", "w2w")),
-                    urgency=HowlUrgency(data.get("urgency", 3)),
-                    timestamp=datetime.fromisoformat(data["timestamp"]),
-                    metadata=data.get("metadata", {}),
-                    heard=data.get("heard", False)
-                )
-                howls.append(msg)
+                howls.append(_record_to_howl(data))
             except Exception:
                 pass
         
@@ -180,21 +230,99 @@ class MessageQueue:
     
     def mark_heard(self, howl_id: str, wolf_id: str) -> bool:
         """Mark a howl as heard."""
-        howl_file = self.territory / wolf_id / "incoming" / f"{howl_id}.json"
-        if not howl_file.exists():
-            return False
-        
-        try:
-            data = json.loads(howl_file.read_text())
-            data["heard"] = True
-            howl_file.write_text(json.dumps(data, indent=2))
-            return True
-        except Exception:
-            return False
+        return self.store.mark_heard(wolf_id, howl_id)
+    
+    def mark_heard_up_to(self, howl_id: str, wolf_id: str) -> bool:
+        """Mark a howl and every howl sent to the wolf before it as heard."""
+        return self.store.mark_heard_up_to(wolf_id, howl_id)
+    
+    def next_unheard(self, wolf_id: str, limit: int = 10) -> List[Howl]:
+        """
+        🐺 Pick up where the wolf left off: the oldest unheard howls, oldest first.
+        
+        Args:
+            wolf_id: Wolf listening
+            limit: Max howls to return
+        
+        Returns:
+            List of unheard howls
+        """
+        howls = []
+        for data in self.store.next_unheard(wolf_id, limit=limit):
+            try:
+                howls.append(_record_to_howl(data))
+            except Exception:
+                pass
+        
+        return howls
+    
+    def receive(
+        self,
+        wolf_id: str,
+        timeout: float = 30.0,
+        min_urgency: HowlUrgency = HowlUrgency.LOW,
+        limit: int = 10,
+        consume: bool = True
+    ) -> List[Howl]:
+        """
+        🐺 Wait for unheard howls, most urgent first.
+        
+        Returns as soon as at least one unheard howl at or above
+        ``min_urgency`` is waiting, sleeping on the inbox in between (see
+        InboxWatcher) instead of polling.
+        
+        Args:
+            wolf_id: Wolf listening
+            timeout: Max seconds to wait (0 checks once without blocking)
+            min_urgency: Least urgent level to accept
+            limit: Max howls to return
+            consume: Mark returned howls as heard
+            
+        Returns:
+            Howls ordered EMERGENCY → LOW, oldest first within a level
+            (empty if the timeout passed)
+        """
+        deadline = time.monotonic() + max(timeout, 0)
+        # Consuming picks and marks in one store operation, so concurrent
+        # receivers of the same wolf never get the same howl
+        pick = self.store.take_by_urgency if consume else self.store.next_by_urgency
+        
+        with self.store.watch(wolf_id) as watcher:
+            while True:
+                records = pick(wolf_id, min_urgency.value, limit)
+                remaining = deadline - time.monotonic()
+                if records or remaining <= 0:
+                    break
+                watcher.wait(remaining)
+        
+        howls = []
+        for data in records:
+            try:
+                howls.append(_record_to_howl(data))
+            except Exception:
+                pass
+        
+        return howls
     
     def count_unheard(self, wolf_id: str) -> int:
-        """Count unheard howls for a wolf."""
-        return len(self.listen(wolf_id, unheard_only=True))
+        """Count unheard howls for a wolf (not capped by any listen limit)."""
+        return self.store.count_unheard(wolf_id)
+    
+    def wolves(self) -> List[str]:
+        """Wolves that have an inbox in this territory."""
+        return self.store.wolves()
+    
+    def compact(self, wolf_id: str) -> Dict[str, int]:
+        """Reclaim space used by heard howls in a wolf's inbox."""
+        return self.store.compact(wolf_id)
+    
+    def flush(self) -> None:
+        """Make all sent howls durable."""
+        self.store.flush()
+    
+    def close(self) -> None:
+        """Flush and release storage handles."""
+        self.store.close()
 
 
 # Convenience functions
@@ -224,17 +352,6 @@ def broadcast(
     content: str,
     pack: List[str],
     urgency: HowlUrgency = HowlUrgency.NORMAL
-) -> List[Howl]:
-    """🐺 Howl to the entire pack."""
-    queue = get_queue()
-    howls = []
-    for wolf in pack:
-        msg = queue.send(
-            sender=sender,
-            recipient=wolf,
-            content=content,
-            urgency=urgency,
-            howl_type=HowlType.PACK_HOWL
-        )
-        howls.append(msg)
-    return howls
+) -> Howl:
+    """🐺 Howl to the entire pack (stored once, see MessageQueue.broadcast)."""
+    return get_queue().broadcast(sender, content, pack=pack, urgency=urgency)
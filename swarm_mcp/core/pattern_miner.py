@@ -23,14 +23,41 @@ Author: The Swarm
 License: MIT
 """
 
+import atexit
+import itertools
 import json
+import os
+import time
+import weakref
 from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, Set
-from collections import defaultdict
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple, Set
+from collections import Counter, deque
 import re
 
+from .event_store import EventStore
+from .locking import file_lock
+
+
+# Successful events this close together count as a task sequence
+SEQUENCE_WINDOW = timedelta(hours=2)
+
+# Shared by every miner in the process, so event ids never collide
+_event_counter = itertools.count(1)
+
+_open_miners: "weakref.WeakSet[PatternMiner]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_miners() -> None:
+    """Write pending aggregates when the process exits."""
+    for miner in list(_open_miners):
+        try:
+            miner.flush()
+        except Exception:
+            pass
+
 
 @dataclass
 class CoordinationEvent:
@@ -75,6 +102,131 @@ class Suggestion:
     similar_past_events: List[str]
 
 
+@dataclass
+class MiningAggregates:
+    """
+    Running totals behind every pattern type.
+    
+    ``add`` folds one event in without looking at history: pair, hour and
+    category counters are plain increments, and sequences are counted
+    against per-category totals of the successful events still inside
+    SEQUENCE_WINDOW (a deque evicted from the left), so the cost per event
+    depends on the number of categories in the window, not on the number
+    of events ever recorded.
+    """
+    total_events: int = 0
+    # "agent-1|agent-2" -> successful events: count, quality, categories, examples
+    pairs: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # "cat1|cat2" -> successful pairs within the window: count, quality, examples
+    sequences: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # hour of day -> [successful events, quality sum]
+    hours: Dict[int, List[float]] = field(default_factory=dict)
+    # category -> count, successes, quality (of successes), agents, examples
+    categories: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    # Successful events inside the sequence window: (timestamp, category, quality, id)
+    window: Deque[Tuple[datetime, str, float, str]] = field(default_factory=deque)
+    # category -> [count, quality sum, latest id] over the window
+    window_totals: Dict[str, List[Any]] = field(default_factory=dict)
+    # day partition -> event store rows folded in (None: unknown, rebuild)
+    folded: Optional[Dict[str, int]] = field(default_factory=dict)
+    
+    def add(self, event: CoordinationEvent) -> Dict[str, Any]:
+        """
+        Fold one event into the totals (events must arrive in time order).
+        
+        Returns:
+            The keys this event touched: "pair", "sequences", "category"
+        """
+        self.total_events += 1
+        touched: Dict[str, Any] = {"pair": None, "sequences": [], "category": None}
+        success = event.outcome == "success"
+        category = event.context.get("category")
+        
+        if category:
+            stats = self.categories.setdefault(
+                category, {"count": 0, "successes": 0, "quality": 0.0, "agents": {}, "examples": []}
+            )
+            stats["count"] += 1
+            stats["examples"] = (stats["examples"] + [event.id])[-5:]
+            if success:
+                stats["successes"] += 1
+                stats["quality"] += event.quality_score
+                for agent in event.agents:
+                    stats["agents"][agent] = stats["agents"].get(agent, 0) + 1
+            touched["category"] = category
+        
+        if not success:
+            return touched
+        
+        if len(event.agents) >= 2:
+            pair = "|".join(sorted(event.agents))
+            stats = self.pairs.setdefault(pair, {"count": 0, "quality": 0.0, "categories": {}, "examples": []})
+            stats["count"] += 1
+            stats["quality"] += event.quality_score
+            stats["examples"] = (stats["examples"] + [event.id])[-5:]
+            if category:
+                stats["categories"][category] = stats["categories"].get(category, 0) + 1
+            touched["pair"] = pair
+        
+        hour = self.hours.setdefault(event.timestamp.hour, [0, 0.0])
+        hour[0] += 1
+        hour[1] += event.quality_score
+        
+        # Sequences: pair this event with every earlier success in the window
+        while self.window and event.timestamp - self.window[0][0] > SEQUENCE_WINDOW:
+            _, old_category, old_quality, _ = self.window.popleft()
+            totals = self.window_totals[old_category]
+            totals[0] -= 1
+            totals[1] -= old_quality
+            if totals[0] == 0:
+                del self.window_totals[old_category]
+        
+        sequence_category = category or "unknown"
+        for first_category, (count, quality, latest_id) in self.window_totals.items():
+            key = f"{first_category}|{sequence_category}"
+            stats = self.sequences.setdefault(key, {"count": 0, "quality": 0.0, "examples": []})
+            stats["count"] += count
+            stats["quality"] += (quality + count * event.quality_score) / 2
+            stats["examples"] = (stats["examples"] + [latest_id])[-3:]
+            touched["sequences"].append(key)
+        
+        self.window.append((event.timestamp, sequence_category, event.quality_score, event.id))
+        totals = self.window_totals.setdefault(sequence_category, [0, 0.0, event.id])
+        totals[0] += 1
+        totals[1] += event.quality_score
+        totals[2] = event.id
+        
+        return touched
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "total_events": self.total_events,
+            "pairs": self.pairs,
+            "sequences": self.sequences,
+            "hours": self.hours,
+            "categories": self.categories,
+            "window": [[ts.isoformat(), cat, quality, event_id] for ts, cat, quality, event_id in self.window],
+            "window_totals": self.window_totals,
+            "folded": self.folded
+        }
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "MiningAggregates":
+        return cls(
+            total_events=data["total_events"],
+            pairs=data["pairs"],
+            sequences=data["sequences"],
+            hours={int(hour): totals for hour, totals in data["hours"].items()},
+            categories=data["categories"],
+            window=deque(
+                (datetime.fromisoformat(ts), cat, quality, event_id)
+                for ts, cat, quality, event_id in data["window"]
+            ),
+            window_totals=data["window_totals"],
+            folded=data.get("folded")
+        )
+
+
 class PatternMiner:
     """
     Learns coordination patterns from swarm history.
@@ -102,47 +254,76 @@ class PatternMiner:
         )
         # Returns: "Pattern: Agent pairing for auth"
         # "agent-1 and agent-3 have 95% success rate on auth bugs"
+    
+    Patterns are mined incrementally: each event updates MiningAggregates
+    and re-checks only the patterns it touched. ``remine()`` is the batch
+    job that rebuilds the aggregates from the full event history, which is
+    kept in a day-partitioned columnar EventStore (see ``history()``).
+    
+    The aggregates file is rewritten every ``save_every`` events or
+    ``save_interval`` seconds (and on ``flush()``/exit), not per event.
+    Events recorded after the last save are folded back in from the event
+    store on the next load. A save starts from the file on disk and folds
+    in every event stored since, so miners in several processes sharing a
+    storage directory never drop each other's events.
     """
     
-    def __init__(self, storage_dir: str = "./swarm_patterns"):
-        """Initialize pattern miner."""
+    def __init__(
+        self,
+        storage_dir: str = "./swarm_patterns",
+        recent_events: int = 1000,
+        save_every: int = 100,
+        save_interval: float = 30.0
+    ):
+        """
+        Initialize pattern miner.
+        
+        Args:
+            storage_dir: Directory for events, patterns and aggregates
+            recent_events: How many recorded events to keep in ``events``
+            save_every: Save the aggregates after this many new events
+            save_interval: ...or once this many seconds passed since the last save
+        """
         self.storage_dir = Path(storage_dir)
         self.storage_dir.mkdir(parents=True, exist_ok=True)
         
         self.events_dir = self.storage_dir / "events"
         self.patterns_dir = self.storage_dir / "patterns"
+        self.aggregates_file = self.storage_dir / "aggregates.json"
+        self._aggregates_lock = self.storage_dir / "aggregates.lock"
         self.events_dir.mkdir(exist_ok=True)
         self.patterns_dir.mkdir(exist_ok=True)
+        self.event_store = EventStore(self.events_dir)
         
-        self.events: List[CoordinationEvent] = []
+        # Recently recorded events; the full history stays on disk
+        self.events: Deque[CoordinationEvent] = deque(maxlen=recent_events)
         self.patterns: Dict[str, Pattern] = {}
+        self.aggregates = MiningAggregates()
+        
+        self.save_every = save_every
+        self.save_interval = save_interval
+        self._unsaved = 0
+        self._last_save = time.monotonic()
         
         self._load_data()
+        _open_miners.add(self)
     
     def _generate_id(self, prefix: str) -> str:
         """Generate unique ID."""
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S%f")
-        return f"{prefix}_{timestamp[:16]}"
+        return f"{prefix}_{timestamp[:16]}_{os.getpid()}_{next(_event_counter)}"
     
     def _load_data(self):
-        """Load events and patterns."""
-        # Load events
-        for event_file in sorted(self.events_dir.glob("*.json")):
+        """Load aggregates and patterns."""
+        self._migrate_event_files()
+        
+        # Load aggregates (or build them once from pre-existing event files)
+        if self.aggregates_file.exists():
             try:
-                data = json.loads(event_file.read_text())
-                self.events.append(CoordinationEvent(
-                    id=data["id"],
-                    event_type=data["event_type"],
-                    agents=data["agents"],
-                    context=data["context"],
-                    outcome=data["outcome"],
-                    timestamp=datetime.fromisoformat(data["timestamp"]),
-                    duration_minutes=data.get("duration_minutes", 0),
-                    quality_score=data.get("quality_score", 1.0),
-                    tags=data.get("tags", [])
-                ))
+                self.aggregates = MiningAggregates.from_dict(json.loads(self.aggregates_file.read_text()))
             except Exception:
-                pass
+                self.aggregates = MiningAggregates()
+            self._catch_up()
         
         # Load patterns
         for pattern_file in self.patterns_dir.glob("*.json"):
@@ -164,21 +345,121 @@ class PatternMiner:
                 )
             except Exception:
                 pass
+        
+        if not self.aggregates_file.exists() and self.event_store.partitions():
+            self.remine()
+    
+    def _catch_up(self):
+        """
+        Fold in events stored (by any process) past the aggregates' row cursors.
+        
+        Cursors count rows per day partition, so an event appended late to
+        an older day is still picked up. Aggregates without usable cursors
+        (older files, or cursors past the end of a partition) are rebuilt
+        from the full history.
+        """
+        folded = self.aggregates.folded
+        if folded is None or any(
+            rows > self.event_store.rows(day) for day, rows in folded.items()
+        ):
+            self.aggregates = MiningAggregates()
+            folded = {}
+        
+        records, self.aggregates.folded = self.event_store.read_since(folded)
+        for data in records:
+            self.aggregates.add(CoordinationEvent(**data))
+            self._unsaved += 1
+    
+    def _save_aggregates(self):
+        """
+        Save aggregates to disk, under the aggregates lock.
+        
+        The in-memory totals only hold this process's events since it
+        loaded, so they are rebuilt from the saved file plus the events
+        stored after it, which include every process's events.
+        """
+        with file_lock(self._aggregates_lock):
+            try:
+                self.aggregates = MiningAggregates.from_dict(json.loads(self.aggregates_file.read_text()))
+            except Exception:
+                self.aggregates = MiningAggregates()
+            self._catch_up()
+            self._write_aggregates()
+    
+    def _write_aggregates(self):
+        """Replace the aggregates file atomically (caller holds the aggregates lock)."""
+        tmp_file = self.aggregates_file.with_suffix(".tmp")
+        tmp_file.write_text(json.dumps(self.aggregates.to_dict()))
+        os.replace(tmp_file, self.aggregates_file)
+        self._unsaved = 0
+        self._last_save = time.monotonic()
+    
+    def flush(self):
+        """Save the aggregates if events were recorded since the last save."""
+        if self._unsaved:
+            self._save_aggregates()
+    
+    def _migrate_event_files(self):
+        """Move legacy one-file-per-event history into the event store."""
+        event_files = list(self.events_dir.glob("*.json"))
+        if not event_files:
+            return
+        
+        records = []
+        for event_file in event_files:
+            try:
+                data = json.loads(event_file.read_text())
+                data["timestamp"] = datetime.fromisoformat(data["timestamp"])
+                records.append(data)
+            except Exception:
+                pass
+        
+        for data in sorted(records, key=lambda d: d["timestamp"]):
+            self.event_store.append(data)
+        for event_file in event_files:
+            event_file.unlink()
+    
+    def history(
+        self,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Iterable[CoordinationEvent]:
+        """
+        Stream recorded events, oldest first.
+        
+        Only the day partitions overlapping [start, end] are read, one at
+        a time.
+        
+        Args:
+            start: Earliest timestamp (inclusive)
+            end: Latest timestamp (inclusive)
+        """
+        for data in self.event_store.iter_events(start, end):
+            yield CoordinationEvent(
+                id=data["id"],
+                event_type=data["event_type"],
+                agents=data["agents"],
+                context=data["context"],
+                outcome=data["outcome"],
+                timestamp=data["timestamp"],
+                duration_minutes=data["duration_minutes"],
+                quality_score=data["quality_score"],
+                tags=data["tags"]
+            )
     
-    def _save_event(self, event: CoordinationEvent):
-        """Save event to disk."""
-        event_file = self.events_dir / f"{event.id}.json"
-        event_file.write_text(json.dumps({
+    def _save_event(self, event: CoordinationEvent) -> int:
+        """Append event to the event store; returns its row in the day partition."""
+        return self.event_store.append({
             "id": event.id,
             "event_type": event.event_type,
             "agents": event.agents,
             "context": event.context,
             "outcome": event.outcome,
-            "timestamp": event.timestamp.isoformat(),
+            "timestamp": event.timestamp,
             "duration_minutes": event.duration_minutes,
             "quality_score": event.quality_score,
             "tags": event.tags
-        }, indent=2))
+        })
     
     def _save_pattern(self, pattern: Pattern):
         """Save pattern to disk."""
@@ -235,213 +516,203 @@ class PatternMiner:
         )
         
         self.events.append(event)
-        self._save_event(event)
+        row = self._save_event(event)
         
-        # Trigger pattern mining
-        self._mine_patterns()
+        # Fold into the aggregates and re-check only what this event touched,
+        # unless other processes appended to the same day since our cursor
+        day = event.timestamp.strftime("%Y-%m-%d")
+        folded = self.aggregates.folded
+        if folded is not None and folded.get(day, 0) == row:
+            touched = self.aggregates.add(event)
+            folded[day] = row + 1
+            self._unsaved += 1
+        else:
+            self._catch_up()
+            touched = None
+        if self._unsaved >= self.save_every or time.monotonic() - self._last_save >= self.save_interval:
+            self._save_aggregates()
+        if self.aggregates.total_events == 5:
+            self._mine_patterns()
+        elif self.aggregates.total_events > 5:
+            self._mine_patterns(touched)
         
         return event
     
-    def _mine_patterns(self):
-        """Mine patterns from event history."""
-        if len(self.events) < 5:
+    def remine(self) -> int:
+        """
+        Batch job: rebuild the aggregates from the full event history and
+        re-check every pattern. Not needed in normal operation.
+        
+        Returns:
+            Number of events mined
+        """
+        with file_lock(self._aggregates_lock):
+            self.aggregates = MiningAggregates()
+            self._catch_up()
+            self._write_aggregates()
+        self._mine_patterns()
+        return self.aggregates.total_events
+    
+    def _mine_patterns(self, touched: Optional[Dict[str, Any]] = None):
+        """
+        Turn aggregates into patterns.
+        
+        Args:
+            touched: Keys updated by one event (see MiningAggregates.add);
+                None re-checks everything
+        """
+        if self.aggregates.total_events < 5:
             return  # Need minimum data
         
+        if touched is None:
+            pairs = list(self.aggregates.pairs)
+            sequences = list(self.aggregates.sequences)
+            categories = list(self.aggregates.categories)
+        else:
+            pairs = [touched["pair"]] if touched["pair"] else []
+            sequences = touched["sequences"]
+            categories = [touched["category"]] if touched["category"] else []
+        
         # Mine different pattern types
-        self._mine_pairing_patterns()
-        self._mine_sequence_patterns()
+        for pair in pairs:
+            self._mine_pairing_pattern(pair)
+        for sequence in sequences:
+            self._mine_sequence_pattern(sequence)
         self._mine_timing_patterns()
-        self._mine_context_patterns()
+        for category in categories:
+            self._mine_context_pattern(category)
     
-    def _mine_pairing_patterns(self):
-        """Find successful agent pairing patterns."""
-        # Group events by agent pairs
-        pair_outcomes: Dict[Tuple[str, ...], List[CoordinationEvent]] = defaultdict(list)
-        
-        for event in self.events:
-            if len(event.agents) >= 2 and event.outcome == "success":
-                pair = tuple(sorted(event.agents))
-                pair_outcomes[pair].append(event)
-        
-        # Find pairs with high success rates
-        for pair, events in pair_outcomes.items():
-            if len(events) < 3:
-                continue
-            
-            # Calculate metrics
-            success_count = sum(1 for e in events if e.outcome == "success")
-            success_rate = success_count / len(events)
-            avg_quality = sum(e.quality_score for e in events) / len(events)
-            
-            if success_rate >= 0.8 and avg_quality >= 0.7:
-                # Extract common context
-                categories = [e.context.get("category") for e in events if "category" in e.context]
-                common_category = max(set(categories), key=categories.count) if categories else None
-                
-                pattern_id = f"pairing_{'-'.join(pair)}"
-                
-                if pattern_id in self.patterns:
-                    # Update existing
-                    pattern = self.patterns[pattern_id]
-                    pattern.occurrence_count = len(events)
-                    pattern.success_rate = success_rate
-                    pattern.avg_quality = avg_quality
-                    pattern.last_seen = datetime.now()
-                    pattern.example_events = [e.id for e in events[-5:]]
-                else:
-                    # Create new
-                    self.patterns[pattern_id] = Pattern(
-                        id=pattern_id,
-                        name=f"Successful pairing: {' + '.join(pair)}",
-                        description=f"Agents {' and '.join(pair)} work well together",
-                        pattern_type="pairing",
-                        conditions={"agents": list(pair), "category": common_category},
-                        actions=[f"Pair {pair[0]} with {pair[1]}"],
-                        success_rate=success_rate,
-                        occurrence_count=len(events),
-                        avg_quality=avg_quality,
-                        example_events=[e.id for e in events[-5:]]
-                    )
-                
-                self._save_pattern(self.patterns[pattern_id])
-    
-    def _mine_sequence_patterns(self):
-        """Find successful task sequence patterns."""
-        # Look at tasks completed within 2 hours of each other
-        window = timedelta(hours=2)
-        sequences: Dict[Tuple[str, str], List[Tuple[CoordinationEvent, CoordinationEvent]]] = defaultdict(list)
+    def _mine_pairing_pattern(self, pair_key: str):
+        """Check one agent pair for a successful pairing pattern."""
+        stats = self.aggregates.pairs[pair_key]
+        count = stats["count"]
+        if count < 3:
+            return
         
-        sorted_events = sorted(self.events, key=lambda e: e.timestamp)
+        # Only successful events are counted per pair
+        success_rate = 1.0
+        avg_quality = stats["quality"] / count
         
-        for i, event1 in enumerate(sorted_events):
-            if event1.outcome != "success":
-                continue
+        if success_rate >= 0.8 and avg_quality >= 0.7:
+            # Most common context
+            categories = Counter(stats["categories"])
+            common_category = categories.most_common(1)[0][0] if categories else None
             
-            cat1 = event1.context.get("category", "unknown")
+            pair = tuple(pair_key.split("|"))
+            pattern_id = f"pairing_{'-'.join(pair)}"
             
-            for event2 in sorted_events[i+1:]:
-                if event2.timestamp - event1.timestamp > window:
-                    break
-                
-                if event2.outcome != "success":
-                    continue
-                
-                cat2 = event2.context.get("category", "unknown")
-                sequences[(cat1, cat2)].append((event1, event2))
-        
-        # Find frequent sequences
-        for (cat1, cat2), event_pairs in sequences.items():
-            if len(event_pairs) < 3:
-                continue
+            if pattern_id in self.patterns:
+                # Update existing
+                pattern = self.patterns[pattern_id]
+                pattern.occurrence_count = count
+                pattern.success_rate = success_rate
+                pattern.avg_quality = avg_quality
+                pattern.last_seen = datetime.now()
+                pattern.example_events = list(stats["examples"])
+            else:
+                # Create new
+                self.patterns[pattern_id] = Pattern(
+                    id=pattern_id,
+                    name=f"Successful pairing: {' + '.join(pair)}",
+                    description=f"Agents {' and '.join(pair)} work well together",
+                    pattern_type="pairing",
+                    conditions={"agents": list(pair), "category": common_category},
+                    actions=[f"Pair {pair[0]} with {pair[1]}"],
+                    success_rate=success_rate,
+                    occurrence_count=count,
+                    avg_quality=avg_quality,
+                    example_events=list(stats["examples"])
+                )
             
-            # Calculate combined quality
-            avg_quality = sum(
-                (e1.quality_score + e2.quality_score) / 2
-                for e1, e2 in event_pairs
-            ) / len(event_pairs)
+            self._save_pattern(self.patterns[pattern_id])
+    
+    def _mine_sequence_pattern(self, sequence_key: str):
+        """Check one category transition for a successful sequence pattern."""
+        stats = self.aggregates.sequences[sequence_key]
+        if stats["count"] < 3:
+            return
+        
+        # Combined quality of both tasks in each pair
+        avg_quality = stats["quality"] / stats["count"]
+        
+        if avg_quality >= 0.7:
+            cat1, cat2 = sequence_key.split("|", 1)
+            pattern_id = f"sequence_{cat1}_{cat2}"
             
-            if avg_quality >= 0.7:
-                pattern_id = f"sequence_{cat1}_{cat2}"
-                
-                if pattern_id not in self.patterns:
-                    self.patterns[pattern_id] = Pattern(
-                        id=pattern_id,
-                        name=f"Sequence: {cat1} → {cat2}",
-                        description=f"Doing {cat1} before {cat2} leads to better outcomes",
-                        pattern_type="sequence",
-                        conditions={"first_category": cat1, "second_category": cat2},
-                        actions=[f"Do {cat1} task first", f"Then do {cat2} task"],
-                        success_rate=1.0,  # All were successful
-                        occurrence_count=len(event_pairs),
-                        avg_quality=avg_quality,
-                        example_events=[e[0].id for e in event_pairs[-3:]]
-                    )
-                    self._save_pattern(self.patterns[pattern_id])
+            if pattern_id not in self.patterns:
+                self.patterns[pattern_id] = Pattern(
+                    id=pattern_id,
+                    name=f"Sequence: {cat1} → {cat2}",
+                    description=f"Doing {cat1} before {cat2} leads to better outcomes",
+                    pattern_type="sequence",
+                    conditions={"first_category": cat1, "second_category": cat2},
+                    actions=[f"Do {cat1} task first", f"Then do {cat2} task"],
+                    success_rate=1.0,  # All were successful
+                    occurrence_count=stats["count"],
+                    avg_quality=avg_quality,
+                    example_events=list(stats["examples"])
+                )
+                self._save_pattern(self.patterns[pattern_id])
     
     def _mine_timing_patterns(self):
-        """Find time-of-day productivity patterns."""
-        # Group by hour of day
-        hourly_quality: Dict[int, List[float]] = defaultdict(list)
-        
-        for event in self.events:
-            if event.outcome == "success":
-                hour = event.timestamp.hour
-                hourly_quality[hour].append(event.quality_score)
+        """Find time-of-day productivity patterns (at most 24 hourly buckets)."""
+        if "timing_peak_hours" in self.patterns:
+            return
         
         # Find peak hours
         peak_hours = []
-        for hour, qualities in hourly_quality.items():
-            if len(qualities) >= 3:
-                avg = sum(qualities) / len(qualities)
+        for hour, (count, quality) in self.aggregates.hours.items():
+            if count >= 3:
+                avg = quality / count
                 if avg >= 0.85:
-                    peak_hours.append((hour, avg, len(qualities)))
+                    peak_hours.append((hour, avg, int(count)))
         
         if peak_hours:
             peak_hours.sort(key=lambda x: x[1], reverse=True)
             best_hours = [h[0] for h in peak_hours[:3]]
             
             pattern_id = "timing_peak_hours"
+            self.patterns[pattern_id] = Pattern(
+                id=pattern_id,
+                name="Peak productivity hours",
+                description=f"Best work happens at hours: {best_hours}",
+                pattern_type="timing",
+                conditions={"peak_hours": best_hours},
+                actions=[f"Schedule complex tasks for hours {best_hours}"],
+                success_rate=peak_hours[0][1],
+                occurrence_count=sum(h[2] for h in peak_hours),
+                avg_quality=sum(h[1] for h in peak_hours) / len(peak_hours)
+            )
+            self._save_pattern(self.patterns[pattern_id])
+    
+    def _mine_context_pattern(self, category: str):
+        """Check one category for consistent success."""
+        stats = self.aggregates.categories[category]
+        if stats["count"] < 5:
+            return
+        
+        success_rate = stats["successes"] / stats["count"]
+        
+        if success_rate >= 0.8:
+            # Most common agents for this category
+            best_agents = Counter(stats["agents"]).most_common(3)
+            
+            pattern_id = f"context_{category}"
             if pattern_id not in self.patterns:
                 self.patterns[pattern_id] = Pattern(
                     id=pattern_id,
-                    name="Peak productivity hours",
-                    description=f"Best work happens at hours: {best_hours}",
-                    pattern_type="timing",
-                    conditions={"peak_hours": best_hours},
-                    actions=[f"Schedule complex tasks for hours {best_hours}"],
-                    success_rate=peak_hours[0][1],
-                    occurrence_count=sum(h[2] for h in peak_hours),
-                    avg_quality=sum(h[1] for h in peak_hours) / len(peak_hours)
+                    name=f"Experts for {category}",
+                    description=f"Best agents for {category}: {[a[0] for a in best_agents]}",
+                    pattern_type="context",
+                    conditions={"category": category},
+                    actions=[f"Assign {category} tasks to {best_agents[0][0]}"],
+                    success_rate=success_rate,
+                    occurrence_count=stats["count"],
+                    avg_quality=stats["quality"] / stats["successes"],
+                    example_events=list(stats["examples"])
                 )
                 self._save_pattern(self.patterns[pattern_id])
     
-    def _mine_context_patterns(self):
-        """Find patterns based on context (files, categories)."""
-        # Group by category
-        category_outcomes: Dict[str, List[CoordinationEvent]] = defaultdict(list)
-        
-        for event in self.events:
-            category = event.context.get("category")
-            if category:
-                category_outcomes[category].append(event)
-        
-        # Find categories with consistent success
-        for category, events in category_outcomes.items():
-            if len(events) < 5:
-                continue
-            
-            success_events = [e for e in events if e.outcome == "success"]
-            success_rate = len(success_events) / len(events)
-            
-            if success_rate >= 0.8:
-                # Find common agents for this category
-                agent_counts: Dict[str, int] = defaultdict(int)
-                for event in success_events:
-                    for agent in event.agents:
-                        agent_counts[agent] += 1
-                
-                best_agents = sorted(
-                    agent_counts.items(),
-                    key=lambda x: x[1],
-                    reverse=True
-                )[:3]
-                
-                pattern_id = f"context_{category}"
-                if pattern_id not in self.patterns:
-                    self.patterns[pattern_id] = Pattern(
-                        id=pattern_id,
-                        name=f"Experts for {category}",
-                        description=f"Best agents for {category}: {[a[0] for a in best_agents]}",
-                        pattern_type="context",
-                        conditions={"category": category},
-                        actions=[f"Assign {category} tasks to {best_agents[0][0]}"],
-                        success_rate=success_rate,
-                        occurrence_count=len(events),
-                        avg_quality=sum(e.quality_score for e in success_events) / len(success_events),
-                        example_events=[e.id for e in events[-5:]]
-                    )
-                    self._save_pattern(self.patterns[pattern_id])
-    
     def suggest(
         self,
         context: Dict[str, Any],
@@ -509,7 +780,7 @@ class PatternMiner:
     def get_stats(self) -> Dict[str, Any]:
         """Get pattern mining statistics."""
         return {
-            "total_events": len(self.events),
+            "total_events": self.aggregates.total_events,
             "total_patterns": len(self.patterns),
             "patterns_by_type": {
                 ptype: len([p for p in self.patterns.values() if p.pattern_type == ptype])
@@ -13,10 +13,16 @@ attributes:
     - Effort (1-10): Estimated complexity/time.
     - Risk (1-10): Probability of breaking things.
     - Dependencies (count): Number of blocking tasks.
+
+TaskScheduler keeps the ready tasks in a heap keyed by ROI and releases
+dependent tasks as their prerequisites complete, so each pick costs
+O(log n) instead of a re-sort of the whole backlog.
 """
 
 from dataclasses import dataclass, field
-from typing import List, Optional, Dict, Any
+from typing import Dict, Iterable, List, Optional, Any, Set, Tuple
+import heapq
+import itertools
 import math
 
 @dataclass
@@ -54,12 +60,15 @@ class TaskScorer:
         return sorted(tasks, key=lambda t: t.roi_score, reverse=True)
 
     def select_next_task(self, tasks: List[ScoredTask]) -> Optional[ScoredTask]:
-        """Select the single highest impact task."""
+        """Select the single highest impact task (first one on ties)."""
         if not tasks:
             return None
         
-        scored = self.score_tasks(tasks)
-        return scored[0]
+        return max(tasks, key=lambda t: t.roi_score)
+
+    def select_top_tasks(self, tasks: Iterable[ScoredTask], k: int) -> List[ScoredTask]:
+        """Select the k highest impact tasks, best first, without a full sort."""
+        return heapq.nlargest(k, tasks, key=lambda t: t.roi_score)
 
     def parse_task_metadata(self, task_description: str) -> Dict[str, float]:
         """
@@ -93,3 +102,216 @@ class TaskScorer:
                         pass
                         
         return attrs
+
+    def parse_task_links(self, task_description: str) -> Tuple[Optional[str], List[str]]:
+        """
+        Extract the task's own id and its prerequisites if present.
+        Expected format: "Publish [v=9 id=publish after=build,ci]"
+        """
+        import re
+
+        ref, dependencies = None, []
+        match = re.search(r"\[(.*?)\]", task_description)
+        if match:
+            for p in match.group(1).split():
+                k, _, v = p.partition("=")
+                if k == "id" and v:
+                    ref = v
+                elif k in ["after", "deps"]:
+                    dependencies.extend(dep for dep in v.split(",") if dep)
+        return ref, dependencies
+
+
+class TaskScheduler:
+    """
+    Long-lived ready queue over a dependency DAG.
+
+    A task is ready once every id in its ``dependencies`` has been
+    completed; ready tasks wait in a max-heap on ``roi_score`` (insertion
+    order breaks ties). Dependencies on ids the scheduler has never seen
+    (e.g. work tracked elsewhere) block until ``complete`` is called for
+    them.
+
+    Example:
+        scheduler = TaskScheduler([docs, tests, release])
+        picks = scheduler.assign(["agent-1", "agent-2"])
+        scheduler.complete(picks["agent-1"].id)  # may release new tasks
+    """
+
+    def __init__(self, tasks: Iterable[ScoredTask] = ()):
+        self._tasks: Dict[str, ScoredTask] = {}
+        self._done: Set[str] = set()
+        self._claimed: Set[str] = set()
+        # Unfinished prerequisites per waiting task, and the reverse edges
+        self._waiting: Dict[str, Set[str]] = {}
+        self._dependents: Dict[str, Set[str]] = {}
+        # Heap of (-roi, seq, task_id); an entry is live while _entries[task_id] == seq
+        self._heap: List[Tuple[float, int, str]] = []
+        self._entries: Dict[str, int] = {}
+        self._seq = itertools.count()
+
+        for task in tasks:
+            self.add(task)
+
+    def __len__(self) -> int:
+        """Number of ready (unclaimed) tasks."""
+        return len(self._entries)
+
+    def _push(self, task: ScoredTask) -> None:
+        seq = next(self._seq)
+        self._entries[task.id] = seq
+        heapq.heappush(self._heap, (-task.roi_score, seq, task.id))
+
+    def _prune(self) -> None:
+        """Drop stale heap entries from the top."""
+        while self._heap and self._entries.get(self._heap[0][2]) != self._heap[0][1]:
+            heapq.heappop(self._heap)
+
+    def _reaches(self, start: Iterable[str], target: str) -> bool:
+        """Whether ``target`` is among the transitive dependencies of ``start``."""
+        stack, seen = list(start), set()
+        while stack:
+            task_id = stack.pop()
+            if task_id == target:
+                return True
+            if task_id in seen or task_id not in self._tasks:
+                continue
+            seen.add(task_id)
+            stack.extend(self._tasks[task_id].dependencies)
+        return False
+
+    def add(self, task: ScoredTask) -> bool:
+        """
+        Add a task, or replace one with the same id (e.g. re-scored).
+
+        Returns:
+            True if the task is ready now
+
+        Raises:
+            ValueError: If the dependencies would form a cycle
+        """
+        # Only a known prerequisite can lead back to this task
+        known = [dep for dep in task.dependencies if dep in self._tasks]
+        if task.id in task.dependencies or (known and self._reaches(known, task.id)):
+            raise ValueError(f"Dependency cycle through task {task.id}")
+
+        claimed = task.id in self._claimed
+        self.remove(task.id)
+        self._tasks[task.id] = task
+        self._done.discard(task.id)
+
+        waiting = {dep for dep in task.dependencies if dep not in self._done}
+        for dep in waiting:
+            self._dependents.setdefault(dep, set()).add(task.id)
+        if waiting:
+            self._waiting[task.id] = waiting
+            return False
+        if claimed:
+            self._claimed.add(task.id)
+            return False
+        self._push(task)
+        return True
+
+    def remove(self, task_id: str) -> Optional[ScoredTask]:
+        """Forget a task without completing it (its dependents stay blocked)."""
+        task = self._tasks.pop(task_id, None)
+        self._entries.pop(task_id, None)
+        self._claimed.discard(task_id)
+        for dep in self._waiting.pop(task_id, ()):
+            self._dependents[dep].discard(task_id)
+            if not self._dependents[dep]:
+                del self._dependents[dep]
+        return task
+
+    def complete(self, task_id: str) -> List[ScoredTask]:
+        """
+        Mark a task (or an external dependency id) done.
+
+        Returns:
+            Tasks that became ready as a result
+        """
+        self.remove(task_id)
+        self._done.add(task_id)
+
+        released = []
+        for dependent in self._dependents.pop(task_id, ()):
+            waiting = self._waiting[dependent]
+            waiting.discard(task_id)
+            if not waiting:
+                del self._waiting[dependent]
+                self._push(self._tasks[dependent])
+                released.append(self._tasks[dependent])
+        return released
+
+    def update(self, tasks: Iterable[ScoredTask], done: Iterable[str]) -> None:
+        """
+        Bring the scheduler in line with a fresh snapshot of the backlog.
+
+        Only the differences are applied: tasks missing from ``tasks`` are
+        removed, ids newly in ``done`` are completed, new or changed tasks
+        are (re-)added and ids no longer done block their dependents again.
+        Unchanged tasks keep their place and their claims.
+
+        Args:
+            tasks: Every open task
+            done: Every completed id
+        """
+        tasks = list(tasks)
+        done = set(done)
+        current = {task.id for task in tasks}
+
+        for task_id in [task_id for task_id in self._tasks if task_id not in current]:
+            self.remove(task_id)
+        reopened = self._done - done
+        self._done -= reopened
+        for task_id in done - self._done:
+            self.complete(task_id)
+        for task in tasks:
+            if self._tasks.get(task.id) != task or reopened.intersection(task.dependencies):
+                self.add(task)
+
+    def is_ready(self, task_id: str) -> bool:
+        return task_id in self._entries
+
+    def blocked_by(self, task_id: str) -> List[str]:
+        """Unfinished prerequisites of a task."""
+        return sorted(self._waiting.get(task_id, ()))
+
+    def peek(self) -> Optional[ScoredTask]:
+        """Best ready task, without claiming it."""
+        self._prune()
+        return self._tasks[self._heap[0][2]] if self._heap else None
+
+    def pop(self, k: int = 1) -> List[ScoredTask]:
+        """
+        Claim up to k ready tasks, best ROI first.
+
+        Claimed tasks leave the ready queue until ``complete`` or
+        ``release`` is called for them.
+        """
+        picked = []
+        while len(picked) < k:
+            self._prune()
+            if not self._heap:
+                break
+            _, _, task_id = heapq.heappop(self._heap)
+            del self._entries[task_id]
+            self._claimed.add(task_id)
+            picked.append(self._tasks[task_id])
+        return picked
+
+    def assign(self, agents: List[str]) -> Dict[str, ScoredTask]:
+        """
+        Hand one ready task to each agent, best tasks to the first agents.
+
+        Agents beyond the number of ready tasks get nothing.
+        """
+        return dict(zip(agents, self.pop(len(agents))))
+
+    def release(self, task_id: str) -> bool:
+        """Put a claimed task back in the ready queue (e.g. its agent failed)."""
+        if task_id not in self._claimed:
+            return False
+        self._claimed.discard(task_id)
+        self._push(self._tasks[task_id])
+        return True
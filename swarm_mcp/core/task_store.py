@@ -0,0 +1,593 @@
+"""
+Task Store - Transactional storage behind MASTER_TASK_LOG.md.
+
+🐺 The pack keeps one ledger; the markdown is how it reads aloud.
+
+The swarm-tasks server used to treat the markdown log as its database.
+Tasks now live in one SQLite database in WAL mode and the markdown is
+rendered from it:
+
+    tasks   - One row per line of a managed section body (section,
+              position, kind, done, text, ROI inputs and score, and the
+              ``id=``/``after=`` links)
+    layout  - Everything outside the managed sections, in order, with a
+              placeholder row where each section body goes
+    meta    - Per-section versions and the signature of the last render
+
+Lookups go through indexes on (section, done, roi) and (section, text).
+Each change runs in one ``BEGIN IMMEDIATE`` transaction and re-renders only
+the sections whose version moved. Ready queues (TaskScheduler) live as
+long as the store and are updated in place by each change. The markdown is still the file humans
+edit: when it changes on disk behind the store's back it is re-imported
+before the next operation.
+"""
+
+import os
+import re
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+from .locking import file_lock
+from .task_scoring import ScoredTask, TaskScheduler, TaskScorer
+
+
+# Managed sections: name -> heading prefix in the log
+SECTIONS = {
+    "INBOX": "## 📥 INBOX",
+    "THIS WEEK": "## 🎯 THIS WEEK",
+    "WAITING ON": "## ⏳ WAITING ON",
+    "PARKED": "## 🧊 PARKED",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY,
+    section TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    indent TEXT NOT NULL DEFAULT '',
+    done INTEGER NOT NULL DEFAULT 0,
+    text TEXT NOT NULL,
+    value REAL,
+    urgency REAL,
+    effort REAL,
+    risk REAL,
+    roi REAL,
+    ref TEXT,
+    after TEXT NOT NULL DEFAULT ''
+);
+CREATE INDEX IF NOT EXISTS tasks_order ON tasks (section, position);
+CREATE INDEX IF NOT EXISTS tasks_open ON tasks (section, kind, done, roi DESC, position);
+CREATE INDEX IF NOT EXISTS tasks_text ON tasks (section, text);
+
+CREATE TABLE IF NOT EXISTS layout (
+    seq INTEGER PRIMARY KEY,
+    section TEXT,
+    chunk TEXT NOT NULL DEFAULT ''
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+INSERT_TASK = (
+    "INSERT INTO tasks (section, position, kind, indent, done, text, value, urgency, effort, risk, roi, ref, after) "
+    "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"
+)
+
+TASK_LINE = re.compile(r"^(\s*)- \[([ xX])\] (.*)$")
+LAST_UPDATED = re.compile(r"\*\*Last Updated:\*\* \d{4}-\d{2}-\d{2}")
+
+
+def parse_log(content: str) -> Tuple[List[Tuple[Optional[str], str]], Dict[str, List[str]]]:
+    """
+    Split a task log into layout chunks and managed section bodies.
+
+    A section body is what the server's regexes always captured: the text
+    after the first blank line below the heading, up to the next ``---``.
+
+    Returns:
+        (layout, bodies) - layout is a list of (section, chunk) where
+        section is None for literal text; bodies maps section -> lines
+    """
+    spans = []
+    for name, heading in SECTIONS.items():
+        match = re.search(rf"{re.escape(heading)}.*?\n\n(.*?)\n---", content, re.DOTALL)
+        if match:
+            spans.append((match.start(1), match.end(1), name))
+    spans.sort()
+
+    layout: List[Tuple[Optional[str], str]] = []
+    bodies: Dict[str, List[str]] = {}
+    cursor = 0
+    for start, end, name in spans:
+        if start < cursor:
+            continue
+        layout.append((None, content[cursor:start]))
+        layout.append((name, ""))
+        bodies[name] = content[start:end].split("\n")
+        cursor = end
+    layout.append((None, content[cursor:]))
+    return layout, bodies
+
+
+class TaskStore:
+    """
+    🐺 SQLite (WAL) task store that renders MASTER_TASK_LOG.md.
+
+    Each thread gets its own connection. Writers hold a file lock next to
+    the database while they change rows and re-render, so the markdown is
+    never written by two processes at once.
+
+    Example:
+        store = TaskStore("./MASTER_TASK_LOG.db", "./MASTER_TASK_LOG.md")
+        store.add_task("INBOX", "Fix login [v=8 u=9 e=2]")
+        store.complete_task("INBOX", "Fix login")
+        best = store.top_tasks("INBOX", k=1)
+        ready = store.scheduler("INBOX").peek()
+        picks = store.assign("INBOX", ["agent-1", "agent-2"])
+    """
+
+    def __init__(
+        self,
+        db_path: Union[str, Path],
+        log_path: Union[str, Path],
+        busy_timeout_ms: int = 5000
+    ):
+        """
+        Initialize task store.
+
+        Args:
+            db_path: Database file (created if missing)
+            log_path: Markdown task log to import from and render to
+            busy_timeout_ms: How long writers wait for the database lock
+        """
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.log_path = Path(log_path)
+        self.busy_timeout_ms = busy_timeout_ms
+        self._lock_path = self.db_path.with_name(self.db_path.name + ".lock")
+        self._local = threading.local()
+        self._scorer = TaskScorer()
+
+        # Rendered section bodies: section -> (version, text)
+        self._rendered: Dict[str, Tuple[str, str]] = {}
+        self._render_guard = threading.Lock()
+
+        # Ready queues: section -> (section versions they reflect, scheduler)
+        self._schedulers: Dict[str, Tuple[Tuple[str, ...], TaskScheduler]] = {}
+        self._scheduler_guard = threading.RLock()
+
+        # executescript() commits first, so the transaction is in the script
+        self._conn().executescript(f"BEGIN IMMEDIATE;\n{SCHEMA}\nCOMMIT;")
+        self._add_link_columns()
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.db_path), isolation_level=None, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            conn.execute(f"PRAGMA busy_timeout = {int(self.busy_timeout_ms)}")
+            conn.execute("PRAGMA journal_mode = WAL")
+            conn.execute("PRAGMA synchronous = NORMAL")
+            self._local.conn = conn
+        return conn
+
+    @contextmanager
+    def _write(self) -> Iterator[sqlite3.Connection]:
+        """Run a block in one write transaction."""
+        conn = self._conn()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            yield conn
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        conn.execute("COMMIT")
+
+    def _add_link_columns(self) -> None:
+        """Give a database that predates the link columns its ``ref``/``after`` values."""
+        with self._write() as conn:
+            columns = {row["name"] for row in conn.execute("PRAGMA table_info(tasks)")}
+            if "ref" in columns:
+                return
+            conn.execute("ALTER TABLE tasks ADD COLUMN ref TEXT")
+            conn.execute("ALTER TABLE tasks ADD COLUMN after TEXT NOT NULL DEFAULT ''")
+            rows = conn.execute("SELECT id, text FROM tasks WHERE kind = 'task'").fetchall()
+            for row in rows:
+                ref, dependencies = self._scorer.parse_task_links(row["text"])
+                conn.execute(
+                    "UPDATE tasks SET ref = ?, after = ? WHERE id = ?",
+                    (ref, ",".join(dependencies), row["id"])
+                )
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # --- Markdown sync ---
+
+    def _log_signature(self) -> str:
+        try:
+            stat = self.log_path.stat()
+        except FileNotFoundError:
+            return "missing"
+        return f"{stat.st_ino}:{stat.st_mtime_ns}:{stat.st_size}"
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self._conn().execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row["value"] if row else None
+
+    @staticmethod
+    def _set_meta(conn: sqlite3.Connection, key: str, value: str) -> None:
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, ?) "
+            "ON CONFLICT (key) DO UPDATE SET value = excluded.value",
+            (key, value)
+        )
+
+    @staticmethod
+    def _bump(conn: sqlite3.Connection, section: str) -> None:
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES (?, '1') "
+            "ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1",
+            (f"version:{section}",)
+        )
+
+    def _row(self, section: str, position: int, line: str) -> Tuple[Any, ...]:
+        match = TASK_LINE.match(line)
+        if not match:
+            kind = "item" if line.strip().startswith("-") else "text"
+            return (section, position, kind, "", 0, line, None, None, None, None, None, None, "")
+
+        indent, mark, text = match.groups()
+        attrs = self._scorer.parse_task_metadata(text)
+        ref, dependencies = self._scorer.parse_task_links(text)
+        task = ScoredTask(id="", description=text, dependencies=dependencies, **attrs)
+        return (
+            section, position, "task", indent, int(mark != " "), text,
+            task.value, task.urgency, task.effort, task.risk, task.roi_score,
+            ref, ",".join(dependencies)
+        )
+
+    def _import(self, conn: sqlite3.Connection, content: str) -> None:
+        """Replace all rows with the contents of a markdown log."""
+        layout, bodies = parse_log(content)
+        conn.execute("DELETE FROM tasks")
+        conn.execute("DELETE FROM layout")
+        conn.executemany(
+            "INSERT INTO layout (seq, section, chunk) VALUES (?, ?, ?)",
+            [(seq, section, chunk) for seq, (section, chunk) in enumerate(layout)]
+        )
+        conn.executemany(
+            INSERT_TASK,
+            [
+                self._row(section, position, line)
+                for section, lines in bodies.items()
+                for position, line in enumerate(lines)
+            ]
+        )
+        for section in SECTIONS:
+            self._bump(conn, section)
+
+    def sync(self) -> bool:
+        """
+        Re-import the markdown log if it changed since the last render.
+
+        Returns:
+            True if the log was (re-)imported
+        """
+        if self._meta("log_signature") == self._log_signature():
+            return False
+        with file_lock(self._lock_path):
+            return self._sync_locked()
+
+    def _sync_locked(self) -> bool:
+        signature = self._log_signature()
+        if self._meta("log_signature") == signature:
+            return False
+        content = self.log_path.read_text(encoding="utf-8") if signature != "missing" else ""
+        with self._write() as conn:
+            self._import(conn, content)
+            self._set_meta(conn, "log_signature", signature)
+        return True
+
+    @contextmanager
+    def _change(self) -> Iterator[sqlite3.Connection]:
+        """
+        Locked, synced write transaction. If the block changed any rows the
+        Last Updated stamp is refreshed and the log re-rendered.
+        """
+        with file_lock(self._lock_path):
+            self._sync_locked()
+            with self._write() as conn:
+                before = conn.total_changes
+                yield conn
+                changed = conn.total_changes != before
+                if changed:
+                    self._touch(conn)
+            if changed:
+                self._render()
+
+    @staticmethod
+    def _touch(conn: sqlite3.Connection) -> None:
+        """Set the log's Last Updated date to today."""
+        row = conn.execute(
+            "SELECT seq, chunk FROM layout WHERE section IS NULL AND chunk LIKE '%**Last Updated:**%' "
+            "ORDER BY seq LIMIT 1"
+        ).fetchone()
+        if row is not None:
+            stamp = f"**Last Updated:** {datetime.now().strftime('%Y-%m-%d')}"
+            conn.execute("UPDATE layout SET chunk = ? WHERE seq = ?", (LAST_UPDATED.sub(stamp, row["chunk"]), row["seq"]))
+
+    def _section_text(self, section: str, version: str) -> str:
+        cached = self._rendered.get(section)
+        if cached and cached[0] == version:
+            return cached[1]
+        rows = self._conn().execute(
+            "SELECT kind, indent, done, text FROM tasks WHERE section = ? ORDER BY position", (section,)
+        )
+        text = "\n".join(self._line(row) for row in rows)
+        self._rendered[section] = (version, text)
+        return text
+
+    @staticmethod
+    def _line(row: sqlite3.Row) -> str:
+        if row["kind"] != "task":
+            return row["text"]
+        return f"{row['indent']}- [{'x' if row['done'] else ' '}] {row['text']}"
+
+    def render(self) -> str:
+        """The markdown log, re-reading only sections that changed."""
+        self.sync()
+        return self._render_text()
+
+    def _render_text(self) -> str:
+        with self._render_guard:
+            versions = {
+                row["key"][len("version:"):]: row["value"]
+                for row in self._conn().execute("SELECT key, value FROM meta WHERE key LIKE 'version:%'")
+            }
+            parts = []
+            for row in self._conn().execute("SELECT section, chunk FROM layout ORDER BY seq"):
+                if row["section"] is None:
+                    parts.append(row["chunk"])
+                else:
+                    parts.append(self._section_text(row["section"], versions.get(row["section"], "0")))
+            return "".join(parts)
+
+    def _render(self) -> None:
+        """Write the log atomically and remember its signature (lock held)."""
+        tmp_path = self.log_path.with_name(f".{self.log_path.name}.tmp")
+        tmp_path.write_text(self._render_text(), encoding="utf-8")
+        os.replace(tmp_path, self.log_path)
+        with self._write() as conn:
+            self._set_meta(conn, "log_signature", self._log_signature())
+
+    # --- Queries & updates ---
+
+    def has_section(self, section: str) -> bool:
+        """Whether the log contains the section."""
+        self.sync()
+        row = self._conn().execute("SELECT 1 FROM layout WHERE section = ?", (section,)).fetchone()
+        return row is not None
+
+    def get_lines(self, section: str) -> List[str]:
+        """List lines (tasks and other ``-`` items) of a section, in order."""
+        self.sync()
+        rows = self._conn().execute(
+            "SELECT kind, indent, done, text FROM tasks WHERE section = ? AND kind != 'text' ORDER BY position",
+            (section,)
+        )
+        return [self._line(row).strip() for row in rows]
+
+    def add_task(self, section: str, text: str) -> bool:
+        """
+        Append an open task after the last line of a section.
+
+        Returns:
+            False if the section is not in the log
+        """
+        with self._change() as conn:
+            if conn.execute("SELECT 1 FROM layout WHERE section = ?", (section,)).fetchone() is None:
+                return False
+            last = conn.execute(
+                "SELECT MAX(position) FROM tasks WHERE section = ? AND trim(text) != ''", (section,)
+            ).fetchone()[0]
+            position = -1 if last is None else last
+            # Shift the trailing blank line(s) down to keep the gap before ---
+            conn.execute(
+                "UPDATE tasks SET position = position + 1 WHERE section = ? AND position > ?",
+                (section, position)
+            )
+            before = self._versions(conn)
+            row = self._row(section, position + 1, f"- [ ] {text}")
+            row_id = conn.execute(INSERT_TASK, row).lastrowid
+            self._bump(conn, section)
+            after = self._versions(conn)
+        task = self._task(row_id, row[5], row[11], row[12], *row[6:10])
+
+        def apply(name: str, scheduler: TaskScheduler) -> None:
+            if name == section:
+                scheduler.add(task)
+
+        self._update_schedulers(before, after, apply)
+        return True
+
+    def complete_task(self, section: str, description: str) -> Optional[str]:
+        """
+        Tick the first open task whose text contains ``description``.
+
+        An exact text match is found through the index; otherwise the open
+        tasks of the section are searched by substring.
+
+        Returns:
+            The completed task's text, or None if no open task matches
+        """
+        with self._change() as conn:
+            row = conn.execute(
+                "SELECT id, text, ref FROM tasks WHERE section = ? AND text = ? AND kind = 'task' AND done = 0 "
+                "ORDER BY position LIMIT 1",
+                (section, description)
+            ).fetchone()
+            if row is None:
+                row = conn.execute(
+                    "SELECT id, text, ref FROM tasks WHERE section = ? AND kind = 'task' AND done = 0 "
+                    "AND instr(text, ?) > 0 ORDER BY position LIMIT 1",
+                    (section, description)
+                ).fetchone()
+            if row is None:
+                return None
+            before = self._versions(conn)
+            conn.execute("UPDATE tasks SET done = 1 WHERE id = ?", (row["id"],))
+            self._bump(conn, section)
+            after = self._versions(conn)
+        # Other sections only care about the id their tasks may wait on
+        def apply(name: str, scheduler: TaskScheduler) -> None:
+            if name == section:
+                scheduler.complete(row["ref"] or f"task_{row['id']}")
+            elif row["ref"]:
+                scheduler.complete(row["ref"])
+
+        self._update_schedulers(before, after, apply)
+        return row["text"]
+
+    def top_tasks(self, section: str, k: int = 1) -> List[ScoredTask]:
+        """
+        🐺 Open tasks of a section with the best ROI, first in log order on ties.
+
+        Args:
+            section: Section name
+            k: How many tasks
+
+        Returns:
+            ScoredTask list (id is ``task_<row id>``)
+        """
+        self.sync()
+        rows = self._conn().execute(
+            "SELECT id, text, value, urgency, effort, risk FROM tasks "
+            "WHERE section = ? AND kind = 'task' AND done = 0 ORDER BY roi DESC, position LIMIT ?",
+            (section, k)
+        )
+        return [
+            ScoredTask(
+                id=f"task_{row['id']}",
+                description=row["text"],
+                value=row["value"],
+                urgency=row["urgency"],
+                effort=row["effort"],
+                risk=row["risk"]
+            )
+            for row in rows
+        ]
+
+    # --- Scheduling ---
+
+    @staticmethod
+    def _versions(conn: sqlite3.Connection) -> Tuple[str, ...]:
+        """Versions of every section; any change to the tasks moves one of them."""
+        return tuple(
+            f"{row['key']}={row['value']}"
+            for row in conn.execute("SELECT key, value FROM meta WHERE key LIKE 'version:%' ORDER BY key")
+        )
+
+    @staticmethod
+    def _task(row_id: int, text: str, ref: Optional[str], after: str, *scores: float) -> ScoredTask:
+        value, urgency, effort, risk = scores
+        return ScoredTask(
+            id=ref or f"task_{row_id}",
+            description=text,
+            value=value,
+            urgency=urgency,
+            effort=effort,
+            risk=risk,
+            dependencies=after.split(",") if after else []
+        )
+
+    def _update_schedulers(
+        self,
+        before: Tuple[str, ...],
+        after: Tuple[str, ...],
+        apply: Callable[[str, TaskScheduler], Any]
+    ) -> None:
+        """
+        Apply a committed change to the ready queues that were current
+        before it. Queues that missed another change are reloaded on their
+        next use instead.
+        """
+        with self._scheduler_guard:
+            for section, (versions, scheduler) in list(self._schedulers.items()):
+                if versions != before:
+                    continue
+                try:
+                    apply(section, scheduler)
+                except ValueError:
+                    # A new dependency cycle: let the next reload report it
+                    del self._schedulers[section]
+                    continue
+                self._schedulers[section] = (after, scheduler)
+
+    def _load(self, section: str, scheduler: TaskScheduler) -> None:
+        """Bring a ready queue in line with the stored tasks, keeping its claims."""
+        rows = self._conn().execute(
+            "SELECT id, done, text, ref, after, value, urgency, effort, risk FROM tasks "
+            "WHERE kind = 'task' AND (done = 1 OR section = ?) ORDER BY position",
+            (section,)
+        ).fetchall()
+        scheduler.update(
+            [self._task(row["id"], row["text"], row["ref"], row["after"], *row[5:]) for row in rows if not row["done"]],
+            {row["ref"] for row in rows if row["done"] and row["ref"]}
+        )
+
+    def scheduler(self, section: str) -> TaskScheduler:
+        """
+        🐺 Ready queue over the open tasks of a section, honouring dependencies.
+
+        A task names itself with ``id=`` and its prerequisites with
+        ``after=`` in its metadata, e.g. ``Publish [v=9 id=publish after=build]``.
+        A prerequisite is met once a ticked task anywhere in the log carries
+        that id; until then the task stays blocked.
+
+        The queue is kept for the life of the store: ``add_task`` and
+        ``complete_task`` update it in place, and changes made elsewhere
+        (other processes, edits to the markdown) are folded in on the next
+        call. Tasks claimed with ``pop``/``assign`` stay claimed.
+
+        Args:
+            section: Section name
+
+        Returns:
+            TaskScheduler whose ids are the tasks' ``id=`` (else ``task_<row id>``)
+        """
+        self.sync()
+        with self._scheduler_guard:
+            versions = self._versions(self._conn())
+            cached = self._schedulers.get(section)
+            if cached is not None and cached[0] == versions:
+                return cached[1]
+            scheduler = cached[1] if cached is not None else TaskScheduler()
+            self._load(section, scheduler)
+            self._schedulers[section] = (versions, scheduler)
+            return scheduler
+
+    def claim(self, section: str, k: int = 1) -> List[ScoredTask]:
+        """Claim up to k ready tasks of a section, best ROI first."""
+        with self._scheduler_guard:
+            return self.scheduler(section).pop(k)
+
+    def assign(self, section: str, agents: List[str]) -> Dict[str, ScoredTask]:
+        """Hand one ready task of a section to each agent, best tasks to the first agents."""
+        with self._scheduler_guard:
+            return self.scheduler(section).assign(agents)
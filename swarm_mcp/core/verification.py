@@ -4,16 +4,36 @@ Automated Verification Harness
 
 Ensures "claims" of work are backed by machine-verifiable proof.
 No "done" without verification.
+
+Suites run concurrently: identical checks run once, test runs are capped
+at a bounded number of pytest processes, and page fetches share one
+pooled HTTP session. A suite takes roughly as long as its slowest check.
 """
 
+import datetime
+import os
 import subprocess
-import requests
 import json
-from dataclasses import dataclass, field
-from typing import List, Dict, Any, Optional, Union
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field, replace
+from typing import Iterator, List, Dict, Any, Optional, Tuple, Union
 from enum import Enum
 from pathlib import Path
 
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+    HAS_REQUESTS = True
+except ImportError:
+    HAS_REQUESTS = False
+
+# Per-check timeouts in seconds (a check may override with "timeout")
+DEFAULT_TIMEOUTS = {
+    "page_fetch": 10,
+    "unit_test": 60,
+}
+
 class VerificationType(Enum):
     PAGE_FETCH = "page_fetch"
     SCREENSHOT_DIFF = "screenshot_diff" # Placeholder for now
@@ -32,13 +52,53 @@ class VerificationResult:
 class VerificationHarness:
     """Runs automated checks to verify task completion."""
 
-    def __init__(self, workspace_root: str = "."):
+    def __init__(
+        self,
+        workspace_root: str = ".",
+        max_workers: int = 8,
+        max_test_processes: Optional[int] = None
+    ):
+        """
+        Args:
+            workspace_root: Directory checks run in
+            max_workers: Checks run at the same time within a suite
+            max_test_processes: Concurrent pytest processes (default: CPU count)
+        """
         self.workspace_root = Path(workspace_root)
+        self.max_workers = max_workers
+        self._test_slots = threading.BoundedSemaphore(max_test_processes or os.cpu_count() or 2)
+        self._session = None
+        self._session_lock = threading.Lock()
+
+    def _http(self) -> "requests.Session":
+        """Shared session, so fetches to the same host reuse connections."""
+        with self._session_lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=self.max_workers, pool_maxsize=self.max_workers)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._session = session
+            return self._session
 
-    def verify_page_fetch(self, url: str, expected_content: Optional[str] = None) -> VerificationResult:
+    def close(self) -> None:
+        """Close pooled HTTP connections."""
+        with self._session_lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+    def verify_page_fetch(
+        self,
+        url: str,
+        expected_content: Optional[str] = None,
+        timeout: float = DEFAULT_TIMEOUTS["page_fetch"]
+    ) -> VerificationResult:
         """Verify a URL returns 200 OK and optionally contains text."""
         try:
-            response = requests.get(url, timeout=10)
+            if not HAS_REQUESTS:
+                raise RuntimeError("requests is not installed (pip install swarm-mcp[full])")
+            response = self._http().get(url, timeout=timeout)
             passed = response.status_code == 200
             details = f"Status: {response.status_code}"
             
@@ -65,19 +125,24 @@ class VerificationHarness:
                 timestamp=""
             )
 
-    def verify_unit_test(self, test_path: str) -> VerificationResult:
+    def verify_unit_test(
+        self,
+        test_path: str,
+        timeout: float = DEFAULT_TIMEOUTS["unit_test"]
+    ) -> VerificationResult:
         """Run a specific unit test file."""
         import sys
         try:
             # Assume python/pytest for now
             cmd = [sys.executable, "-m", "pytest", test_path]
-            result = subprocess.run(
-                cmd, 
-                cwd=self.workspace_root,
-                capture_output=True,
-                text=True,
-                timeout=60
-            )
+            with self._test_slots:
+                result = subprocess.run(
+                    cmd, 
+                    cwd=self.workspace_root,
+                    capture_output=True,
+                    text=True,
+                    timeout=timeout
+                )
             
             passed = result.returncode == 0
             details = result.stdout[-500:] if passed else result.stdout + "\n" + result.stderr
@@ -110,26 +175,52 @@ class VerificationHarness:
             timestamp=""
         )
 
-    def run_suite(self, checks: List[Dict[str, Any]]) -> List[VerificationResult]:
-        """Run a suite of verification checks."""
-        results = []
-        import datetime
+    def run_check(self, check: Dict[str, Any]) -> Optional[VerificationResult]:
+        """Run one check dict ({"type", "target", "extra", "timeout"}); None if the type is unknown."""
+        c_type = check.get("type")
+        target = check.get("target")
+        extra = check.get("extra", {})
+        timeout = check.get("timeout", DEFAULT_TIMEOUTS.get(c_type))
         
-        for check in checks:
-            c_type = check.get("type")
-            target = check.get("target")
-            extra = check.get("extra", {})
-            
-            res = None
-            if c_type == "page_fetch":
-                res = self.verify_page_fetch(target, extra.get("expected_content"))
-            elif c_type == "unit_test":
-                res = self.verify_unit_test(target)
-            elif c_type == "file_exists":
-                res = self.verify_file_exists(target)
-            
-            if res:
-                res.timestamp = datetime.datetime.now().isoformat()
-                results.append(res)
-                
-        return results
+        res = None
+        if c_type == "page_fetch":
+            res = self.verify_page_fetch(target, extra.get("expected_content"), timeout=timeout)
+        elif c_type == "unit_test":
+            res = self.verify_unit_test(target, timeout=timeout)
+        elif c_type == "file_exists":
+            res = self.verify_file_exists(target)
+        
+        if res:
+            res.timestamp = datetime.datetime.now().isoformat()
+        return res
+
+    def iter_suite(self, checks: List[Dict[str, Any]]) -> Iterator[Tuple[int, VerificationResult]]:
+        """
+        Run checks concurrently, yielding (index, result) as each finishes.
+        
+        Identical checks run once and every copy gets the result. Checks of
+        unknown type yield nothing.
+        """
+        groups: Dict[str, List[int]] = {}
+        for index, check in enumerate(checks):
+            key = json.dumps(check, sort_keys=True, default=str)
+            groups.setdefault(key, []).append(index)
+        if not groups:
+            return
+        
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(groups))) as pool:
+            futures = {
+                pool.submit(self.run_check, checks[indexes[0]]): indexes
+                for indexes in groups.values()
+            }
+            for future in as_completed(futures):
+                res = future.result()
+                if res is None:
+                    continue
+                for n, index in enumerate(futures[future]):
+                    yield index, res if n == 0 else replace(res)
+
+    def run_suite(self, checks: List[Dict[str, Any]]) -> List[VerificationResult]:
+        """Run a suite of verification checks; results follow the order of checks."""
+        results = dict(self.iter_suite(checks))
+        return [results[index] for index in sorted(results)]
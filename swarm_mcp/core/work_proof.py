@@ -13,6 +13,10 @@ How It Works:
 3. After work: Generate proof (before/after hashes, git commits, time spent)
 4. Verification: Anyone can verify the proof is valid
 
+Content hashes are cached by (path, size, mtime_ns, inode), so proving a
+large work set only re-reads files whose metadata changed. Git evidence is
+gathered with one batched call per kind instead of one call per file.
+
 Use Cases:
 - Leaderboard integrity (only count real work)
 - Task handoffs (prove what was done)
@@ -25,13 +29,24 @@ License: MIT
 
 import json
 import hashlib
+import os
 import subprocess
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 
+# Files are hashed in chunks of this size, never read whole
+HASH_CHUNK_SIZE = 1024 * 1024
+# Hash cache entries kept on disk
+HASH_CACHE_LIMIT = 10000
+# Files modified more recently than this are not cached (mtime granularity)
+RACY_WINDOW_NS = 2_000_000_000
+# Paths per git invocation (keeps the command line under OS limits)
+GIT_PATHS_PER_CALL = 500
+
 @dataclass
 class FileSnapshot:
     """Snapshot of a file at a point in time."""
@@ -131,35 +146,81 @@ class WorkProofSystem:
         
         self.active_commitments: Dict[str, WorkCommitment] = {}
         self._load_commitments()
+        
+        # path -> [size, mtime_ns, inode, sha256], shared across instances
+        self.hash_cache_file = self.storage_dir / "hash_cache.json"
+        self._hash_cache: Dict[str, List[Any]] = {}
+        self._hash_cache_dirty = False
+        self._load_hash_cache()
     
     def _generate_hash(self, data: str) -> str:
         """Generate SHA256 hash."""
         return hashlib.sha256(data.encode()).hexdigest()
     
     def _file_hash(self, path: Path) -> str:
-        """Generate hash of file contents."""
-        if not path.exists():
-            return ""
+        """Generate hash of file contents, streamed in chunks."""
         try:
-            content = path.read_bytes()
-            return hashlib.sha256(content).hexdigest()
+            digest = hashlib.sha256()
+            with open(path, "rb") as handle:
+                for chunk in iter(lambda: handle.read(HASH_CHUNK_SIZE), b""):
+                    digest.update(chunk)
+            return digest.hexdigest()
         except Exception:
             return ""
     
+    def _load_hash_cache(self):
+        """Load cached content hashes."""
+        try:
+            self._hash_cache = json.loads(self.hash_cache_file.read_text())
+        except Exception:
+            self._hash_cache = {}
+    
+    def _save_hash_cache(self):
+        """Persist cached content hashes (atomically, newest entries kept)."""
+        if not self._hash_cache_dirty:
+            return
+        entries = list(self._hash_cache.items())[-HASH_CACHE_LIMIT:]
+        self._hash_cache = dict(entries)
+        tmp_file = self.hash_cache_file.with_name(f".{self.hash_cache_file.name}.{os.getpid()}.tmp")
+        try:
+            tmp_file.write_text(json.dumps(self._hash_cache))
+            os.replace(tmp_file, self.hash_cache_file)
+            self._hash_cache_dirty = False
+        except Exception:
+            tmp_file.unlink(missing_ok=True)
+    
+    def _cached_hash(self, file_path: Path, stat: os.stat_result) -> str:
+        """
+        Content hash, re-read only if size, mtime or inode changed.
+        
+        Files modified within the last RACY_WINDOW_NS are hashed but not
+        cached: another write in the same mtime tick could keep the size
+        and timestamp while changing the content.
+        """
+        key = str(file_path)
+        signature = [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+        cached = self._hash_cache.get(key)
+        if cached and cached[:3] == signature:
+            return cached[3]
+        
+        content_hash = self._file_hash(file_path)
+        if content_hash and time.time_ns() - stat.st_mtime_ns > RACY_WINDOW_NS:
+            self._hash_cache.pop(key, None)
+            self._hash_cache[key] = signature + [content_hash]
+            self._hash_cache_dirty = True
+        return content_hash
+    
     def _snapshot_file(self, path: str) -> FileSnapshot:
         """Take a snapshot of a file."""
         file_path = self.repo_path / path
         
-        if not file_path.exists():
-            return FileSnapshot(path=path, exists=False)
-        
         try:
             stat = file_path.stat()
             return FileSnapshot(
                 path=path,
                 exists=True,
                 size=stat.st_size,
-                content_hash=self._file_hash(file_path),
+                content_hash=self._cached_hash(file_path, stat),
                 last_modified=datetime.fromtimestamp(stat.st_mtime)
             )
         except Exception:
@@ -235,7 +296,7 @@ class WorkProofSystem:
         return []
     
     def _get_git_diff_stats(self, files: List[str]) -> Dict[str, Any]:
-        """Get git diff statistics for files."""
+        """Get git diff statistics for files (batched, not one call per file)."""
         stats = {
             "insertions": 0,
             "deletions": 0,
@@ -243,16 +304,18 @@ class WorkProofSystem:
         }
         
         try:
-            for file in files:
+            for start in range(0, len(files), GIT_PATHS_PER_CALL):
                 result = subprocess.run(
-                    ["git", "diff", "--numstat", "HEAD~1", "--", file],
+                    ["git", "diff", "--numstat", "HEAD~1", "--", *files[start:start + GIT_PATHS_PER_CALL]],
                     cwd=self.repo_path,
                     capture_output=True,
                     text=True,
                     timeout=10
                 )
-                if result.returncode == 0 and result.stdout.strip():
-                    parts = result.stdout.strip().split()
+                if result.returncode != 0:
+                    continue
+                for line in result.stdout.splitlines():
+                    parts = line.split()
                     if len(parts) >= 2:
                         try:
                             stats["insertions"] += int(parts[0]) if parts[0] != "-" else 0
@@ -265,6 +328,26 @@ class WorkProofSystem:
         
         return stats
     
+    def _get_missing_commits(self, commits: List[str]) -> List[str]:
+        """Commits the repository does not know, checked in one git call."""
+        if not commits:
+            return []
+        result = subprocess.run(
+            ["git", "cat-file", "--batch-check"],
+            cwd=self.repo_path,
+            input="".join(f"{commit_hash}\n" for commit_hash in commits),
+            capture_output=True,
+            text=True,
+            timeout=10
+        )
+        if result.returncode != 0:
+            raise RuntimeError(result.stderr)
+        return [
+            line.split()[0]
+            for line in result.stdout.splitlines()
+            if line.endswith(" missing")
+        ]
+    
     def commit(
         self,
         agent_id: str,
@@ -292,6 +375,7 @@ class WorkProofSystem:
         before_snapshots = {}
         for file in files:
             before_snapshots[file] = self._snapshot_file(file)
+        self._save_hash_cache()
         
         # Create commitment
         timestamp = datetime.now().strftime("%Y%m%d%H%M%S")
@@ -344,6 +428,7 @@ class WorkProofSystem:
                 files_deleted.append(file)
             elif before_snap.content_hash != after_snap.content_hash:
                 files_modified.append(file)
+        self._save_hash_cache()
         
         # Get git evidence
         git_commits = self._get_git_commits_since(commitment.created_at)
@@ -461,18 +546,11 @@ class WorkProofSystem:
                     issues.append(f"File claimed modified but hashes match: {file}")
         
         # Check git commits exist (if we can)
-        for commit_hash in proof.git_commits:
-            try:
-                result = subprocess.run(
-                    ["git", "cat-file", "-t", commit_hash],
-                    cwd=self.repo_path,
-                    capture_output=True,
-                    timeout=5
-                )
-                if result.returncode != 0:
-                    issues.append(f"Git commit not found: {commit_hash}")
-            except Exception:
-                pass  # Can't verify git, skip
+        try:
+            for commit_hash in self._get_missing_commits(proof.git_commits):
+                issues.append(f"Git commit not found: {commit_hash}")
+        except Exception:
+            pass  # Can't verify git, skip
         
         is_valid = len(issues) == 0 and proof.valid
         return is_valid, issues
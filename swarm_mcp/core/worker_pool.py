@@ -0,0 +1,301 @@
+"""
+Worker Pool - Warm Python workers that run modules as ``python -m`` would.
+
+🐺 The pack stays on its feet between hunts.
+
+Starting an interpreter and importing a tool's dependencies costs far more
+than most tools take to run. ModuleWorkerPool keeps a few worker processes
+alive with the common modules already imported; each call runs a module
+as ``__main__`` inside a worker (``runpy``) with its file descriptors 1 and
+2 pointed at temporary files, so everything the tool prints - including
+logging handlers and child processes - is captured like a subprocess run.
+
+Each call gets the worker's working directory and environment back when it
+returns. Workers are recycled after ``max_runs`` calls, when their resident
+memory has grown by more than ``max_rss_growth_mb`` since start-up, when a
+call leaves threads running, and when a call times out or the worker dies.
+"""
+
+import atexit
+import importlib
+import multiprocessing
+import os
+import queue
+import runpy
+import sys
+import tempfile
+import threading
+import traceback
+import weakref
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List, Optional, Sequence, Union
+
+try:
+    import resource
+    HAS_RESOURCE = True
+except ImportError:  # Windows
+    HAS_RESOURCE = False
+
+
+_open_pools: "weakref.WeakSet[ModuleWorkerPool]" = weakref.WeakSet()
+
+
+@atexit.register
+def _close_open_pools() -> None:
+    for pool in list(_open_pools):
+        pool.close()
+
+
+@dataclass
+class RunResult:
+    """Outcome of one module run."""
+    exit_code: int
+    stdout: str
+    stderr: str
+
+
+def _rss_kb() -> int:
+    """Current resident set size in KiB (peak RSS where /proc is missing)."""
+    try:
+        with open("/proc/self/statm") as statm:
+            return int(statm.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") // 1024
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    if HAS_RESOURCE:
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak // 1024 if sys.platform == "darwin" else peak
+    return 0
+
+
+def _exit_code(exc: SystemExit) -> int:
+    if exc.code is None:
+        return 0
+    if isinstance(exc.code, int):
+        return exc.code
+    print(exc.code, file=sys.stderr)
+    return 1
+
+
+def _run_captured(module: str, argv: Sequence[str]) -> RunResult:
+    """
+    Run ``module`` as __main__ with fds 1 and 2 redirected to temp files.
+
+    argv, the working directory and os.environ are restored afterwards.
+    """
+    saved_argv = sys.argv
+    saved_cwd = os.getcwd()
+    saved_environ = dict(os.environ)
+    saved_fds = []
+    with tempfile.TemporaryFile() as out, tempfile.TemporaryFile() as err:
+        sys.stdout.flush()
+        sys.stderr.flush()
+        for fd, target in ((1, out), (2, err)):
+            saved_fds.append(os.dup(fd))
+            os.dup2(target.fileno(), fd)
+
+        exit_code = 0
+        try:
+            sys.argv = [module, *argv]
+            runpy.run_module(module, run_name="__main__", alter_sys=True)
+        except SystemExit as exc:
+            exit_code = _exit_code(exc)
+        except BaseException:
+            traceback.print_exc()
+            exit_code = 1
+        finally:
+            sys.argv = saved_argv
+            os.chdir(saved_cwd)
+            if os.environ != saved_environ:
+                os.environ.clear()
+                os.environ.update(saved_environ)
+            sys.stdout.flush()
+            sys.stderr.flush()
+            for fd, saved in zip((1, 2), saved_fds):
+                os.dup2(saved, fd)
+                os.close(saved)
+
+        out.seek(0)
+        err.seek(0)
+        return RunResult(
+            exit_code=exit_code,
+            stdout=out.read().decode("utf-8", errors="replace"),
+            stderr=err.read().decode("utf-8", errors="replace")
+        )
+
+
+def _worker_main(conn, cwd: str, sys_path: List[str], preload: List[str]) -> None:
+    """Worker process loop: import ``preload``, then serve runs until told to stop."""
+    os.chdir(cwd)
+    sys.path[:0] = [path for path in sys_path if path not in sys.path]
+    os.environ["PYTHONPATH"] = os.pathsep.join(
+        sys_path + ([os.environ["PYTHONPATH"]] if os.environ.get("PYTHONPATH") else [])
+    )
+    for module in preload:
+        try:
+            importlib.import_module(module)
+        except Exception:
+            pass
+    conn.send(_rss_kb())
+
+    while True:
+        try:
+            request = conn.recv()
+        except EOFError:
+            return
+        if request is None:
+            return
+        module, argv = request
+        threads = threading.active_count()
+        result = _run_captured(module, argv)
+        # Threads the module left running would carry over into the next call
+        conn.send((result, _rss_kb(), threading.active_count() > threads))
+
+
+class _Worker:
+    """Handle on one worker process."""
+
+    def __init__(self, context, cwd: str, sys_path: List[str], preload: List[str]):
+        self.conn, child_conn = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main,
+            args=(child_conn, cwd, sys_path, preload),
+            daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.runs = 0
+        self.base_rss_kb: Optional[int] = None
+
+    def wait_ready(self, timeout: Optional[float]) -> None:
+        if self.base_rss_kb is None:
+            if not self.conn.poll(timeout):
+                raise TimeoutError("Worker did not start in time")
+            self.base_rss_kb = self.conn.recv()
+
+    def stop(self) -> None:
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class ModuleWorkerPool:
+    """
+    🐺 Pool of warm interpreters for ``python -m <module> <args>`` style runs.
+
+    Example:
+        pool = ModuleWorkerPool(cwd=".", preload=["tools.toolbelt_registry"])
+        result = pool.run("tools.toolbelt", ["--list"])
+        print(result.exit_code, result.stdout)
+        pool.close()
+    """
+
+    def __init__(
+        self,
+        cwd: Union[str, Path] = ".",
+        workers: int = 2,
+        preload: Sequence[str] = (),
+        sys_path: Sequence[str] = (),
+        max_runs: int = 50,
+        max_rss_growth_mb: float = 256,
+        start_timeout: float = 30
+    ):
+        """
+        Initialize worker pool (workers start in the background right away).
+
+        Args:
+            cwd: Working directory of the workers
+            workers: Number of worker processes
+            preload: Modules each worker imports before taking calls
+            sys_path: Entries prepended to the workers' sys.path and PYTHONPATH
+            max_runs: Calls a worker serves before it is replaced
+            max_rss_growth_mb: Memory growth after which a worker is replaced
+            start_timeout: Seconds to wait for a worker to finish warming up
+        """
+        self.cwd = str(Path(cwd).resolve())
+        self.preload = list(preload)
+        self.sys_path = [str(path) for path in sys_path]
+        self.max_runs = max_runs
+        self.max_rss_growth_kb = int(max_rss_growth_mb * 1024)
+        self.start_timeout = start_timeout
+
+        # spawn: workers never inherit the server's threads or locks
+        self._context = multiprocessing.get_context("spawn")
+        self._idle: "queue.Queue[_Worker]" = queue.Queue()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.recycled = 0
+        for _ in range(workers):
+            self._idle.put(self._spawn())
+        _open_pools.add(self)
+
+    def _spawn(self) -> _Worker:
+        return _Worker(self._context, self.cwd, self.sys_path, self.preload)
+
+    def _replace(self, worker: _Worker) -> None:
+        worker.stop()
+        with self._lock:
+            self.recycled += 1
+            if not self._closed:
+                self._idle.put(self._spawn())
+
+    def run(self, module: str, argv: Sequence[str] = (), timeout: Optional[float] = None) -> RunResult:
+        """
+        Run a module in a warm worker.
+
+        Args:
+            module: Module or package to run as __main__
+            argv: Arguments (sys.argv[1:] for the module)
+            timeout: Seconds before the worker is killed (None = no limit)
+
+        Returns:
+            Exit code and captured output
+
+        Raises:
+            TimeoutError: If the run (or worker start-up) took too long
+            RuntimeError: If the pool is closed or the worker died
+        """
+        if self._closed:
+            raise RuntimeError("Worker pool is closed")
+        worker = self._idle.get()
+        try:
+            worker.wait_ready(self.start_timeout)
+            worker.conn.send((module, list(argv)))
+            if not worker.conn.poll(timeout):
+                raise TimeoutError(f"{module} did not finish within {timeout}s")
+            result, rss_kb, leaked_threads = worker.conn.recv()
+        except EOFError:
+            self._replace(worker)
+            raise RuntimeError(f"Worker died while running {module}")
+        except BaseException:
+            self._replace(worker)
+            raise
+
+        worker.runs += 1
+        if self._closed:
+            worker.stop()
+        elif (
+            leaked_threads
+            or worker.runs >= self.max_runs
+            or rss_kb - worker.base_rss_kb > self.max_rss_growth_kb
+        ):
+            self._replace(worker)
+        else:
+            self._idle.put(worker)
+        return result
+
+    def close(self) -> None:
+        """Stop all idle workers; busy ones stop when their call returns."""
+        with self._lock:
+            self._closed = True
+        while True:
+            try:
+                self._idle.get_nowait().stop()
+            except queue.Empty:
+                break
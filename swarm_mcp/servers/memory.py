@@ -5,6 +5,7 @@ Exposes Swarm Brain knowledge base operations via Model Context Protocol
 """
 
 import json
+import os
 import sys
 from pathlib import Path
 from typing import Any, Dict, List, Optional
@@ -18,13 +19,27 @@ try:
 except ImportError:
     HAS_CORE = False
 
+# Brain storage backend: "files" (default) or "sqlite", one WAL database
+# that several server processes can share
+BACKEND_ENV = "SWARM_BRAIN_BACKEND"
+
+# One brain per server process keeps the search index warm between calls
+_brain = None
+
+def get_brain() -> "SwarmBrain":
+    """Get or create the server's SwarmBrain (backend from SWARM_BRAIN_BACKEND)."""
+    global _brain
+    if _brain is None:
+        _brain = SwarmBrain(backend=os.environ.get(BACKEND_ENV, "files"))
+    return _brain
+
 def share_learning(agent_id: str, title: str, content: str, category: str = "general", tags: Optional[List[str]] = None) -> Dict[str, Any]:
     """Share a learning to Swarm Brain."""
     if not HAS_CORE:
         return {"success": False, "error": "Swarm Core not available"}
 
     try:
-        brain = SwarmBrain()
+        brain = get_brain()
         learning = brain.share_learning(
             agent_id=agent_id,
             category=category,
@@ -46,7 +61,7 @@ def record_decision(agent_id: str, title: str, decision: str, rationale: str, ou
         return {"success": False, "error": "Swarm Core not available"}
 
     try:
-        brain = SwarmBrain()
+        brain = get_brain()
         # Note: 'title' is not in SwarmBrain.record_decision, but was in the old server. 
         # The new one has 'context'. I'll map 'title' + 'rationale' to 'context' or just 'rationale' -> 'context'.
         # Actually record_decision has (agent_id, decision, context, outcome, success, learnings)
@@ -72,7 +87,7 @@ def search_knowledge(agent_id: str, query: str, category: Optional[str] = None,
         return {"success": False, "error": "Swarm Core not available"}
 
     try:
-        brain = SwarmBrain()
+        brain = get_brain()
         results = brain.search(query=query, category=category, limit=limit)
         
         return {
@@ -55,54 +55,59 @@ def broadcast_message(message: str, priority: str = "regular") -> Dict[str, Any]
         urgency = HowlUrgency.URGENT if priority.lower() == "urgent" else HowlUrgency.NORMAL
         queue = get_queue()
         
-        # We need a list of agents. For now, we'll just broadcast to a known set or use a specific howl type
-        # But `broadcast` in core takes a list of wolves.
-        # We can try to discover wolves or just use a generic "pack" recipient if supported,
-        # but the core `broadcast` function iterates over the list.
-        # Let's see if we can get the pack list. 
-        # Ideally we'd use PackCoordinator, but we don't want to couple heavily here.
-        # For now, we'll scan the 'pack_messages' directory or just support a few default agents if we can't find them.
-        
-        # A simple way is to check who has an inbox in pack_messages
-        inboxes = [d.name for d in queue.territory.iterdir() if d.is_dir()]
-        if not inboxes:
+        # The howl is stored once in the pack topic; every wolf with an inbox hears it.
+        inboxes = queue.wolves()
+        if inboxes:
+            queue.broadcast(sender="CAPTAIN", content=message, urgency=urgency)
+        else:
             # Fallback
             inboxes = ["Agent-1", "Agent-2", "Agent-8"] # Common agents seen in workspace
-            
-        howls = []
-        for wolf in inboxes:
-            howl = queue.send(
-                sender="CAPTAIN",
-                recipient=wolf,
-                content=message,
-                urgency=urgency,
-                howl_type=HowlType.PACK_HOWL
-            )
-            howls.append(howl)
+            queue.broadcast(sender="CAPTAIN", content=message, pack=inboxes, urgency=urgency)
 
         return {
             "success": True,
             "total_agents": len(inboxes),
             "message_sent": message,
-            "results": {h.recipient: True for h in howls}
+            "results": {wolf: True for wolf in inboxes}
         }
     except Exception as e:
         return {"success": False, "error": str(e)}
 
-def read_messages(agent_id: str, unread_only: bool = True, limit: int = 10) -> Dict[str, Any]:
-    """Read messages for an agent."""
+def read_messages(
+    agent_id: str,
+    unread_only: bool = True,
+    limit: int = 10,
+    wait_seconds: float = 0,
+    min_urgency: str = "low"
+) -> Dict[str, Any]:
+    """Read messages for an agent.
+
+    With ``wait_seconds`` > 0 this long-polls: it blocks until unread
+    messages at or above ``min_urgency`` arrive (most urgent first) or the
+    wait runs out.
+    """
     if not HAS_CORE:
         return {"success": False, "error": "Swarm Core not available"}
         
     try:
         queue = get_queue()
-        howls = queue.listen(agent_id, unheard_only=unread_only, limit=limit)
         
-        # Mark as heard if we read them? The tool definition should specify.
-        # Usually reading implies consuming.
-        for howl in howls:
-            if not howl.heard:
-                queue.mark_heard(howl.id, agent_id)
+        if wait_seconds > 0:
+            # Long-poll: receive() blocks on the inbox and marks what it returns as heard
+            howls = queue.receive(
+                agent_id,
+                timeout=wait_seconds,
+                min_urgency=HowlUrgency[min_urgency.upper()],
+                limit=limit
+            )
+        else:
+            howls = queue.listen(agent_id, unheard_only=unread_only, limit=limit)
+            
+            # Mark as heard if we read them? The tool definition should specify.
+            # Usually reading implies consuming.
+            for howl in howls:
+                if not howl.heard:
+                    queue.mark_heard(howl.id, agent_id)
                 
         return {
             "success": True,
@@ -165,13 +170,19 @@ def main():
                                 },
                             },
                             "read_messages": {
-                                "description": "Read messages for an agent (and mark as read)",
+                                "description": "Read messages for an agent (and mark as read). Set wait_seconds to long-poll for new messages, most urgent first",
                                 "inputSchema": {
                                     "type": "object",
                                     "properties": {
                                         "agent_id": {"type": "string"},
                                         "unread_only": {"type": "boolean", "default": True},
                                         "limit": {"type": "integer", "default": 10},
+                                        "wait_seconds": {"type": "number", "default": 0},
+                                        "min_urgency": {
+                                            "type": "string",
+                                            "enum": ["emergency", "urgent", "normal", "low"],
+                                            "default": "low",
+                                        },
                                     },
                                     "required": ["agent_id"],
                                 },
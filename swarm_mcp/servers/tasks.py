@@ -5,9 +5,7 @@ Exposes MASTER_TASK_LOG operations via Model Context Protocol
 """
 
 import json
-import re
 import sys
-from datetime import datetime
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -16,15 +14,28 @@ sys.path.insert(0, str(Path(__file__).parent.parent.parent))
 
 # Import Stage 4 Capabilities
 try:
-    from swarm_mcp.core.task_scoring import TaskScorer, ScoredTask
+    from swarm_mcp.core.task_scoring import ScoredTask
     from swarm_mcp.core.verification import VerificationHarness, VerificationType
     from swarm_mcp.core.recovery import RecoveryManager, FailureEvent
     HAS_STAGE_4 = True
 except ImportError:
     HAS_STAGE_4 = False
 
+from swarm_mcp.core.task_store import SECTIONS, TaskStore
+
 # Locate MASTER_TASK_LOG.md relative to workspace root
 TASK_LOG_PATH = Path(__file__).parent.parent.parent / "MASTER_TASK_LOG.md"
+# Tasks are stored here; the markdown log is rendered from it
+TASK_DB_PATH = TASK_LOG_PATH.with_suffix(".db")
+
+_task_store: Optional[TaskStore] = None
+
+def get_task_store() -> TaskStore:
+    """Shared TaskStore for MASTER_TASK_LOG.md (created on first use)."""
+    global _task_store
+    if _task_store is None:
+        _task_store = TaskStore(TASK_DB_PATH, TASK_LOG_PATH)
+    return _task_store
 
 def read_task_log() -> str:
     """Read the current MASTER_TASK_LOG.md file."""
@@ -32,129 +43,47 @@ def read_task_log() -> str:
         return ""
     return TASK_LOG_PATH.read_text(encoding="utf-8")
 
-def write_task_log(content: str) -> bool:
-    """Write content to MASTER_TASK_LOG.md."""
-    try:
-        TASK_LOG_PATH.write_text(content, encoding="utf-8")
-        return True
-    except Exception as e:
-        return False
-
 def add_to_inbox(task: str, agent_id: Optional[str] = None) -> Dict[str, Any]:
     """Add a task to the INBOX section."""
     try:
-        content = read_task_log()
-        
-        # If file doesn't exist or is empty, maybe create it? 
-        # For now assume it exists or fail gracefully if section missing.
-        
-        inbox_pattern = r"(## 📥 INBOX.*?\n\n)(.*?)(\n---)"
-        match = re.search(inbox_pattern, content, re.DOTALL)
-
-        if not match:
-            return {"success": False, "error": "INBOX section not found in MASTER_TASK_LOG.md"}
-
-        prefix = match.group(1)
-        existing_tasks = match.group(2).strip()
-        suffix = match.group(3)
-
         agent_note = f" (from {agent_id})" if agent_id else ""
-        new_task = f"- [ ] {task}{agent_note}\n"
-        
-        updated_tasks = existing_tasks + "\n" + new_task if existing_tasks else new_task
-        
-        new_content = content[:match.start()] + prefix + updated_tasks + "\n" + suffix + content[match.end():]
-        
-        # Update timestamp
-        new_content = re.sub(
-            r"\*\*Last Updated:\*\* \d{4}-\d{2}-\d{2}",
-            f"**Last Updated:** {datetime.now().strftime('%Y-%m-%d')}",
-            new_content
-        )
-
-        if write_task_log(new_content):
-            return {"success": True, "task": task, "location": "INBOX"}
-        else:
-            return {"success": False, "error": "Failed to write task log"}
+        if not get_task_store().add_task("INBOX", f"{task}{agent_note}"):
+            return {"success": False, "error": "INBOX section not found in MASTER_TASK_LOG.md"}
+        return {"success": True, "task": task, "location": "INBOX"}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 def mark_task_complete(task_description: str, section: str = "THIS WEEK") -> Dict[str, Any]:
     """Mark a task as complete."""
     try:
-        content = read_task_log()
-        
-        section_patterns = {
-            "THIS WEEK": r"(## 🎯 THIS WEEK.*?\n\n)(.*?)(\n---)",
-            "INBOX": r"(## 📥 INBOX.*?\n\n)(.*?)(\n---)",
-        }
-        
-        pattern = section_patterns.get(section)
-        if not pattern:
+        if section not in ("THIS WEEK", "INBOX"):
             return {"success": False, "error": f"Unknown section: {section}"}
-            
-        match = re.search(pattern, content, re.DOTALL)
-        if not match:
+
+        store = get_task_store()
+        if not store.has_section(section):
             return {"success": False, "error": f"{section} section not found"}
-            
-        tasks_text = match.group(2)
-        
-        # Escape regex characters in task description
-        escaped_desc = re.escape(task_description)
-        # Look for [ ] followed by description
-        task_pattern = rf"(- \[ \] .*?{escaped_desc}.*?\n)"
-        
-        if not re.search(task_pattern, tasks_text):
-             return {"success": False, "error": f"Task not found: {task_description}"}
-             
-        replacement = r"- [x] " + task_description + "\n"
-        new_tasks_text = re.sub(task_pattern, replacement, tasks_text)
-        
-        new_content = content[:match.start()] + match.group(1) + new_tasks_text + match.group(3) + content[match.end():]
-        
-        new_content = re.sub(
-            r"\*\*Last Updated:\*\* \d{4}-\d{2}-\d{2}",
-            f"**Last Updated:** {datetime.now().strftime('%Y-%m-%d')}",
-            new_content
-        )
 
-        if write_task_log(new_content):
-            return {"success": True, "task": task_description, "section": section}
-        else:
-            return {"success": False, "error": "Failed to write task log"}
+        if store.complete_task(section, task_description) is None:
+            return {"success": False, "error": f"Task not found: {task_description}"}
+        return {"success": True, "task": task_description, "section": section}
     except Exception as e:
         return {"success": False, "error": str(e)}
 
 def get_tasks(section: Optional[str] = None) -> Dict[str, Any]:
     """Get tasks from specified section or all sections."""
     try:
-        content = read_task_log()
-        
-        sections_map = {
-            "INBOX": r"## 📥 INBOX.*?\n\n(.*?)\n---",
-            "THIS WEEK": r"## 🎯 THIS WEEK.*?\n\n(.*?)\n---",
-            "WAITING ON": r"## ⏳ WAITING ON.*?\n\n(.*?)\n---",
-            "PARKED": r"## 🧊 PARKED.*?\n\n(.*?)\n---",
-        }
+        store = get_task_store()
 
         if section:
-            pattern = sections_map.get(section)
-            if not pattern:
+            if section not in SECTIONS:
                 return {"success": False, "error": f"Unknown section: {section}"}
-            
-            match = re.search(pattern, content, re.DOTALL)
-            tasks = []
-            if match:
-                tasks_text = match.group(1).strip()
-                tasks = [line.strip() for line in tasks_text.split("\n") if line.strip().startswith("-")]
-            return {"success": True, "section": section, "tasks": tasks}
+            return {"success": True, "section": section, "tasks": store.get_lines(section)}
         else:
-            results = {}
-            for sec_name, pattern in sections_map.items():
-                match = re.search(pattern, content, re.DOTALL)
-                if match:
-                    tasks_text = match.group(1).strip()
-                    results[sec_name] = [line.strip() for line in tasks_text.split("\n") if line.strip().startswith("-")]
+            results = {
+                sec_name: store.get_lines(sec_name)
+                for sec_name in SECTIONS
+                if store.has_section(sec_name)
+            }
             return {"success": True, "sections": results}
     except Exception as e:
         return {"success": False, "error": str(e)}
@@ -170,47 +99,60 @@ def select_next_task(context: Optional[str] = None) -> Dict[str, Any]:
         return {"success": False, "error": "Stage 4 modules not available"}
         
     try:
-        # Get inbox tasks
-        result = get_tasks("INBOX")
-        if not result.get("success"):
-            return result
-            
-        raw_tasks = result.get("tasks", [])
-        if not raw_tasks:
-            return {"success": False, "error": "No tasks in INBOX"}
-            
-        scorer = TaskScorer()
-        scored_tasks = []
-        
-        for i, raw_task in enumerate(raw_tasks):
-            # Parse description and metadata
-            clean_desc = raw_task.replace("- [ ] ", "")
-            attrs = scorer.parse_task_metadata(clean_desc)
-            
-            scored_tasks.append(ScoredTask(
-                id=f"task_{i}",
-                description=clean_desc,
-                value=attrs.get("value", 5.0),
-                urgency=attrs.get("urgency", 5.0),
-                effort=attrs.get("effort", 5.0),
-                risk=attrs.get("risk", 1.0)
-            ))
-            
-        best_task = scorer.select_next_task(scored_tasks)
-        
-        if best_task:
-            return {
-                "success": True, 
-                "task": best_task.description,
-                "roi_score": best_task.roi_score,
-                "explanation": f"Value={best_task.value}, Urgency={best_task.urgency}, Effort={best_task.effort}"
-            }
-        else:
-             return {"success": False, "error": "Could not select task"}
+        # Best open INBOX task whose prerequisites are done
+        best_task = get_task_store().scheduler("INBOX").peek()
+        if best_task is None:
+            return {"success": False, "error": "No ready tasks in INBOX"}
+
+        return {
+            "success": True, 
+            "task": best_task.description,
+            "roi_score": best_task.roi_score,
+            "explanation": f"Value={best_task.value}, Urgency={best_task.urgency}, Effort={best_task.effort}"
+        }
              
     except Exception as e:
         return {"success": False, "error": str(e)}
 
+def _task_summary(task: ScoredTask) -> Dict[str, Any]:
+    return {"id": task.id, "task": task.description, "roi_score": task.roi_score}
+
+def claim_tasks(count: int = 1, section: str = "INBOX") -> Dict[str, Any]:
+    """
+    Claim the best ready tasks of a section in one call.
+    Claimed tasks are not handed out again until completed.
+    """
+    if not HAS_STAGE_4:
+        return {"success": False, "error": "Stage 4 modules not available"}
+
+    try:
+        if section not in SECTIONS:
+            return {"success": False, "error": f"Unknown section: {section}"}
+        tasks = get_task_store().claim(section, count)
+        return {"success": True, "section": section, "tasks": [_task_summary(task) for task in tasks]}
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
+def assign_tasks(agents: List[str], section: str = "INBOX") -> Dict[str, Any]:
+    """
+    Hand one ready task to each agent, best tasks to the first agents.
+    Agents beyond the number of ready tasks get nothing.
+    """
+    if not HAS_STAGE_4:
+        return {"success": False, "error": "Stage 4 modules not available"}
+
+    try:
+        if section not in SECTIONS:
+            return {"success": False, "error": f"Unknown section: {section}"}
+        picks = get_task_store().assign(section, agents)
+        return {
+            "success": True,
+            "section": section,
+            "assignments": {agent: _task_summary(task) for agent, task in picks.items()}
+        }
+    except Exception as e:
+        return {"success": False, "error": str(e)}
+
 def verify_task_completion(
     task_description: str, 
     checks: List[Dict[str, Any]]
@@ -331,6 +273,35 @@ def main():
                                     }
                                 }
                             },
+                            "claim_tasks": {
+                                "description": "Claim the best ready tasks of a section (Stage 4)",
+                                "inputSchema": {
+                                    "type": "object",
+                                    "properties": {
+                                        "count": {"type": "integer", "default": 1},
+                                        "section": {
+                                            "type": "string",
+                                            "enum": ["INBOX", "THIS WEEK", "WAITING ON", "PARKED"],
+                                            "default": "INBOX"
+                                        }
+                                    }
+                                }
+                            },
+                            "assign_tasks": {
+                                "description": "Assign one ready task to each agent (Stage 4)",
+                                "inputSchema": {
+                                    "type": "object",
+                                    "properties": {
+                                        "agents": {"type": "array", "items": {"type": "string"}},
+                                        "section": {
+                                            "type": "string",
+                                            "enum": ["INBOX", "THIS WEEK", "WAITING ON", "PARKED"],
+                                            "default": "INBOX"
+                                        }
+                                    },
+                                    "required": ["agents"]
+                                }
+                            },
                             "verify_task_completion": {
                                 "description": "Verify task with automated checks (Stage 4)",
                                 "inputSchema": {
@@ -389,6 +360,10 @@ def main():
                     result = get_tasks(**arguments)
                 elif tool_name == "select_next_task":
                     result = select_next_task(**arguments)
+                elif tool_name == "claim_tasks":
+                    result = claim_tasks(**arguments)
+                elif tool_name == "assign_tasks":
+                    result = assign_tasks(**arguments)
                 elif tool_name == "verify_task_completion":
                     result = verify_task_completion(**arguments)
                 elif tool_name == "recover_system":
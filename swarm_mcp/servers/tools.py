@@ -9,6 +9,7 @@ import sys
 import subprocess
 import shutil
 import os
+import threading
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -21,8 +22,32 @@ except ImportError:
     # Fallback if tools directory not found in python path
     TOOLS_REGISTRY = {}
 
-def execute_toolbelt(flag: str, args: List[str] = None) -> Dict[str, Any]:
-    """Execute a toolbelt command via subprocess."""
+from swarm_mcp.core.worker_pool import ModuleWorkerPool
+
+# Warm workers running toolbelt commands in-process (created on first use)
+TOOLBELT_WORKERS = 2
+_toolbelt_pool: Optional[ModuleWorkerPool] = None
+_toolbelt_pool_lock = threading.Lock()
+
+def get_toolbelt_pool() -> Optional[ModuleWorkerPool]:
+    """Shared pool of pre-warmed toolbelt workers, or None if it cannot start."""
+    global _toolbelt_pool
+    with _toolbelt_pool_lock:
+        if _toolbelt_pool is None:
+            cwd = Path(__file__).parent.parent.parent
+            try:
+                _toolbelt_pool = ModuleWorkerPool(
+                    cwd=cwd,
+                    workers=TOOLBELT_WORKERS,
+                    preload=["tools.toolbelt_registry"],
+                    sys_path=[str(cwd)]
+                )
+            except Exception:
+                return None
+        return _toolbelt_pool
+
+def execute_toolbelt(flag: str, args: List[str] = None, timeout: Optional[float] = None) -> Dict[str, Any]:
+    """Execute a toolbelt command in a warm worker (subprocess if no pool)."""
     args = args or []
     
     # Ensure we run from workspace root
@@ -33,6 +58,22 @@ def execute_toolbelt(flag: str, args: List[str] = None) -> Dict[str, Any]:
     
     cmd = [sys.executable, "-m", "tools.toolbelt", flag] + args
     
+    pool = get_toolbelt_pool()
+    if pool is not None:
+        try:
+            run = pool.run("tools.toolbelt", [flag] + args, timeout=timeout)
+            return {
+                "success": run.exit_code == 0,
+                "stdout": run.stdout,
+                "stderr": run.stderr,
+                "exit_code": run.exit_code,
+                "debug_cwd": str(cwd),
+                "debug_pythonpath": env.get("PYTHONPATH"),
+                "debug_cmd": str(cmd)
+            }
+        except Exception as e:
+            return {"success": False, "error": str(e)}
+    
     try:
         result = subprocess.run(
             cmd,
@@ -40,7 +81,8 @@ def execute_toolbelt(flag: str, args: List[str] = None) -> Dict[str, Any]:
             env=env,
             capture_output=True,
             text=True,
-            check=False
+            check=False,
+            timeout=timeout
         )
         
         return {
@@ -42,3 +42,37 @@ def test_calculate_strengths(agent_dna):
     
     profile = agent_dna.get_profile("agent-1")
     assert "frontend" in profile.strengths
+
+def test_top_k_and_leaderboard(agent_dna):
+    agent_dna.record_task("agent-1", "python", "t1", ["src/auth.py"], 10, True, 1.0)
+    agent_dna.record_task("agent-2", "python", "t2", ["src/db.py"], 10, True, 0.8)
+    agent_dna.record_task("agent-3", "docs", "t3", ["README.md"], 10, True, 1.0)
+    agent_dna.record_task("agent-4", "docs", "t4", ["guide.md"], 10, False, 0.0)
+
+    # Little experience is discounted, so an unmatched perfect record still ranks first
+    top = agent_dna.find_best_agents(category="python", files=["src/auth.py"], k=3)
+    assert [agent for agent, _ in top] == ["agent-3", "agent-2", "agent-1"]
+    assert agent_dna.find_best_agent(category="python", exclude=["agent-1", "agent-2", "agent-3"]) == ("agent-4", 0.0)
+
+    assert [row[0] for row in agent_dna.get_leaderboard("python")] == ["agent-1", "agent-2"]
+    assert agent_dna.get_leaderboard(limit=1) == [("agent-1", 1.0, 1)]
+
+def test_profiles_persist_as_deltas(tmp_path, monkeypatch):
+    from swarm_mcp.core import agent_dna as module
+    from swarm_mcp.core.agent_dna import AgentDNA
+    monkeypatch.setattr(module, "SNAPSHOT_EVERY", 3)
+
+    dna = AgentDNA(storage_dir=str(tmp_path / "dna"))
+    for i in range(4):
+        dna.record_task("agent-1", "python", f"task{i}", [f"pkg/mod{i}.py"], 10, i != 2, 0.9)
+
+    profiles = tmp_path / "dna" / "profiles"
+    assert len((profiles / "agent-1.log").read_text().splitlines()) == 1
+
+    reloaded = AgentDNA(storage_dir=str(tmp_path / "dna"))
+    profile = reloaded.get_profile("agent-1")
+    assert profile.total_tasks == 4
+    assert profile.success_rate == 0.75
+    assert profile.file_expertise == dna.get_profile("agent-1").file_expertise
+    assert profile.category_scores == dna.get_profile("agent-1").category_scores
+    assert reloaded.find_best_agent(files=["pkg/mod3.py"])[0] == "agent-1"
@@ -65,3 +65,42 @@ def test_expiration(conflict_detector):
     
     # Should be no conflict because previous intent expired
     assert len(conflicts) == 0
+
+def test_directory_claim_covers_files(conflict_detector):
+    conflict_detector.declare_intent("agent-1", "Refactor auth package", files=["src/auth"])
+
+    below = conflict_detector.check_conflicts("agent-2", files=["src/auth/tokens.py"])
+    assert below[0].severity == ConflictSeverity.HIGH
+    assert below[0].overlapping_files == ["src/auth/tokens.py"]
+
+    conflict_detector.declare_intent("agent-3", "Fix login", files=["src/auth/login.py"], functions=["login"])
+    above = conflict_detector.check_conflicts("agent-2", files=["src"], functions=["login"])
+    assert {c.agents[1]: c.severity for c in above} == {
+        "agent-1": ConflictSeverity.HIGH,
+        "agent-3": ConflictSeverity.BLOCKING
+    }
+    assert conflict_detector.check_conflicts("agent-2", files=["src/authz.py"], modules=["authz"]) == []
+
+def test_intents_shared_across_detectors(tmp_path):
+    first = ConflictDetector(storage_dir=str(tmp_path / "conflicts"))
+    second = ConflictDetector(storage_dir=str(tmp_path / "conflicts"))
+
+    first.declare_intent("agent-1", "Work on auth", files=["src/auth.py"])
+    _, conflicts = second.declare_intent("agent-2", "Also auth", files=["src/auth.py"])
+    assert [c.agents for c in conflicts] == [["agent-2", "agent-1"]]
+
+    first.complete_work("agent-2")
+    assert second.get_agent_intent("agent-2") is None
+    assert [i.agent_id for i in second.get_active_intents()] == ["agent-1"]
+
+def test_journal_compaction(tmp_path):
+    detector = ConflictDetector(storage_dir=str(tmp_path / "conflicts"))
+    detector.JOURNAL_SLACK = 4
+    reader = ConflictDetector(storage_dir=str(tmp_path / "conflicts"))
+
+    for i in range(10):
+        detector.declare_intent("agent-1", f"Step {i}", files=[f"src/step{i}.py"])
+
+    journal = tmp_path / "conflicts" / "intents.journal"
+    assert len(journal.read_text().splitlines()) < 10
+    assert reader.get_blocked_files() == {"src/step9.py": "agent-1"}
@@ -0,0 +1,61 @@
+import threading
+import pytest
+from swarm_mcp.core.brain import SwarmBrain
+from swarm_mcp.core.memory import PackMemory
+
+@pytest.fixture
+def memory(tmp_path):
+    return PackMemory(den=str(tmp_path / "memory"), backend="sqlite")
+
+def test_sqlite_recall_and_stats(memory):
+    memory.share_lore("wolf-1", "tooling", "Linting setup", "Run ruff before committing")
+    memory.share_lore("wolf-2", "debugging", "Import cycles", "An import can fail due to a cycle")
+    memory.share_lore("wolf-3", "debugging", "Circular imports", "Circular import errors: move the import inside the function", tags=["circular"])
+    memory.record_hunt("beta", "Used async", "High concurrency", success=True)
+
+    results = memory.recall("circular ImportError")
+
+    assert [lore.title for lore in results] == ["Circular imports", "Import cycles"]
+    assert results[0].tags == ["circular"]
+    assert memory.recall("import", category="tooling") == []
+    assert memory.recall("!!!") == []
+    assert memory.pack_stats() == {
+        "total_lore": 3,
+        "total_hunts": 1,
+        "categories": ["debugging", "tooling"],
+        "active_wolves": ["beta"]
+    }
+
+def test_sqlite_notes_from_threads(memory):
+    threads = [
+        threading.Thread(target=memory.add_note, args=("alpha", f"Note {i}"))
+        for i in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    notes = memory.get_wolf_notes("alpha")
+    assert [note["id"] for note in notes] == [f"note_{i}" for i in range(1, 9)]
+    assert memory.get_wolf_notes("beta") == []
+
+def test_import_from_files(tmp_path):
+    brain_dir = str(tmp_path / "brain")
+    files = SwarmBrain(brain_dir=brain_dir)
+    files.share_learning("agent-1", "debugging", "Flaky tests", "Pin the random seed", tags=["tests"])
+    files.record_decision("agent-2", "Pinned deps", "Broken CI", learnings=["Lock files help"])
+    files.add_note("agent-1", "Remember the seed")
+
+    brain = SwarmBrain(brain_dir=brain_dir, backend="sqlite")
+    assert brain.import_from_files() == {"entries": 1, "records": 1, "notes": 1}
+    assert brain.import_from_files() == {"entries": 0, "records": 0, "notes": 0}
+
+    assert [l.title for l in brain.search("random seed")] == ["Flaky tests"]
+    assert brain.get_agent_notes("agent-1")[0]["content"] == "Remember the seed"
+    assert brain.add_note("agent-1", "Second")["id"] == "note_2"
+    assert brain.get_stats()["agents_with_decisions"] == ["agent-2"]
+
+    # A second handle (e.g. another server process) sees the same data
+    other = SwarmBrain(brain_dir=brain_dir, backend="sqlite")
+    assert other.get_stats()["total_learnings"] == 1
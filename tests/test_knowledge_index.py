@@ -0,0 +1,41 @@
+import pytest
+from swarm_mcp.core.brain import SwarmBrain
+from swarm_mcp.core.memory import PackMemory
+from swarm_mcp.core.knowledge_index import KnowledgeIndex, tokenize
+
+@pytest.fixture
+def memory(tmp_path):
+    return PackMemory(den=str(tmp_path / "memory"))
+
+def test_tokenize():
+    assert tokenize("Fix ImportError in imports!") == ["fix", "import", "error", "in", "import"]
+
+def test_recall_ranks_by_relevance(memory):
+    memory.share_lore("wolf-1", "tooling", "Linting setup", "Run ruff before committing")
+    memory.share_lore("wolf-2", "debugging", "Import cycles", "An import can fail due to a cycle")
+    memory.share_lore("wolf-3", "debugging", "Circular imports", "Circular import errors: move the import inside the function", tags=["circular"])
+
+    results = memory.recall("circular import")
+
+    assert [lore.title for lore in results] == ["Circular imports", "Import cycles"]
+    assert [lore.title for lore in memory.recall("import", category="tooling")] == []
+    assert len(memory.recall("import", limit=1)) == 1
+
+def test_index_rebuilds_from_files(tmp_path):
+    brain = SwarmBrain(brain_dir=str(tmp_path / "brain"))
+    brain.share_learning("agent-1", "debugging", "Flaky tests", "Pin the random seed")
+    (tmp_path / "brain" / "index" / "postings.log").unlink()
+
+    # A fresh brain builds the missing index from the learning files
+    fresh = SwarmBrain(brain_dir=str(tmp_path / "brain"))
+    assert [l.title for l in fresh.search("random seed")] == ["Flaky tests"]
+    assert fresh.rebuild_index() == 1
+
+def test_index_sees_other_writers(tmp_path):
+    reader = KnowledgeIndex(tmp_path / "index")
+    writer = KnowledgeIndex(tmp_path / "index")
+    assert reader.search("wolves") == []
+
+    writer.add("doc-1", "general", "doc-1.json", title="Wolves", body="Hunt in packs")
+
+    assert [doc_id for doc_id, _, _ in reader.search("pack")] == ["doc-1"]
@@ -1,3 +1,4 @@
+import os
 import sys
 import json
 import subprocess
@@ -72,6 +73,33 @@ class TestMCPServers:
         
         assert response["result"]["serverInfo"]["name"] == "swarm-memory"
 
+    def test_memory_server_sqlite_backend(self, tmp_path):
+        """SWARM_BRAIN_BACKEND=sqlite puts the server's brain in the shared database."""
+        root = str(Path(__file__).parent.parent)
+        env = {**os.environ, "SWARM_BRAIN_BACKEND": "sqlite", "PYTHONPATH": root}
+        calls = [
+            {"jsonrpc": "2.0", "id": 1, "method": "tools/call", "params": {
+                "name": "share_learning",
+                "arguments": {"agent_id": "agent-1", "title": "WAL mode", "content": "Readers never block writers"}
+            }},
+            {"jsonrpc": "2.0", "id": 2, "method": "tools/call", "params": {
+                "name": "search_knowledge",
+                "arguments": {"agent_id": "agent-2", "query": "readers writers"}
+            }},
+        ]
+
+        stdout = subprocess.run(
+            [sys.executable, "-m", "swarm_mcp.servers.memory"],
+            input="\n".join(json.dumps(call) for call in calls) + "\n",
+            capture_output=True, text=True, cwd=tmp_path, env=env
+        ).stdout
+        responses = [json.loads(line) for line in stdout.splitlines()[1:]]
+
+        assert (tmp_path / "swarm_brain" / "swarm_brain.db").exists()
+        assert not (tmp_path / "swarm_brain" / "learnings").exists()
+        found = json.loads(responses[1]["result"]["content"][0]["text"])
+        assert [r["title"] for r in found["results"]] == ["WAL mode"]
+
     def test_tasks_server_initialize(self):
         """Test swarm-tasks-server initialization and Stage 4 tools."""
         init_req = {
@@ -92,5 +120,7 @@ class TestMCPServers:
         
         # Stage 4 additions
         assert "select_next_task" in tools
+        assert "claim_tasks" in tools
+        assert "assign_tasks" in tools
         assert "verify_task_completion" in tools
         assert "recover_system" in tools
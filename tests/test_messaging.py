@@ -0,0 +1,258 @@
+import threading
+import time
+import pytest
+from swarm_mcp.core.messaging import MessageQueue, HowlUrgency
+from swarm_mcp.core.howl_store import SegmentLogStore, migrate_file_inboxes
+
+@pytest.fixture
+def queue(tmp_path):
+    return MessageQueue(territory=str(tmp_path / "messages"))
+
+def test_send_and_listen(queue):
+    queue.send("scout-1", "alpha", "Found prey", urgency=HowlUrgency.URGENT)
+    queue.send("scout-2", "alpha", "Second howl")
+
+    howls = queue.listen("alpha")
+
+    assert [h.content for h in howls] == ["Second howl", "Found prey"]
+    assert howls[1].urgency == HowlUrgency.URGENT
+    assert queue.count_unheard("alpha") == 2
+    assert queue.wolves() == ["alpha"]
+
+def test_mark_heard(queue):
+    first = queue.send("scout-1", "alpha", "One")
+    queue.send("scout-1", "alpha", "Two")
+
+    assert queue.mark_heard(first.id, "alpha") is True
+    assert queue.mark_heard("missing", "alpha") is False
+
+    unheard = queue.listen("alpha", unheard_only=True)
+    assert [h.content for h in unheard] == ["Two"]
+    assert queue.count_unheard("alpha") == 1
+
+def test_segment_rollover_and_compaction(tmp_path):
+    store = SegmentLogStore(tmp_path / "messages", segment_max_bytes=400)
+    queue = MessageQueue(territory=str(tmp_path / "messages"), backend=store)
+
+    sent = [queue.send("scout-1", "alpha", f"Howl {i}") for i in range(10)]
+    for msg in sent[:6]:
+        queue.mark_heard(msg.id, "alpha")
+
+    stats = queue.compact("alpha")
+
+    assert stats["howls_dropped"] > 0
+    assert stats["segments_removed"] > 0
+    remaining = [h.content for h in queue.listen("alpha")]
+    assert remaining[:4] == ["Howl 9", "Howl 8", "Howl 7", "Howl 6"]
+    assert queue.count_unheard("alpha") == 4
+
+def test_append_cuts_torn_tail(tmp_path):
+    territory = tmp_path / "messages"
+    queue = MessageQueue(territory=str(territory))
+    queue.send("scout-1", "w", "one")
+    queue.store.flush()
+    with open(territory / "w" / "log" / "index.bin", "ab") as index:
+        index.write(b"\x00\x01\x02")
+    with open(territory / "w" / "log" / "ids.txt", "ab") as ids:
+        ids.write(b"1\thowl_to")
+
+    reopened = MessageQueue(territory=str(territory))
+    two = reopened.send("scout-1", "w", "two")
+
+    assert [h.content for h in reopened.listen("w", unheard_only=False)] == ["two", "one"]
+    assert reopened.mark_heard(two.id, "w") is True
+    assert reopened.count_unheard("w") == 1
+
+def test_migrate_file_inboxes(tmp_path):
+    territory = tmp_path / "messages"
+    legacy = MessageQueue(territory=str(territory), backend="files")
+    old = legacy.send("scout-1", "alpha", "Old howl")
+    legacy.send("scout-1", "alpha", "Newer howl")
+    legacy.mark_heard(old.id, "alpha")
+
+    assert migrate_file_inboxes(territory) == {"alpha": 2}
+    assert migrate_file_inboxes(territory) == {"alpha": 0}
+
+    queue = MessageQueue(territory=str(territory))
+    howls = queue.listen("alpha")
+    assert [h.content for h in howls] == ["Newer howl", "Old howl"]
+    assert howls[1].heard is True
+
+def test_migrate_into_live_log_keeps_time_order(tmp_path):
+    territory = tmp_path / "messages"
+    legacy = MessageQueue(territory=str(territory), backend="files")
+    old = [legacy.send("scout-1", "alpha", f"Old {i}") for i in range(11)]
+    legacy.mark_heard(old[0].id, "alpha")
+
+    queue = MessageQueue(territory=str(territory), backend=SegmentLogStore(territory))
+    live = queue.send("scout-2", "alpha", "Live")
+    queue.mark_heard(live.id, "alpha")
+    newest = queue.send("scout-2", "alpha", "Newest")
+
+    assert migrate_file_inboxes(territory, queue.store) == {"alpha": 11}
+    assert [h.content for h in queue.listen("alpha", limit=None)] == (
+        ["Newest", "Live"] + [f"Old {i}" for i in reversed(range(11))]
+    )
+    assert queue.count_unheard("alpha") == 11
+
+    assert queue.mark_heard_up_to(old[5].id, "alpha") is True
+    assert [h.content for h in queue.next_unheard("alpha", limit=20)] == (
+        [f"Old {i}" for i in range(6, 11)] + ["Newest"]
+    )
+
+def test_segment_queue_leaves_legacy_inboxes_alone(tmp_path, monkeypatch):
+    territory = tmp_path / "messages"
+    legacy = MessageQueue(territory=str(territory), backend="files")
+    legacy.send("scout-1", "alpha", "Old howl")
+
+    with pytest.warns(UserWarning, match="migrate-messages"):
+        MessageQueue(territory=str(territory))
+
+    assert [h.content for h in legacy.listen("alpha")] == ["Old howl"]
+    assert migrate_file_inboxes(territory) == {"alpha": 1}
+    assert (territory / ".migrated").exists()
+
+    # Migrated territories are not scanned again
+    def fail(*args):
+        raise AssertionError("legacy inboxes scanned")
+    monkeypatch.setattr(SegmentLogStore, "contains", fail)
+    assert [h.content for h in MessageQueue(territory=str(territory)).listen("alpha")] == ["Old howl"]
+
+def test_unheard_cursor(tmp_path):
+    territory = tmp_path / "messages"
+    queue = MessageQueue(territory=str(territory))
+    sent = [queue.send("scout-1", "alpha", f"Howl {i}") for i in range(80)]
+
+    assert queue.count_unheard("alpha") == 80
+
+    queue.mark_heard(sent[50].id, "alpha")
+    assert queue.mark_heard_up_to(sent[9].id, "alpha") is True
+    assert queue.count_unheard("alpha") == 69
+    assert [h.content for h in queue.next_unheard("alpha", limit=2)] == ["Howl 10", "Howl 11"]
+
+    # Heard state survives a fresh queue (e.g. a restarted server)
+    restarted = MessageQueue(territory=str(territory))
+    restarted.mark_heard_up_to(sent[49].id, "alpha")
+    assert restarted.count_unheard("alpha") == 29
+    assert restarted.next_unheard("alpha", limit=1)[0].content == "Howl 51"
+    assert len(restarted.listen("alpha", unheard_only=True, limit=100)) == 29
+
+def test_receive_orders_by_urgency(queue):
+    queue.send("scout-1", "alpha", "Routine", urgency=HowlUrgency.NORMAL)
+    queue.send("scout-1", "alpha", "Whenever", urgency=HowlUrgency.LOW)
+    queue.send("scout-1", "alpha", "Fire!", urgency=HowlUrgency.EMERGENCY)
+    queue.send("scout-1", "alpha", "Soon", urgency=HowlUrgency.URGENT)
+
+    urgent = queue.receive("alpha", timeout=0, min_urgency=HowlUrgency.URGENT)
+    assert [h.content for h in urgent] == ["Fire!", "Soon"]
+
+    rest = queue.receive("alpha", timeout=0)
+    assert [h.content for h in rest] == ["Routine", "Whenever"]
+    assert queue.count_unheard("alpha") == 0
+
+def test_receive_wakes_on_send(queue):
+    def send_later():
+        time.sleep(0.1)
+        queue.send("scout-1", "alpha", "Wake up")
+
+    sender = threading.Thread(target=send_later)
+    started = time.monotonic()
+    sender.start()
+    howls = queue.receive("alpha", timeout=5)
+    sender.join()
+
+    assert [h.content for h in howls] == ["Wake up"]
+    assert time.monotonic() - started < 1
+
+def test_receive_times_out(queue):
+    assert queue.receive("alpha", timeout=0.05) == []
+
+def test_concurrent_receivers_get_disjoint_howls(tmp_path):
+    territory = str(tmp_path / "messages")
+    sender = MessageQueue(territory=territory)
+    sent = {sender.send("scout-1", "alpha", f"Howl {i}").id for i in range(30)}
+    sent.add(sender.broadcast("scout-1", "Pack hunt").id)
+
+    received = []
+    def drain():
+        queue = MessageQueue(territory=territory)
+        while True:
+            howls = queue.receive("alpha", timeout=0, limit=3)
+            if not howls:
+                return
+            received.extend(h.id for h in howls)
+
+    workers = [threading.Thread(target=drain) for _ in range(4)]
+    for worker in workers:
+        worker.start()
+    for worker in workers:
+        worker.join()
+
+    assert sorted(received) == sorted(sent)
+    assert sender.count_unheard("alpha") == 0
+
+def test_broadcast_stored_once(queue):
+    queue.send("scout-1", "alpha", "Direct")
+    queue.store.join("beta")
+    queue.store.join("gamma")
+    msg = queue.broadcast("alpha", "Pack hunt at dawn")
+
+    pack_log = queue.territory / "_pack" / "log"
+    assert len(list(pack_log.glob("*.seg"))) == 1
+    assert not (queue.territory / "beta" / "log" / "index.bin").exists()
+
+    for wolf in ["alpha", "beta", "gamma"]:
+        howls = queue.listen(wolf)
+        assert howls[0].content == "Pack hunt at dawn"
+        assert howls[0].recipient == wolf
+
+    assert [h.content for h in queue.listen("alpha")] == ["Pack hunt at dawn", "Direct"]
+
+    # Each wolf's read position is its own
+    assert queue.mark_heard(msg.id, "beta") is True
+    assert queue.count_unheard("beta") == 0
+    assert queue.count_unheard("gamma") == 1
+    assert queue.count_unheard("alpha") == 2
+
+def test_broadcast_to_subset_reaches_only_listed_wolves(queue):
+    queue.store.join("gamma")
+    msg = queue.broadcast("alpha", "Flank left", pack=["alpha", "beta"])
+    queue.broadcast("alpha", "Regroup")
+
+    # Stored once, in the pack topic
+    assert not (queue.territory / "beta" / "log" / "index.bin").exists()
+    assert [h.content for h in queue.listen("beta")] == ["Regroup", "Flank left"]
+    assert [h.content for h in queue.listen("gamma")] == ["Regroup"]
+    assert queue.count_unheard("gamma") == 1
+    assert queue.mark_heard(msg.id, "gamma") is False
+
+    queue.mark_heard_up_to(queue.listen("gamma")[0].id, "gamma")
+    assert queue.count_unheard("gamma") == 0
+    assert queue.count_unheard("beta") == 2
+
+def test_module_broadcast_stores_once(tmp_path, monkeypatch):
+    from swarm_mcp.core import messaging
+
+    queue = MessageQueue(territory=str(tmp_path / "messages"))
+    monkeypatch.setattr(messaging, "_default_queue", queue)
+    msg = messaging.broadcast("alpha", "Hunt", pack=["beta", "gamma"])
+
+    assert msg.recipient == "pack"
+    assert len((queue.territory / "_pack" / "log" / "ids.txt").read_text().splitlines()) == 1
+    assert [h.content for h in queue.listen("gamma")] == ["Hunt"]
+
+def test_reading_unknown_wolf_does_not_join(queue):
+    queue.send("scout-1", "alpha", "Direct")
+
+    assert queue.listen("typo-wolf") == []
+    assert queue.count_unheard("typo-wolf") == 0
+    assert queue.receive("typo-wolf", timeout=0) == []
+    assert queue.wolves() == ["alpha"]
+
+def test_late_joiner_skips_old_broadcasts(queue):
+    queue.broadcast("alpha", "Before", pack=["beta"])
+    queue.send("alpha", "delta", "Welcome")
+
+    assert [h.content for h in queue.listen("delta")] == ["Welcome"]
+    queue.broadcast("alpha", "After")
+    assert [h.content for h in queue.receive("delta", timeout=0)] == ["Welcome", "After"]
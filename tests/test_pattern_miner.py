@@ -1,3 +1,6 @@
+import json
+from datetime import timedelta
+
 import pytest
 from swarm_mcp.core.pattern_miner import PatternMiner
 
@@ -50,3 +53,185 @@ def test_suggest(miner):
     
     assert len(suggestions) > 0
     assert suggestions[0].confidence > 0.5
+
+def test_aggregates_survive_restart_and_match_remine(tmp_path):
+    miner = PatternMiner(storage_dir=str(tmp_path / "patterns"))
+    for category in ["infra", "database"] * 4:
+        miner.record_event(
+            event_type="task_complete",
+            agents=["agent-1"],
+            context={"category": category},
+            outcome="success",
+            quality_score=0.9
+        )
+    miner.record_event("task_complete", ["agent-2"], {"category": "database"}, "failure")
+
+    # 8 successes alternating infra/database: every earlier success pairs with each later one
+    sequences = miner.aggregates.sequences
+    assert sequences["infra|database"]["count"] == 10
+    assert sequences["database|infra"]["count"] == 6
+    assert "sequence_infra_database" in miner.patterns
+
+    restarted = PatternMiner(storage_dir=str(tmp_path / "patterns"))
+    assert len(restarted.events) == 0
+    assert restarted.get_stats()["total_events"] == 9
+    assert restarted.aggregates.to_dict() == miner.aggregates.to_dict()
+
+    assert restarted.remine() == 9
+    assert restarted.aggregates.to_dict() == miner.aggregates.to_dict()
+
+def test_aggregates_saved_in_batches_and_caught_up(tmp_path):
+    miner = PatternMiner(storage_dir=str(tmp_path / "patterns"), save_every=3, save_interval=3600)
+    for _ in range(4):
+        miner.record_event("task_complete", ["agent-1", "agent-2"], {"category": "infra"}, "success")
+
+    # Saved once, after the third event
+    saved = json.loads(miner.aggregates_file.read_text())
+    assert saved["total_events"] == 3
+
+    # The fourth event is replayed from the event store on load
+    restarted = PatternMiner(storage_dir=str(tmp_path / "patterns"))
+    assert restarted.aggregates.to_dict() == miner.aggregates.to_dict()
+
+    miner.flush()
+    assert json.loads(miner.aggregates_file.read_text())["total_events"] == 4
+
+def test_aggregates_merged_across_miners(tmp_path):
+    first = PatternMiner(storage_dir=str(tmp_path / "patterns"), save_every=100, save_interval=3600)
+    second = PatternMiner(storage_dir=str(tmp_path / "patterns"), save_every=100, save_interval=3600)
+    for i in range(3):
+        first.record_event("task_complete", ["agent-1", "agent-2"], {"category": "infra"}, "success")
+        second.record_event("task_complete", ["agent-3", "agent-4"], {"category": "database"}, "success")
+
+    second.flush()
+    first.flush()
+
+    saved = json.loads(first.aggregates_file.read_text())
+    assert saved["total_events"] == 6
+    assert set(saved["pairs"]) == {"agent-1|agent-2", "agent-3|agent-4"}
+
+    rebuilt = PatternMiner(storage_dir=str(tmp_path / "patterns"))
+    rebuilt.remine()
+    assert json.loads(rebuilt.aggregates_file.read_text()) == saved
+
+def test_catch_up_folds_late_events_in_older_partitions(tmp_path):
+    miner = PatternMiner(storage_dir=str(tmp_path / "patterns"))
+    event = miner.record_event("task_complete", ["agent-1", "agent-2"], {"category": "infra"}, "success")
+    miner.flush()
+
+    # Another process stamps an event just before midnight but appends it after ours
+    miner.event_store.append({
+        "id": "event_late",
+        "event_type": "task_complete",
+        "agents": ["agent-3", "agent-4"],
+        "context": {"category": "database"},
+        "outcome": "success",
+        "timestamp": event.timestamp.replace(hour=0, minute=0, second=0) - timedelta(seconds=1),
+        "duration_minutes": 0,
+        "quality_score": 1.0,
+        "tags": [],
+    })
+    miner.record_event("task_complete", ["agent-1", "agent-2"], {"category": "infra"}, "success")
+    miner.flush()
+
+    saved = json.loads(miner.aggregates_file.read_text())
+    assert saved["total_events"] == 3
+    assert "agent-3|agent-4" in saved["pairs"]
+    assert PatternMiner(storage_dir=str(tmp_path / "patterns")).get_stats()["total_events"] == 3
+
+def test_aggregates_without_cursors_are_rebuilt(tmp_path):
+    miner = PatternMiner(storage_dir=str(tmp_path / "patterns"))
+    for _ in range(3):
+        miner.record_event("task_complete", ["agent-1", "agent-2"], {"category": "infra"}, "success")
+    miner.flush()
+
+    # An aggregates file from before row cursors were kept
+    saved = json.loads(miner.aggregates_file.read_text())
+    del saved["folded"]
+    saved["last_event"] = ["2020-01-01T00:00:00", "event_gone"]
+    miner.aggregates_file.write_text(json.dumps(saved))
+
+    restarted = PatternMiner(storage_dir=str(tmp_path / "patterns"))
+    assert restarted.get_stats()["total_events"] == 3
+    assert restarted.aggregates.to_dict() == miner.aggregates.to_dict()
+
+def test_event_store_partitions_and_legacy_import(tmp_path):
+    import json
+    from datetime import datetime
+
+    events_dir = tmp_path / "patterns" / "events"
+    events_dir.mkdir(parents=True)
+    for day in [1, 2, 3]:
+        (events_dir / f"event_{day}.json").write_text(json.dumps({
+            "id": f"event_{day}",
+            "event_type": "task_complete",
+            "agents": ["agent-1", "agent-2"],
+            "context": {"category": "infra", "file": "deploy.py"},
+            "outcome": "success",
+            "timestamp": datetime(2025, 1, day, 12).isoformat(),
+            "quality_score": 0.5 + day / 10
+        }))
+
+    miner = PatternMiner(storage_dir=str(tmp_path / "patterns"))
+
+    assert not list(events_dir.glob("*.json"))
+    assert miner.event_store.partitions() == ["2025-01-01", "2025-01-02", "2025-01-03"]
+    assert miner.get_stats()["total_events"] == 3
+
+    recent = list(miner.history(start=datetime(2025, 1, 2)))
+    assert [e.id for e in recent] == ["event_2", "event_3"]
+    assert recent[0].agents == ["agent-1", "agent-2"]
+    assert recent[0].context == {"category": "infra", "file": "deploy.py"}
+    assert recent[0].quality_score == 0.7
+    assert miner.event_store.count(start=datetime(2025, 1, 1, 13)) == 2
+
+def test_event_store_recovers_from_torn_append(tmp_path):
+    from datetime import datetime
+    from swarm_mcp.core.event_store import EventStore
+
+    store = EventStore(tmp_path / "events")
+
+    def event(n, agents):
+        return {
+            "id": f"event_{n}",
+            "event_type": "task_complete",
+            "agents": agents,
+            "context": {"n": n},
+            "outcome": "success",
+            "timestamp": datetime(2025, 1, 1, 12, n),
+        }
+
+    store.append(event(1, ["agent-1"]))
+    # Crash after the variable-width writes and one fixed column
+    partition = tmp_path / "events" / "2025-01-01"
+    with open(partition / "extra.jsonl", "ab") as handle:
+        handle.write(b'{"id": "torn", "context": {}, "ta')
+    with open(partition / "agents.col", "ab") as handle:
+        handle.write(b"\x07\x00\x00\x00\x08\x00")
+    with open(partition / "duration.col", "ab") as handle:
+        handle.write(b"\x00" * 8)
+    assert [e["id"] for e in store.iter_events()] == ["event_1"]
+
+    store.append(event(2, ["agent-2", "agent-3"]))
+    events = list(store.iter_events())
+    assert [(e["id"], e["agents"], e["context"]) for e in events] == [
+        ("event_1", ["agent-1"], {"n": 1}),
+        ("event_2", ["agent-2", "agent-3"], {"n": 2}),
+    ]
+    assert events[1]["duration_minutes"] == 0.0
+
+def test_event_store_cuts_torn_string(tmp_path):
+    from swarm_mcp.core.event_store import EventStore
+
+    store = EventStore(tmp_path / "events")
+    store._intern("alpha")
+    with open(tmp_path / "events" / "strings.txt", "ab") as handle:
+        handle.write(b'"bet')
+
+    other = EventStore(tmp_path / "events")
+    gamma = other._intern("gamma")
+
+    reopened = EventStore(tmp_path / "events")
+    assert reopened._string(gamma) == "gamma"
+    assert store._string(gamma) == "gamma"
+    assert store._intern("delta") == gamma + 1
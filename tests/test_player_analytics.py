@@ -0,0 +1,145 @@
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from player_analytics.core import AnalyticsEngine, EventBuffer, PlayerDatabase, SessionTracker
+
+@pytest.fixture
+def db(tmp_path):
+    return PlayerDatabase(tmp_path / "players.db")
+
+@pytest.fixture
+def tracker(db):
+    return SessionTracker(db, server_name="survival")
+
+def test_join_and_leave_round_trip(db, tracker):
+    assert tracker.player_join("p1", "Steve")["is_new_player"]
+    tracker.log_player_event("p1", "kill", {"mob": "zombie"})
+    assert tracker.player_leave("p1", reason="quit")["success"]
+
+    assert [event["event_type"] for event in db.get_player_events("p1")] == ["leave", "kill", "join"]
+    assert db.get_player("p1").session_count == 1
+    assert db.get_stats()["total_sessions"] == 1
+    assert AnalyticsEngine(db).get_engagement_metrics()["unique_players"] == 1
+
+def test_join_is_one_transaction(db, tracker, monkeypatch):
+    def fail(**kwargs):
+        raise RuntimeError("disk full")
+    monkeypatch.setattr(db, "log_event", fail)
+
+    with pytest.raises(RuntimeError):
+        tracker.player_join("p1", "Steve")
+
+    assert db.get_player("p1") is None
+    assert db.get_active_sessions() == []
+    assert not tracker.is_player_online("p1")
+
+def test_persistent_wal_connection_per_thread(db):
+    conn = db.connection()
+    assert db.connection() is conn
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+
+    other = []
+    thread = threading.Thread(target=lambda: other.append(db.connection()))
+    thread.start()
+    thread.join()
+    assert other[0] is not conn
+
+def test_buffered_events_flush_in_batches(db):
+    tracker = SessionTracker(db, buffer_events=True, event_batch_size=50, event_flush_interval=60)
+    seen = []
+    tracker.on_event(lambda event_type, data: seen.append(data["data"]["i"]))
+
+    for i in range(120):
+        tracker.log_player_event("p1", "pickup", {"i": i})
+
+    assert seen == list(range(120))
+    tracker.close()
+    events = db.get_player_events("p1", event_type="pickup", limit=200)
+    assert sorted(event["event_data"]["i"] for event in events) == list(range(120))
+
+def test_full_buffer_applies_backpressure(db):
+    buffer = EventBuffer(db, batch_size=10**6, flush_interval=60, capacity=5)
+    for i in range(5):
+        buffer.append("p1", "death", {"i": i})
+
+    assert len(buffer) == 0
+    assert db.get_stats()["total_events"] == 5
+    buffer.close()
+
+def test_rollups_track_sessions_and_backfill(tmp_path, db):
+    for server, player_ids in (("survival", ["p1", "p2"]), ("creative", ["p3", "p4"])):
+        tracker = SessionTracker(db, server_name=server)
+        for player_id in player_ids:
+            tracker.player_join(player_id, player_id.upper())
+            tracker.player_leave(player_id)
+    SessionTracker(db, server_name="survival").player_join("p5", "P5")
+
+    engine = AnalyticsEngine(db)
+    engagement = engine.get_engagement_metrics(days=1)
+    assert engagement["unique_players"] == 5
+    assert engagement["total_sessions"] == 5
+    assert engagement["dau"]["data"][-1]["count"] == 5
+    assert sum(hour["sessions"] for hour in engine.get_peak_hours()["hourly_distribution"]) == 5
+    servers = {server["server_name"]: server for server in engine.get_server_comparison()["servers"]}
+    assert servers["survival"]["sessions"] == 2
+    assert servers["survival"]["unique_players"] == 3
+
+    # Rollups are rebuilt from sessions for databases that predate them
+    db.connection().execute("DELETE FROM hourly_rollups")
+    db.connection().execute("DELETE FROM daily_player_rollups")
+    assert AnalyticsEngine(PlayerDatabase(db.db_path)).get_engagement_metrics(days=1) == engagement
+
+def test_retention_triangle(db):
+    today = datetime.now().date()
+
+    def day(offset):
+        return (today - timedelta(days=offset)).isoformat()
+
+    # (player, days ago) of each session: two cohorts, 10 and 3 days old
+    sessions = [("a", 10), ("a", 9), ("a", 2), ("b", 10), ("b", 8), ("c", 10), ("d", 3), ("d", 2)]
+    db.connection().executemany(
+        "INSERT INTO sessions (session_id, player_id, server_name, start_time) VALUES (?, ?, 's', ?)",
+        [(f"{player}{ago}", player, f"{day(ago)}T12:00:00") for player, ago in sessions],
+    )
+    db.rebuild_rollups()
+
+    metrics = AnalyticsEngine(db).get_retention_metrics(day(30), offsets=(1, 7))
+    assert metrics["cohort_size"] == 4
+    assert metrics["cohorts"] == [
+        {"date": day(10), "size": 3, "retention": {
+            "day_1": {"returned": 2, "rate": 66.7}, "day_7": {"returned": 1, "rate": 33.3}}},
+        {"date": day(3), "size": 1, "retention": {"day_1": {"returned": 1, "rate": 100.0}}},
+    ]
+    assert metrics["retention"]["day_1"] == {"returned": 3, "players": 4, "rate": 75.0}
+    assert metrics["retention"]["day_7"] == {"returned": 1, "players": 3, "rate": 33.3}
+
+    # Sessions created through the database keep first/last day current
+    db.create_session("b", "s")
+    assert db.connection().execute(
+        "SELECT first_day, last_day FROM player_first_seen WHERE player_id = 'b'"
+    ).fetchone()[:] == (day(10), day(0))
+
+def test_segments_are_cached_until_players_change(db):
+    stale = (datetime.now() - timedelta(days=30)).isoformat()
+    db.connection().executemany(
+        """INSERT INTO players (player_id, username, first_seen, last_seen,
+           total_playtime_minutes, session_count) VALUES (?, ?, ?, ?, ?, ?)""",
+        [(f"p{i}", f"P{i}", stale, datetime.now().isoformat(), 100 - i, 5) for i in range(10)]
+        + [("old", "Old", stale, stale, 1000, 50), ("quit", "Quit", stale, stale, 0, 1)],
+    )
+    engine = AnalyticsEngine(db)
+
+    segments = engine.get_player_segments()
+    assert segments["total_players"] == 12
+    counts = {name: segment["count"] for name, segment in segments["segments"].items()}
+    assert counts == {"whales": 1, "regulars": 3, "casuals": 6, "churned": 2, "new": 0}
+    assert [p["player_id"] for p in segments["segments"]["regulars"]["top_players"]] == ["p1", "p2", "p3"]
+
+    version = db.table_version()
+    assert engine.get_player_segments() == segments
+    player = db.get_player("p9")
+    player.session_count = 1
+    db.update_player(player)
+    assert db.table_version() == version + 1
+    assert engine.get_player_segments()["segments"]["new"]["count"] == 1
@@ -1,5 +1,5 @@
 import pytest
-from swarm_mcp.core.task_scoring import TaskScorer, ScoredTask
+from swarm_mcp.core.task_scoring import TaskScorer, ScoredTask, TaskScheduler
 from swarm_mcp.core.verification import VerificationHarness, VerificationResult, VerificationType
 from swarm_mcp.core.recovery import RecoveryManager, FailureEvent
 
@@ -36,6 +36,65 @@ class TestTaskScoring:
         selected = scorer.select_next_task([t1, t2])
         assert selected.id == "2"
 
+    def test_select_top_tasks(self):
+        scorer = TaskScorer()
+        tasks = [ScoredTask(str(i), f"Task {i}", value=v) for i, v in enumerate([3, 9, 9, 1])]
+        assert [t.id for t in scorer.select_top_tasks(tasks, 3)] == ["1", "2", "0"]
+
+class TestTaskScheduler:
+    def test_assign_in_roi_order(self):
+        scheduler = TaskScheduler([
+            ScoredTask("low", "Low", value=1),
+            ScoredTask("high", "High", value=10),
+            ScoredTask("mid", "Mid", value=5),
+        ])
+        picks = scheduler.assign(["agent-1", "agent-2"])
+        assert {agent: t.id for agent, t in picks.items()} == {"agent-1": "high", "agent-2": "mid"}
+        assert len(scheduler) == 1
+
+        assert scheduler.release("mid")
+        assert [t.id for t in scheduler.pop(5)] == ["mid", "low"]
+        assert scheduler.assign(["agent-3"]) == {}
+
+    def test_dependencies_release_tasks(self):
+        scheduler = TaskScheduler()
+        scheduler.add(ScoredTask("build", "Build", value=2))
+        assert scheduler.add(ScoredTask("publish", "Publish", value=10, dependencies=["build", "ci"])) is False
+
+        assert scheduler.peek().id == "build"
+        assert scheduler.complete("build") == []
+        assert scheduler.blocked_by("publish") == ["ci"]
+        assert [t.id for t in scheduler.complete("ci")] == ["publish"]
+        assert scheduler.pop()[0].id == "publish"
+
+    def test_rescore_and_cycles(self):
+        scheduler = TaskScheduler([ScoredTask("a", "A", value=1), ScoredTask("b", "B", value=2)])
+        scheduler.add(ScoredTask("a", "A", value=10))
+        assert scheduler.peek().id == "a"
+        assert len(scheduler) == 2
+
+        scheduler.add(ScoredTask("c", "C", dependencies=["b"]))
+        with pytest.raises(ValueError):
+            scheduler.add(ScoredTask("b", "B", dependencies=["c"]))
+        with pytest.raises(ValueError):
+            scheduler.add(ScoredTask("d", "D", dependencies=["d"]))
+
+    def test_update_applies_only_differences(self):
+        build = ScoredTask("build", "Build", value=2)
+        publish = ScoredTask("publish", "Publish", value=10, dependencies=["ci"])
+        scheduler = TaskScheduler([build, publish])
+        scheduler.complete("ci")
+        assert scheduler.pop()[0].id == "publish"
+
+        # ci reopened, build re-scored, docs added
+        scheduler.update([ScoredTask("build", "Build", value=3), publish, ScoredTask("docs", "Docs")], done=[])
+        assert scheduler.blocked_by("publish") == ["ci"]
+        assert [t.id for t in scheduler.pop(5)] == ["docs", "build"]
+
+        scheduler.update([ScoredTask("build", "Build", value=3)], done=["ci", "docs"])
+        assert len(scheduler) == 0
+        assert scheduler.blocked_by("publish") == []
+
 class TestVerification:
     def test_file_exists(self, tmp_path):
         harness = VerificationHarness(workspace_root=str(tmp_path))
@@ -59,6 +118,33 @@ class TestVerification:
         assert res.passed is True
         assert res.type == VerificationType.UNIT_TEST
 
+    def test_run_suite_parallel_and_deduped(self, tmp_path):
+        import time
+        harness = VerificationHarness(workspace_root=str(tmp_path), max_test_processes=3)
+        (tmp_path / "test.txt").touch()
+        for name in ("a", "b"):
+            (tmp_path / f"test_{name}.py").write_text("import time\ndef test_ok(): time.sleep(2)")
+        (tmp_path / "test_slow.py").write_text("import time\ndef test_slow(): time.sleep(30)")
+
+        checks = [
+            {"type": "unit_test", "target": "test_a.py"},
+            {"type": "file_exists", "target": "test.txt"},
+            {"type": "unit_test", "target": "test_b.py"},
+            {"type": "unknown", "target": "x"},
+            {"type": "file_exists", "target": "test.txt"},
+            {"type": "unit_test", "target": "test_slow.py", "timeout": 0.5},
+        ]
+        start = time.monotonic()
+        results = harness.run_suite(checks)
+        elapsed = time.monotonic() - start
+
+        assert [r.target for r in results] == ["test_a.py", "test.txt", "test_b.py", "test.txt", "test_slow.py"]
+        assert [r.passed for r in results] == [True, True, True, True, False]
+        assert "timed out" in results[-1].details
+        assert results[1] is not results[3]
+        # Two 2s test runs side by side, not one after the other
+        assert elapsed < 4.5
+
 class TestRecovery:
     def test_analyze_failure(self):
         manager = RecoveryManager()
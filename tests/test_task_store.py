@@ -0,0 +1,122 @@
+import threading
+import pytest
+from swarm_mcp.core.task_store import TaskStore
+
+LOG = """# 🐺 MASTER TASK LOG
+
+**Last Updated:** 2025-01-01
+
+---
+
+## 📥 INBOX - Untriaged
+
+- [ ] Write docs [v=3 u=3 e=5]
+- [ ] Fix login [v=9 u=9 e=2]
+
+---
+
+## 🎯 THIS WEEK - High Priority
+
+### Publishing
+- [x] Build package
+- [ ] Publish to PyPI
+
+---
+
+## 📆 BACKLOG
+
+- [ ] Not managed
+"""
+
+@pytest.fixture
+def store(tmp_path):
+    log = tmp_path / "MASTER_TASK_LOG.md"
+    log.write_text(LOG, encoding="utf-8")
+    return TaskStore(tmp_path / "tasks.db", log)
+
+def test_import_renders_log_unchanged(store):
+    assert store.render() == LOG
+    assert store.get_lines("THIS WEEK") == ["- [x] Build package", "- [ ] Publish to PyPI"]
+    assert store.has_section("INBOX")
+    assert not store.has_section("PARKED")
+
+def test_add_complete_and_select(store):
+    assert store.add_task("INBOX", "Triage bugs (from agent-1)")
+    assert store.add_task("PARKED", "Nowhere to go") is False
+
+    assert store.complete_task("INBOX", "Fix login") == "Fix login [v=9 u=9 e=2]"
+    assert store.complete_task("INBOX", "Fix login") is None
+    assert [task.description for task in store.top_tasks("INBOX", k=2)] == [
+        "Triage bugs (from agent-1)",
+        "Write docs [v=3 u=3 e=5]"
+    ]
+
+    text = store.log_path.read_text(encoding="utf-8")
+    assert "- [x] Fix login [v=9 u=9 e=2]\n- [ ] Triage bugs (from agent-1)\n\n---" in text
+    assert "**Last Updated:** 2025-01-01" not in text
+    assert text.endswith("## 📆 BACKLOG\n\n- [ ] Not managed\n")
+
+def test_external_edits_are_reimported(store):
+    store.add_task("INBOX", "First")
+    edited = store.log_path.read_text(encoding="utf-8").replace("- [ ] Publish to PyPI", "- [x] Publish to PyPI")
+    store.log_path.write_text(edited + "\n", encoding="utf-8")
+
+    assert store.get_lines("THIS WEEK")[-1] == "- [x] Publish to PyPI"
+    assert store.render() == edited + "\n"
+
+def test_concurrent_writers(tmp_path, store):
+    other = TaskStore(tmp_path / "tasks.db", store.log_path)
+    threads = [
+        threading.Thread(target=(store if i % 2 else other).add_task, args=("INBOX", f"Task {i}"))
+        for i in range(8)
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    lines = TaskStore(tmp_path / "tasks.db", store.log_path).get_lines("INBOX")
+    assert sorted(lines[2:]) == [f"- [ ] Task {i}" for i in range(8)]
+    assert store.log_path.read_text(encoding="utf-8").count("- [ ] Task") == 8
+
+def test_scheduler_waits_for_prerequisites(store):
+    store.add_task("INBOX", "Ship release [v=10 u=10 e=1 id=ship after=notes]")
+    store.add_task("INBOX", "Write notes [v=2 u=2 e=5 id=notes]")
+
+    # Highest ROI, but blocked until the notes are ticked
+    assert store.top_tasks("INBOX", k=1)[0].description.startswith("Ship release")
+    scheduler = store.scheduler("INBOX")
+    assert scheduler.peek().description == "Fix login [v=9 u=9 e=2]"
+    assert scheduler.blocked_by("ship") == ["notes"]
+
+    store.complete_task("INBOX", "Write notes")
+    assert store.scheduler("INBOX").peek().id == "ship"
+
+def test_scheduler_is_kept_and_updated_in_place(tmp_path, store):
+    scheduler = store.scheduler("INBOX")
+    store.add_task("INBOX", "Hotfix [v=10 u=10 e=1 id=hotfix]")
+    assert store.scheduler("INBOX") is scheduler
+    assert scheduler.peek().id == "hotfix"
+
+    picks = store.assign("INBOX", ["agent-1", "agent-2"])
+    assert [task.description for task in picks.values()] == [
+        "Hotfix [v=10 u=10 e=1 id=hotfix]",
+        "Fix login [v=9 u=9 e=2]"
+    ]
+
+    # Another process adds a task: folded in, claims kept
+    TaskStore(tmp_path / "tasks.db", store.log_path).add_task("INBOX", "Deploy [v=8 u=8 e=1 after=hotfix]")
+    assert store.scheduler("INBOX") is scheduler
+    assert [task.description for task in store.claim("INBOX", k=5)] == ["Write docs [v=3 u=3 e=5]"]
+
+    store.complete_task("INBOX", "Hotfix")
+    assert [task.description for task in store.claim("INBOX")] == ["Deploy [v=8 u=8 e=1 after=hotfix]"]
+
+def test_servers_claim_and_assign(tmp_path, monkeypatch, store):
+    from swarm_mcp.servers import tasks
+
+    monkeypatch.setattr(tasks, "_task_store", store)
+    assigned = tasks.assign_tasks(["agent-1"])
+    assert assigned["assignments"]["agent-1"]["task"] == "Fix login [v=9 u=9 e=2]"
+    assert [task["task"] for task in tasks.claim_tasks(count=3)["tasks"]] == ["Write docs [v=3 u=3 e=5]"]
+    assert tasks.select_next_task()["success"] is False
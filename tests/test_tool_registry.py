@@ -0,0 +1,39 @@
+import sys
+
+from tools_v2 import ToolRegistry, spec_cache
+
+
+def test_category_queries_import_no_adapters():
+    registry = ToolRegistry()
+    before = set(sys.modules)
+
+    assert "messaging" in registry.get_categories()
+    assert registry.list_by_category("vector") == ["vector.context", "vector.index", "vector.search"]
+    spec = registry.get_spec("msg.send")
+
+    assert spec.category == "messaging"
+    assert "agent_id" in spec.required_params
+    assert not {m for m in set(sys.modules) - before if m.startswith("tools_v2.categories")}
+
+
+def test_spec_cache_rebuilt_on_change(tmp_path):
+    package = tmp_path / "fake_tools"
+    package.mkdir()
+    (package / "__init__.py").write_text("")
+    (package / "demo.py").write_text(
+        "class DemoTool:\n"
+        "    def get_spec(self):\n"
+        "        return ToolSpec(name='demo.run', category='demo', summary='Run demo',\n"
+        "                        required_params=['target'], optional_params={'n': 1})\n"
+    )
+    lock = tmp_path / "tool_registry.lock.json"
+    lock.write_text('{"tools": {"demo.run": ["fake_tools.demo", "DemoTool"]}}')
+
+    cache = spec_cache.load_spec_cache(lock, root=tmp_path)
+    assert cache["tools"]["demo.run"]["required_params"] == ["target"]
+    assert spec_cache.load_spec_cache(lock, root=tmp_path) == cache
+
+    (package / "demo.py").write_text(
+        (package / "demo.py").read_text().replace("category='demo'", "category='other'")
+    )
+    assert spec_cache.load_spec_cache(lock, root=tmp_path)["categories"] == {"other": ["demo.run"]}
@@ -44,3 +44,48 @@ class TestToolbelt:
         """Test that tool listing runs without error."""
         with patch("sys.argv", ["tools/cli.py", "--list"]):
             assert main() == 0
+
+    def test_dispatcher_reads_manifest_lazily(self):
+        """Resolving a command must not import the generated registry."""
+        import subprocess
+        code = (
+            "import sys\n"
+            "from tools.cli.dispatchers.unified_dispatcher import UnifiedCLIDispatcher\n"
+            "d = UnifiedCLIDispatcher()\n"
+            "assert d.commands['agent-checkin']['module'] == 'tools.agent_checkin'\n"
+            "assert 'tools.cli.commands.registry' not in sys.modules\n"
+        )
+        workspace_root = Path(__file__).parent.parent
+        subprocess.run([sys.executable, "-c", code], cwd=workspace_root, check=True)
+
+    def test_stale_manifest_rebuilt_from_registry(self, tmp_path):
+        from tools.cli.commands.manifest import CommandManifest, read_manifest, write_manifest
+        from tools.cli.commands.registry import COMMAND_REGISTRY
+        manifest_path = tmp_path / "manifest.json"
+        write_manifest({"version": 1, "registry_sha256": "old", "commands": {}, "categories": {}, "files": {}}, manifest_path)
+
+        commands = CommandManifest(path=manifest_path)
+        assert len(commands) == len(COMMAND_REGISTRY)
+        assert read_manifest(manifest_path)["registry_sha256"] != "old"
+
+        commands["new-cmd"] = {"module": "tools.new_cmd", "function": "main", "category": "zeta"}
+        assert commands.by_category()["zeta"] == ["new-cmd"]
+
+    def test_discovery_reanalyzes_changed_files_only(self, tmp_path):
+        from tools.cli.command_discovery import CommandDiscovery
+        (tmp_path / "alpha_tool.py").write_text('"""Alpha tool."""\ndef main():\n    pass\n')
+        (tmp_path / "beta_tool.py").write_text('"""Beta tool."""\ndef main():\n    pass\n')
+
+        first = CommandDiscovery(tools_dir=tmp_path)
+        first.discover_commands()
+        assert first.analyzed == 2
+
+        (tmp_path / "beta_tool.py").write_text('"""Beta tool, now longer."""\ndef main():\n    pass\n')
+        second = CommandDiscovery(tools_dir=tmp_path)
+        commands = second.discover_commands(cache=first.files)
+        assert second.analyzed == 1
+        assert {c["name"]: c["description"] for c in commands} == {
+            "alpha-tool": "Alpha tool.",
+            "beta-tool": "Beta tool, now longer."
+        }
+        assert second.registry_dict()["alpha-tool"]["module"] == "tools.alpha_tool"
@@ -0,0 +1,188 @@
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from tools_v2 import ToolbeltCore, ToolRegistry, toolbelt_core
+from tools_v2.adapters.base_adapter import IToolAdapter, ToolResult, ToolSpec
+from tools_v2.batch_runner import ToolCall
+from tools_v2.telemetry import TelemetrySink, ToolStats, bucket_bounds, bucket_index, load_stats
+
+
+class CountingTool(IToolAdapter):
+    """Test adapter counting instances and executions."""
+
+    instances = 0
+    executions = 0
+    cache_ttl = None
+
+    def __init__(self):
+        CountingTool.instances += 1
+
+    def get_spec(self) -> ToolSpec:
+        return ToolSpec(
+            name="test.count",
+            version="1.0.0",
+            category="test",
+            summary="Count calls",
+            required_params=["n"],
+            optional_params={},
+            cache_ttl=self.cache_ttl,
+        )
+
+    def validate(self, params):
+        return self.get_spec().validate_params(params)
+
+    def execute(self, params, context=None) -> ToolResult:
+        CountingTool.executions += 1
+        return ToolResult(success=True, output={"double": params["n"] * 2})
+
+
+class SleepTool(IToolAdapter):
+    """Test adapter that sleeps for the requested seconds."""
+
+    def get_spec(self) -> ToolSpec:
+        return ToolSpec(
+            name="test.sleep",
+            version="1.0.0",
+            category="test",
+            summary="Sleep",
+            required_params=["seconds"],
+            optional_params={},
+        )
+
+    def validate(self, params):
+        return self.get_spec().validate_params(params)
+
+    def execute(self, params, context=None) -> ToolResult:
+        time.sleep(params["seconds"])
+        return ToolResult(success=True, output=params["seconds"])
+
+
+@pytest.fixture
+def core(tmp_path):
+    """Core whose registry resolves the test tools above."""
+    CountingTool.instances = CountingTool.executions = 0
+    CountingTool.cache_ttl = None
+    core = ToolbeltCore(telemetry=TelemetrySink(tmp_path / "telemetry.jsonl"))
+    core.registry = ToolRegistry()
+    core.registry._cache["test.count"] = CountingTool
+    core.registry._cache["test.sleep"] = SleepTool
+    yield core
+    core.close()
+
+
+def test_adapter_instances_reused(core):
+    for n in range(3):
+        assert core.run("test.count", {"n": n}).output == {"double": n * 2}
+
+    assert CountingTool.instances == 1
+    assert CountingTool.executions == 3
+
+
+def test_cacheable_results_memoized(core):
+    CountingTool.cache_ttl = 60
+    core.run("test.count", {"n": 2})
+    result = core.run("test.count", {"n": 2})
+
+    assert result.output == {"double": 4}
+    assert CountingTool.executions == 1
+    assert core.execution_history[-1]["cached"] is True
+
+    core.run("test.count", {"n": 3})
+    core.run("test.count", {"n": 2}, use_cache=False)
+    assert CountingTool.executions == 3
+
+    core.clear_result_cache("test.count")
+    core.run("test.count", {"n": 2})
+    assert CountingTool.executions == 4
+
+
+def test_cached_results_are_private_copies(core):
+    CountingTool.cache_ttl = 60
+    first = core.run("test.count", {"n": 2})
+    first.output["double"] = "mutated"
+
+    second = core.run("test.count", {"n": 2})
+    second.output["extra"] = True
+
+    assert core.run("test.count", {"n": 2}).output == {"double": 4}
+    assert CountingTool.executions == 1
+
+
+def test_run_many_concurrent_in_order(core):
+    calls = [("test.sleep", {"seconds": 0.5}) for _ in range(4)]
+    calls.append({"tool": "test.count", "params": {"n": 5}})
+
+    start = time.monotonic()
+    results = core.run_many(calls)
+
+    assert time.monotonic() - start < 1.5
+    assert [result.output for result in results] == [0.5, 0.5, 0.5, 0.5, {"double": 10}]
+    assert [record["executor"] for record in core.execution_history] == ["thread"] * 5
+
+
+def test_run_many_timeout(core):
+    results = core.run_many(
+        [ToolCall("test.sleep", {"seconds": 1}, timeout=0.1), ("test.count", {"n": 1})]
+    )
+
+    assert results[0].success is False
+    assert "Timed out" in results[0].error_message
+    assert results[1].output == {"double": 2}
+
+
+def test_run_async(core):
+    async def gather():
+        return await asyncio.gather(
+            core.run_async("test.count", {"n": 1}),
+            core.run_async("test.count", {"n": 2}),
+        )
+
+    assert [result.output for result in asyncio.run(gather())] == [{"double": 2}, {"double": 4}]
+
+
+def test_telemetry_persisted_and_merged(core):
+    core.run("test.count", {"n": 1})
+    core.telemetry.flush()
+    core.run("test.count", {})
+    core.run_many([("test.sleep", {"seconds": 0.05})])
+    core.telemetry.flush()
+
+    stats = load_stats(core.telemetry.path)
+    assert stats["test.count"].calls == 2
+    assert stats["test.count"].errors == 1
+    assert 40 <= stats["test.sleep"].percentile(99) <= 80
+
+
+def test_process_pool_calls_recorded_once(core, monkeypatch):
+    # Stand-in pool running _run_in_process on this core, as a child would on its own
+    monkeypatch.setattr(toolbelt_core, "_core_instance", core)
+    monkeypatch.setattr(core, "_execution_hints", lambda call: ("process", None))
+    pool = ThreadPoolExecutor(max_workers=1)
+    monkeypatch.setattr(core.executors, "get", lambda kind: pool)
+
+    assert core.run_many([("test.count", {"n": 1})])[0].output == {"double": 2}
+    pool.shutdown()
+    core.telemetry.flush()
+
+    assert [record["executor"] for record in core.execution_history] == ["process"]
+    assert load_stats(core.telemetry.path)["test.count"].calls == 1
+
+
+def test_histogram_buckets_cover_values():
+    for micros in [0, 1, 31, 32, 33, 1000, 123_456, 10**9]:
+        low, high = bucket_bounds(bucket_index(micros))
+        assert low <= micros <= high
+        assert high - low <= micros / 16
+
+
+def test_histogram_percentiles():
+    stats = ToolStats()
+    for ms in range(1, 101):
+        stats.add(ms / 1000, success=True, cached=False, param_bytes=10)
+
+    assert abs(stats.percentile(50) - 50) <= 50 / 16
+    assert abs(stats.percentile(95) - 95) <= 95 / 16
+    assert stats.percentile(100) == 100
@@ -41,3 +41,49 @@ def test_invalid_proof_no_changes(proof_system, tmp_path):
     
     assert proof.valid is False
     assert "No file changes detected" in proof.validation_notes
+
+def test_hash_cache_skips_unchanged_files(tmp_path, monkeypatch):
+    from swarm_mcp.core import work_proof as module
+    monkeypatch.setattr(module, "RACY_WINDOW_NS", 0)
+    (tmp_path / "big.bin").write_bytes(b"x" * 3_000_000)
+    (tmp_path / "small.txt").write_text("before")
+
+    system = WorkProofSystem(storage_dir=str(tmp_path / "proofs"), repo_path=str(tmp_path))
+    commitment = system.commit("agent-1", "Touch small", ["big.bin", "small.txt"])
+
+    hashed = []
+    reader = WorkProofSystem(storage_dir=str(tmp_path / "proofs"), repo_path=str(tmp_path))
+    original = reader._file_hash
+    monkeypatch.setattr(reader, "_file_hash", lambda path: hashed.append(path.name) or original(path))
+
+    (tmp_path / "small.txt").write_text("after!")
+    proof = reader.prove(commitment.id)
+
+    assert hashed == ["small.txt"]
+    assert proof.files_modified == ["small.txt"]
+    assert proof.before_hashes["big.bin"] == proof.after_hashes["big.bin"]
+
+def test_batched_git_evidence(tmp_path):
+    import subprocess
+    def git(*args):
+        subprocess.run(["git", "-c", "user.name=t", "-c", "user.email=t@t", *args], cwd=tmp_path, check=True, capture_output=True)
+
+    git("init", "-q")
+    for name in ("a.py", "b.py", "c.py"):
+        (tmp_path / name).write_text("one\n")
+    git("add", ".")
+    git("commit", "-qm", "base")
+
+    system = WorkProofSystem(storage_dir=str(tmp_path / ".proofs"), repo_path=str(tmp_path))
+    commitment = system.commit("agent-1", "Edit files", ["a.py", "b.py", "c.py"])
+    (tmp_path / "a.py").write_text("one\ntwo\n")
+    (tmp_path / "b.py").write_text("uno\n")
+    git("commit", "-qam", "work")
+
+    proof = system.prove(commitment.id)
+    assert proof.git_diff_stats == {"insertions": 2, "deletions": 1, "files_changed": 2}
+
+    proof.git_commits.append("0" * 40)
+    valid, issues = system.verify(proof)
+    assert issues[-1] == f"Git commit not found: {'0' * 40}"
+    assert len([issue for issue in issues if issue.startswith("Git commit")]) == 1
@@ -0,0 +1,61 @@
+import pytest
+from swarm_mcp.core.worker_pool import ModuleWorkerPool
+
+TOOL = """
+import logging, subprocess, sys, time
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+
+if sys.argv[1] == "sleep":
+    time.sleep(30)
+print("args", sys.argv[1:])
+logging.getLogger(__name__).info("logged")
+subprocess.run([sys.executable, "-c", "print('from child')"])
+sys.exit(int(sys.argv[1]))
+"""
+
+@pytest.fixture
+def pool(tmp_path):
+    (tmp_path / "fake_tool.py").write_text(TOOL)
+    pool = ModuleWorkerPool(cwd=tmp_path, workers=1, sys_path=[str(tmp_path)], max_runs=3)
+    yield pool
+    pool.close()
+
+def test_run_captures_output(pool):
+    result = pool.run("fake_tool", ["0"])
+    assert result.exit_code == 0
+    assert result.stdout == "args ['0']\nfrom child\n"
+    assert result.stderr == "logged\n"
+
+    assert pool.run("fake_tool", ["3"]).exit_code == 3
+    assert pool.run("missing_tool").exit_code == 1
+
+def test_workers_recycled(pool):
+    for _ in range(4):
+        assert pool.run("fake_tool", ["0"]).exit_code == 0
+    assert pool.recycled == 1
+
+    with pytest.raises(TimeoutError):
+        pool.run("fake_tool", ["sleep"], timeout=0.5)
+    assert pool.recycled == 2
+    assert pool.run("fake_tool", ["0"]).exit_code == 0
+
+MESSY_TOOL = """
+import os, sys, threading, time
+
+if sys.argv[1] == "chdir":
+    os.chdir(os.path.dirname(os.getcwd()))
+    os.environ["MESSY_TOOL"] = "1"
+elif sys.argv[1] == "thread":
+    threading.Thread(target=time.sleep, args=(30,), daemon=True).start()
+print(os.getcwd(), os.environ.get("MESSY_TOOL"))
+"""
+
+def test_process_state_reset_between_runs(tmp_path, pool):
+    (tmp_path / "messy_tool.py").write_text(MESSY_TOOL)
+
+    assert pool.run("messy_tool", ["chdir"]).stdout == f"{tmp_path.parent} 1\n"
+    assert pool.run("messy_tool", ["check"]).stdout == f"{tmp_path} None\n"
+    assert pool.recycled == 0
+
+    pool.run("messy_tool", ["thread"])
+    assert pool.recycled == 1
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+CLI Cold Start Benchmark
+========================
+
+Measures how long ``python -m tools.cli <command>`` takes to reach the
+selected command, on top of bare interpreter start-up.
+
+Each sample is a fresh interpreter that builds the dispatcher and resolves
+one registered command (without running it). The same is timed for
+importing the full generated registry, for comparison.
+
+Usage:
+    python -m tools.cli.benchmark_cold_start [--runs N] [--budget-ms 50]
+
+Exits 1 if the median CLI overhead exceeds the budget.
+
+<!-- SSOT Domain: infrastructure -->
+
+V2 Compliant: Yes (<300 lines)
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).parent.parent.parent
+
+BASELINE = "pass"
+CLI_RESOLVE = (
+    "from tools.cli.main import main\n"
+    "from tools.cli.dispatchers.unified_dispatcher import UnifiedCLIDispatcher\n"
+    "d = UnifiedCLIDispatcher()\n"
+    "name = next(iter(d.commands))\n"
+    "assert d.commands[name]['module']\n"
+)
+FULL_REGISTRY = "from tools.cli.commands.registry import COMMAND_REGISTRY\n"
+
+
+def time_snippet(code: str, runs: int) -> float:
+    """Median wall time in ms of a fresh interpreter running ``code``."""
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, "-c", code], cwd=PROJECT_ROOT, check=True)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main() -> int:
+    """Run the benchmark and print a short report."""
+    parser = argparse.ArgumentParser(description="Benchmark CLI cold start")
+    parser.add_argument("--runs", type=int, default=15, help="Samples per measurement")
+    parser.add_argument("--budget-ms", type=float, default=50.0, help="Allowed CLI overhead")
+    args = parser.parse_args()
+
+    # Warm the bytecode cache and the manifest once
+    time_snippet(CLI_RESOLVE, 1)
+
+    baseline = time_snippet(BASELINE, args.runs)
+    cli = time_snippet(CLI_RESOLVE, args.runs)
+    registry = time_snippet(FULL_REGISTRY, args.runs)
+    overhead = cli - baseline
+
+    print(f"Interpreter start-up:        {baseline:7.1f} ms")
+    print(f"CLI start + command lookup:  {cli:7.1f} ms  (+{overhead:.1f} ms)")
+    print(f"Import full registry.py:     {registry:7.1f} ms  (+{registry - baseline:.1f} ms)")
+    print(f"Budget:                      {args.budget_ms:7.1f} ms  -> {'OK' if overhead <= args.budget_ms else 'OVER'}")
+    return 0 if overhead <= args.budget_ms else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
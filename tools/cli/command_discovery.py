@@ -6,6 +6,10 @@ Command Discovery - CLI Consolidation
 Discovers CLI commands in tools directory and generates registry entries.
 Scans for argparse, click, and main() patterns.
 
+Writes registry.py and the manifest.json the dispatcher reads. Results are
+cached per file by (mtime_ns, size) in the manifest, so a re-run only
+re-analyzes files that changed.
+
 <!-- SSOT Domain: infrastructure -->
 
 Author: Agent-7 (Web Development Specialist)
@@ -19,6 +23,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import logging
 
+from tools.cli.commands.manifest import build_manifest, read_manifest, write_manifest
+
 logger = logging.getLogger(__name__)
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
@@ -32,15 +38,25 @@ class CommandDiscovery:
         """Initialize command discovery."""
         self.tools_dir = tools_dir
         self.commands: List[Dict] = []
+        # tools-relative path -> {"mtime_ns", "size", "command"}
+        self.files: Dict[str, Dict] = {}
+        self.analyzed = 0
     
-    def discover_commands(self) -> List[Dict]:
+    def discover_commands(self, cache: Optional[Dict[str, Dict]] = None) -> List[Dict]:
         """
         Discover all CLI commands in tools directory.
         
+        Args:
+            cache: Per-file results of a previous run (``self.files``);
+                files whose mtime and size match are not re-read
+        
         Returns:
             List of command dictionaries with metadata
         """
+        cache = cache or {}
         self.commands = []
+        self.files = {}
+        self.analyzed = 0
         
         # Scan tools directory
         for py_file in self.tools_dir.rglob("*.py"):
@@ -53,7 +69,15 @@ class CommandDiscovery:
                 continue
             
             try:
-                command_info = self._analyze_file(py_file)
+                stat = py_file.stat()
+                key = py_file.relative_to(self.tools_dir).as_posix()
+                cached = cache.get(key)
+                if cached and cached["mtime_ns"] == stat.st_mtime_ns and cached["size"] == stat.st_size:
+                    command_info = cached["command"]
+                else:
+                    command_info = self._analyze_file(py_file)
+                    self.analyzed += 1
+                self.files[key] = {"mtime_ns": stat.st_mtime_ns, "size": stat.st_size, "command": command_info}
                 if command_info:
                     self.commands.append(command_info)
             except Exception as e:
@@ -225,7 +249,7 @@ class CommandDiscovery:
             lines.append(f'        "function": "{cmd["function"]}",')
             if cmd.get("description"):
                 # Escape quotes in description
-                desc = cmd["description"].replace('"', '\\"').replace("\\", "\\\\")
+                desc = cmd["description"].replace("\\", "\\\\").replace('"', '\\"')
                 lines.append(f'        "description": "{desc}",')
             lines.append(f'        "category": "{cmd.get("category", "general")}",')
             # Use forward slashes for file paths (works on Windows too)
@@ -238,14 +262,27 @@ class CommandDiscovery:
         lines.append(f"# Total commands: {len(self.commands)}")
         
         return "\n".join(lines)
+    
+    def registry_dict(self) -> Dict[str, Dict]:
+        """Commands as the COMMAND_REGISTRY dict that registry.py defines."""
+        registry = {}
+        for cmd in sorted(self.commands, key=lambda c: (c.get("category", "general"), c["name"])):
+            entry = {"module": cmd["module"], "function": cmd["function"]}
+            if cmd.get("description"):
+                entry["description"] = cmd["description"]
+            entry["category"] = cmd.get("category", "general")
+            entry["file"] = cmd["file"].replace("\\", "/")
+            registry[cmd["name"]] = entry
+        return registry
 
 
 def main():
     """Main entry point for command discovery."""
     discovery = CommandDiscovery()
-    commands = discovery.discover_commands()
+    previous = read_manifest() or {}
+    commands = discovery.discover_commands(cache=previous.get("files"))
     
-    print(f"✅ Discovered {len(commands)} CLI commands")
+    print(f"✅ Discovered {len(commands)} CLI commands ({discovery.analyzed} files re-analyzed)")
     print(f"\nCategories:")
     categories = {}
     for cmd in commands:
@@ -261,6 +298,7 @@ def main():
     # Write to registry file
     registry_file = PROJECT_ROOT / "tools" / "cli" / "commands" / "registry.py"
     registry_file.write_text(registry_code, encoding="utf-8")
+    write_manifest(build_manifest(discovery.registry_dict(), files=discovery.files, registry_path=registry_file))
     
     print(f"✅ Registry written to: {registry_file}")
     print(f"   Total commands registered: {len(commands)}")
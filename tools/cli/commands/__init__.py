@@ -1,8 +1,15 @@
 """CLI Commands Registry Package."""
 
-try:
-    from tools.cli.commands.registry import COMMAND_REGISTRY
-except ImportError:
-    COMMAND_REGISTRY = {}
+
+def __getattr__(name):
+    # Imported on demand: the dispatcher resolves commands from manifest.json
+    if name == "COMMAND_REGISTRY":
+        try:
+            from tools.cli.commands.registry import COMMAND_REGISTRY
+        except ImportError:
+            COMMAND_REGISTRY = {}
+        return COMMAND_REGISTRY
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
 
 __all__ = ["COMMAND_REGISTRY"]
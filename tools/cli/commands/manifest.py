@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Command Manifest - Lazy Command Index
+=====================================
+
+JSON manifest of the command registry, so the CLI can resolve a command
+without importing the generated ``registry.py`` dict.
+
+manifest.json holds:
+    commands   - name -> {module, function, description, category, file}
+    categories - category -> sorted command names (prebuilt for listings)
+    files      - discovery cache: tools-relative path -> {mtime_ns, size,
+                 command}; lets command_discovery re-analyze only files
+                 that changed
+    registry_sha256 - hash of the registry.py it mirrors; a hand-edited
+                 registry.py is noticed and wins over a stale manifest
+
+<!-- SSOT Domain: infrastructure -->
+
+V2 Compliant: Yes (<300 lines)
+"""
+
+import hashlib
+import json
+import os
+from collections.abc import MutableMapping
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional
+
+MANIFEST_PATH = Path(__file__).with_name("manifest.json")
+REGISTRY_PATH = Path(__file__).with_name("registry.py")
+MANIFEST_VERSION = 1
+
+
+def _sha256(path: Path) -> str:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return ""
+
+
+def _categories(commands: Dict[str, Dict]) -> Dict[str, List[str]]:
+    categories: Dict[str, List[str]] = {}
+    for name, config in commands.items():
+        categories.setdefault(config.get("category", "general"), []).append(name)
+    return {cat: sorted(names) for cat, names in sorted(categories.items())}
+
+
+def build_manifest(
+    commands: Dict[str, Dict],
+    files: Optional[Dict[str, Dict]] = None,
+    registry_path: Path = REGISTRY_PATH
+) -> Dict[str, Any]:
+    """
+    Build a manifest from a command registry dict.
+
+    Args:
+        commands: Command name -> config (as in COMMAND_REGISTRY)
+        files: Discovery cache to carry along
+        registry_path: registry.py the manifest mirrors
+
+    Returns:
+        Manifest dict (see module docstring)
+    """
+    return {
+        "version": MANIFEST_VERSION,
+        "registry_sha256": _sha256(registry_path),
+        "commands": commands,
+        "categories": _categories(commands),
+        "files": files or {},
+    }
+
+
+def write_manifest(manifest: Dict[str, Any], path: Path = MANIFEST_PATH) -> None:
+    """Write a manifest atomically."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(manifest, separators=(",", ":"), sort_keys=True), encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def read_manifest(path: Path = MANIFEST_PATH) -> Optional[Dict[str, Any]]:
+    """Load a manifest, or None if it is missing, unreadable or outdated."""
+    try:
+        manifest = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if manifest.get("version") != MANIFEST_VERSION:
+        return None
+    return manifest
+
+
+class CommandManifest(MutableMapping):
+    """
+    Command name -> config mapping, loaded on first access.
+
+    Reads manifest.json. When it is missing or no longer matches
+    registry.py, the registry module is imported once instead and the
+    manifest rewritten (best effort) for the next start.
+    """
+
+    def __init__(self, path: Path = MANIFEST_PATH, registry_path: Path = REGISTRY_PATH):
+        """Initialize lazy manifest (nothing is read yet)."""
+        self.path = path
+        self.registry_path = registry_path
+        self._manifest: Optional[Dict[str, Any]] = None
+        self._categories_stale = False
+
+    def _load(self) -> Dict[str, Any]:
+        if self._manifest is not None:
+            return self._manifest
+
+        manifest = read_manifest(self.path)
+        if manifest is None or (
+            self.registry_path.exists()
+            and manifest.get("registry_sha256") != _sha256(self.registry_path)
+        ):
+            manifest = self._rebuild(manifest)
+        self._manifest = manifest
+        return manifest
+
+    def _rebuild(self, stale: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        try:
+            from tools.cli.commands.registry import COMMAND_REGISTRY
+        except ImportError:
+            COMMAND_REGISTRY = {}
+        manifest = build_manifest(
+            dict(COMMAND_REGISTRY),
+            files=(stale or {}).get("files"),
+            registry_path=self.registry_path
+        )
+        try:
+            write_manifest(manifest, self.path)
+        except OSError:
+            pass
+        return manifest
+
+    @property
+    def commands(self) -> Dict[str, Dict]:
+        return self._load()["commands"]
+
+    def by_category(self) -> Dict[str, List[str]]:
+        """Category -> sorted command names (prebuilt, no grouping pass)."""
+        manifest = self._load()
+        if self._categories_stale:
+            manifest["categories"] = _categories(manifest["commands"])
+            self._categories_stale = False
+        return manifest["categories"]
+
+    def __getitem__(self, name: str) -> Dict:
+        return self.commands[name]
+
+    def __setitem__(self, name: str, config: Dict) -> None:
+        self.commands[name] = config
+        self._categories_stale = True
+
+    def __delitem__(self, name: str) -> None:
+        del self.commands[name]
+        self._categories_stale = True
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.commands)
+
+    def __len__(self) -> int:
+        return len(self.commands)
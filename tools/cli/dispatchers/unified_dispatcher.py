@@ -17,7 +17,9 @@ import argparse
 import importlib
 import sys
 from pathlib import Path
-from typing import Dict, Optional, List
+from typing import Optional, List
+
+from tools.cli.commands.manifest import CommandManifest
 
 PROJECT_ROOT = Path(__file__).parent.parent.parent
 
@@ -27,17 +29,12 @@ class UnifiedCLIDispatcher:
     
     def __init__(self):
         """Initialize dispatcher with command registry."""
-        self.commands: Dict[str, Dict] = {}
+        self.commands: CommandManifest
         self._load_command_registry()
     
     def _load_command_registry(self):
-        """Load command registry from configuration."""
-        try:
-            from tools.cli.commands.registry import COMMAND_REGISTRY
-            self.commands = COMMAND_REGISTRY.copy()
-        except ImportError:
-            # Fallback to empty registry if not available
-            self.commands = {}
+        """Load command registry lazily from the manifest (read on first lookup)."""
+        self.commands = CommandManifest()
     
     def register_command(self, name: str, module: str, function: str = "main"):
         """Register a command."""
@@ -48,17 +45,11 @@ class UnifiedCLIDispatcher:
         if command not in self.commands:
             print(f"❌ Unknown command: {command}")
             print(f"\nAvailable commands ({len(self.commands)}):")
-            # Group by category
-            categories = {}
-            for cmd_name, cmd_info in self.commands.items():
-                cat = cmd_info.get("category", "general")
-                if cat not in categories:
-                    categories[cat] = []
-                categories[cat].append(cmd_name)
+            categories = self.commands.by_category()
             
             for cat in sorted(categories.keys()):
                 print(f"\n  {cat.upper()} ({len(categories[cat])}):")
-                for cmd in sorted(categories[cat])[:10]:  # Show first 10 per category
+                for cmd in categories[cat][:10]:  # Show first 10 per category
                     print(f"    - {cmd}")
                 if len(categories[cat]) > 10:
                     print(f"    ... and {len(categories[cat]) - 10} more")
@@ -134,17 +125,11 @@ def main() -> int:
     
     if args.list:
         print(f"Available commands ({len(dispatcher.commands)}):\n")
-        # Group by category
-        categories = {}
-        for cmd_name, cmd_info in dispatcher.commands.items():
-            cat = cmd_info.get("category", "general")
-            if cat not in categories:
-                categories[cat] = []
-            categories[cat].append(cmd_name)
+        categories = dispatcher.commands.by_category()
         
         for cat in sorted(categories.keys()):
             print(f"{cat.upper()} ({len(categories[cat])}):")
-            for cmd in sorted(categories[cat]):
+            for cmd in categories[cat]:
                 desc = dispatcher.commands[cmd].get("description", "")
                 if desc:
                     print(f"  {cmd:50} - {desc[:60]}")
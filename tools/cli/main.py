@@ -5,12 +5,13 @@ from __future__ import annotations
 import sys
 
 from tools.cli.dispatchers.unified_dispatcher import main as unified_main
-from tools.toolbelt.__main__ import main as toolbelt_main
 from tools.toolbelt_registry import ToolRegistry
 
 def main() -> int:
     """Route between toolbelt flags and unified dispatcher commands."""
     if _should_use_toolbelt(sys.argv):
+        # Imported here: it sets up logging, which plain commands never need
+        from tools.toolbelt.__main__ import main as toolbelt_main
         try:
             toolbelt_main()
         except SystemExit as exc:
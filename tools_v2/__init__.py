@@ -1,18 +1,41 @@
-# AUTO-GENERATED __init__.py
-# DO NOT EDIT MANUALLY - changes may be overwritten
+"""
+Agent Toolbelt V2
+=================
 
-from . import advisor_cli
-from . import demo_swarm_pulse
-from . import test_bi_tools
-from . import test_toolbelt_basic
-from . import tool_registry
-from . import toolbelt_core
+Submodules and the registry/core entry points are imported on first
+access, so importing the package (or listing tools through the spec
+cache) does not pull in every adapter category.
+"""
 
-__all__ = [
+import importlib
+
+_SUBMODULES = (
     'advisor_cli',
+    'batch_runner',
     'demo_swarm_pulse',
+    'execution_cache',
+    'spec_cache',
+    'telemetry',
     'test_bi_tools',
     'test_toolbelt_basic',
     'tool_registry',
     'toolbelt_core',
-]
+)
+
+_EXPORTS = {
+    'ToolRegistry': 'tool_registry',
+    'get_tool_registry': 'tool_registry',
+    'ToolbeltCore': 'toolbelt_core',
+    'get_toolbelt_core': 'toolbelt_core',
+}
+
+__all__ = [*_SUBMODULES, *_EXPORTS]
+
+
+def __getattr__(name):
+    if name in _SUBMODULES:
+        return importlib.import_module(f'.{name}', __name__)
+    if name in _EXPORTS:
+        module = importlib.import_module(f'.{_EXPORTS[name]}', __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -15,7 +15,17 @@ from typing import Any
 
 @dataclass
 class ToolSpec:
-    """Specification for a tool."""
+    """
+    Specification for a tool.
+
+    pure: Result depends only on params; ToolbeltCore may cache it
+        until evicted.
+    cache_ttl: Read-only tool whose results may be cached for this many
+        seconds (None = not cached unless pure).
+    executor: Where ToolbeltCore.run_many runs it: "thread", or "process"
+        for CPU-bound pure-Python tools (params/result must pickle).
+    timeout: Default seconds before a batched call is given up on.
+    """
 
     name: str
     version: str
@@ -23,6 +33,10 @@ class ToolSpec:
     summary: str
     required_params: list[str]
     optional_params: dict[str, Any]
+    pure: bool = False
+    cache_ttl: float | None = None
+    executor: str = "thread"
+    timeout: float | None = None
 
     def validate_params(self, params: dict[str, Any]) -> tuple[bool, list[str]]:
         """
@@ -0,0 +1,156 @@
+"""
+Batch Runner
+============
+
+Concurrent execution of independent tool calls for ToolbeltCore.
+
+Each call runs on a thread pool by default. Tools whose ToolSpec sets
+``executor="process"`` (CPU-bound, pure-Python scans) run on a process
+pool instead, so they do not hold the GIL of the calling process; their
+params, context and result must be picklable. The spec is read from the
+registry's spec cache, so picking an executor imports nothing.
+
+Timeouts count from submission. A call that times out gets a failed
+ToolResult; its worker cannot be interrupted and finishes in the
+background.
+
+V2 Compliance: <200 lines
+"""
+
+import multiprocessing
+import threading
+import time
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
+from typing import Any, Sequence
+
+from .adapters.base_adapter import ToolResult
+
+
+@dataclass
+class ToolCall:
+    """One call in a batch."""
+
+    tool_name: str
+    params: dict[str, Any] = field(default_factory=dict)
+    context: dict[str, Any] | None = None
+    timeout: float | None = None
+
+
+def as_tool_call(call: "ToolCall | dict[str, Any] | Sequence[Any]") -> ToolCall:
+    """
+    Normalize a batch entry.
+
+    Accepts a ToolCall, a dict with ``tool``/``tool_name``, ``params``,
+    ``context`` and ``timeout`` keys, or a ``(tool_name, params)`` tuple.
+    """
+    if isinstance(call, ToolCall):
+        return call
+    if isinstance(call, dict):
+        return ToolCall(
+            tool_name=call.get("tool_name") or call["tool"],
+            params=call.get("params") or {},
+            context=call.get("context"),
+            timeout=call.get("timeout"),
+        )
+    return ToolCall(*call)
+
+
+def _run_in_process(
+    tool_name: str, params: dict[str, Any], context: dict[str, Any] | None, use_cache: bool
+) -> tuple[ToolResult, bool]:
+    """
+    Process pool entry point: run the tool on the child's own core.
+
+    Returns (result, from_cache) without recording the call; the parent
+    records it in its history and telemetry.
+    """
+    from .toolbelt_core import get_toolbelt_core
+
+    return get_toolbelt_core()._execute(tool_name, params, context, use_cache)
+
+
+class BatchExecutors:
+    """Lazily created thread and process pools shared by a core's batches."""
+
+    def __init__(self, max_threads: int = 8, max_processes: int | None = None):
+        """
+        Initialize executors (no pool is started yet).
+
+        Args:
+            max_threads: Thread pool size
+            max_processes: Process pool size (None = CPU count)
+        """
+        self.max_threads = max_threads
+        self.max_processes = max_processes
+        self._threads: ThreadPoolExecutor | None = None
+        self._processes: ProcessPoolExecutor | None = None
+        self._lock = threading.Lock()
+
+    def get(self, kind: str) -> Executor:
+        """Executor for a ToolSpec ``executor`` hint ("thread" or "process")."""
+        with self._lock:
+            if kind == "process":
+                if self._processes is None:
+                    self._processes = ProcessPoolExecutor(
+                        max_workers=self.max_processes,
+                        mp_context=multiprocessing.get_context("spawn"),
+                    )
+                return self._processes
+            if self._threads is None:
+                self._threads = ThreadPoolExecutor(
+                    max_workers=self.max_threads, thread_name_prefix="toolbelt"
+                )
+            return self._threads
+
+    def shutdown(self, wait: bool = True) -> None:
+        """Shut down any started pools."""
+        with self._lock:
+            pools, self._threads, self._processes = (self._threads, self._processes), None, None
+        for pool in pools:
+            if pool is not None:
+                pool.shutdown(wait=wait, cancel_futures=True)
+
+
+def wait_in_order(
+    futures: list[Future], deadlines: list[float | None], started: list[float]
+) -> list[Any]:
+    """
+    Collect outcomes in submission order, failing calls past their deadline.
+
+    Args:
+        futures: Futures of the submitted calls
+        deadlines: time.monotonic() deadline per future (None = no limit)
+        started: time.monotonic() submission time per future
+
+    Returns:
+        Each future's value, or a failed ToolResult if it timed out or raised
+    """
+    results = []
+    for future, deadline, start in zip(futures, deadlines, started):
+        remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+        try:
+            results.append(future.result(timeout=remaining))
+        except FutureTimeoutError:
+            future.cancel()
+            results.append(
+                ToolResult(
+                    success=False,
+                    output=None,
+                    exit_code=1,
+                    error_message=f"Timed out after {deadline - start:.1f}s",
+                    execution_time=time.monotonic() - start,
+                )
+            )
+        except Exception as e:
+            results.append(
+                ToolResult(
+                    success=False,
+                    output=None,
+                    exit_code=1,
+                    error_message=f"Unexpected error: {e}",
+                    execution_time=time.monotonic() - start,
+                )
+            )
+    return results
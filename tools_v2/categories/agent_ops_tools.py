@@ -31,6 +31,7 @@ class AgentStatusTool(IToolAdapter):
             summary="Get comprehensive agent status and metrics",
             required_params=["agent_id"],
             optional_params={"include_vector": True},
+            cache_ttl=10,
         )
 
     def validate(self, params: dict[str, Any]) -> tuple[bool, list[str]]:
@@ -31,6 +31,7 @@ class QuickMetricsTool(IToolAdapter):
             summary="Quick analysis of Python file metrics (lines, classes, functions, V2 compliance)",
             required_params=["files"],
             optional_params={"pattern": None, "json": False, "summary": False, "violations_only": False},
+            cache_ttl=30,
         )
 
     def validate(self, params: dict[str, Any]) -> tuple[bool, list[str]]:
@@ -127,6 +128,7 @@ class TaskROICalculatorTool(IToolAdapter):
             summary="Calculate task ROI (points, complexity, V2 impact, autonomy impact)",
             required_params=["points", "complexity"],
             optional_params={"v2_impact": 0, "autonomy_impact": 0},
+            pure=True,
         )
 
     def validate(self, params: dict[str, Any]) -> tuple[bool, list[str]]:
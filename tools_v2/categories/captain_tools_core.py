@@ -37,6 +37,7 @@ class StatusCheckTool(IToolAdapter):
             summary="Check all agent status files to detect idle agents",
             required_params=[],
             optional_params={"agents": SWARM_AGENTS, "threshold_hours": 24},
+            cache_ttl=30,
         )
 
     def validate(self, params: dict[str, Any]) -> tuple[bool, list[str]]:
@@ -36,6 +36,8 @@ class MemoryLeakDetectorTool(IToolAdapter):
             summary="Detect potential memory leaks (unbounded structures, missing size checks)",
             required_params=[],
             optional_params={"target_path": "src"},
+            executor="process",
+            timeout=300,
         )
 
     def validate(self, params: dict[str, Any]) -> tuple[bool, list[str]]:
@@ -100,6 +102,8 @@ class UnboundedScanTool(IToolAdapter):
             summary="Scan for unbounded data structures that could grow indefinitely",
             required_params=[],
             optional_params={"target_path": "src"},
+            executor="process",
+            timeout=300,
         )
 
     def validate(self, params: dict[str, Any]) -> tuple[bool, list[str]]:
@@ -169,6 +173,8 @@ class FileHandleCheckTool(IToolAdapter):
             summary="Check for unclosed file handles (resource leak detection)",
             required_params=[],
             optional_params={"target_path": "src"},
+            executor="process",
+            timeout=300,
         )
 
     def validate(self, params: dict[str, Any]) -> tuple[bool, list[str]]:
@@ -53,6 +53,7 @@ class MessagePatternAnalyzerTool(IToolAdapter):
             summary="Analyze communication patterns from message history",
             required_params=[],
             optional_params={"limit": 1000},
+            cache_ttl=60,
         )
     
     def validate(self, params: dict[str, Any]) -> tuple[bool, list[str]]:
@@ -152,6 +153,7 @@ class MessageMetricsDashboardTool(IToolAdapter):
             summary="Generate comprehensive metrics dashboard from message system",
             required_params=[],
             optional_params={},
+            cache_ttl=60,
         )
     
     def validate(self, params: dict[str, Any]) -> tuple[bool, list[str]]:
@@ -234,6 +236,7 @@ class MessageLearningExtractorTool(IToolAdapter):
             summary="Extract learning opportunities and insights from message history",
             required_params=[],
             optional_params={"limit": 500},
+            cache_ttl=60,
         )
     
     def validate(self, params: dict[str, Any]) -> tuple[bool, list[str]]:
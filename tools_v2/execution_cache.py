@@ -0,0 +1,139 @@
+"""
+Execution Cache
+===============
+
+Adapter instance reuse and result memoization for ToolbeltCore.
+
+AdapterPool keeps constructed adapters per adapter class, so adapters that
+build heavy state in ``__init__`` (repositories, pattern engines) pay for it
+once. Concurrent callers each check out their own instance; an instance is
+only shared sequentially.
+
+ResultCache memoizes results of tools whose ToolSpec opts in: ``pure=True``
+(result depends only on params, kept until evicted) or ``cache_ttl`` set
+(read-only, fresh for that many seconds). Entries are keyed by tool name
+and canonicalized params, and evicted LRU-first beyond ``maxsize``. Results
+are deep-copied in and out, so callers may mutate what they get back.
+
+V2 Compliance: <200 lines
+"""
+
+import copy
+import json
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Iterator
+
+from .adapters.base_adapter import IToolAdapter, ToolResult, ToolSpec
+
+
+def canonical_params(params: dict[str, Any]) -> str:
+    """Stable text form of ``params`` (key order and tuple/list independent)."""
+    return json.dumps(params, sort_keys=True, separators=(",", ":"), default=repr)
+
+
+def is_cacheable(spec: ToolSpec) -> bool:
+    """True if the tool's results may be served from the result cache."""
+    return spec.pure or spec.cache_ttl is not None
+
+
+class AdapterPool:
+    """Thread-safe pool of reusable adapter instances, per adapter class."""
+
+    def __init__(self, max_idle: int = 4):
+        """
+        Initialize adapter pool.
+
+        Args:
+            max_idle: Idle instances kept per adapter class (0 = no reuse)
+        """
+        self.max_idle = max_idle
+        self._idle: dict[type[IToolAdapter], list[IToolAdapter]] = {}
+        self._lock = threading.Lock()
+        self.created = 0
+
+    @contextmanager
+    def checkout(self, adapter_class: type[IToolAdapter]) -> Iterator[IToolAdapter]:
+        """
+        Borrow an adapter instance for the duration of the block.
+
+        The instance goes back to the pool when the block exits normally;
+        if the block raises, it is discarded in case its state is broken.
+        """
+        with self._lock:
+            idle = self._idle.get(adapter_class)
+            adapter = idle.pop() if idle else None
+        if adapter is None:
+            adapter = adapter_class()
+            with self._lock:
+                self.created += 1
+
+        yield adapter
+
+        with self._lock:
+            idle = self._idle.setdefault(adapter_class, [])
+            if len(idle) < self.max_idle:
+                idle.append(adapter)
+
+    def clear(self) -> None:
+        """Drop all idle instances."""
+        with self._lock:
+            self._idle.clear()
+
+
+class ResultCache:
+    """Thread-safe LRU cache of tool results with per-entry expiry."""
+
+    def __init__(self, maxsize: int = 256):
+        """
+        Initialize result cache.
+
+        Args:
+            maxsize: Maximum cached results (0 disables caching)
+        """
+        self.maxsize = maxsize
+        self._entries: OrderedDict[tuple[str, str], tuple[float, ToolResult]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, tool_name: str, params: dict[str, Any]) -> ToolResult | None:
+        """Cached result for this call, or None if missing or expired."""
+        key = (tool_name, canonical_params(params))
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] < time.monotonic():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(entry[1])
+
+    def put(self, tool_name: str, params: dict[str, Any], result: ToolResult, spec: ToolSpec) -> None:
+        """Store a result according to the spec's cache policy."""
+        if self.maxsize <= 0 or not is_cacheable(spec):
+            return
+        expires_at = float("inf") if spec.cache_ttl is None else time.monotonic() + spec.cache_ttl
+        key = (tool_name, canonical_params(params))
+        with self._lock:
+            self._entries[key] = (expires_at, copy.deepcopy(result))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, tool_name: str | None = None) -> None:
+        """Drop cached results of one tool (or all tools)."""
+        with self._lock:
+            if tool_name is None:
+                self._entries.clear()
+            else:
+                for key in [key for key in self._entries if key[0] == tool_name]:
+                    del self._entries[key]
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,259 @@
+"""
+Tool Spec Cache
+===============
+
+Prebuilt name/category/summary/params index for every tool in
+``tool_registry.lock.json``, read from the adapter modules' source (AST)
+instead of importing them. Listing tools and grouping them by category
+therefore never imports an adapter; full imports happen only on resolve.
+
+tool_specs.cache.json holds:
+    tools       - tool name -> ToolSpec fields (name, version, category,
+                  summary, required_params, optional_params, ...)
+    categories  - category -> sorted tool names
+    lock_sha256 - hash of the lock file the cache was built from
+    sources     - project-relative module path -> sha256 of its content
+
+The cache is rebuilt when the lock file or any source it was read from
+changes content. Specs that are not literal in the source fall back to
+what can be read statically: non-literal values become None, and a tool
+without a readable get_spec() gets the category of its name prefix
+("msg.send" -> "msg") and its class docstring as summary.
+
+V2 Compliance: <300 lines
+"""
+
+import ast
+import hashlib
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+PACKAGE_DIR = Path(__file__).parent
+PROJECT_ROOT = PACKAGE_DIR.parent
+LOCK_PATH = PACKAGE_DIR / "tool_registry.lock.json"
+CACHE_NAME = "tool_specs.cache.json"
+CACHE_VERSION = 3
+
+
+def _sha256(path: Path) -> str:
+    try:
+        return hashlib.sha256(path.read_bytes()).hexdigest()
+    except OSError:
+        return ""
+
+
+def _module_file(module: str, root: Path) -> Path:
+    """Source file of a dotted module name, relative to ``root``."""
+    base = root.joinpath(*module.split("."))
+    package_init = base / "__init__.py"
+    return package_init if package_init.exists() else base.with_suffix(".py")
+
+
+def _literal(node: ast.AST) -> Any:
+    """JSON-safe literal value of ``node``, or None if it is not a literal."""
+    try:
+        value = ast.literal_eval(node)
+    except (ValueError, TypeError, SyntaxError, RecursionError):
+        if isinstance(node, ast.Dict):
+            # Keep the keys (parameter names) even if some defaults are computed
+            return {
+                key: _literal(value)
+                for key, value in zip(map(_literal, node.keys), node.values)
+                if isinstance(key, str)
+            }
+        return None
+    if isinstance(value, (set, frozenset)):
+        value = sorted(value, key=repr)
+    try:
+        return json.loads(json.dumps(value))
+    except (TypeError, ValueError):
+        return None
+
+
+class _SourceIndex:
+    """Parses module sources once and finds classes through re-exports."""
+
+    def __init__(self, root: Path):
+        self.root = root
+        self.sources: dict[str, str] = {}
+        self._trees: dict[str, ast.Module | None] = {}
+
+    def _tree(self, module: str) -> ast.Module | None:
+        if module not in self._trees:
+            path = _module_file(module, self.root)
+            relpath = path.relative_to(self.root).as_posix()
+            self.sources[relpath] = _sha256(path)
+            try:
+                self._trees[module] = ast.parse(path.read_bytes(), filename=str(path))
+            except (OSError, SyntaxError, ValueError) as e:
+                logger.debug(f"Could not parse {relpath}: {e}")
+                self._trees[module] = None
+        return self._trees[module]
+
+    @staticmethod
+    def _absolute(module: str, node: ast.ImportFrom, is_package: bool) -> str:
+        if not node.level:
+            return node.module or ""
+        parts = module.split(".")
+        base = parts[: len(parts) - node.level + (1 if is_package else 0)]
+        return ".".join(base + ([node.module] if node.module else []))
+
+    def find_class(self, module: str, class_name: str, depth: int = 0) -> ast.ClassDef | None:
+        """Class definition ``module.class_name``, following ``from x import``."""
+        tree = self._tree(module)
+        if tree is None or depth > 5:
+            return None
+        is_package = _module_file(module, self.root).name == "__init__.py"
+        for node in tree.body:
+            if isinstance(node, ast.ClassDef) and node.name == class_name:
+                return node
+        for node in tree.body:
+            if isinstance(node, ast.ImportFrom):
+                for alias in node.names:
+                    if (alias.asname or alias.name) == class_name:
+                        source = self._absolute(module, node, is_package)
+                        return self.find_class(source, alias.name, depth + 1)
+        return None
+
+
+def _spec_call(class_node: ast.ClassDef) -> ast.Call | None:
+    """The ``ToolSpec(...)`` call returned by the class's get_spec()."""
+    for node in class_node.body:
+        if isinstance(node, ast.FunctionDef) and node.name == "get_spec":
+            for child in ast.walk(node):
+                if (
+                    isinstance(child, ast.Return)
+                    and isinstance(child.value, ast.Call)
+                    and getattr(child.value.func, "id", getattr(child.value.func, "attr", "")) == "ToolSpec"
+                ):
+                    return child.value
+    return None
+
+
+def _read_spec(tool_name: str, class_node: ast.ClassDef | None) -> dict[str, Any]:
+    spec = {
+        "name": tool_name,
+        "version": "1.0.0",
+        "category": tool_name.split(".", 1)[0],
+        "summary": "",
+        "required_params": [],
+        "optional_params": {},
+        "pure": False,
+        "cache_ttl": None,
+        "executor": "thread",
+        "timeout": None,
+    }
+    if class_node is None:
+        return spec
+
+    call = _spec_call(class_node)
+    if call is None:
+        spec["summary"] = (ast.get_docstring(class_node) or "").split("\n", 1)[0]
+        return spec
+
+    for keyword in call.keywords:
+        if keyword.arg in spec and keyword.arg != "name":
+            value = _literal(keyword.value)
+            if value is not None:
+                spec[keyword.arg] = value
+    return spec
+
+
+def _categories(tools: dict[str, dict]) -> dict[str, list[str]]:
+    categories: dict[str, list[str]] = {}
+    for name, spec in tools.items():
+        categories.setdefault(spec["category"], []).append(name)
+    return {category: sorted(names) for category, names in sorted(categories.items())}
+
+
+def build_spec_cache(lock_path: Path = LOCK_PATH, root: Path = PROJECT_ROOT) -> dict[str, Any]:
+    """
+    Build the spec cache from a lock file and the adapter sources.
+
+    Args:
+        lock_path: tool_registry.lock.json to index
+        root: Directory the lock file's module names are relative to
+
+    Returns:
+        Cache dict (see module docstring)
+    """
+    try:
+        registry = json.loads(Path(lock_path).read_text(encoding="utf-8")).get("tools", {})
+    except (OSError, ValueError) as e:
+        logger.warning(f"Could not load registry data: {e}")
+        registry = {}
+
+    index = _SourceIndex(Path(root))
+    tools = {
+        name: _read_spec(name, index.find_class(module, class_name))
+        for name, (module, class_name) in sorted(registry.items())
+    }
+    return {
+        "version": CACHE_VERSION,
+        "lock_sha256": _sha256(Path(lock_path)),
+        "sources": dict(sorted(index.sources.items())),
+        "tools": tools,
+        "categories": _categories(tools),
+    }
+
+
+def write_spec_cache(cache: dict[str, Any], path: Path) -> None:
+    """Write a spec cache atomically."""
+    tmp_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    tmp_path.write_text(json.dumps(cache, indent=1, sort_keys=True) + "\n", encoding="utf-8")
+    os.replace(tmp_path, path)
+
+
+def read_spec_cache(path: Path) -> dict[str, Any] | None:
+    """Load a spec cache, or None if it is missing, unreadable or outdated."""
+    try:
+        cache = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(cache, dict) or cache.get("version") != CACHE_VERSION:
+        return None
+    return cache
+
+
+def is_fresh(cache: dict[str, Any], lock_path: Path = LOCK_PATH, root: Path = PROJECT_ROOT) -> bool:
+    """True if neither the lock file nor any indexed source changed content."""
+    if cache.get("lock_sha256") != _sha256(Path(lock_path)):
+        return False
+    return all(
+        _sha256(Path(root) / relpath) == digest
+        for relpath, digest in cache.get("sources", {}).items()
+    )
+
+
+def load_spec_cache(
+    lock_path: Path = LOCK_PATH,
+    cache_path: Path | None = None,
+    root: Path = PROJECT_ROOT,
+) -> dict[str, Any]:
+    """
+    Load the spec cache next to ``lock_path``, rebuilding it if stale.
+
+    A rebuilt cache is written back (best effort) for the next start.
+    """
+    cache_path = Path(cache_path) if cache_path else Path(lock_path).with_name(CACHE_NAME)
+    cache = read_spec_cache(cache_path)
+    if cache is not None and is_fresh(cache, lock_path, root):
+        return cache
+
+    cache = build_spec_cache(lock_path, root)
+    try:
+        write_spec_cache(cache, cache_path)
+    except OSError as e:
+        logger.debug(f"Could not write spec cache: {e}")
+    return cache
+
+
+if __name__ == "__main__":
+    cache = build_spec_cache()
+    write_spec_cache(cache, LOCK_PATH.with_name(CACHE_NAME))
+    print(f"Indexed {len(cache['tools'])} tools in {len(cache['categories'])} categories")
@@ -0,0 +1,294 @@
+"""
+Toolbelt Telemetry
+==================
+
+Per-tool latency histograms, error counters and parameter-size stats for
+ToolbeltCore, persisted across processes.
+
+Each process accumulates deltas in memory and appends them as JSON lines
+(one per tool) to an append-only file, at most every ``flush_interval``
+seconds and at exit. Lines from any number of processes merge by adding
+them up, so the file can be shared by every agent on the machine.
+
+Latencies go into log-linear buckets (HDR-style: 16 sub-buckets per
+power of two of microseconds, so percentiles are within ~6%), which
+merge exactly and stay small no matter how many calls are recorded.
+
+Usage:
+    python -m tools_v2.telemetry                  # slowest / most failing
+    python -m tools_v2.telemetry --by p99 --since 24 --limit 20
+
+V2 Compliance: <300 lines
+"""
+
+import argparse
+import atexit
+import json
+import os
+import threading
+import time
+import weakref
+from pathlib import Path
+from typing import Any
+
+from .execution_cache import canonical_params
+
+DEFAULT_PATH = Path(__file__).parent.parent / "runtime" / "toolbelt_telemetry.jsonl"
+SUB_BUCKET_BITS = 4
+RANK_KEYS = ("p50", "p95", "p99", "max", "calls", "errors", "error_rate")
+
+_open_sinks: "weakref.WeakSet[TelemetrySink]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_open_sinks() -> None:
+    for sink in list(_open_sinks):
+        sink.flush()
+
+
+def bucket_index(micros: int) -> int:
+    """Histogram bucket of a latency in microseconds."""
+    if micros < 2 << SUB_BUCKET_BITS:
+        return max(micros, 0)
+    shift = micros.bit_length() - SUB_BUCKET_BITS - 1
+    return (shift << SUB_BUCKET_BITS) + (micros >> shift)
+
+
+def bucket_bounds(index: int) -> tuple[int, int]:
+    """Lowest and highest microsecond value falling into ``index``."""
+    if index < 2 << SUB_BUCKET_BITS:
+        return index, index
+    shift = (index >> SUB_BUCKET_BITS) - 1
+    low = (index - (shift << SUB_BUCKET_BITS)) << shift
+    return low, low + (1 << shift) - 1
+
+
+class ToolStats:
+    """Mergeable call statistics of one tool."""
+
+    def __init__(self):
+        """Initialize empty stats."""
+        self.calls = 0
+        self.errors = 0
+        self.cached = 0
+        self.sum_us = 0
+        self.max_us = 0
+        self.param_bytes = 0
+        self.param_bytes_max = 0
+        self.histogram: dict[int, int] = {}
+
+    def add(self, seconds: float, success: bool, cached: bool, param_bytes: int) -> None:
+        """Count one call."""
+        micros = int(seconds * 1_000_000)
+        index = bucket_index(micros)
+        self.histogram[index] = self.histogram.get(index, 0) + 1
+        self.calls += 1
+        self.errors += not success
+        self.cached += cached
+        self.sum_us += micros
+        self.max_us = max(self.max_us, micros)
+        self.param_bytes += param_bytes
+        self.param_bytes_max = max(self.param_bytes_max, param_bytes)
+
+    def merge(self, other: "ToolStats") -> None:
+        """Add another process's (or period's) stats into these."""
+        for index, count in other.histogram.items():
+            self.histogram[index] = self.histogram.get(index, 0) + count
+        self.calls += other.calls
+        self.errors += other.errors
+        self.cached += other.cached
+        self.sum_us += other.sum_us
+        self.max_us = max(self.max_us, other.max_us)
+        self.param_bytes += other.param_bytes
+        self.param_bytes_max = max(self.param_bytes_max, other.param_bytes_max)
+
+    def percentile(self, q: float) -> float:
+        """Latency in ms below which ``q`` percent of calls finished."""
+        if not self.calls:
+            return 0.0
+        target = self.calls * q / 100
+        seen = 0
+        for index in sorted(self.histogram):
+            seen += self.histogram[index]
+            if seen >= target:
+                low, high = bucket_bounds(index)
+                return min((low + high) / 2, self.max_us) / 1000
+        return self.max_us / 1000
+
+    def metric(self, key: str) -> float:
+        """Value of a RANK_KEYS metric."""
+        if key.startswith("p"):
+            return self.percentile(float(key[1:]))
+        if key == "max":
+            return self.max_us / 1000
+        if key == "error_rate":
+            return self.errors / self.calls if self.calls else 0.0
+        return getattr(self, key)
+
+    def to_record(self) -> dict[str, Any]:
+        """JSON-serializable form (one telemetry line without tool/ts/pid)."""
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "cached": self.cached,
+            "sum_us": self.sum_us,
+            "max_us": self.max_us,
+            "param_bytes": self.param_bytes,
+            "param_bytes_max": self.param_bytes_max,
+            "hist": {str(index): count for index, count in sorted(self.histogram.items())},
+        }
+
+    @classmethod
+    def from_record(cls, record: dict[str, Any]) -> "ToolStats":
+        """Inverse of to_record()."""
+        stats = cls()
+        for key in ("calls", "errors", "cached", "sum_us", "max_us", "param_bytes", "param_bytes_max"):
+            setattr(stats, key, int(record.get(key, 0)))
+        stats.histogram = {int(index): int(count) for index, count in record.get("hist", {}).items()}
+        return stats
+
+
+class TelemetrySink:
+    """Accumulates ToolStats per tool and appends them to a file periodically."""
+
+    def __init__(self, path: str | Path | None = None, flush_interval: float = 30.0):
+        """
+        Initialize telemetry sink.
+
+        Args:
+            path: Append-only telemetry file (default: $TOOLBELT_TELEMETRY_PATH
+                or runtime/toolbelt_telemetry.jsonl in the project)
+            flush_interval: Minimum seconds between appends
+        """
+        self.path = Path(path or os.environ.get("TOOLBELT_TELEMETRY_PATH") or DEFAULT_PATH)
+        self.flush_interval = flush_interval
+        self._pending: dict[str, ToolStats] = {}
+        self._lock = threading.Lock()
+        self._last_flush = time.monotonic()
+        _open_sinks.add(self)
+
+    def record(
+        self, tool_name: str, params: dict[str, Any], seconds: float, success: bool, cached: bool = False
+    ) -> None:
+        """Count one call; appends to the file when the flush interval passed."""
+        param_bytes = len(canonical_params(params))
+        with self._lock:
+            stats = self._pending.get(tool_name)
+            if stats is None:
+                stats = self._pending[tool_name] = ToolStats()
+            stats.add(seconds, success, cached, param_bytes)
+            due = time.monotonic() - self._last_flush >= self.flush_interval
+        if due:
+            self.flush()
+
+    def flush(self) -> None:
+        """Append pending stats (one line per tool) and reset them."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            self._last_flush = time.monotonic()
+        if not pending:
+            return
+
+        header = {"ts": time.time(), "pid": os.getpid()}
+        data = "".join(
+            json.dumps({**header, "tool": tool_name, **stats.to_record()}, separators=(",", ":")) + "\n"
+            for tool_name, stats in pending.items()
+        ).encode("utf-8")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # One O_APPEND write, so lines from concurrent processes do not interleave
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, data)
+            finally:
+                os.close(fd)
+        except OSError:
+            pass
+
+
+_default_sink: TelemetrySink | None = None
+
+
+def get_telemetry_sink() -> TelemetrySink:
+    """Get the process-wide telemetry sink."""
+    global _default_sink
+    if _default_sink is None:
+        _default_sink = TelemetrySink()
+    return _default_sink
+
+
+def load_stats(path: str | Path | None = None, since: float | None = None) -> dict[str, ToolStats]:
+    """
+    Merge a telemetry file into per-tool stats.
+
+    Args:
+        path: Telemetry file (default as for TelemetrySink)
+        since: Only lines written at or after this Unix time
+
+    Returns:
+        Tool name -> merged ToolStats
+    """
+    path = Path(path or os.environ.get("TOOLBELT_TELEMETRY_PATH") or DEFAULT_PATH)
+    merged: dict[str, ToolStats] = {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue  # torn line from a crashed writer
+                if since is not None and record.get("ts", 0) < since:
+                    continue
+                merged.setdefault(record["tool"], ToolStats()).merge(ToolStats.from_record(record))
+    except FileNotFoundError:
+        pass
+    return merged
+
+
+def rank_tools(stats: dict[str, ToolStats], by: str = "p95", limit: int = 10) -> list[tuple[str, ToolStats]]:
+    """Tools sorted by a RANK_KEYS metric, worst first."""
+    ranked = sorted(stats.items(), key=lambda item: (item[1].metric(by), item[1].calls), reverse=True)
+    return ranked[:limit]
+
+
+def format_report(stats: dict[str, ToolStats], by: str = "p95", limit: int = 10) -> str:
+    """Text report: tools ranked by ``by`` and by error rate."""
+    if not stats:
+        return "No telemetry recorded yet."
+
+    def table(title: str, key: str) -> list[str]:
+        lines = [
+            title,
+            f"{'tool':32} {'calls':>7} {'err%':>6} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9} {'params B':>9}",
+        ]
+        for name, tool in rank_tools(stats, key, limit):
+            lines.append(
+                f"{name:32} {tool.calls:7d} {tool.metric('error_rate') * 100:6.1f} "
+                f"{tool.percentile(50):9.1f} {tool.percentile(95):9.1f} {tool.percentile(99):9.1f} "
+                f"{tool.max_us / 1000:9.1f} {tool.param_bytes / tool.calls if tool.calls else 0:9.0f}"
+            )
+        return lines
+
+    calls = sum(tool.calls for tool in stats.values())
+    lines = [f"{len(stats)} tools, {calls} calls", ""]
+    lines += table(f"Slowest by {by}:", by)
+    lines += [""] + table("Most failing:", "error_rate")
+    return "\n".join(lines)
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Print the telemetry report."""
+    parser = argparse.ArgumentParser(description="Toolbelt latency and error report")
+    parser.add_argument("--path", help="Telemetry file (default: runtime/toolbelt_telemetry.jsonl)")
+    parser.add_argument("--by", choices=RANK_KEYS, default="p95", help="Ranking metric")
+    parser.add_argument("--since", type=float, help="Only the last N hours")
+    parser.add_argument("--limit", type=int, default=10, help="Tools per table")
+    args = parser.parse_args(argv)
+
+    since = time.time() - args.since * 3600 if args.since is not None else None
+    print(format_report(load_stats(args.path, since), args.by, args.limit))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
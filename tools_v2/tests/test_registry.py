@@ -53,7 +53,8 @@ class TestToolRegistry:
 
         assert isinstance(categories, dict)
         assert "vector" in categories
-        assert "msg" in categories  # msg.send -> "msg" category
+        assert "messaging" in categories  # msg.send spec category
+        assert "msg.send" in categories["messaging"]
 
     def test_resolve_valid_tool(self):
         """Test resolving a valid tool."""
@@ -4,6 +4,10 @@ Tool Registry
 
 Dynamic tool registry for agent toolbelt operations.
 
+Tool metadata (category, summary, params) comes from the prebuilt spec
+cache (see spec_cache.py), so listing and category queries import no
+adapter module; adapters are imported only on resolve.
+
 V2 Compliance: <200 lines
 Author: Agent-5 (Business Intelligence Specialist)
 """
@@ -11,10 +15,12 @@ Author: Agent-5 (Business Intelligence Specialist)
 import importlib
 import json
 import logging
+from pathlib import Path
 from typing import Any
 
-from .adapters.base_adapter import IToolAdapter
+from .adapters.base_adapter import IToolAdapter, ToolSpec
 from .adapters.error_types import ToolNotFoundError
+from .spec_cache import LOCK_PATH, load_spec_cache
 
 logger = logging.getLogger(__name__)
 
@@ -25,15 +31,25 @@ _registry_instance = None
 class ToolRegistry:
     """Dynamic registry for tool discovery and resolution."""
 
-    def __init__(self):
-        """Initialize registry."""
+    def __init__(self, lock_path: str | Path | None = None, cache_path: str | Path | None = None):
+        """
+        Initialize registry.
+
+        Args:
+            lock_path: Registry lock file (default: tool_registry.lock.json
+                next to this module, independent of the CWD)
+            cache_path: Spec cache file (default: next to the lock file)
+        """
+        self.lock_path = Path(lock_path) if lock_path else LOCK_PATH
+        self.cache_path = Path(cache_path) if cache_path else None
         self._cache: dict[str, IToolAdapter] = {}
+        self._specs: dict[str, Any] | None = None
         self._registry_data = self._load_registry_data()
 
     def _load_registry_data(self) -> dict[str, list[str]]:
         """Load tool registry data from JSON file."""
         try:
-            with open("tools_v2/tool_registry.lock.json", "r") as f:
+            with open(self.lock_path, "r", encoding="utf-8") as f:
                 data = json.load(f)
                 return data.get("tools", {})
         except (FileNotFoundError, json.JSONDecodeError) as e:
@@ -72,32 +88,46 @@ class ToolRegistry:
         """List all available tools."""
         return sorted(self._registry_data.keys())
 
-    def list_by_category(self, category: str) -> list[str]:
-        """List tools by category."""
-        tools = []
-        for tool_name in self._registry_data.keys():
-            try:
-                tool = self.get_tool(tool_name)
-                if tool.get_spec().category == category:
-                    tools.append(tool_name)
-            except Exception:
-                continue
-        return sorted(tools)
+    def _spec_index(self) -> dict[str, Any]:
+        """Spec cache, loaded (and rebuilt if stale) on first use."""
+        if self._specs is None:
+            self._specs = load_spec_cache(self.lock_path, self.cache_path)
+        return self._specs
+
+    def get_spec(self, tool_name: str) -> ToolSpec:
+        """Get a tool's spec from the spec cache, without importing it."""
+        if tool_name not in self._registry_data:
+            raise ToolNotFoundError(f"Tool '{tool_name}' not found in registry")
+        spec = self._spec_index()["tools"].get(tool_name)
+        if spec is None:
+            # Lock file changed after the cache was loaded
+            self._specs = None
+            spec = self._spec_index()["tools"][tool_name]
+        return ToolSpec(**spec)
+
+    def list_by_category(self, category: str | None = None) -> dict[str, list[str]] | list[str]:
+        """
+        List tools by category.
+
+        Args:
+            category: Category to list (None = all categories)
+
+        Returns:
+            Sorted tool names in ``category``, or category -> tool names
+        """
+        categories = self._spec_index()["categories"]
+        if category is None:
+            return {name: list(tools) for name, tools in categories.items()}
+        return list(categories.get(category, []))
 
     def get_categories(self) -> list[str]:
         """Get all available categories."""
-        categories = set()
-        for tool_name in self._registry_data.keys():
-            try:
-                tool = self.get_tool(tool_name)
-                categories.add(tool.get_spec().category)
-            except Exception:
-                continue
-        return sorted(categories)
+        return sorted(self._spec_index()["categories"])
 
     def clear_cache(self):
         """Clear the tool cache."""
         self._cache.clear()
+        self._specs = None
 
 
 def get_tool_registry() -> ToolRegistry:
@@ -4,13 +4,15 @@ Toolbelt Core Orchestrator
 
 Thin orchestrator for Agent Toolbelt operations (resolve→validate→execute→record).
 
-V2 Compliance: <240 lines
+V2 Compliance: <400 lines
 Author: Agent-7 - Repository Cloning Specialist
 """
 
+import asyncio
 import logging
+import threading
 import time
-from typing import Any
+from typing import Any, Sequence
 
 from .adapters.base_adapter import ToolResult
 from .adapters.error_types import (
@@ -19,6 +21,9 @@ from .adapters.error_types import (
     ToolValidationError,
     format_toolbelt_error,
 )
+from .batch_runner import BatchExecutors, ToolCall, _run_in_process, as_tool_call, wait_in_order
+from .execution_cache import AdapterPool, ResultCache, is_cacheable
+from .telemetry import TelemetrySink, get_telemetry_sink
 from .tool_registry import get_tool_registry
 
 logger = logging.getLogger(__name__)
@@ -27,54 +32,182 @@ logger = logging.getLogger(__name__)
 class ToolbeltCore:
     """Core orchestrator for agent toolbelt operations."""
 
-    def __init__(self):
-        """Initialize toolbelt core."""
+    def __init__(
+        self,
+        result_cache_size: int = 256,
+        max_idle_adapters: int = 4,
+        max_workers: int = 8,
+        telemetry: TelemetrySink | bool = True,
+    ):
+        """
+        Initialize toolbelt core.
+
+        Args:
+            result_cache_size: Results kept for tools whose spec is pure or
+                has a cache_ttl (0 disables result caching)
+            max_idle_adapters: Adapter instances kept for reuse per tool
+            max_workers: Thread pool size for run_many/run_async
+            telemetry: Sink for persistent per-tool latency/error stats
+                (True = shared process sink, False = off)
+        """
         self.registry = get_tool_registry()
+        self.adapters = AdapterPool(max_idle=max_idle_adapters)
+        self.result_cache = ResultCache(maxsize=result_cache_size)
+        self.executors = BatchExecutors(max_threads=max_workers)
         self.execution_history: list[dict[str, Any]] = []
+        self._history_lock = threading.Lock()
+        if telemetry is True:
+            telemetry = get_telemetry_sink()
+        self.telemetry = telemetry or None
         self.logger = logging.getLogger(__name__)
 
     def run(
-        self, tool_name: str, params: dict[str, Any], context: dict[str, Any] | None = None
+        self,
+        tool_name: str,
+        params: dict[str, Any],
+        context: dict[str, Any] | None = None,
+        use_cache: bool = True,
     ) -> ToolResult:
         """
         Run a tool with given parameters (resolve→validate→execute→record).
 
+        Adapter instances are reused across calls. Tools whose spec is pure
+        or has a cache_ttl are served from the result cache when the same
+        params were run recently; the cache key ignores ``context``.
+
         Args:
             tool_name: Name of tool to run (e.g., "vector.context")
             params: Tool parameters
             context: Optional execution context
+            use_cache: Set False to bypass (and refresh) the result cache
 
         Returns:
             Tool execution result
         """
+        result, cached = self._execute(tool_name, params, context, use_cache)
+        self._record_execution(tool_name, params, result, cached=cached)
+        return result
+
+    def run_many(
+        self, calls: Sequence[ToolCall | dict[str, Any] | tuple], use_cache: bool = True
+    ) -> list[ToolResult]:
+        """
+        Run independent tool calls concurrently.
+
+        Each call runs on the thread pool, or on the process pool if its
+        spec sets ``executor="process"``. A call's timeout (or its spec's)
+        counts from submission; a call past it gets a failed result.
+
+        Args:
+            calls: ToolCall objects, dicts (tool, params, context, timeout)
+                or (tool_name, params) tuples
+            use_cache: Passed on to each run
+
+        Returns:
+            One result per call, in the order of ``calls``
+        """
+        batch = [as_tool_call(call) for call in calls]
+        futures, deadlines, started, executors = [], [], [], []
+        for call in batch:
+            executor, timeout = self._execution_hints(call)
+            start = time.monotonic()
+            if executor == "process":
+                future = self.executors.get("process").submit(
+                    _run_in_process, call.tool_name, call.params, call.context, use_cache
+                )
+            else:
+                future = self.executors.get("thread").submit(
+                    self._execute, call.tool_name, call.params, call.context, use_cache
+                )
+            futures.append(future)
+            deadlines.append(None if timeout is None else start + timeout)
+            started.append(start)
+            executors.append(executor)
+
+        results = []
+        for call, executor, outcome in zip(batch, executors, wait_in_order(futures, deadlines, started)):
+            result, cached = outcome if isinstance(outcome, tuple) else (outcome, False)
+            self._record_execution(call.tool_name, call.params, result, cached=cached, executor=executor)
+            results.append(result)
+        return results
+
+    async def run_async(
+        self,
+        tool_name: str,
+        params: dict[str, Any],
+        context: dict[str, Any] | None = None,
+        timeout: float | None = None,
+    ) -> ToolResult:
+        """
+        Run a tool without blocking the event loop (same rules as run_many).
+
+        Example:
+            results = await asyncio.gather(
+                core.run_async("agent.status", {"agent_id": "Agent-1"}),
+                core.run_async("captain.status_check", {}),
+            )
+        """
+        call = ToolCall(tool_name, params, context, timeout)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, lambda: self.run_many([call])[0])
+
+    def close(self) -> None:
+        """Shut down the batch thread and process pools."""
+        self.executors.shutdown()
+
+    def _execution_hints(self, call: ToolCall) -> tuple[str, float | None]:
+        """Executor kind and timeout for a call, from its spec (no import)."""
+        try:
+            spec = self.registry.get_spec(call.tool_name)
+        except ToolNotFoundError:
+            return "thread", call.timeout
+        return spec.executor, call.timeout if call.timeout is not None else spec.timeout
+
+    def _execute(
+        self,
+        tool_name: str,
+        params: dict[str, Any],
+        context: dict[str, Any] | None,
+        use_cache: bool,
+    ) -> tuple[ToolResult, bool]:
+        """Resolve, validate and execute a tool; returns (result, from_cache)."""
         start_time = time.time()
 
         try:
             # Step 1: Resolve tool
             self.logger.info(f"Resolving tool: {tool_name}")
             adapter_class = self.registry.resolve(tool_name)
-            adapter = adapter_class()
-
-            # Step 2: Validate parameters
-            self.logger.debug(f"Validating parameters for {tool_name}")
-            is_valid, invalid_params = adapter.validate(params)
-            if not is_valid:
-                raise ToolValidationError(
-                    f"Invalid parameters for {tool_name}",
-                    tool_name=tool_name,
-                    invalid_params=invalid_params,
-                )
 
-            # Step 3: Execute tool
-            self.logger.info(f"Executing tool: {tool_name}")
-            result = adapter.execute(params, context)
-            result.execution_time = time.time() - start_time
-
-            # Step 4: Record execution
-            self._record_execution(tool_name, params, result)
+            with self.adapters.checkout(adapter_class) as adapter:
+                spec = adapter.get_spec()
+                cacheable = is_cacheable(spec)
+                if cacheable and use_cache:
+                    result = self.result_cache.get(tool_name, params)
+                    if result is not None:
+                        result.execution_time = time.time() - start_time
+                        self.logger.info(f"Tool {tool_name} served from result cache")
+                        return result, True
+
+                # Step 2: Validate parameters
+                self.logger.debug(f"Validating parameters for {tool_name}")
+                is_valid, invalid_params = adapter.validate(params)
+                if not is_valid:
+                    raise ToolValidationError(
+                        f"Invalid parameters for {tool_name}",
+                        tool_name=tool_name,
+                        invalid_params=invalid_params,
+                    )
+
+                # Step 3: Execute tool
+                self.logger.info(f"Executing tool: {tool_name}")
+                result = adapter.execute(params, context)
+                result.execution_time = time.time() - start_time
+
+            if cacheable and result.success:
+                self.result_cache.put(tool_name, params, result, spec)
 
             self.logger.info(f"Tool {tool_name} completed in {result.execution_time:.2f}s")
-            return result
+            return result, False
 
         except (ToolNotFoundError, ToolValidationError, ToolExecutionError) as e:
             # Known toolbelt errors
@@ -88,8 +221,7 @@ class ToolbeltCore:
                 error_message=str(e),
                 execution_time=time.time() - start_time,
             )
-            self._record_execution(tool_name, params, result)
-            return result
+            return result, False
 
         except Exception as e:
             # Unexpected errors
@@ -102,8 +234,7 @@ class ToolbeltCore:
                 error_message=f"Unexpected error: {e}",
                 execution_time=time.time() - start_time,
             )
-            self._record_execution(tool_name, params, result)
-            return result
+            return result, False
 
     def list_tools(self) -> list[str]:
         """
@@ -152,12 +283,28 @@ class ToolbeltCore:
         """
         return self.execution_history[-limit:]
 
+    def clear_result_cache(self, tool_name: str | None = None) -> None:
+        """
+        Drop cached results, e.g. after a write that cached reads depend on.
+
+        Args:
+            tool_name: Tool whose results to drop (None = all tools)
+        """
+        self.result_cache.invalidate(tool_name)
+
     def clear_history(self) -> None:
         """Clear execution history."""
         self.execution_history.clear()
         self.logger.info("Execution history cleared")
 
-    def _record_execution(self, tool_name: str, params: dict[str, Any], result: ToolResult) -> None:
+    def _record_execution(
+        self,
+        tool_name: str,
+        params: dict[str, Any],
+        result: ToolResult,
+        cached: bool = False,
+        executor: str = "inline",
+    ) -> None:
         """
         Record tool execution for metrics and debugging.
 
@@ -165,6 +312,8 @@ class ToolbeltCore:
             tool_name: Name of tool executed
             params: Parameters used
             result: Execution result
+            cached: Whether the result came from the result cache
+            executor: Where it ran ("inline", "thread" or "process")
         """
         record = {
             "tool_name": tool_name,
@@ -174,13 +323,19 @@ class ToolbeltCore:
             "exit_code": result.exit_code,
             "params_count": len(params),
             "had_error": result.error_message is not None,
+            "cached": cached,
+            "executor": executor,
         }
 
-        self.execution_history.append(record)
+        if self.telemetry is not None:
+            self.telemetry.record(tool_name, params, result.execution_time, result.success, cached)
+
+        with self._history_lock:
+            self.execution_history.append(record)
 
-        # Keep history limited to last 100 executions
-        if len(self.execution_history) > 100:
-            self.execution_history = self.execution_history[-100:]
+            # Keep history limited to last 100 executions
+            if len(self.execution_history) > 100:
+                del self.execution_history[:-100]
 
 
 # Singleton instance